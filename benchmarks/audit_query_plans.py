@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Audyt planów zapytań Database (EXPLAIN QUERY PLAN)
+
+Wykonuje metody odczytu i zapisu Database na bazie z przykładowymi danymi
+(albo na kopii wskazanej bazy), zbiera wszystkie wysłane instrukcje SQL
+i wypisuje ich plany. Pełne przeglądy tabel w zapytaniach z WHERE oraz
+sortowania w tymczasowym B-drzewie są oznaczane - wtedy skrypt kończy się
+kodem 1.
+
+Uruchomienie: python benchmarks/audit_query_plans.py [ścieżka_do_bazy] [-v]
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+from database.query_audit import QueryAudit
+
+TASK_COUNT = 2000
+TABLE_ROW_COUNT = 2000
+COLUMNS = [
+    {'name': 'Nazwa', 'type': 'Tekstowa'},
+    {'name': 'Data', 'type': 'Data'},
+    {'name': 'Kwota', 'type': 'Waluta'},
+]
+
+
+def fill_database(db):
+    """Przykładowe zadania, notatki, tabela użytkownika i lista słownikowa"""
+    column_id = db.add_task_column('Prio', 'Tekstowa')
+    with db.connection() as conn:
+        conn.executemany(
+            'INSERT INTO tasks (title, status, category, kanban, archived) VALUES (?, ?, ?, ?, ?)',
+            [(f"Zadanie {i}", 'completed' if i % 3 == 0 else 'todo', 'Praca' if i % 2 else 'Dom',
+              i % 5 == 0, i % 7 == 0) for i in range(TASK_COUNT)]
+        )
+        conn.execute('INSERT INTO task_column_values (task_id, column_id, value) SELECT id, ?, ? FROM tasks',
+                     (column_id, 'wysoki'))
+    root = db.add_note('Notatki', 'Korzeń')
+    for i in range(50):
+        db.add_note(f"Notatka {i}", f"Treść {i}", root)
+    db.create_dictionary_list({'name': 'Statusy', 'items': ['Nowy', 'W toku', 'Zamknięty']})
+    table_id = db.create_user_table({'name': 'Audyt', 'columns': COLUMNS})
+    schema = db.get_user_table_schema(table_id)
+    with db.connection() as conn:
+        conn.executemany(schema.insert_sql, (
+            (f"Rekord {i}", '2024-10-01', i + 0.5) for i in range(TABLE_ROW_COUNT)
+        ))
+
+
+def run_workload(db, work_dir):
+    """Wywołuje metody Database tak, jak robi to interfejs"""
+    # Bez cache metadanych - zapytania mają trafić do bazy
+    db.invalidate_metadata()
+
+    task_ids = [task['id'] for task in db.query_tasks(limit=20)]
+    task_id = task_ids[0] if task_ids else None
+    db.get_tasks()
+    db.get_tasks('todo')
+    db.get_tasks(kanban=1)
+    db.get_task_rows()
+    db.get_task_rows(task_ids)
+    for status in (None, 'completed', 'open'):
+        for archived in (None, False, True):
+            db.query_tasks(status=status, archived=archived, limit=50)
+            db.count_tasks(status=status, archived=archived)
+    db.query_tasks(tag='Praca', archived=False, limit=50)
+    db.query_tasks(text='Zadanie 1', limit=50)
+    db.search('Zadanie')
+    db.get_categories()
+    db.get_task_tags()
+    db.get_task_columns()
+    db.get_panel_columns()
+    db.get_task_column_values()
+    db.get_task_column_values(task_ids)
+    for column in db.get_task_columns():
+        if column.get('id') is not None:
+            db.get_task_ids_by_column_value(column['id'], 'wysoki')
+    if task_id is not None:
+        db.get_task(task_id)
+        db.update_task(task_id, status='todo')
+    db.archive_completed_tasks(30)
+
+    notes = db.get_all_notes()
+    for note in notes[:5]:
+        db.get_note_by_id(note['id'])
+        db.get_notes_by_parent(note['id'])
+
+    for dictionary_list in db.get_dictionary_lists():
+        db.get_dictionary_list_by_id(dictionary_list['id'])
+        db.get_dictionary_list_by_name(dictionary_list['name'])
+        db.get_dictionary_list_items(dictionary_list['id'])
+
+    for table in db.get_user_tables():
+        table_id = table['id']
+        db.get_column_widths(table_id)
+        db.count_table_rows(table_id)
+        rows = list(db.iter_table_rows(table_id, offset=0, limit=100))
+        list(db.iter_table_rows(table_id, offset=1000, limit=100))
+        if rows:
+            db.table_edits.stage_update(table_id, rows[0]['_row_id'], {'Nazwa': 'Zmieniony'})
+            db.table_edits.flush()
+        db.export_user_table(table_id, os.path.join(work_dir, f'tabela_{table_id}.csv'))
+    db.export_tasks(os.path.join(work_dir, 'zadania.csv'))
+    db.export_notes(os.path.join(work_dir, 'notatki.csv'))
+    db.get_setting('theme')
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != '-v']
+    verbose = '-v' in sys.argv[1:]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'data', 'tasks.db')
+        os.makedirs(os.path.dirname(db_path))
+        if args:
+            # Kopia - audyt zapisuje dane i nie może zmieniać prawdziwej bazy
+            shutil.copy2(args[0], db_path)
+
+        # Komunikaty DEBUG metod Database zaciemniałyby raport
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            db = Database(db_path)
+            if not args:
+                fill_database(db)
+            with QueryAudit(db.pool.get()) as audit:
+                run_workload(db, tmp_dir)
+            results = audit.report()
+            db.close()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    flagged = [entry for entry in results if entry['problems']]
+    print(f"Sprawdzono {len(results)} różnych instrukcji SQL, do poprawy: {len(flagged)}\n")
+    for entry in results:
+        if not (entry['problems'] or entry['error'] or verbose):
+            continue
+        marker = '!!' if entry['problems'] else ('??' if entry['error'] else 'ok')
+        print(f"[{marker}] x{entry['count']}  {entry['sql'][:160]}")
+        for step in entry['plan']:
+            flag = '  <--' if step in entry['problems'] else ''
+            print(f"        {step}{flag}")
+        if entry['error']:
+            print(f"        błąd EXPLAIN: {entry['error']}")
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
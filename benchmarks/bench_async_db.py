@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark responsywności wątku GUI przy zablokowanej bazie
+
+Inne połączenie trzyma blokadę zapisu (BEGIN IMMEDIATE) przez LOCK_SECONDS,
+a wątek GUI w tym czasie archiwizuje ukończone zadania - raz bezpośrednio
+(Database.archive_completed_tasks), raz przez AsyncDatabase. Mierzy, ile razy
+w tym czasie zadziałał 10 ms QTimer i jaka była najdłuższa przerwa między
+jego wywołaniami - czyli jak długo okno byłoby zamrożone.
+
+Uruchomienie: python benchmarks/bench_async_db.py [sekundy_blokady]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from database.db_manager import Database
+from ui.async_db import AsyncDatabase
+
+LOCK_SECONDS = 2.0
+TASK_COUNT = 10000
+
+
+def hold_write_lock(db_path, seconds, locked):
+    """Trzyma blokadę zapisu w osobnym wątku (jak inny proces zapisujący do bazy)"""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute('BEGIN IMMEDIATE')
+    locked.set()
+    time.sleep(seconds)
+    conn.rollback()
+    conn.close()
+
+
+def measure(app, db_path, lock_seconds, run):
+    """Uruchamia run() przy zablokowanej bazie i mierzy pętlę zdarzeń
+
+    Returns:
+        tuple: (czas do wyniku w s, liczba tyknięć timera, najdłuższa przerwa w ms)
+    """
+    ticks = []
+    timer = QTimer()
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+    timer.start(10)
+
+    locked = threading.Event()
+    locker = threading.Thread(target=hold_write_lock, args=(db_path, lock_seconds, locked))
+    locker.start()
+    locked.wait()
+
+    done = []
+    start = time.perf_counter()
+    ticks.append(start)
+    run(lambda result: done.append(time.perf_counter()))
+    while not done:
+        app.processEvents()
+        time.sleep(0.001)
+    ticks.append(time.perf_counter())
+    timer.stop()
+    locker.join()
+
+    longest = max(later - earlier for earlier, later in zip(ticks, ticks[1:]))
+    return done[0] - start, len(ticks) - 2, longest * 1000
+
+
+def main():
+    lock_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else LOCK_SECONDS
+    app = QCoreApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'data', 'tasks.db')
+        db = Database(db_path)
+        async_db = AsyncDatabase.for_database(db)
+
+        def fill():
+            with db.connection() as conn:
+                conn.executemany(
+                    "INSERT INTO tasks (title, status, updated_at) VALUES (?, 'completed', datetime('now', '-60 days'))",
+                    [(f"Zadanie {i}",) for i in range(TASK_COUNT)]
+                )
+
+        fill()
+        sync_time, sync_ticks, sync_gap = measure(
+            app, db_path, lock_seconds,
+            lambda done: done(db.archive_completed_tasks(30)))
+
+        fill()
+        async_time, async_ticks, async_gap = measure(
+            app, db_path, lock_seconds,
+            lambda done: async_db.submit(db.archive_completed_tasks, 30, on_result=done))
+
+        async_db.shutdown()
+        db.close()
+
+    print(f"Archiwizacja {TASK_COUNT} zadań przy blokadzie zapisu przez {lock_seconds:.1f} s:")
+    print(f"  w wątku GUI:         wynik po {sync_time:5.2f} s, tyknięć timera {sync_ticks:4d}, "
+          f"najdłuższe zamrożenie {sync_gap:7.1f} ms")
+    print(f"  przez AsyncDatabase: wynik po {async_time:5.2f} s, tyknięć timera {async_ticks:4d}, "
+          f"najdłuższe zamrożenie {async_gap:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
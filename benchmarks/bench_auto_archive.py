@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark automatycznej archiwizacji ukończonych zadań
+
+Porównuje dawne check_tasks_for_archiving (odczyt wszystkich ukończonych
+zadań, strptime w Pythonie i UPDATE na każde zadanie) z jednym UPDATE
+Database.archive_completed_tasks. Mierzy pierwsze wywołanie (archiwizacja
+wielu zadań) i kolejne cogodzinne sprawdzenie, gdy nie ma nic do zrobienia.
+
+Uruchomienie: python benchmarks/bench_auto_archive.py [liczba_zadań]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+
+TASK_COUNT = 200000
+ARCHIVE_DAYS = 30
+
+
+def archive_per_row(db, days):
+    """Dawna implementacja z TaskManagerApp.check_tasks_for_archiving"""
+    cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days)
+    archived_ids = []
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, updated_at FROM tasks WHERE status = 'completed' AND archived = 0")
+        for task_id, updated_at_str in cursor.fetchall():
+            try:
+                updated_at = datetime.datetime.strptime(updated_at_str, "%Y-%m-%d %H:%M:%S")
+                if updated_at < cutoff_date:
+                    cursor.execute('UPDATE tasks SET archived = 1 WHERE id = ?', (task_id,))
+                    archived_ids.append(task_id)
+            except Exception:
+                pass
+    return archived_ids
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, len(result)
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else TASK_COUNT
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        with db.connection() as conn:
+            # Połowa zadań ukończona, daty zmiany rozłożone na 60 dni
+            conn.executemany(
+                "INSERT INTO tasks (title, status, updated_at) VALUES (?, ?, datetime('now', ?))",
+                [(f"Zadanie {i}", 'completed' if i % 2 else 'todo', f'-{i % 60} days')
+                 for i in range(task_count)]
+            )
+
+        old_first = timed(lambda: archive_per_row(db, ARCHIVE_DAYS))
+        old_idle = timed(lambda: archive_per_row(db, ARCHIVE_DAYS))
+        with db.connection() as conn:
+            conn.execute('UPDATE tasks SET archived = 0')
+        new_first = timed(lambda: db.archive_completed_tasks(ARCHIVE_DAYS))
+        new_idle = timed(lambda: db.archive_completed_tasks(ARCHIVE_DAYS))
+        db.close()
+
+    print(f"Archiwizacja zadań starszych niż {ARCHIVE_DAYS} dni ({task_count} zadań):")
+    print(f"  per wiersz, pierwsze wywołanie:     {old_first[0]:9.1f} ms  ({old_first[1]} zadań)")
+    print(f"  per wiersz, kolejne sprawdzenie:    {old_idle[0]:9.1f} ms")
+    print(f"  jedno UPDATE, pierwsze wywołanie:   {new_first[0]:9.1f} ms  ({new_first[1]} zadań)")
+    print(f"  jedno UPDATE, kolejne sprawdzenie:  {new_idle[0]:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
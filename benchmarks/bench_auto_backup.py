@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark automatycznych backupów (BackupScheduler.run_backup)
+
+Mierzy pierwszą kopię (backup API + skrót + kompresja gzip) i jej rozmiar
+względem bazy, kolejne wywołanie bez zmian w bazie (PRAGMA data_version)
+oraz wywołanie po ponownym uruchomieniu bez zmian (porównanie skrótu
+z nazwą ostatniej kopii - bez zapisu nowego pliku).
+
+Uruchomienie: python benchmarks/bench_auto_backup.py [liczba_zadań]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database.db_manager import Database
+from src.utils.backup_scheduler import BackupScheduler, list_backups
+
+TASK_COUNT = 300000
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result[0]
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else TASK_COUNT
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'data', 'tasks.db')
+        db = Database(db_path)
+        with db.connection() as conn:
+            conn.executemany('INSERT INTO tasks (title, description) VALUES (?, ?)',
+                             [(f"Zadanie {i}", f"Opis zadania numer {i}") for i in range(task_count)])
+        db.checkpoint('TRUNCATE')
+        db_size = os.path.getsize(db_path)
+
+        # Komunikaty o utworzonych kopiach zaburzałyby wynik
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            scheduler = BackupScheduler(db_path)
+            first = timed(scheduler.run_backup)
+            idle = timed(scheduler.run_backup)
+            restarted = timed(BackupScheduler(db_path).run_backup)
+            db.add_task('Nowe zadanie')
+            changed = timed(scheduler.run_backup)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        backups = list_backups(scheduler.backup_dir, scheduler.stem)
+        backup_size = os.path.getsize(backups[-1][2])
+        db.close()
+
+    print(f"Automatyczny backup bazy {db_size / 1000000:.1f} MB ({task_count} zadań):")
+    print(f"  pierwsza kopia:                 {first[0]:9.1f} ms  ({first[1]}, "
+          f"plik {backup_size / 1000000:.1f} MB = {backup_size * 100 / db_size:.0f}% bazy)")
+    print(f"  bez zmian (data_version):       {idle[0]:9.2f} ms  ({idle[1]})")
+    print(f"  bez zmian po restarcie (skrót): {restarted[0]:9.1f} ms  ({restarted[1]})")
+    print(f"  po zmianie w bazie:             {changed[0]:9.1f} ms  ({changed[1]})")
+    print(f"  kopii w katalogu:               {len(backups):9d}")
+
+
+if __name__ == "__main__":
+    main()
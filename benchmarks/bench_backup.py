@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark backupu działającej bazy
+
+Porównuje dawne shutil.copy2 pliku bazy z backupem przez sqlite3 backup API
+(backup_database) przy zapisach wykonywanych w tym samym czasie przez inny
+wątek - jak aplikacja pracująca w trakcie backupu. Sprawdza, czy kopia
+przechodzi PRAGMA quick_check i ile zadań zawiera, oraz mierzy najdłuższe
+opóźnienie pojedynczego zapisu w trakcie kopiowania.
+
+Uruchomienie: python benchmarks/bench_backup.py [liczba_zadań]
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database.db_manager import Database
+from src.utils.backup_manager import backup_database
+
+TASK_COUNT = 300000
+
+
+class Writer(threading.Thread):
+    """Dodaje zadania w pętli i zapamiętuje najdłuższy czas zapisu"""
+
+    def __init__(self, db):
+        super().__init__(daemon=True)
+        self.db = db
+        self.running = True
+        self.writes = 0
+        self.max_ms = 0.0
+
+    def run(self):
+        while self.running:
+            start = time.perf_counter()
+            with self.db.connection() as conn:
+                conn.execute("INSERT INTO tasks (title) VALUES ('w trakcie backupu')")
+            self.max_ms = max(self.max_ms, (time.perf_counter() - start) * 1000)
+            self.writes += 1
+        self.db.pool.close()
+
+
+def check_copy(path):
+    conn = sqlite3.connect(path)
+    try:
+        status = conn.execute('PRAGMA quick_check').fetchone()[0]
+        count = conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[0]
+    except sqlite3.Error as e:
+        status, count = str(e), 0
+    conn.close()
+    return status, count
+
+
+def measure(db, copy):
+    writer = Writer(db)
+    writer.start()
+    time.sleep(0.2)
+    start = time.perf_counter()
+    copy()
+    elapsed = time.perf_counter() - start
+    writer.running = False
+    writer.join()
+    return elapsed, writer
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else TASK_COUNT
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'data', 'tasks.db')
+        db = Database(db_path)
+        with db.connection() as conn:
+            conn.executemany('INSERT INTO tasks (title, description) VALUES (?, ?)',
+                             [(f"Zadanie {i}", 'opis ' * 40) for i in range(task_count)])
+        size_mb = os.path.getsize(db_path) / 1000000
+
+        copy_path = os.path.join(tmp_dir, 'copy2.db')
+        copy_time, copy_writer = measure(db, lambda: shutil.copy2(db_path, copy_path))
+        copy_status, copy_count = check_copy(copy_path)
+
+        backup_path = os.path.join(tmp_dir, 'backup.db')
+        steps = []
+        backup_time, backup_writer = measure(
+            db, lambda: backup_database(db_path, backup_path, progress=lambda done, total: steps.append(done)))
+        backup_status, backup_count = check_copy(backup_path)
+        db.close()
+
+    print(f"Backup bazy {size_mb:.0f} MB ({task_count} zadań + zapisy w tle):")
+    print(f"  shutil.copy2:     {copy_time:6.2f} s  quick_check={copy_status}  zadań w kopii={copy_count}"
+          f"  (zapisów w tle: {copy_writer.writes}, najdłuższy {copy_writer.max_ms:.1f} ms)")
+    print(f"  backup_database:  {backup_time:6.2f} s  quick_check={backup_status}  zadań w kopii={backup_count}"
+          f"  (zapisów w tle: {backup_writer.writes}, najdłuższy {backup_writer.max_ms:.1f} ms, kroków postępu: {len(steps)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark importu backupu bazy
+
+Tworzy backup bazy z dużą liczbą zadań, a następnie importuje go przez
+BackupManager.import_backup (kopia robocza, PRAGMA quick_check, sprawdzenie
+schematu, podmiana przez os.replace) - jawnie i jako skompresowaną kopię
+.db.gz. Próbuje też zaimportować kopię uciętą w połowie i kopię z
+uszkodzonymi stronami - obie muszą zostać odrzucone, a aktualna baza musi
+pozostać nietknięta.
+
+Uruchomienie: python benchmarks/bench_backup_import.py [liczba_zadań]
+"""
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database.db_manager import Database
+from src.utils.backup_manager import BackupManager, backup_database
+
+TASK_COUNT = 300000
+
+
+def count_tasks(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def timed_import(manager, path):
+    steps = []
+    start = time.perf_counter()
+    success, message = manager.import_backup(path, progress=lambda percent, stage: steps.append(percent))
+    return time.perf_counter() - start, success, message, len(steps)
+
+
+def main():
+    task_count = int(sys.argv[1]) if len(sys.argv) > 1 else TASK_COUNT
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Backup z dużą liczbą zadań
+        source_path = os.path.join(tmp_dir, 'source', 'tasks.db')
+        source = Database(source_path)
+        with source.connection() as conn:
+            conn.executemany('INSERT INTO tasks (title, description) VALUES (?, ?)',
+                             [(f"Zadanie {i}", 'opis ' * 40) for i in range(task_count)])
+        source.close()
+        backup_path = os.path.join(tmp_dir, 'backup.db')
+        backup_database(source_path, backup_path)
+        size_mb = os.path.getsize(backup_path) / 1000000
+
+        gzip_path = backup_path + '.gz'
+        with open(backup_path, 'rb') as plain, gzip.open(gzip_path, 'wb', compresslevel=6) as packed:
+            shutil.copyfileobj(plain, packed)
+
+        with open(backup_path, 'rb') as plain:
+            data = bytearray(plain.read())
+        truncated_path = os.path.join(tmp_dir, 'truncated.db')
+        with open(truncated_path, 'wb') as target:
+            target.write(data[:len(data) // 2])
+        # Uszkodzenie stron w środku pliku - nagłówek pozostaje poprawny
+        middle = len(data) // 2
+        data[middle:middle + 64 * 4096] = b'\x55' * (64 * 4096)
+        corrupt_path = os.path.join(tmp_dir, 'corrupt.db')
+        with open(corrupt_path, 'wb') as target:
+            target.write(data)
+
+        # Aktualna baza aplikacji
+        live_path = os.path.join(tmp_dir, 'data', 'tasks.db')
+        live = Database(live_path)
+        live.add_task('Aktualne zadanie')
+        live.close()
+        manager = BackupManager(live_path)
+
+        print(f"Import backupu {size_mb:.0f} MB ({task_count} zadań):")
+        for label, path in (('ucięty w połowie', truncated_path), ('uszkodzone strony', corrupt_path)):
+            elapsed, success, message, steps = timed_import(manager, path)
+            print(f"  {label:18} {elapsed:6.2f} s  przyjęty={success}  zadań w bazie={count_tasks(live_path)}"
+                  f"  ({message.replace(chr(10), ' ')[:90]})")
+        for label, path in (('plik .db', backup_path), ('plik .db.gz', gzip_path)):
+            elapsed, success, message, steps = timed_import(manager, path)
+            print(f"  {label:18} {elapsed:6.2f} s  przyjęty={success}  zadań w bazie={count_tasks(live_path)}"
+                  f"  (kroków postępu: {steps})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Mikro-benchmark warstwy połączeń - operacje CRUD na zadaniach
+
+Porównuje liczbę operacji na sekundę dla:
+  - "przed": nowe sqlite3.connect() przy każdym wywołaniu metody Database
+  - "po":    trwałe połączenie wątku z puli ConnectionPool
+
+Uruchomienie: python benchmarks/bench_connection_pool.py [liczba_operacji]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+
+
+class FreshConnectionDatabase(Database):
+    """Database zachowujący się jak przed zmianą - połączenie na każde wywołanie"""
+
+    @contextmanager
+    def connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+def run_crud(db, operations):
+    """Wykonuje mieszankę add/get/update/delete i zwraca słownik ops/s"""
+    results = {}
+
+    start = time.perf_counter()
+    task_ids = [db.add_task(f"Zadanie {i}", category='Praca') for i in range(operations)]
+    results['add_task'] = operations / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for task_id in task_ids:
+        db.get_task(task_id)
+    results['get_task'] = operations / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for task_id in task_ids:
+        db.update_task(task_id, status='completed')
+    results['update_task'] = operations / (time.perf_counter() - start)
+
+    # Odczyt wprost z tabeli - db.get_setting() czyta migawkę AppSettings w
+    # pamięci i nie sięga do bazy, więc nie mierzyłby warstwy połączeń
+    start = time.perf_counter()
+    for _ in range(operations):
+        with db.connection() as conn:
+            conn.execute(
+                'SELECT value FROM app_settings WHERE key = ?', ('task_auto_move_completed',)
+            ).fetchone()
+    results['read_setting'] = operations / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for task_id in task_ids:
+        db.delete_task(task_id)
+    results['delete_task'] = operations / (time.perf_counter() - start)
+
+    return results
+
+
+def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        before_db = FreshConnectionDatabase(os.path.join(tmp_dir, 'before', 'tasks.db'))
+        before = run_crud(before_db, operations)
+
+        after_db = Database(os.path.join(tmp_dir, 'after', 'tasks.db'))
+        after = run_crud(after_db, operations)
+        after_db.close()
+
+    print(f"Operacji na pomiar: {operations}")
+    print(f"{'operacja':<14}{'przed [ops/s]':>16}{'po [ops/s]':>16}{'przyspieszenie':>16}")
+    for name in before:
+        speedup = after[name] / before[name] if before[name] else 0
+        print(f"{name:<14}{before[name]:>16.0f}{after[name]:>16.0f}{speedup:>15.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark odczytów metadanych (kolumny zadań, tagi, kategorie, listy słownikowe)
+
+Symuluje edycję komórek i przeładowania widoku zadań: wielokrotne
+get_task_columns/get_dictionary_list_items/get_dictionary_lists. Porównuje
+odczyty z cache metadanych Database z zapytaniami do bazy.
+
+Uruchomienie: python benchmarks/bench_metadata_cache.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+
+ROUNDS = 2000
+COLUMN_COUNT = 20
+LIST_COUNT = 10
+ITEMS_PER_LIST = 30
+
+
+def fill_database(db):
+    list_ids = []
+    for i in range(LIST_COUNT):
+        list_ids.append(db.create_dictionary_list({
+            'name': f"Lista {i}",
+            'items': [f"Element {j}" for j in range(ITEMS_PER_LIST)],
+        }))
+    for i in range(COLUMN_COUNT):
+        db.add_task_column(f"Kolumna {i}", 'Lista', dictionary_list_id=list_ids[i % LIST_COUNT])
+    return list_ids
+
+
+def read_metadata(db, list_ids):
+    """Odczyty wykonywane przy edycji komórki i ładowaniu widoku"""
+    db.get_task_columns()
+    db.get_task_tags()
+    db.get_categories()
+    db.get_dictionary_lists()
+    for list_id in list_ids[:3]:
+        db.get_dictionary_list_items(list_id)
+
+
+def measure(db, list_ids, uncached):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        if uncached:
+            db.invalidate_metadata()
+        read_metadata(db, list_ids)
+    return (time.perf_counter() - start) * 1000000 / ROUNDS
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        list_ids = fill_database(db)
+
+        uncached_us = measure(db, list_ids, uncached=True)
+        cached_us = measure(db, list_ids, uncached=False)
+        stats = db.metadata_cache_stats()
+        db.close()
+
+    print(f"Odczyt metadanych ({ROUNDS} powtórzeń, średnio na jedną rundę odczytów):")
+    print(f"  zapytania do bazy:  {uncached_us:10.1f} µs")
+    print(f"  cache metadanych:   {cached_us:10.1f} µs")
+    print(f"  przyspieszenie:     {uncached_us / cached_us:10.1f}x")
+    print(f"  trafienia/chybienia: {stats['hits']}/{stats['misses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark inicjalizacji bazy przy starcie aplikacji
+
+Porównuje dawne init_database (CREATE TABLE IF NOT EXISTS dla wszystkich tabel,
+sondy PRAGMA table_info i wstawienie domyślnych kategorii przy każdym
+Database()) z MigrationRunner, który przy aktualnym schemacie czyta tylko
+PRAGMA user_version.
+
+Uruchomienie: python benchmarks/bench_migrations.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+from database.migrations import MigrationRunner, MIGRATIONS
+
+ROUNDS = 200
+
+
+def replay_all_migrations(conn):
+    """Dawne zachowanie - cały skrypt schematu przy każdym starcie"""
+    cursor = conn.cursor()
+    for _, _, func in MIGRATIONS:
+        func(cursor)
+    conn.commit()
+
+
+def measure(func, *args):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        conn = db.pool.get()
+
+        full_us = measure(replay_all_migrations, conn)
+        runner_us = measure(MigrationRunner().run, conn)
+        db.close()
+
+    print(f"Inicjalizacja aktualnej bazy (mediana z {ROUNDS} prób):")
+    print(f"  pełny skrypt schematu:  {full_us:10.1f} µs")
+    print(f"  MigrationRunner:        {runner_us:10.1f} µs")
+    print(f"  przyspieszenie:         {full_us / runner_us:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
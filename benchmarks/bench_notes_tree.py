@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark ładowania drzewa notatek
+
+Porównuje pobranie wszystkich notatek z treścią (Database.get_all_notes,
+dotychczasowe ładowanie drzewa) z pobraniem samych notatek głównych bez treści
+(NotesRepository.get_children) oraz mierzy zapytania WITH RECURSIVE na
+głębokim poddrzewie (liczba potomków, ścieżka do korzenia, usunięcie).
+
+Uruchomienie: python benchmarks/bench_notes_tree.py [liczba_notatek]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+
+NOTE_COUNT = 50000
+ROOT_COUNT = 50
+CONTENT = 'Treść notatki ' * 150  # ok. 2 KB na notatkę
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    note_count = int(sys.argv[1]) if len(sys.argv) > 1 else NOTE_COUNT
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        with db.connection() as conn:
+            # Notatki główne, pod każdą łańcuch podnotatek
+            for i in range(ROOT_COUNT):
+                conn.execute('INSERT INTO notes (title, content) VALUES (?, ?)', (f"Notatka {i}", CONTENT))
+            parents = list(range(1, ROOT_COUNT + 1))
+            for i in range(ROOT_COUNT, note_count):
+                parent_id = parents[i % ROOT_COUNT]
+                cursor = conn.execute('INSERT INTO notes (title, content, parent_id) VALUES (?, ?, ?)',
+                                      (f"Podnotatka {i}", CONTENT, parent_id))
+                parents[i % ROOT_COUNT] = cursor.lastrowid
+        deepest = parents[0]
+
+        all_ms, all_notes = timed(db.get_all_notes)
+        roots_ms, roots = timed(db.notes.get_children, None)
+        children_ms, children = timed(db.notes.get_children, roots[0]['id'])
+        content_ms, _ = timed(db.notes.get_content, roots[0]['id'])
+        count_ms, descendants = timed(db.notes.count_descendants, roots[0]['id'])
+        path_ms, path = timed(db.notes.get_path, deepest)
+        delete_ms, deleted = timed(db.notes.delete_subtree, roots[1]['id'])
+        db.close()
+
+    print(f"Drzewo {note_count} notatek ({ROOT_COUNT} głównych):")
+    print(f"  get_all_notes (z treścią):        {all_ms:8.1f} ms  ({len(all_notes)} notatek)")
+    print(f"  get_children(None) (bez treści):  {roots_ms:8.1f} ms  ({len(roots)} notatek)")
+    print(f"  get_children(rozwinięty węzeł):   {children_ms:8.1f} ms  ({len(children)} notatek)")
+    print(f"  get_content (wybór notatki):      {content_ms:8.1f} ms")
+    print(f"  count_descendants (CTE):          {count_ms:8.1f} ms  ({descendants} potomków)")
+    print(f"  get_path (CTE):                   {path_ms:8.1f} ms  (głębokość {len(path)})")
+    print(f"  delete_subtree (CTE):             {delete_ms:8.1f} ms  ({len(deleted)} notatek)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark wklejenia bloku komórek do tabeli użytkownika
+
+Porównuje zapis każdego zmienionego wiersza osobną transakcją
+(update_table_row - dawne save_table_row) z kolejką edycji: stage_update
+(linia dziennika do bufora systemu, bez fsync) w wątku GUI i jeden zapis
+zbiorczy przez flush().
+
+Uruchomienie: python benchmarks/bench_table_edit_queue.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+
+EDIT_COUNT = 1000
+COLUMNS = [{'name': f"Kolumna {i}", 'type': 'Tekstowa'} for i in range(6)]
+
+
+def fill_database(db):
+    table_id = db.create_user_table({'name': 'Benchmark', 'columns': COLUMNS})
+    row_ids = [db.insert_table_row(table_id, {col['name']: f"{i}" for col in COLUMNS})
+               for i in range(EDIT_COUNT)]
+    return table_id, row_ids
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+
+        # Komunikaty DEBUG zapisu zaburzałyby pomiar
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            table_id, row_ids = fill_database(db)
+            row_data = {col['name']: "wklejona wartość" for col in COLUMNS}
+
+            start = time.perf_counter()
+            for row_id in row_ids:
+                db.update_table_row(table_id, row_id, row_data)
+            direct_ms = (time.perf_counter() - start) * 1000
+
+            queue = db.table_edits
+            start = time.perf_counter()
+            for row_id in row_ids:
+                queue.stage_update(table_id, row_id, row_data)
+            staged_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            queue.flush()
+            flush_ms = (time.perf_counter() - start) * 1000
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        db.close()
+
+    print(f"Wklejenie {EDIT_COUNT} wierszy ({len(COLUMNS)} kolumn):")
+    print(f"  transakcja na wiersz (wątek GUI):    {direct_ms:10.1f} ms")
+    print(f"  kolejka - stage_update (wątek GUI):  {staged_ms:10.1f} ms")
+    print(f"  kolejka - flush (wątek w tle):       {flush_ms:10.1f} ms")
+    print(f"  przyspieszenie w wątku GUI:          {direct_ms / staged_ms:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
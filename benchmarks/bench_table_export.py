@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark eksportu tabeli użytkownika
+
+Porównuje eksport przez get_table_rows (wszystkie wiersze jako słowniki
+w pamięci, csv.DictWriter) z eksportem strumieniowym export_user_table
+(fetchmany, krotki prosto do csv.writer / linie JSON z gotowych kluczy).
+
+Uruchomienie: python benchmarks/bench_table_export.py [liczba_wierszy]
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+
+ROW_COUNT = 200000
+COLUMNS = [
+    {'name': 'Nazwa', 'type': 'Tekstowa'},
+    {'name': 'Data', 'type': 'Data'},
+    {'name': 'Kwota', 'type': 'Waluta'},
+    {'name': 'Zakończone', 'type': 'CheckBox'},
+    {'name': 'Status', 'type': 'Lista'},
+]
+
+
+def export_materialized(db, table_id, path):
+    """Eksport dotychczasowym API - lista słowników z całej tabeli"""
+    rows = db.get_table_rows(table_id)
+    with open(path, 'w', newline='', encoding='utf-8-sig') as out:
+        writer = csv.DictWriter(out, fieldnames=list(rows[0].keys()) if rows else [], delimiter=';')
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def measure(func):
+    """Zwraca (czas w s, szczyt pamięci w MB) - pamięć mierzona w osobnym przebiegu"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1000000
+    tracemalloc.stop()
+    return elapsed, peak_mb
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else ROW_COUNT
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        table_id = db.create_user_table({'name': 'Eksport', 'columns': COLUMNS})
+        schema = db.get_user_table_schema(table_id)
+        with db.connection() as conn:
+            conn.executemany(schema.insert_sql, (
+                (f"Rekord {i}", '2024-10-01', i + 0.5, i % 2, 'Nowy') for i in range(row_count)
+            ))
+
+        # Komunikaty DEBUG get_table_rows zaburzałyby pomiar
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            old_path = os.path.join(tmp_dir, 'stary.csv')
+            old = measure(lambda: export_materialized(db, table_id, old_path))
+            csv_path = os.path.join(tmp_dir, 'eksport.csv')
+            new_csv = measure(lambda: db.export_user_table(table_id, csv_path))
+            jsonl_path = os.path.join(tmp_dir, 'eksport.jsonl')
+            new_jsonl = measure(lambda: db.export_user_table(table_id, jsonl_path, 'jsonl'))
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        db.close()
+
+    print(f"Eksport {row_count} wierszy ({len(COLUMNS)} kolumn):")
+    print(f"  get_table_rows + DictWriter:    {old[0]:8.2f} s   szczyt pamięci {old[1]:8.1f} MB")
+    print(f"  export_user_table (CSV):        {new_csv[0]:8.2f} s   szczyt pamięci {new_csv[1]:8.1f} MB")
+    print(f"  export_user_table (JSONL):      {new_jsonl[0]:8.2f} s   szczyt pamięci {new_jsonl[1]:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark importu CSV do tabeli użytkownika
+
+Porównuje wstawianie wierszy pojedynczo (insert_table_row - jak przy
+wpisywaniu w GUI) z importem strumieniowym import_table_csv (csv.reader,
+konwersja typów, executemany w porcjach).
+
+Uruchomienie: python benchmarks/bench_table_import.py [liczba_wierszy]
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+
+ROW_COUNT = 200000
+SINGLE_INSERT_COUNT = 5000
+COLUMNS = [
+    {'name': 'Nazwa', 'type': 'Tekstowa'},
+    {'name': 'Data', 'type': 'Data'},
+    {'name': 'Kwota', 'type': 'Waluta'},
+    {'name': 'Zakończone', 'type': 'CheckBox'},
+    {'name': 'Status', 'type': 'Lista'},
+]
+
+
+def write_csv(path, row_count):
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file, delimiter=';')
+        writer.writerow([column['name'] for column in COLUMNS])
+        for i in range(row_count):
+            writer.writerow([f"Rekord {i}", '01.10.2024', f"{i},50 zł", 'tak' if i % 2 else 'nie', 'Nowy'])
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else ROW_COUNT
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'dane.csv')
+        write_csv(csv_path, row_count)
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        single_table = db.create_user_table({'name': 'Pojedynczo', 'columns': COLUMNS})
+        import_table = db.create_user_table({'name': 'Import', 'columns': COLUMNS})
+        memory_table = db.create_user_table({'name': 'Pamiec', 'columns': COLUMNS})
+
+        # Komunikaty DEBUG insert_table_row zaburzałyby pomiar
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            start = time.perf_counter()
+            for i in range(SINGLE_INSERT_COUNT):
+                db.insert_table_row(single_table, {'Nazwa': f"Rekord {i}", 'Data': '2024-10-01',
+                                                   'Kwota': i + 0.5, 'Zakończone': i % 2, 'Status': 'Nowy'})
+            single_us = (time.perf_counter() - start) * 1000000 / SINGLE_INSERT_COUNT
+
+            start = time.perf_counter()
+            result = db.import_table_csv(import_table, csv_path)
+            import_s = time.perf_counter() - start
+
+            # Pamięć mierzona osobnym importem - tracemalloc spowalnia wykonanie
+            tracemalloc.start()
+            db.import_table_csv(memory_table, csv_path)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1000000
+            tracemalloc.stop()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        db.close()
+
+    print(f"Import {result['rows']} wierszy CSV ({len(COLUMNS)} kolumn):")
+    print(f"  insert_table_row (na wiersz):   {single_us:10.1f} µs  (~{single_us * row_count / 1000000:.1f} s dla całego pliku)")
+    print(f"  import_table_csv:               {import_s:10.2f} s   ({import_s * 1000000 / row_count:.1f} µs na wiersz)")
+    print(f"  szczyt pamięci importu:         {peak_mb:10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
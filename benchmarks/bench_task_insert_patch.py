@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark dodania jednego zadania do listy 20 000 zadań
+
+Porównuje dawną ścieżkę (pełne przeładowanie listy przez TaskLoader po
+każdej zmianie) z aktualizacją przyrostową sterowaną szyną zdarzeń
+Database: wczytanie tylko nowego zadania i wstawienie go do listy.
+Jeśli dostępne jest PyQt6, mierzony jest też model TasksTableModel
+(set_tasks kontra insert_task).
+
+Uruchomienie: python benchmarks/bench_task_insert_patch.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+from database.task_loader import TaskLoader
+
+TASK_COUNT = 20000
+ROUNDS = 20
+
+
+def fill_database(db, task_count):
+    """Dodaje zadania z jedną kolumną użytkownika"""
+    prio_id = db.add_task_column('Prio', 'Tekstowa')
+    with db.connection() as conn:
+        conn.executemany(
+            'INSERT INTO tasks (title, description, category) VALUES (?, ?, ?)',
+            [(f"Zadanie {i}", "", 'Praca') for i in range(task_count)]
+        )
+        conn.execute(
+            'INSERT INTO task_column_values (task_id, column_id, value) SELECT id, ?, ? FROM tasks',
+            (prio_id, 'wysoki')
+        )
+
+
+def bench_full_reload(db):
+    """Dodanie zadania + pełne przeładowanie listy (dawne load_tasks)"""
+    timings = []
+    for i in range(ROUNDS):
+        start = time.perf_counter()
+        db.add_task(f"Nowe zadanie {i}", category='Praca')
+        tasks = TaskLoader(db).load()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, len(tasks)
+
+
+def bench_incremental(db, tasks):
+    """Dodanie zadania + wczytanie tylko zmienionych wierszy ze zdarzenia"""
+    def on_change(table, kind, task_ids):
+        if table == 'tasks' and kind == 'insert':
+            for task in TaskLoader(db).load(task_ids):
+                tasks.insert(0, task)
+
+    db.events.subscribe(on_change)
+    timings = []
+    try:
+        for i in range(ROUNDS):
+            start = time.perf_counter()
+            db.add_task(f"Nowe zadanie przyrostowe {i}", category='Praca')
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        db.events.unsubscribe(on_change)
+    return timings
+
+
+def bench_model(tasks):
+    """Przebudowa modelu tabeli kontra wstawienie jednego wiersza (wymaga PyQt6)"""
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        return None
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    app = QApplication.instance() or QApplication([])
+    from ui.tasks_table_model import TasksTableModel
+
+    model = TasksTableModel()
+    model.set_columns([{"name": "ID"}, {"name": "Status", "type": "CheckBox"},
+                       {"name": "Zadanie"}, {"name": "TAG"}, {"name": "Prio"}])
+    new_task = dict(tasks[0], id=-1)
+
+    start = time.perf_counter()
+    model.set_tasks(tasks)
+    reset_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    model.insert_task(0, new_task)
+    model.row_for_task(-1)
+    insert_ms = (time.perf_counter() - start) * 1000
+    return reset_ms, insert_ms
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        fill_database(db, TASK_COUNT)
+
+        full, task_count = bench_full_reload(db)
+        tasks = TaskLoader(db).load()
+        incremental = bench_incremental(db, tasks)
+        model_timings = bench_model(tasks)
+        db.close()
+
+    print(f"Dodanie 1 zadania do listy ~{task_count} zadań (mediana z {ROUNDS} prób):")
+    print(f"  pełne przeładowanie:   {median(full):8.2f} ms")
+    print(f"  aktualizacja wiersza:  {median(incremental):8.2f} ms")
+    print(f"  przyspieszenie:        {median(full) / median(incremental):8.1f}x")
+    if model_timings is None:
+        print("  (PyQt6 niedostępne - pominięto pomiar modelu tabeli)")
+    else:
+        reset_ms, insert_ms = model_timings
+        print(f"  model: set_tasks {reset_ms:.2f} ms, insert_task {insert_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark regresyjny ładowania zadań - liczba zapytań SQL
+
+Ładuje listę zadań przez TaskLoader dla rosnącej liczby zadań i liczy
+zapytania wysłane do SQLite. Kończy się kodem 1, jeśli liczba zapytań
+rośnie razem z liczbą zadań (regresja N+1).
+
+Uruchomienie: python benchmarks/bench_task_load_queries.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+from database.task_loader import TaskLoader
+
+TASK_COUNTS = (100, 1000, 5000)
+
+
+def fill_database(db, task_count):
+    """Dodaje zadania z kolumnami użytkownika (część w starym formacie opisu)"""
+    prio_id = db.add_task_column('Prio', 'Tekstowa')
+    db.add_task_column('Osoba', 'Tekstowa')
+    with db.connection() as conn:
+        conn.executemany(
+            'INSERT INTO tasks (title, description, category) VALUES (?, ?, ?)',
+            [(f"Zadanie {i}", f"Osoba: Jan {i}" if i % 2 else "", 'Praca') for i in range(task_count)]
+        )
+        conn.execute(
+            'INSERT INTO task_column_values (task_id, column_id, value) SELECT id, ?, ? FROM tasks',
+            (prio_id, 'wysoki')
+        )
+
+
+def count_load_queries(db):
+    """Zwraca (liczba zapytań, czas w ms, liczba zadań) dla jednego ładowania"""
+    statements = []
+    conn = db.pool.get()
+    conn.set_trace_callback(statements.append)
+    try:
+        start = time.perf_counter()
+        tasks = TaskLoader(db).load()
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        conn.set_trace_callback(None)
+    # Pomiń BEGIN/COMMIT - liczymy tylko zapytania o dane
+    queries = [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+    return len(queries), elapsed, len(tasks)
+
+
+def main():
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for task_count in TASK_COUNTS:
+            db = Database(os.path.join(tmp_dir, str(task_count), 'tasks.db'))
+            fill_database(db, task_count)
+            results.append((task_count, *count_load_queries(db)))
+            db.close()
+
+    print(f"{'zadania':>10}{'zapytania':>12}{'czas [ms]':>12}")
+    for task_count, queries, elapsed, loaded in results:
+        print(f"{task_count:>10}{queries:>12}{elapsed:>12.1f}")
+
+    query_counts = {queries for _, queries, _, _ in results}
+    if len(query_counts) != 1:
+        print("REGRESJA: liczba zapytań rośnie wraz z liczbą zadań")
+        sys.exit(1)
+    print("OK: liczba zapytań nie zależy od liczby zadań")
+
+
+if __name__ == "__main__":
+    main()
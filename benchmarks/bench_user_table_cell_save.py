@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark zapisu komórki tabeli użytkownika
+
+Symuluje edycję komórek: update_table_row dla kolejnych wierszy. Porównuje
+zapis z deskryptorem schematu z cache (jedno zapytanie UPDATE) z zapisem,
+który przed każdym UPDATE czyta user_tables i user_table_columns (cache
+unieważniany przed każdym zapisem - dawne zachowanie).
+
+Uruchomienie: python benchmarks/bench_user_table_cell_save.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+from database.metadata_cache import USER_TABLES
+
+ROUNDS = 2000
+ROW_COUNT = 100
+COLUMNS = [{'name': f"Kolumna {i}", 'type': 'Tekstowa'} for i in range(12)]
+
+
+def fill_database(db):
+    table_id = db.create_user_table({'name': 'Benchmark', 'columns': COLUMNS})
+    row_ids = [db.insert_table_row(table_id, {col['name']: f"{i}" for col in COLUMNS})
+               for i in range(ROW_COUNT)]
+    return table_id, row_ids
+
+
+def measure(db, table_id, row_ids, uncached):
+    row_data = {col['name']: "wartość" for col in COLUMNS}
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        if uncached:
+            db.invalidate_metadata(USER_TABLES)
+        db.update_table_row(table_id, row_ids[i % ROW_COUNT], row_data)
+    return (time.perf_counter() - start) * 1000000 / ROUNDS
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        table_id, row_ids = fill_database(db)
+
+        # Komunikaty DEBUG zapisu zaburzałyby pomiar
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            uncached_us = measure(db, table_id, row_ids, uncached=True)
+            cached_us = measure(db, table_id, row_ids, uncached=False)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        db.close()
+
+    print(f"Zapis wiersza tabeli użytkownika ({ROUNDS} zapisów, {len(COLUMNS)} kolumn, średnio):")
+    print(f"  odczyt schematu przy każdym zapisie: {uncached_us:10.1f} µs")
+    print(f"  deskryptor schematu z cache:         {cached_us:10.1f} µs")
+    print(f"  przyspieszenie:                      {uncached_us / cached_us:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark otwierania dużej tabeli użytkownika
+
+Porównuje pobranie wszystkich wierszy (get_table_rows - dawne ładowanie całej
+tabeli do QTableWidget) z pierwszą stroną iter_table_rows i count_table_rows,
+które wykonuje UserTableModel przy otwarciu tabeli.
+
+Uruchomienie: python benchmarks/bench_user_table_paging.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.db_manager import Database
+
+ROW_COUNT = 200000
+PAGE_SIZE = 500
+COLUMNS = [
+    {'name': 'Nazwa', 'type': 'Tekstowa'},
+    {'name': 'Data', 'type': 'Data'},
+    {'name': 'Status', 'type': 'Lista'},
+    {'name': 'Kwota', 'type': 'Waluta'},
+    {'name': 'Zakończone', 'type': 'CheckBox'},
+]
+
+
+def fill_database(db):
+    table_id = db.create_user_table({'name': 'Benchmark', 'columns': COLUMNS})
+    physical_table = db.get_physical_table_name('Benchmark')
+    safe_names = [db.get_safe_column_name(column['name']) for column in COLUMNS]
+    with db.connection() as conn:
+        conn.executemany(
+            f"INSERT INTO {physical_table} ({', '.join(safe_names)}) VALUES (?, ?, ?, ?, ?)",
+            ((f"Rekord {i}", '2024-10-01', 'Nowy', i * 1.5, i % 2) for i in range(ROW_COUNT)))
+        conn.commit()
+    return table_id
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'data', 'tasks.db'))
+        table_id = fill_database(db)
+
+        full_ms = measure(lambda: db.get_table_rows(table_id))
+        page_ms = measure(lambda: (db.count_table_rows(table_id),
+                                   list(db.iter_table_rows(table_id, offset=0, limit=PAGE_SIZE))))
+        deep_ms = measure(lambda: list(db.iter_table_rows(table_id, offset=ROW_COUNT - PAGE_SIZE,
+                                                          limit=PAGE_SIZE)))
+        db.close()
+
+    print(f"Otwarcie tabeli użytkownika ({ROW_COUNT} wierszy, {len(COLUMNS)} kolumn):")
+    print(f"  wszystkie wiersze (get_table_rows):    {full_ms:10.1f} ms")
+    print(f"  liczba + pierwsza strona ({PAGE_SIZE}):     {page_ms:10.1f} ms")
+    print(f"  ostatnia strona (offset {ROW_COUNT - PAGE_SIZE}):     {deep_ms:10.1f} ms")
+    print(f"  przyspieszenie otwarcia:               {full_ms / page_ms:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark opóźnienia zapisu - profil WAL vs. dziennik rollback
+
+Mierzy czas pojedynczych zapisów typowych dla autozapisu aplikacji
+(set_setting, update_task, update_note) dla:
+  - "rollback": journal_mode=DELETE, synchronous=FULL (zachowanie sprzed zmiany)
+  - "WAL":      STORAGE_PROFILE z connection_pool
+
+Uruchomienie: python benchmarks/bench_wal_profile.py [liczba_zapisów]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database.connection_pool import STORAGE_PROFILE
+from database.db_manager import Database
+
+ROLLBACK_PROFILE = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+
+
+def measure(db, writes):
+    """Zwraca listę czasów zapisu (ms) dla mieszanki autozapisów"""
+    task_id = db.add_task("Zadanie testowe")
+    note_id = db.add_note("Notatka testowa")
+    latencies = []
+
+    for i in range(writes):
+        start = time.perf_counter()
+        if i % 3 == 0:
+            db.set_setting('bench_key', i)
+        elif i % 3 == 1:
+            db.update_task(task_id, category=f"Tag {i}")
+        else:
+            db.update_note(note_id, content=f"Treść notatki {i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return latencies
+
+
+def describe(latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    return statistics.mean(ordered), statistics.median(ordered), p95, p99
+
+
+def main():
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {}
+        for label, pragmas in (('rollback', ROLLBACK_PROFILE), ('WAL', STORAGE_PROFILE)):
+            db = Database(os.path.join(tmp_dir, label, 'tasks.db'), pragmas=pragmas)
+            results[label] = describe(measure(db, writes))
+            db.close()
+
+    print(f"Zapisów na pomiar: {writes}")
+    print(f"{'profil':<10}{'średnia [ms]':>14}{'p50 [ms]':>12}{'p95 [ms]':>12}{'p99 [ms]':>12}")
+    for label, (mean, p50, p95, p99) in results.items():
+        print(f"{label:<10}{mean:>14.3f}{p50:>12.3f}{p95:>12.3f}{p99:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Ustawienia aplikacji - migawka tabeli app_settings w pamięci z zapisem odroczonym
+"""
+import sqlite3
+import threading
+
+from .background_writer import DebouncedWriter
+from .connection_pool import ConnectionPool
+from .change_events import ChangeEventBus, UPDATE
+
+
+# Nazwa "tabeli" w zdarzeniach szyny - ids to lista zmienionych kluczy
+SETTINGS_TABLE = 'app_settings'
+
+
+class AppSettings:
+    """Ustawienia czytane z pamięci, zapisywane zbiorczo w tle
+
+    Tabela app_settings jest wczytywana raz. get() nie dotyka bazy, a set()
+    aktualizuje migawkę, publikuje zdarzenie ('app_settings', 'update', [klucze])
+    na szynie zmian bazy i odkłada zapis - zmiany z okna flush_delay trafiają
+    do bazy w jednej transakcji. flush() zapisuje zaległe zmiany od razu
+    (Database.close() wywołuje go przy zamykaniu aplikacji).
+    """
+
+    # Rejestr według ścieżki bazy - jedna migawka na plik bazy
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path, flush_delay=0.5):
+        """
+        Args:
+            db_path: Ścieżka do pliku bazy danych
+            flush_delay: Ile sekund czekać na kolejne zmiany przed zapisem
+        """
+        self.db_path = db_path
+        self.flush_delay = flush_delay
+        self.pool = ConnectionPool.for_path(db_path)
+        self.events = ChangeEventBus.for_path(db_path)
+        self._values = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._writer = None
+
+    @classmethod
+    def for_path(cls, db_path):
+        """Zwraca współdzielone ustawienia dla wskazanej ścieżki bazy"""
+        with cls._instances_lock:
+            settings = cls._instances.get(db_path)
+            if settings is None:
+                settings = cls(db_path)
+                cls._instances[db_path] = settings
+            return settings
+
+    def _snapshot(self):
+        """Wczytuje app_settings przy pierwszym odczycie"""
+        if self._values is None:
+            with self.pool.transaction() as conn:
+                values = dict(conn.execute('SELECT key, value FROM app_settings').fetchall())
+            with self._lock:
+                if self._values is None:
+                    # Zmiany zrobione przed wczytaniem migawki mają pierwszeństwo
+                    values.update(self._pending)
+                    self._values = values
+        return self._values
+
+    def get(self, key, default=None):
+        """Zwraca wartość ustawienia (tekst) lub default"""
+        return self._snapshot().get(key, default)
+
+    def get_bool(self, key, default=False):
+        """Zwraca ustawienie zapisane jako '1'/'0'"""
+        value = self.get(key)
+        return default if value is None else value == '1'
+
+    def get_int(self, key, default=0):
+        value = self.get(key)
+        try:
+            return int(value) if value is not None else default
+        except ValueError:
+            return default
+
+    def set(self, key, value):
+        """Zmienia jedno ustawienie"""
+        self.update({key: value})
+
+    def update(self, values):
+        """Zmienia kilka ustawień - jedno zdarzenie i jeden zapis do bazy
+
+        Wartości są zapisywane jako tekst (bool jako '1'/'0'), tak jak w app_settings.
+        """
+        snapshot = self._snapshot()
+        changed = []
+        with self._lock:
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    value = '1' if value else '0'
+                value = str(value)
+                if snapshot.get(key) != value:
+                    snapshot[key] = value
+                    self._pending[key] = value
+                    changed.append(key)
+            if changed:
+                self._schedule_flush()
+        if changed:
+            self.events.publish(SETTINGS_TABLE, UPDATE, changed)
+
+    def _schedule_flush(self):
+        """Budzi wątek zapisu (wywoływane pod self._lock)"""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = DebouncedWriter(self, name='settings-writer')
+            self._writer.start()
+        self._writer.notify()
+
+    def flush(self):
+        """Zapisuje zaległe zmiany w jednej transakcji
+
+        Returns:
+            int: Liczba zapisanych kluczy
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+        if not pending:
+            return 0
+
+        try:
+            with self.pool.transaction() as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO app_settings (key, value, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                ''', pending.items())
+        except sqlite3.Error as e:
+            print(f"Błąd zapisu ustawień {', '.join(pending)}: {e}")
+            with self._lock:
+                # Nie nadpisuj wartości ustawionych w trakcie nieudanego zapisu
+                for key, value in pending.items():
+                    self._pending.setdefault(key, value)
+            return 0
+        return len(pending)
+
+    def close(self):
+        """Zatrzymuje wątek zapisu i zapisuje zaległe zmiany"""
+        with self._lock:
+            writer = self._writer
+            self._writer = None
+        if writer is not None:
+            writer.stop()
+        self.flush()
+
+    def reload(self):
+        """Odrzuca migawkę - następny odczyt wczyta app_settings z bazy (np. po imporcie)"""
+        self.flush()
+        with self._lock:
+            self._values = None
@@ -0,0 +1,59 @@
+"""
+Wątek zapisu odroczonego - wspólny dla ustawień aplikacji i kolejki edycji tabel
+"""
+import threading
+import time
+
+
+class DebouncedWriter(threading.Thread):
+    """Wątek w tle wywołujący owner.flush() po flush_delay bez kolejnych zmian
+
+    Właściciel musi mieć atrybuty flush_delay i pool oraz metodę flush().
+    Po zatrzymaniu wątek zamyka swoje połączenie z puli.
+    """
+
+    def __init__(self, owner, name='debounced-writer'):
+        super().__init__(name=name, daemon=True)
+        self.owner = owner
+        self._wakeup = threading.Condition()
+        self._due = None  # Czas (monotonic) najbliższego zapisu
+        self._stopped = False
+
+    def notify(self, delay=None):
+        """Zgłasza zmianę - zapis przesunie się o flush_delay
+
+        Args:
+            delay: Opóźnienie zapisu w sekundach zamiast flush_delay
+                (np. ponowienie zapisu po błędzie)
+        """
+        with self._wakeup:
+            due = time.monotonic() + (self.owner.flush_delay if delay is None else delay)
+            previous = self._due
+            self._due = due
+            # Wątek czekający na wcześniejszy termin sam go przeliczy - budzimy
+            # go tylko, gdy nic nie czekało albo termin się przybliżył
+            if previous is None or due < previous:
+                self._wakeup.notify()
+
+    def run(self):
+        while True:
+            with self._wakeup:
+                while self._due is None and not self._stopped:
+                    self._wakeup.wait()
+                if self._stopped:
+                    break
+                remaining = self._due - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.wait(remaining)
+                    continue
+                self._due = None
+            self.owner.flush()
+
+        self.owner.pool.close()
+
+    def stop(self, timeout=5.0):
+        """Zatrzymuje wątek i czeka na jego zakończenie"""
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify()
+        self.join(timeout)
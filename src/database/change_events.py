@@ -0,0 +1,101 @@
+"""
+Szyna zdarzeń zmian danych - powiadamia widoki o dodanych, zmienionych i usuniętych wierszach
+"""
+import threading
+import weakref
+from contextlib import contextmanager
+
+
+# Rodzaje zmian
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+
+
+class ChangeEventBus:
+    """Rozsyła zdarzenia (tabela, rodzaj, lista ID) do subskrybentów
+
+    Subskrybenci są wywoływani synchronicznie w wątku, który zapisał zmianę -
+    widoki Qt powinny przekazywać zdarzenie dalej sygnałem. Metody obiektów
+    są trzymane przez słabe referencje, więc zamknięty widok nie blokuje szyny.
+    """
+
+    # Rejestr szyn według ścieżki bazy - wszystkie instancje Database dla
+    # tego samego pliku publikują na tej samej szynie
+    _buses = {}
+    _buses_lock = threading.Lock()
+
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def for_path(cls, db_path):
+        """Zwraca współdzieloną szynę dla wskazanej ścieżki bazy"""
+        with cls._buses_lock:
+            bus = cls._buses.get(db_path)
+            if bus is None:
+                bus = cls()
+                cls._buses[db_path] = bus
+            return bus
+
+    def subscribe(self, callback):
+        """Rejestruje funkcję callback(table, kind, ids)"""
+        if hasattr(callback, '__self__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with self._lock:
+            self._subscribers.append(ref)
+
+    def unsubscribe(self, callback):
+        """Wyrejestrowuje funkcję zarejestrowaną przez subscribe()"""
+        with self._lock:
+            self._subscribers = [ref for ref in self._subscribers
+                                 if ref() is not None and ref() != callback]
+
+    def publish(self, table, kind, ids):
+        """Publikuje zmianę wierszy tabeli (w trakcie batch() zdarzenia są łączone)"""
+        ids = list(ids)
+        if not ids:
+            return
+
+        pending = getattr(self._local, 'pending', None)
+        if pending is not None:
+            pending.setdefault((table, kind), []).extend(ids)
+            return
+
+        self._dispatch(table, kind, ids)
+
+    @contextmanager
+    def batch(self):
+        """Grupuje zdarzenia z bloku i wysyła je po jednym na (tabela, rodzaj)"""
+        if getattr(self._local, 'pending', None) is not None:
+            # Zagnieżdżony batch - zdarzenia wyśle zewnętrzny blok
+            yield
+            return
+
+        self._local.pending = {}
+        try:
+            yield
+        finally:
+            pending = self._local.pending
+            self._local.pending = None
+            for (table, kind), ids in pending.items():
+                # Usuń duplikaty zachowując kolejność
+                self._dispatch(table, kind, list(dict.fromkeys(ids)))
+
+    def _dispatch(self, table, kind, ids):
+        with self._lock:
+            subscribers = [ref for ref in self._subscribers if ref() is not None]
+            self._subscribers = subscribers
+
+        for ref in subscribers:
+            callback = ref()
+            if callback is None:
+                continue
+            try:
+                callback(table, kind, ids)
+            except Exception as e:
+                print(f"Błąd obsługi zdarzenia zmiany {kind} w tabeli {table}: {e}")
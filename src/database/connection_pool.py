@@ -0,0 +1,259 @@
+"""
+Pula trwałych połączeń SQLite - jedno długo żyjące połączenie na wątek
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from .text_fold import register_functions
+
+
+# Profil pracy bazy: WAL + mniej fsync-ów przy autozapisie
+# (kolejność ma znaczenie - journal_mode musi być ustawiony jako pierwszy)
+STORAGE_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,          # ~16 MB cache stron (wartość ujemna = KiB)
+    'mmap_size': 64 * 1024 * 1024,  # 64 MB odczytu przez mmap
+    'temp_store': 'MEMORY',
+    'journal_size_limit': 64 * 1024 * 1024,  # przycinaj plik WAL po checkpoincie
+}
+
+
+class ConnectionPool:
+    """Przechowuje jedno połączenie SQLite na wątek dla danej ścieżki bazy"""
+
+    # Rejestr pul według ścieżki bazy - kolejne instancje Database współdzielą połączenia
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    # Rozmiar cache przygotowanych zapytań (sqlite3 domyślnie trzyma 128)
+    STATEMENT_CACHE_SIZE = 256
+
+    def __init__(self, db_path, timeout=30.0, pragmas=None):
+        """
+        Inicjalizuje pulę połączeń
+
+        Args:
+            db_path: Ścieżka do pliku bazy danych
+            timeout: Czas oczekiwania na zwolnienie blokady (sekundy)
+            pragmas: Ustawienia PRAGMA dla nowych połączeń (domyślnie STORAGE_PROFILE)
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self.pragmas = STORAGE_PROFILE if pragmas is None else pragmas
+        self._checkpointer = None
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._closed = False  # Po close_all() - nowe połączenia dopiero po reopen()
+        self.opened_count = 0
+
+    @classmethod
+    def for_path(cls, db_path, pragmas=None):
+        """Zwraca współdzieloną pulę dla wskazanej ścieżki bazy
+        
+        pragmas są brane pod uwagę tylko przy tworzeniu puli.
+        """
+        with cls._pools_lock:
+            pool = cls._pools.get(db_path)
+            if pool is None:
+                pool = cls(db_path, pragmas=pragmas)
+                cls._pools[db_path] = pool
+            return pool
+
+    def get(self):
+        """Zwraca połączenie bieżącego wątku (tworzy je przy pierwszym użyciu)
+
+        Po close_all() pula odmawia połączeń (sqlite3.ProgrammingError) do
+        wywołania reopen() - np. w trakcie podmiany pliku bazy przy imporcie
+        backupu żaden wątek nie otworzy starego pliku.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    def _open(self):
+        """Otwiera nowe połączenie dla bieżącego wątku"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+            # Połączenie używa tylko wątek-właściciel, ale close_all()
+            # może je zamknąć z wątku głównego przy wyjściu z aplikacji
+            check_same_thread=False
+        )
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._connections.append(conn)
+                self.opened_count += 1
+        if closed:
+            # Sprawdzane razem z dopisaniem do listy - close_all() nie pominie połączenia
+            conn.close()
+            raise sqlite3.ProgrammingError(f"Połączenia z bazą {self.db_path} są zamknięte")
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name}={value}')
+        # Funkcje SQL aplikacji (np. fold_case w filtrze wyszukiwania zadań)
+        register_functions(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Udostępnia połączenie wątku - commit przy sukcesie, rollback przy błędzie
+
+        Zagnieżdżone wywołania w tym samym wątku (np. metoda Database wołana
+        wewnątrz innej transakcji) tworzą SAVEPOINT - błąd wycofuje tylko
+        zagnieżdżony fragment, a commit wykonuje wyłącznie najbardziej
+        zewnętrzny poziom.
+        """
+        conn = self.get()
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if depth == 0:
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._local.depth = 0
+            return
+
+        savepoint = f'pool_sp_{depth}'
+        if not conn.in_transaction:
+            conn.execute('BEGIN')
+        conn.execute(f'SAVEPOINT {savepoint}')
+        try:
+            yield conn
+        except BaseException:
+            # Jawny commit()/rollback() wewnątrz bloku kończy już cały savepoint
+            if conn.in_transaction:
+                conn.execute(f'ROLLBACK TO {savepoint}')
+                conn.execute(f'RELEASE {savepoint}')
+            raise
+        else:
+            if conn.in_transaction:
+                conn.execute(f'RELEASE {savepoint}')
+        finally:
+            self._local.depth = depth
+
+    def close(self):
+        """Zamyka połączenie bieżącego wątku"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def checkpoint(self, mode='PASSIVE'):
+        """Przenosi zawartość pliku WAL do bazy
+        
+        Args:
+            mode: PASSIVE (nie czeka na czytelników), FULL, RESTART lub TRUNCATE
+        
+        Returns:
+            tuple: (busy, wal_frames, checkpointed_frames) lub None poza trybem WAL
+        """
+        if self.pragmas.get('journal_mode', '').upper() != 'WAL':
+            return None
+        return self.get().execute(f'PRAGMA wal_checkpoint({mode})').fetchone()
+
+    def start_checkpointer(self, idle_seconds=30.0, poll_interval=5.0):
+        """Uruchamia wątek robiący checkpoint WAL, gdy baza jest bezczynna"""
+        if self._checkpointer is not None and self._checkpointer.is_alive():
+            return
+        self._checkpointer = CheckpointWorker(self, idle_seconds, poll_interval)
+        self._checkpointer.start()
+
+    def stop_checkpointer(self):
+        """Zatrzymuje wątek checkpointów"""
+        if self._checkpointer is not None:
+            self._checkpointer.stop()
+            self._checkpointer = None
+
+    def close_all(self):
+        """Zamyka wszystkie połączenia puli (przy zamykaniu aplikacji i imporcie backupu)
+        
+        Przed zamknięciem wykonywany jest checkpoint TRUNCATE, więc plik WAL
+        nie zostaje na dysku w rozrośniętej postaci. Do wywołania reopen()
+        pula nie otwiera nowych połączeń.
+        """
+        self.stop_checkpointer()
+        if not self._closed:
+            try:
+                self.checkpoint('TRUNCATE')
+            except sqlite3.Error as e:
+                print(f"Błąd checkpointu WAL przy zamykaniu: {e}")
+        with self._lock:
+            self._closed = True
+            connections = self._connections
+            self._connections = []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Błąd zamykania połączenia z bazą: {e}")
+        # Połączenia wątków zostały zamknięte - get() w każdym wątku zgłosi błąd
+        self._local = threading.local()
+
+    def reopen(self):
+        """Pozwala znowu otwierać połączenia po close_all()"""
+        with self._lock:
+            self._closed = False
+
+    def is_closed(self):
+        """Czy pula jest zamknięta przez close_all()"""
+        return self._closed
+
+
+class CheckpointWorker(threading.Thread):
+    """Wątek w tle robiący checkpoint WAL po okresie bez zapisów"""
+
+    def __init__(self, pool, idle_seconds=30.0, poll_interval=5.0):
+        """
+        Args:
+            pool: ConnectionPool, którego bazę obsługuje wątek
+            idle_seconds: Ile sekund bez nowych zapisów uznajemy za bezczynność
+            poll_interval: Co ile sekund sprawdzać PRAGMA data_version
+        """
+        super().__init__(name='wal-checkpoint', daemon=True)
+        self.pool = pool
+        self.idle_seconds = idle_seconds
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last_version = None
+        last_change = time.monotonic()
+        dirty = False
+
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                # data_version zmienia się, gdy inne połączenie zatwierdzi zmiany
+                version = self.pool.get().execute('PRAGMA data_version').fetchone()[0]
+                now = time.monotonic()
+                if version != last_version:
+                    dirty = last_version is not None
+                    last_version = version
+                    last_change = now
+                elif dirty and now - last_change >= self.idle_seconds:
+                    self.pool.checkpoint('PASSIVE')
+                    dirty = False
+            except sqlite3.Error as e:
+                print(f"Błąd checkpointu WAL w tle: {e}")
+
+        self.pool.close()
+
+    def stop(self, timeout=5.0):
+        """Zatrzymuje wątek i czeka na jego zakończenie"""
+        self._stop_event.set()
+        self.join(timeout)
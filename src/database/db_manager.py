@@ -2,250 +2,381 @@ import sqlite3
 import os
 from datetime import datetime
 import time
+import threading
+from .connection_pool import ConnectionPool
+from .change_events import ChangeEventBus, INSERT, UPDATE, DELETE
+from .migrations import MigrationRunner, SEARCH_INDEXES, populate_search_index
+from .app_settings import AppSettings
+from .metadata_cache import (MetadataCache, TASK_COLUMNS, TASK_TAGS, CATEGORIES,
+                             DICTIONARY_LISTS, USER_TABLES)
+from .user_table_schema import UserTableSchema
+from .table_edit_queue import TableEditQueue
+from .table_import import import_csv
+from .notes_repository import NotesRepository
+from .text_fold import fold_case, fold_search
+from . import table_export
+
+# Kolumny zadań przechowywane w tabeli tasks (pozostałe to kolumny użytkownika)
+STANDARD_TASK_COLUMNS = {'ID', 'Data dodania', 'Status', 'Zadanie', 'Notatka',
+                         'Data realizacji', 'KanBan', 'Archiwum', 'TAG'}
+
+# Kolumny tabeli tasks zwracane przez get_task_rows/query_tasks
+TASK_ROW_COLUMNS = 'id, title, description, status, category, note_id, created_at, updated_at, kanban, archived'
+
+# Automatyczna archiwizacja - wyszukiwanie po indeksie idx_tasks_archived_status_updated
+ARCHIVE_COMPLETED_SQL = (
+    "UPDATE tasks SET archived = 1 "
+    "WHERE status = 'completed' AND archived = 0 AND updated_at < datetime('now', ?)"
+)
+
+# UPDATE ... RETURNING jest dostępne od SQLite 3.35
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Dozwolone sortowania query_tasks (nazwa -> klauzula ORDER BY)
+TASK_ORDERINGS = {
+    'created': 'created_at DESC, id DESC',
+    'created_asc': 'created_at ASC, id ASC',
+    'status': "status = 'completed', id ASC",  # nieukończone na górze
+    'title': 'title COLLATE NOCASE, id',
+}
+
+
+def build_column_prefix_lookup(columns):
+    """Buduje mapę "Nazwa:" -> kolumna użytkownika do parsowania opisów zadań"""
+    return {f"{col['name']}:": col for col in columns if col['name'] not in STANDARD_TASK_COLUMNS}
+
+
+def split_description_values(description, prefixes):
+    """Rozdziela opis zadania na wartości kolumn użytkownika i pozostałe linie
+    
+    Args:
+        description: Treść tasks.description
+        prefixes: Mapa z build_column_prefix_lookup()
+    
+    Returns:
+        tuple: (lista (kolumna, wartość), lista pozostałych linii)
+    """
+    values = []
+    kept_lines = []
+    for line in description.split('\n'):
+        column = prefixes.get(line.split(':', 1)[0] + ':') if ':' in line else None
+        if column is None:
+            kept_lines.append(line)
+        else:
+            values.append((column, line[len(column['name']) + 1:].strip()))
+    return values, kept_lines
+
 
 class Database:
-    def __init__(self, db_path='data/tasks.db'):
+    # Rejestr instancji według ścieżki bazy - widoki i dialogi aplikacji
+    # dostają jedną instancję (jedna pula połączeń, jedno sprawdzenie schematu)
+    _instances = {}
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, db_path='data/tasks.db', pragmas=None):
         self.db_path = db_path
+        self.pool = ConnectionPool.for_path(db_path, pragmas)
+        # Nowa instancja otwiera bazę jawnie - także po close() poprzedniej
+        self.pool.reopen()
+        self.events = ChangeEventBus.for_path(db_path)
+        self.metadata_cache = MetadataCache.for_path(db_path)
+        self._fts_available = None
         self.init_database()
+        # Edycje tabel użytkownika niezapisane przed przerwaniem aplikacji
+        self.table_edits.recover()
     
-    def get_connection(self):
-        """Tworzy połączenie z bazą z timeout"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
-        # Tymczasowo wyłączamy WAL mode ze względu na problemy z wydajnością
-        # conn.execute('PRAGMA journal_mode=WAL')  # Write-Ahead Logging dla lepszej współbieżności
-        return conn
+    @classmethod
+    def for_path(cls, db_path='data/tasks.db', pragmas=None):
+        """Zwraca współdzieloną instancję Database dla wskazanej ścieżki bazy
+        
+        Główne okno tworzy ją raz i przekazuje widokom jako db_manager -
+        for_path() jest dla kodu, który nie dostał instancji (np. dialog
+        uruchomiony samodzielnie).
+        """
+        with cls._instances_lock:
+            db = cls._instances.get(db_path)
+            if db is None:
+                db = cls(db_path, pragmas)
+                cls._instances[db_path] = db
+            return db
+    
+    def connection(self):
+        """Zwraca kontekst transakcji na trwałym połączeniu bieżącego wątku
+        
+        Użycie: with db.connection() as conn: ...
+        Zmiany są zatwierdzane po wyjściu z bloku, a wycofywane przy wyjątku.
+        """
+        return self.pool.transaction()
+    
+    def close(self):
+        """Zamyka wszystkie połączenia z bazą danych (z końcowym checkpointem WAL)"""
+        # Zaległe zmiany ustawień i tabel użytkownika muszą trafić do bazy
+        # przed zamknięciem połączeń
+        self.settings.close()
+        self.table_edits.close()
+        self.pool.close_all()
+    
+    def reopen(self):
+        """Przywraca połączenia po close() (np. import backupu się nie udał)"""
+        self.pool.reopen()
+    
+    def checkpoint(self, mode='PASSIVE'):
+        """Przenosi zawartość pliku WAL do pliku bazy"""
+        return self.pool.checkpoint(mode)
+    
+    def start_background_checkpoints(self, idle_seconds=30.0):
+        """Włącza checkpointy WAL w tle, gdy aplikacja nie zapisuje danych"""
+        self.pool.start_checkpointer(idle_seconds)
+    
+    def notify_tasks_changed(self, kind, task_ids):
+        """Publikuje zmianę zadań na szynie zdarzeń (insert/update/delete)
+        
+        Metody Database robią to same - wywołanie jest potrzebne tylko po
+        bezpośrednich zapytaniach SQL na tabeli tasks.
+        """
+        self.events.publish('tasks', kind, task_ids)
+    
+    def invalidate_metadata(self, *groups):
+        """Unieważnia cache metadanych (task_columns, task_tags, categories, dictionary_lists, user_tables)
+        
+        Metody Database robią to same - wywołanie jest potrzebne tylko po
+        bezpośrednich zapytaniach SQL na tych tabelach.
+        """
+        self.metadata_cache.invalidate(*groups)
+    
+    def metadata_cache_stats(self):
+        """Zwraca liczniki trafień/chybień cache metadanych"""
+        return self.metadata_cache.stats()
     
     def init_database(self):
-        """Inicjalizuje bazę danych i tworzy tabele jeśli nie istnieją"""
+        """Inicjalizuje bazę danych - wykonuje oczekujące migracje schematu"""
         # Upewnij się, że folder data istnieje
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Tabela zadań
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    status TEXT DEFAULT 'todo',
-                    priority TEXT DEFAULT 'medium',
-                    category TEXT,
-                    due_date TEXT,
-                    note_id INTEGER,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (note_id) REFERENCES notes (id) ON DELETE SET NULL
-                )
-            ''')
-            
-            # Tabela kategorii
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    color TEXT DEFAULT '#3498db',
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Tabela tagów zadań
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS task_tags (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    color TEXT DEFAULT '#3498db',
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Tabela definicji tabel użytkownika
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_tables (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Tabela kolumn dla tabel użytkownika
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_table_columns (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    table_id INTEGER,
-                    name TEXT NOT NULL,
-                    type TEXT NOT NULL,
-                    is_required BOOLEAN DEFAULT 0,
-                    is_visible BOOLEAN DEFAULT 1,
-                    column_order INTEGER DEFAULT 0,
-                    dictionary_list TEXT,
-                    settings TEXT,
-                    FOREIGN KEY (table_id) REFERENCES user_tables (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Sprawdź czy kolumna note_id istnieje w tabeli tasks, jeśli nie - dodaj ją
-            cursor.execute("PRAGMA table_info(tasks)")
-            task_columns = [row[1] for row in cursor.fetchall()]
-            
-            if 'note_id' not in task_columns:
-                cursor.execute('''
-                    ALTER TABLE tasks 
-                    ADD COLUMN note_id INTEGER
-                ''')
-            
-            # Sprawdź czy kolumna kanban istnieje w tabeli tasks, jeśli nie - dodaj ją
-            if 'kanban' not in task_columns:
-                cursor.execute('''
-                    ALTER TABLE tasks 
-                    ADD COLUMN kanban INTEGER DEFAULT 0
-                ''')
-            
-            # Sprawdź czy kolumna archived istnieje w tabeli tasks, jeśli nie - dodaj ją
-            if 'archived' not in task_columns:
-                cursor.execute('''
-                    ALTER TABLE tasks 
-                    ADD COLUMN archived INTEGER DEFAULT 0
-                ''')
-
-            # Sprawdź czy kolumna dictionary_list istnieje, jeśli nie - dodaj ją
-            cursor.execute("PRAGMA table_info(user_table_columns)")
-            columns = [row[1] for row in cursor.fetchall()]
-            
-            if 'dictionary_list' not in columns:
-                cursor.execute('''
-                    ALTER TABLE user_table_columns 
-                    ADD COLUMN dictionary_list TEXT
-                ''')
-            
-            # Sprawdź czy istnieje kolumna context w dictionary_lists
-            cursor.execute('PRAGMA table_info(dictionary_lists)')
-            dict_columns = [row[1] for row in cursor.fetchall()]
-            
-            if 'context' not in dict_columns:
-                cursor.execute('''
-                    ALTER TABLE dictionary_lists 
-                    ADD COLUMN context TEXT DEFAULT 'table'
-                ''')
-            
-            # Tabela list słownikowych
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS dictionary_lists (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    type TEXT DEFAULT 'Inne',
-                    allow_custom BOOLEAN DEFAULT 0,
-                    multiple_selection BOOLEAN DEFAULT 0,
-                    required BOOLEAN DEFAULT 0,
-                    default_item TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Tabela elementów list słownikowych
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS dictionary_list_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    list_id INTEGER,
-                    value TEXT NOT NULL,
-                    order_index INTEGER DEFAULT 0,
-                    FOREIGN KEY (list_id) REFERENCES dictionary_lists (id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Tabela szerokości kolumn dla tabel użytkownika
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS table_column_widths (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    table_id INTEGER,
-                    column_index INTEGER,
-                    width INTEGER,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (table_id) REFERENCES user_tables (id) ON DELETE CASCADE,
-                    UNIQUE(table_id, column_index)
-                )
-            ''')
-            
-            # Tabela kolumn zadań
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS task_columns (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    type TEXT NOT NULL,
-                    visible BOOLEAN DEFAULT 1,
-                    in_panel BOOLEAN DEFAULT 0,
-                    default_value TEXT,
-                    column_order INTEGER DEFAULT 0,
-                    dictionary_list_id INTEGER,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (dictionary_list_id) REFERENCES dictionary_lists (id) ON DELETE SET NULL
-                )
-            ''')
-            
-            # Tabela notatek
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS notes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    content TEXT,
-                    parent_id INTEGER,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (parent_id) REFERENCES notes(id) ON DELETE CASCADE
-                )
-            ''')
-            
-            # Tabela ustawień aplikacji
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS app_settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT,
-                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Dodaj domyślne kategorie
-            default_categories = [
-                ('Praca', '#e74c3c'),
-                ('Dom', '#2ecc71'),
-                ('Nauka', '#f39c12'),
-                ('Hobby', '#9b59b6')
-            ]
-            
-            cursor.executemany('''
-                INSERT OR IGNORE INTO categories (name, color) VALUES (?, ?)
-            ''', default_categories)
-            
-            conn.commit()
+        MigrationRunner().run(self.pool.get())
+    
+    @property
+    def settings(self):
+        """Ustawienia aplikacji (migawka app_settings z zapisem odroczonym)"""
+        return AppSettings.for_path(self.db_path)
+    
+    @property
+    def table_edits(self):
+        """Kolejka zapisów edycji tabel użytkownika (zapis zbiorczy w tle z dziennikiem)"""
+        return TableEditQueue.for_database(self)
+    
+    @property
+    def notes(self):
+        """Zapytania drzewa notatek (dzieci, poddrzewa i treść pobierane osobno)"""
+        return NotesRepository(self)
+    
+    @property
+    def fts_available(self):
+        """Czy baza ma indeks FTS5 (bez niego search() używa LIKE)"""
+        if self._fts_available is None:
+            with self.connection() as conn:
+                self._fts_available = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='tasks_fts'"
+                ).fetchone() is not None
+        return self._fts_available
     
     def add_task(self, title, description='', status='todo', priority='medium', category=None, due_date=None, kanban=0):
         """Dodaje nowe zadanie do bazy danych"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO tasks (title, description, status, priority, category, due_date, kanban)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (title, description, status, priority, category, due_date, kanban))
-            conn.commit()
-            return cursor.lastrowid
+            task_id = cursor.lastrowid
+        self.notify_tasks_changed(INSERT, [task_id])
+        return task_id
     
-    def get_tasks(self, status=None):
-        """Pobiera zadania z bazy danych"""
-        with self.get_connection() as conn:
+    def get_tasks(self, status=None, kanban=None):
+        """Pobiera zadania z bazy danych
+        
+        Args:
+            status: Wartość kolumny status lub None (bez filtra)
+            kanban: 1/0 - tylko zadania z tablicy Kanban / spoza niej, None - bez filtra
+        """
+        conditions = []
+        params = []
+        if status:
+            conditions.append('status = ?')
+            params.append(status)
+        if kanban is not None:
+            conditions.append('kanban = ?')
+            params.append(int(kanban))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        with self.connection() as conn:
             cursor = conn.cursor()
-            if status:
-                cursor.execute('SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC', (status,))
-            else:
-                cursor.execute('SELECT * FROM tasks ORDER BY created_at DESC')
+            cursor.execute(f'SELECT * FROM tasks{where} ORDER BY created_at DESC', params)
             return cursor.fetchall()
     
+    def get_task_rows(self, task_ids=None):
+        """Pobiera zadania jako słowniki z nazwanymi kolumnami (niezależnie od kolejności kolumn w tabeli)
+        
+        Args:
+            task_ids: Lista ID zadań (None = wszystkie zadania)
+        """
+        if task_ids is None:
+            return self.query_tasks()
+        
+        rows = []
+        task_ids = list(task_ids)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(task_ids), 500):
+                chunk = task_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'SELECT {TASK_ROW_COLUMNS} FROM tasks WHERE id IN ({placeholders})', chunk)
+                columns = [description[0] for description in cursor.description]
+                rows.extend(dict(zip(columns, row)) for row in cursor.fetchall())
+        rows.sort(key=lambda row: (row['created_at'] or '', row['id']), reverse=True)
+        return rows
+    
+    def _task_filter_clause(self, status=None, archived=None, tag=None, text=None):
+        """Buduje klauzulę WHERE dla query_tasks/count_tasks"""
+        conditions = []
+        params = []
+        if status == 'open':
+            conditions.append("status IS NOT 'completed'")
+        elif status is not None:
+            conditions.append('status = ?')
+            params.append(status)
+        if archived is not None:
+            conditions.append('archived = ?')
+            params.append(1 if archived else 0)
+        if tag is not None:
+            conditions.append('category = ?')
+            params.append(tag)
+        if text:
+            # fold_case (zarejestrowana w ConnectionPool) zmienia wielkość także
+            # liter polskich - LIKE rozróżniałby "Żółw" i "żółw"
+            conditions.append('instr(fold_case(title), ?) > 0')
+            params.append(fold_case(text))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        return where, params
+    
+    def query_tasks(self, status=None, archived=None, tag=None, text=None,
+                    order_by='created', limit=None, offset=0):
+        """Pobiera zadania z filtrami i sortowaniem wykonanymi przez SQLite
+        
+        Args:
+            status: 'completed', 'open' (wszystkie poza completed), inna wartość
+                kolumny status lub None (bez filtra)
+            archived: True/False lub None (bez filtra)
+            tag: Kategoria zadania (tag) lub None
+            text: Fragment tytułu (bez rozróżniania wielkości liter, także polskich)
+            order_by: Klucz z TASK_ORDERINGS
+            limit: Maksymalna liczba wierszy (None = bez limitu)
+            offset: Liczba pominiętych wierszy (stronicowanie)
+        
+        Returns:
+            Lista słowników z kolumnami TASK_ROW_COLUMNS
+        """
+        if order_by not in TASK_ORDERINGS:
+            raise ValueError(f"Nieznane sortowanie zadań: {order_by}")
+        
+        where, params = self._task_filter_clause(status, archived, tag, text)
+        sql = f'SELECT {TASK_ROW_COLUMNS} FROM tasks{where} ORDER BY {TASK_ORDERINGS[order_by]}'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def count_tasks(self, status=None, archived=None, tag=None, text=None):
+        """Zwraca liczbę zadań spełniających filtry query_tasks"""
+        where, params = self._task_filter_clause(status, archived, tag, text)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT COUNT(*) FROM tasks{where}', params)
+            return cursor.fetchone()[0]
+    
+    @staticmethod
+    def build_fts_query(text):
+        """Zamienia tekst wpisany przez użytkownika na zapytanie FTS5
+        
+        Każde słowo jest cytowane (znaki specjalne FTS5 nie psują zapytania)
+        i dopasowywane jako prefiks; słowa łączone są przez AND. Polskie
+        litery są zamieniane na ASCII jak w indeksie (fold_search).
+        """
+        words = [word.replace('"', '""') for word in fold_search(text).split()]
+        return ' '.join(f'"{word}"*' for word in words if word.strip('"'))
+    
+    def search(self, query, kinds=('task', 'note'), limit=50, highlight=('<b>', '</b>')):
+        """Wyszukuje pełnotekstowo zadania i notatki
+        
+        Args:
+            query: Tekst wpisany przez użytkownika
+            kinds: Rodzaje wyników - klucze SEARCH_INDEXES ('task', 'note')
+            limit: Maksymalna liczba wyników (łącznie)
+            highlight: Znaczniki otaczające dopasowane słowa we fragmencie
+        
+        Returns:
+            Lista słowników {kind, id, title, snippet, rank} od najlepszego
+            dopasowania (mniejszy rank = lepszy wynik bm25)
+        """
+        fts_query = self.build_fts_query(query or '')
+        if not fts_query:
+            return []
+        
+        results = []
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for kind in kinds:
+                fts_table, source, title_col, body_col = SEARCH_INDEXES[kind]
+                if self.fts_available:
+                    # Dopasowanie w tytule waży 10x więcej niż w treści
+                    cursor.execute(f'''
+                        SELECT s.id, s.{title_col},
+                               snippet({fts_table}, -1, ?, ?, '…', 12),
+                               bm25({fts_table}, 10.0, 1.0) AS rank
+                        FROM {fts_table}
+                        JOIN {source} s ON s.id = {fts_table}.rowid
+                        WHERE {fts_table} MATCH ?
+                        ORDER BY rank
+                        LIMIT ?
+                    ''', (highlight[0], highlight[1], fts_query, limit))
+                else:
+                    # Bez FTS5 - wyszukiwanie fragmentu w tytule i treści, bez rankingu
+                    # (polskie litery i wielkość liter porównywane jak w indeksie FTS5)
+                    folded = fold_case(fold_search(query.strip()))
+                    cursor.execute(f'''
+                        SELECT id, {title_col}, substr(coalesce({body_col}, ''), 1, 80), 0
+                        FROM {source}
+                        WHERE instr(fold_case(fold_search({title_col})), ?) > 0
+                           OR instr(fold_case(fold_search({body_col})), ?) > 0
+                        LIMIT ?
+                    ''', (folded, folded, limit))
+                for item_id, title, snippet, rank in cursor.fetchall():
+                    results.append({
+                        'kind': kind,
+                        'id': item_id,
+                        'title': title,
+                        'snippet': snippet,
+                        'rank': rank
+                    })
+        
+        results.sort(key=lambda result: result['rank'])
+        return results[:limit]
+    
+    def rebuild_search_index(self):
+        """Odbudowuje indeksy FTS5 z tabel źródłowych (np. po imporcie bazy)"""
+        if not self.fts_available:
+            return
+        with self.connection() as conn:
+            for fts_table, source, title_col, body_col in SEARCH_INDEXES.values():
+                populate_search_index(conn.cursor(), fts_table, source, title_col, body_col)
+    
     def get_task(self, task_id):
         """Pobiera pojedyncze zadanie z bazy danych"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
             row = cursor.fetchone()
@@ -257,43 +388,49 @@ class Database:
     
     def get_categories(self):
         """Pobiera wszystkie kategorie"""
-        with self.get_connection() as conn:
+        return self.metadata_cache.get(CATEGORIES, 'all', self._load_categories)
+    
+    def _load_categories(self):
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM categories ORDER BY name')
             return cursor.fetchall()
     
     def get_task_tags(self):
         """Pobiera wszystkie tagi zadań"""
-        with self.get_connection() as conn:
+        return self.metadata_cache.get(TASK_TAGS, 'all', self._load_task_tags)
+    
+    def _load_task_tags(self):
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM task_tags ORDER BY name')
             return cursor.fetchall()
     
     def add_task_tag(self, name, color='#3498db'):
         """Dodaje nowy tag zadania"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO task_tags (name, color) VALUES (?, ?)
             ''', (name, color))
-            conn.commit()
+            self.invalidate_metadata(TASK_TAGS)
             return cursor.lastrowid
     
     def update_task_tag(self, tag_id, name, color):
         """Aktualizuje tag zadania"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE task_tags SET name = ?, color = ? WHERE id = ?
             ''', (name, color, tag_id))
-            conn.commit()
+        self.invalidate_metadata(TASK_TAGS)
     
     def delete_task_tag(self, tag_id):
         """Usuwa tag zadania"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM task_tags WHERE id = ?', (tag_id,))
-            conn.commit()
+        self.invalidate_metadata(TASK_TAGS)
     
     def update_task(self, task_id, **kwargs):
         """Aktualizuje zadanie"""
@@ -303,25 +440,142 @@ class Database:
         set_clause = ', '.join([f"{key} = ?" for key in kwargs.keys()])
         values = list(kwargs.values()) + [task_id]
         
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(f'''
                 UPDATE tasks SET {set_clause}, updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
             ''', values)
-            conn.commit()
+        self.notify_tasks_changed(UPDATE, [task_id])
+    
+    def archive_completed_tasks(self, older_than_days):
+        """Archiwizuje ukończone zadania niezmieniane od podanej liczby dni
+        
+        Jedno UPDATE po indeksie idx_tasks_archived_status_updated.
+        updated_at zapisywane jest przez CURRENT_TIMESTAMP (UTC), dlatego
+        granica liczona jest w SQLite przez datetime('now'). Kolumna updated_at
+        nie jest zmieniana - archiwizacja nie jest edycją zadania.
+        
+        Returns:
+            Lista ID zarchiwizowanych zadań
+        """
+        cutoff = f'-{int(older_than_days)} days'
+        with self.connection() as conn:
+            if SQLITE_HAS_RETURNING:
+                archived_ids = [row[0] for row in conn.execute(
+                    f'{ARCHIVE_COMPLETED_SQL} RETURNING id', (cutoff,))]
+            else:
+                # SQLite < 3.35 - te same warunki w jednej transakcji
+                archived_ids = [row[0] for row in conn.execute(
+                    ARCHIVE_COMPLETED_SQL.replace('UPDATE tasks SET archived = 1', 'SELECT id FROM tasks'),
+                    (cutoff,))]
+                if archived_ids:
+                    conn.execute(ARCHIVE_COMPLETED_SQL, (cutoff,))
+        if archived_ids:
+            self.notify_tasks_changed(UPDATE, archived_ids)
+        return archived_ids
     
     def delete_task(self, task_id):
         """Usuwa zadanie"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
+            cursor.execute('DELETE FROM task_column_values WHERE task_id = ?', (task_id,))
             cursor.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
-            conn.commit()
+        self.notify_tasks_changed(DELETE, [task_id])
+    
+    # ==================== Wartości kolumn użytkownika dla zadań ====================
+    
+    def get_task_column_values(self, task_ids=None):
+        """Pobiera wartości kolumn użytkownika
+        
+        Args:
+            task_ids: Lista ID zadań (None = wszystkie zadania)
+        
+        Returns:
+            Dict {task_id: {nazwa_kolumny: wartość}}
+        """
+        sql = '''
+            SELECT v.task_id, c.name, v.value
+            FROM task_column_values v
+            JOIN task_columns c ON c.id = v.column_id
+        '''
+        values = {}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            if task_ids is None:
+                cursor.execute(sql)
+                rows = cursor.fetchall()
+            else:
+                task_ids = list(task_ids)
+                rows = []
+                # SQLite ogranicza liczbę parametrów zapytania
+                for start in range(0, len(task_ids), 500):
+                    chunk = task_ids[start:start + 500]
+                    placeholders = ', '.join('?' * len(chunk))
+                    cursor.execute(f'{sql} WHERE v.task_id IN ({placeholders})', chunk)
+                    rows.extend(cursor.fetchall())
+        
+        for task_id, column_name, value in rows:
+            values.setdefault(task_id, {})[column_name] = value
+        return values
+    
+    def set_task_column_value(self, task_id, column_id, value):
+        """Zapisuje wartość kolumny użytkownika (pusta wartość usuwa wpis)"""
+        self.set_task_column_values(task_id, {column_id: value})
+    
+    def set_task_column_values(self, task_id, values):
+        """Zapisuje wartości kolumn użytkownika dla zadania
+        
+        Args:
+            task_id: ID zadania
+            values: Dict {column_id: wartość}
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for column_id, value in values.items():
+                if value is None or value == '':
+                    cursor.execute('''
+                        DELETE FROM task_column_values WHERE task_id = ? AND column_id = ?
+                    ''', (task_id, column_id))
+                else:
+                    cursor.execute('''
+                        INSERT OR REPLACE INTO task_column_values (task_id, column_id, value)
+                        VALUES (?, ?, ?)
+                    ''', (task_id, column_id, value))
+        self.notify_tasks_changed(UPDATE, [task_id])
+    
+    def get_task_ids_by_column_value(self, column_id, value=None, descending=False):
+        """Zwraca ID zadań z wartością w danej kolumnie użytkownika
+        
+        Args:
+            column_id: ID kolumny z task_columns
+            value: Wymagana wartość (None = dowolna niepusta)
+            descending: Sortowanie malejące po wartości
+        
+        Returns:
+            Lista ID zadań posortowana po wartości kolumny
+        """
+        order = 'DESC' if descending else 'ASC'
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            if value is None:
+                cursor.execute(f'''
+                    SELECT task_id FROM task_column_values
+                    WHERE column_id = ?
+                    ORDER BY value {order}, task_id
+                ''', (column_id,))
+            else:
+                cursor.execute('''
+                    SELECT task_id FROM task_column_values
+                    WHERE column_id = ? AND value = ?
+                    ORDER BY task_id
+                ''', (column_id, value))
+            return [row[0] for row in cursor.fetchall()]
     
     # Metody obsługi tabel użytkownika
     def create_user_table(self, table_config):
         """Tworzy nową tabelę użytkownika"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             # Dodaj definicję tabeli
@@ -352,12 +606,12 @@ class Database:
             # Utwórz fizyczną tabelę dla danych
             self.create_physical_table(table_config['name'], table_config['columns'], conn)
             
-            conn.commit()
-            return table_id
+        self.invalidate_metadata(USER_TABLES)
+        return table_id
     
     def update_user_table(self, table_id, table_config):
         """Aktualizuje istniejącą tabelę użytkownika"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             # Aktualizuj podstawowe informacje tabeli
@@ -392,13 +646,13 @@ class Database:
             # TODO: Zaktualizuj fizyczną tabelę (to jest skomplikowane - wymaga migracji danych)
             # Na razie pozostaw starą strukturę fizycznej tabeli
             
-            conn.commit()
-            return table_id
+        self.invalidate_metadata(USER_TABLES)
+        return table_id
     
     def create_physical_table(self, table_name, columns, conn=None):
         """Tworzy fizyczną tabelę w bazie danych"""
         if conn is None:
-            with self.get_connection() as conn:
+            with self.connection() as conn:
                 self._create_physical_table_impl(table_name, columns, conn)
         else:
             self._create_physical_table_impl(table_name, columns, conn)
@@ -453,7 +707,6 @@ class Database:
         '''
         
         cursor.execute(create_sql)
-        conn.commit()
     
     def get_sql_type(self, column_type):
         """Konwertuje typ kolumny na typ SQL"""
@@ -473,7 +726,7 @@ class Database:
     
     def get_user_tables(self):
         """Pobiera listę tabel użytkownika"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, name, description, created_at 
@@ -521,7 +774,7 @@ class Database:
         """Usuwa tabelę użytkownika"""
         print(f"DEBUG: delete_user_table wywoływana dla ID={table_id}")
         
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             # Pobierz nazwę tabeli
@@ -543,15 +796,15 @@ class Database:
                 rows_affected = cursor.rowcount
                 print(f"DEBUG: Usunięto definicję tabeli, wierszy usuniętych: {rows_affected}")
                 
-                conn.commit()
                 print(f"DEBUG: Transakcja zakończona, tabela {table_name} usunięta")
             else:
                 print(f"DEBUG: Nie znaleziono tabeli o ID={table_id}")
+        self.invalidate_metadata(USER_TABLES)
     
     # Metody obsługi list słownikowych
     def create_dictionary_list(self, list_config):
         """Tworzy nową listę słownikową"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -578,12 +831,16 @@ class Database:
                     VALUES (?, ?, ?)
                 ''', (list_id, item, i))
             
-            conn.commit()
+            self.invalidate_metadata(DICTIONARY_LISTS)
             return list_id
     
     def get_dictionary_lists(self, context="table"):
         """Pobiera listę słowników dla określonego kontekstu"""
-        with self.get_connection() as conn:
+        return self.metadata_cache.get(DICTIONARY_LISTS, ('context', context),
+                                       lambda: self._load_dictionary_lists(context))
+    
+    def _load_dictionary_lists(self, context):
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, name, description, type, allow_custom, multiple_selection, required, default_item, context
@@ -621,7 +878,11 @@ class Database:
     
     def get_dictionary_list_by_id(self, list_id):
         """Pobiera konkretną listę słownikową po ID"""
-        with self.get_connection() as conn:
+        return self.metadata_cache.get(DICTIONARY_LISTS, ('id', list_id),
+                                       lambda: self._load_dictionary_list_by_id(list_id))
+    
+    def _load_dictionary_list_by_id(self, list_id):
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, name, description, type, allow_custom, multiple_selection, required, default_item, context
@@ -658,7 +919,11 @@ class Database:
     
     def get_dictionary_list_by_name(self, name, context="table"):
         """Pobiera konkretną listę słownikową po nazwie i kontekście"""
-        with self.get_connection() as conn:
+        return self.metadata_cache.get(DICTIONARY_LISTS, ('name', name, context),
+                                       lambda: self._load_dictionary_list_by_name(name, context))
+    
+    def _load_dictionary_list_by_name(self, name, context):
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -696,7 +961,11 @@ class Database:
     
     def get_dictionary_list_items(self, list_id):
         """Pobiera elementy listy słownikowej"""
-        with self.get_connection() as conn:
+        return self.metadata_cache.get(DICTIONARY_LISTS, ('items', list_id),
+                                       lambda: self._load_dictionary_list_items(list_id))
+    
+    def _load_dictionary_list_items(self, list_id):
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, value, order_index FROM dictionary_list_items 
@@ -706,7 +975,7 @@ class Database:
     
     def add_dictionary_list_item(self, list_id, value, description=""):
         """Dodaje element do listy słownikowej"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             # Pobierz następny order_index
             cursor.execute('SELECT MAX(order_index) FROM dictionary_list_items WHERE list_id = ?', (list_id,))
@@ -717,19 +986,19 @@ class Database:
                 INSERT INTO dictionary_list_items (list_id, value, order_index) 
                 VALUES (?, ?, ?)
             ''', (list_id, value, next_order))
-            conn.commit()
+            self.invalidate_metadata(DICTIONARY_LISTS)
             return cursor.lastrowid
     
     def delete_dictionary_list_item(self, item_id):
         """Usuwa element z listy słownikowej"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM dictionary_list_items WHERE id = ?', (item_id,))
-            conn.commit()
+        self.invalidate_metadata(DICTIONARY_LISTS)
     
     def delete_dictionary_list(self, list_id):
         """Usuwa listę słownikową i wszystkie jej elementy"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             # Usuń wszystkie elementy listy
@@ -741,13 +1010,13 @@ class Database:
             # Zaktualizuj kolumny które używały tej listy (ustaw dictionary_list_id na NULL)
             cursor.execute('UPDATE user_table_columns SET dictionary_list_id = NULL WHERE dictionary_list_id = ?', (list_id,))
             
-            conn.commit()
             print(f"Usunięto listę słownikową ID: {list_id}")
+        self.invalidate_metadata(DICTIONARY_LISTS)
 
     # Metody zarządzania szerokościami kolumn
     def save_column_widths(self, table_id, column_widths):
         """Zapisuje szerokości kolumn dla tabeli"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             for column_index, width in enumerate(column_widths):
@@ -756,12 +1025,11 @@ class Database:
                     VALUES (?, ?, ?, CURRENT_TIMESTAMP)
                 ''', (table_id, column_index, width))
             
-            conn.commit()
             print(f"DEBUG: Zapisano szerokości kolumn dla tabeli {table_id}: {column_widths}")
 
     def get_column_widths(self, table_id):
         """Pobiera zapisane szerokości kolumn dla tabeli"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT column_index, width 
@@ -779,27 +1047,25 @@ class Database:
 
     def delete_column_widths(self, table_id):
         """Usuwa zapisane szerokości kolumn dla tabeli"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM table_column_widths WHERE table_id = ?', (table_id,))
-            conn.commit()
 
     # === ZARZĄDZANIE NOTATKAMI ===
     
     def add_note(self, title, content='', parent_id=None):
         """Dodaje nową notatkę"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO notes (title, content, parent_id, updated_at)
                 VALUES (?, ?, ?, CURRENT_TIMESTAMP)
             ''', (title, content, parent_id))
-            conn.commit()
             return cursor.lastrowid
     
     def update_note(self, note_id, title=None, content=None):
         """Aktualizuje notatkę"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             if title is not None and content is not None:
@@ -818,18 +1084,18 @@ class Database:
                     WHERE id = ?
                 ''', (content, note_id))
             
-            conn.commit()
     
     def delete_note(self, note_id):
-        """Usuwa notatkę i wszystkie jej podnotatki (CASCADE)"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM notes WHERE id = ?', (note_id,))
-            conn.commit()
+        """Usuwa notatkę i wszystkie jej podnotatki
+        
+        Returns:
+            Lista ID usuniętych notatek
+        """
+        return self.notes.delete_subtree(note_id)
     
     def get_all_notes(self):
         """Pobiera wszystkie notatki"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, title, content, parent_id, created_at, updated_at
@@ -853,7 +1119,7 @@ class Database:
     
     def get_note_by_id(self, note_id):
         """Pobiera notatkę po ID"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, title, content, parent_id, created_at, updated_at
@@ -874,11 +1140,11 @@ class Database:
     
     def get_notes_by_parent(self, parent_id):
         """Pobiera podnotatki dla danego rodzica"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, title, content, parent_id, created_at, updated_at
-                FROM notes WHERE parent_id = ? ORDER BY created_at
+                FROM notes WHERE parent_id IS ? ORDER BY created_at
             ''', (parent_id,))
             notes = cursor.fetchall()
             
@@ -899,7 +1165,10 @@ class Database:
     
     def get_task_columns(self):
         """Pobiera wszystkie kolumny zadań"""
-        with self.get_connection() as conn:
+        return self.metadata_cache.get(TASK_COLUMNS, 'all', self._load_task_columns)
+    
+    def _load_task_columns(self):
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, name, type, visible, in_panel, default_value, column_order, dictionary_list_id
@@ -925,7 +1194,10 @@ class Database:
     
     def get_panel_columns(self):
         """Pobiera kolumny oznaczone do wyświetlania w dolnym panelu"""
-        with self.get_connection() as conn:
+        return self.metadata_cache.get(TASK_COLUMNS, 'panel', self._load_panel_columns)
+    
+    def _load_panel_columns(self):
+        with self.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, name, type, visible, in_panel, default_value, column_order, dictionary_list_id
@@ -952,7 +1224,7 @@ class Database:
     
     def add_task_column(self, name, col_type, visible=True, in_panel=False, default_value='', dictionary_list_id=None):
         """Dodaje nową kolumnę zadania"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             # Pobierz maksymalny numer porządkowy
@@ -965,12 +1237,12 @@ class Database:
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (name, col_type, visible, in_panel, default_value, next_order, dictionary_list_id))
             
-            conn.commit()
+            self.invalidate_metadata(TASK_COLUMNS)
             return cursor.lastrowid
     
     def update_task_column(self, column_id, name=None, col_type=None, visible=None, in_panel=None, default_value=None, dictionary_list_id=None, column_order=None):
         """Aktualizuje kolumnę zadania"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             # Pobierz aktualną kolumnę
@@ -995,12 +1267,12 @@ class Database:
                 WHERE id = ?
             ''', (new_name, new_type, new_visible, new_in_panel, new_default, new_dict_list, new_order, column_id))
             
-            conn.commit()
+            self.invalidate_metadata(TASK_COLUMNS)
             return True
     
     def update_task_column_by_name(self, column_name, name=None, col_type=None, visible=None, in_panel=None, default_value=None, dictionary_list_id=None, column_order=None):
         """Aktualizuje kolumnę zadania przez nazwę (dla kolumn standardowych)"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             # Pobierz aktualną kolumnę
@@ -1027,38 +1299,29 @@ class Database:
                 WHERE id = ?
             ''', (new_name, new_type, new_visible, new_in_panel, new_default, new_dict_list, new_order, column_id))
             
-            conn.commit()
+            self.invalidate_metadata(TASK_COLUMNS)
             return True
     
     def delete_task_column(self, column_id):
         """Usuwa kolumnę zadania"""
-        with self.get_connection() as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
+            cursor.execute('DELETE FROM task_column_values WHERE column_id = ?', (column_id,))
             cursor.execute('DELETE FROM task_columns WHERE id = ?', (column_id,))
-            conn.commit()
+            self.invalidate_metadata(TASK_COLUMNS)
             return cursor.rowcount > 0
     
     def set_setting(self, key, value):
-        """Zapisuje ustawienie do bazy danych"""
+        """Zapisuje ustawienie (zapis do bazy jest odroczony - patrz AppSettings)"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO app_settings (key, value, updated_at)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                ''', (key, str(value)))
-                conn.commit()
+            self.settings.set(key, value)
         except Exception as e:
             print(f"Błąd podczas zapisywania ustawienia {key}: {e}")
     
     def get_setting(self, key, default=None):
-        """Pobiera ustawienie z bazy danych"""
+        """Pobiera ustawienie z migawki w pamięci"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT value FROM app_settings WHERE key = ?', (key,))
-                result = cursor.fetchone()
-                return result[0] if result else default
+            return self.settings.get(key, default)
         except Exception as e:
             print(f"Błąd podczas odczytu ustawienia {key}: {e}")
             return default
@@ -1074,6 +1337,45 @@ class Database:
         safe_name = column_name.lower().replace(' ', '_').replace('-', '_')
         return ''.join(c for c in safe_name if c.isalnum() or c == '_')
     
+    def get_user_table_schema(self, table_id):
+        """Zwraca deskryptor schematu tabeli użytkownika (z cache) lub None
+        
+        Deskryptor (UserTableSchema) trzyma nazwę tabeli fizycznej, bezpieczne
+        nazwy i typy kolumn oraz gotowe zapytania INSERT/UPDATE.
+        """
+        return self.metadata_cache.get(USER_TABLES, ('schema', table_id),
+                                       lambda: self._load_user_table_schema(table_id))
+    
+    def _load_user_table_schema(self, table_id):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT name FROM user_tables WHERE id = ?', (table_id,))
+            result = cursor.fetchone()
+            if not result:
+                return None
+            table_name = result[0]
+            physical_table = self.get_physical_table_name(table_name)
+            
+            cursor.execute('''
+                SELECT name, type FROM user_table_columns 
+                WHERE table_id = ? 
+                ORDER BY column_order
+            ''', (table_id,))
+            original_columns = cursor.fetchall()
+            
+            cursor.execute(f'PRAGMA table_info({physical_table})')
+            db_columns = {row[1] for row in cursor.fetchall()}
+        
+        # Pomijane są kolumny, których nie ma w tabeli fizycznej
+        # (update_user_table nie zmienia jej struktury)
+        columns = []
+        for orig_name, col_type in original_columns:
+            safe_name = self.get_safe_column_name(orig_name)
+            if safe_name in db_columns:
+                columns.append((orig_name, safe_name, col_type))
+        return UserTableSchema(table_id, table_name, physical_table, columns,
+                               self.get_safe_column_name)
+    
     def insert_table_row(self, table_id, row_data):
         """Wstawia nowy wiersz do tabeli użytkownika
         
@@ -1085,60 +1387,26 @@ class Database:
             ID nowo utworzonego wiersza lub None w przypadku błędu
         """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Pobierz nazwę tabeli
-                cursor.execute('SELECT name FROM user_tables WHERE id = ?', (table_id,))
-                result = cursor.fetchone()
-                if not result:
-                    print(f"ERROR: Nie znaleziono tabeli o ID {table_id}")
-                    return None
-                
-                table_name = result[0]
-                physical_table = self.get_physical_table_name(table_name)
-                
-                # Pobierz konfigurację kolumn
-                cursor.execute('''
-                    SELECT name FROM user_table_columns 
-                    WHERE table_id = ? 
-                    ORDER BY column_order
-                ''', (table_id,))
-                columns = [self.get_safe_column_name(row[0]) for row in cursor.fetchall()]
-                
-                if not columns:
-                    print(f"ERROR: Brak kolumn dla tabeli {table_name}")
-                    return None
-                
-                # Przygotuj dane do wstawienia
-                insert_columns = []
-                insert_values = []
-                placeholders = []
-                
-                for col_name, col_value in row_data.items():
-                    safe_col = self.get_safe_column_name(col_name)
-                    if safe_col in columns:
-                        insert_columns.append(safe_col)
-                        insert_values.append(col_value)
-                        placeholders.append('?')
-                
-                if not insert_columns:
-                    print(f"ERROR: Brak prawidłowych kolumn do wstawienia")
-                    return None
-                
-                # Wykonaj INSERT
-                sql = f'''
-                    INSERT INTO {physical_table} 
-                    ({', '.join(insert_columns)}) 
-                    VALUES ({', '.join(placeholders)})
-                '''
-                
-                cursor.execute(sql, insert_values)
-                conn.commit()
-                
+            schema = self.get_user_table_schema(table_id)
+            if schema is None:
+                print(f"ERROR: Nie znaleziono tabeli o ID {table_id}")
+                return None
+            
+            if not schema.columns:
+                print(f"ERROR: Brak kolumn dla tabeli {schema.table_name}")
+                return None
+            
+            params = schema.insert_params(row_data)
+            if params is None:
+                print(f"ERROR: Brak prawidłowych kolumn do wstawienia")
+                return None
+            
+            with self.connection() as conn:
+                cursor = conn.execute(schema.insert_sql, params)
                 row_id = cursor.lastrowid
-                print(f"DEBUG: Dodano wiersz o ID {row_id} do tabeli {table_name}")
-                return row_id
+            
+            print(f"DEBUG: Dodano wiersz o ID {row_id} do tabeli {schema.table_name}")
+            return row_id
                 
         except Exception as e:
             print(f"ERROR podczas wstawiania wiersza: {e}")
@@ -1158,59 +1426,22 @@ class Database:
             True jeśli sukces, False w przeciwnym razie
         """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Pobierz nazwę tabeli
-                cursor.execute('SELECT name FROM user_tables WHERE id = ?', (table_id,))
-                result = cursor.fetchone()
-                if not result:
-                    print(f"ERROR: Nie znaleziono tabeli o ID {table_id}")
-                    return False
-                
-                table_name = result[0]
-                physical_table = self.get_physical_table_name(table_name)
-                
-                # Pobierz konfigurację kolumn
-                cursor.execute('''
-                    SELECT name FROM user_table_columns 
-                    WHERE table_id = ? 
-                    ORDER BY column_order
-                ''', (table_id,))
-                columns = [self.get_safe_column_name(row[0]) for row in cursor.fetchall()]
-                
-                # Przygotuj dane do aktualizacji
-                update_parts = []
-                update_values = []
-                
-                for col_name, col_value in row_data.items():
-                    safe_col = self.get_safe_column_name(col_name)
-                    if safe_col in columns:
-                        update_parts.append(f"{safe_col} = ?")
-                        update_values.append(col_value)
-                
-                if not update_parts:
-                    print(f"ERROR: Brak prawidłowych kolumn do aktualizacji")
-                    return False
-                
-                # Dodaj updated_at
-                update_parts.append("updated_at = CURRENT_TIMESTAMP")
-                
-                # Dodaj row_id na końcu dla WHERE
-                update_values.append(row_id)
-                
-                # Wykonaj UPDATE
-                sql = f'''
-                    UPDATE {physical_table} 
-                    SET {', '.join(update_parts)}
-                    WHERE id = ?
-                '''
-                
-                cursor.execute(sql, update_values)
-                conn.commit()
-                
-                print(f"DEBUG: Zaktualizowano wiersz ID {row_id} w tabeli {table_name}")
-                return True
+            schema = self.get_user_table_schema(table_id)
+            if schema is None:
+                print(f"ERROR: Nie znaleziono tabeli o ID {table_id}")
+                return False
+            
+            statement = schema.update_statement(row_data, row_id)
+            if statement is None:
+                print(f"ERROR: Brak prawidłowych kolumn do aktualizacji")
+                return False
+            
+            sql, params = statement
+            with self.connection() as conn:
+                conn.execute(sql, params)
+            
+            print(f"DEBUG: Zaktualizowano wiersz ID {row_id} w tabeli {schema.table_name}")
+            return True
                 
         except Exception as e:
             print(f"ERROR podczas aktualizacji wiersza: {e}")
@@ -1218,9 +1449,133 @@ class Database:
             traceback.print_exc()
             return False
     
+    def _table_rows_filter_clause(self, columns, filters):
+        """Buduje WHERE dla filtrów {nazwa kolumny: wartość} (None = pusta wartość)"""
+        safe_names = dict(columns)
+        clauses = []
+        params = []
+        for column_name, value in (filters or {}).items():
+            safe_name = safe_names.get(column_name)
+            if safe_name is None:
+                raise ValueError(f"Nieznana kolumna filtra: {column_name}")
+            if value is None:
+                clauses.append(f"{safe_name} IS NULL")
+            else:
+                clauses.append(f"{safe_name} = ?")
+                params.append(value)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+    
+    def iter_table_rows(self, table_id, offset=0, limit=None, order_by=None, filters=None,
+                        descending=False, batch_size=500):
+        """Zwraca wiersze tabeli użytkownika porcjami (generator)
+        
+        Porcje są pobierane osobnymi zapytaniami, więc wiersze zmienione
+        w trakcie iteracji mogą pochodzić z różnych stanów tabeli.
+        
+        Args:
+            table_id: ID tabeli w user_tables
+            offset: Ile wierszy pominąć
+            limit: Maksymalna liczba wierszy (None = wszystkie)
+            order_by: Nazwa kolumny do sortowania (None = kolejność dodania)
+            filters: Dict {column_name: value} - równość wartości
+            descending: Sortowanie malejące
+            batch_size: Ile wierszy pobierać jednym zapytaniem
+        
+        Yields:
+            dict {'_row_id': id, column_name: value}
+        
+        Raises:
+            ValueError: Nieznana kolumna w order_by lub filters
+        """
+        schema = self.get_user_table_schema(table_id)
+        if schema is None:
+            print(f"ERROR: Nie znaleziono tabeli o ID {table_id}")
+            return
+        physical_table = schema.physical_table
+        columns = [(orig_name, safe_name) for orig_name, safe_name, _ in schema.columns]
+        
+        where, params = self._table_rows_filter_clause(columns, filters)
+        direction = 'DESC' if descending else 'ASC'
+        if order_by is None or order_by == '_row_id':
+            order = f'id {direction}'
+            # Kolejne porcje od ostatniego id (keyset) - bez przeskakiwania OFFSET
+            keyset_where = f"{where} {'AND' if where else 'WHERE'} id {'<' if descending else '>'} ?"
+        else:
+            safe_names = dict(columns)
+            if order_by not in safe_names:
+                raise ValueError(f"Nieznana kolumna sortowania: {order_by}")
+            # id jako drugi klucz - stała kolejność przy stronicowaniu
+            order = f'{safe_names[order_by]} {direction}, id {direction}'
+            keyset_where = None
+        
+        select_columns = ', '.join(['id'] + [safe_name for _, safe_name in columns])
+        column_names = [orig_name for orig_name, _ in columns]
+        remaining = limit
+        batch_offset = offset
+        last_id = None
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            if keyset_where is not None and last_id is not None:
+                sql_where, batch_params = keyset_where, params + [last_id, size, 0]
+            else:
+                sql_where, batch_params = where, params + [size, batch_offset]
+            # Każda porcja w osobnym, krótkim odczycie - yield poza blokiem
+            # connection(), więc przerwana iteracja nie trzyma otwartego zapytania
+            # (migawki odczytu blokującej checkpoint WAL) na połączeniu wątku
+            with self.connection() as conn:
+                rows = conn.execute(
+                    f'SELECT {select_columns} FROM {physical_table}{sql_where} '
+                    f'ORDER BY {order} LIMIT ? OFFSET ?',
+                    batch_params
+                ).fetchall()
+            
+            for row in rows:
+                row_dict = {'_row_id': row[0]}
+                row_dict.update(zip(column_names, row[1:]))
+                yield row_dict
+            
+            if len(rows) < size:
+                break
+            last_id = rows[-1][0]
+            batch_offset += len(rows)
+            if remaining is not None:
+                remaining -= len(rows)
+    
+    def count_table_rows(self, table_id, filters=None):
+        """Zwraca liczbę wierszy tabeli użytkownika (z filtrami jak w iter_table_rows)"""
+        schema = self.get_user_table_schema(table_id)
+        if schema is None:
+            return 0
+        columns = [(orig_name, safe_name) for orig_name, safe_name, _ in schema.columns]
+        where, params = self._table_rows_filter_clause(columns, filters)
+        with self.connection() as conn:
+            cursor = conn.execute(f'SELECT COUNT(*) FROM {schema.physical_table}{where}', params)
+            return cursor.fetchone()[0]
+    
+    def import_table_csv(self, table_id, file_path, **options):
+        """Importuje plik CSV do tabeli użytkownika (strumieniowo, executemany w porcjach)
+        
+        Opcje i wynik - patrz table_import.import_csv().
+        """
+        return import_csv(self, table_id, file_path, **options)
+    
+    def export_user_table(self, table_id, file_path, fmt='csv', **options):
+        """Eksportuje tabelę użytkownika do CSV/JSONL strumieniowo (patrz table_export)"""
+        return table_export.export_user_table(self, table_id, file_path, fmt, **options)
+    
+    def export_tasks(self, file_path, fmt='csv', **options):
+        """Eksportuje zadania z kolumnami użytkownika do CSV/JSONL"""
+        return table_export.export_tasks(self, file_path, fmt, **options)
+    
+    def export_notes(self, file_path, fmt='csv', **options):
+        """Eksportuje notatki do CSV/JSONL"""
+        return table_export.export_notes(self, file_path, fmt, **options)
+    
     def get_table_rows(self, table_id):
         """Pobiera wszystkie wiersze z tabeli użytkownika
         
+        Przy dużych tabelach lepiej użyć iter_table_rows() ze stronicowaniem.
+        
         Args:
             table_id: ID tabeli w user_tables
         
@@ -1228,51 +1583,7 @@ class Database:
             Lista dict {column_name: value} lub [] w przypadku błędu
         """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Pobierz nazwę tabeli
-                cursor.execute('SELECT name FROM user_tables WHERE id = ?', (table_id,))
-                result = cursor.fetchone()
-                if not result:
-                    print(f"ERROR: Nie znaleziono tabeli o ID {table_id}")
-                    return []
-                
-                table_name = result[0]
-                physical_table = self.get_physical_table_name(table_name)
-                
-                # Pobierz konfigurację kolumn (oryginalne nazwy)
-                cursor.execute('''
-                    SELECT name FROM user_table_columns 
-                    WHERE table_id = ? 
-                    ORDER BY column_order
-                ''', (table_id,))
-                original_columns = [row[0] for row in cursor.fetchall()]
-                
-                # Pobierz dane
-                cursor.execute(f'SELECT * FROM {physical_table} ORDER BY id')
-                rows = cursor.fetchall()
-                
-                # Pobierz nazwy kolumn z PRAGMA
-                cursor.execute(f'PRAGMA table_info({physical_table})')
-                db_columns = [row[1] for row in cursor.fetchall()]
-                
-                # Konwertuj wyniki na dict z oryginalnymi nazwami
-                result_rows = []
-                for row in rows:
-                    row_dict = {'_row_id': row[0]}  # ID wiersza
-                    
-                    # Mapuj bezpieczne nazwy kolumn na oryginalne
-                    for orig_name in original_columns:
-                        safe_name = self.get_safe_column_name(orig_name)
-                        if safe_name in db_columns:
-                            col_index = db_columns.index(safe_name)
-                            row_dict[orig_name] = row[col_index]
-                    
-                    result_rows.append(row_dict)
-                
-                return result_rows
-                
+            return list(self.iter_table_rows(table_id))
         except Exception as e:
             print(f"ERROR podczas pobierania wierszy: {e}")
             import traceback
@@ -1290,24 +1601,16 @@ class Database:
             True jeśli sukces, False w przeciwnym razie
         """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Pobierz nazwę tabeli
-                cursor.execute('SELECT name FROM user_tables WHERE id = ?', (table_id,))
-                result = cursor.fetchone()
-                if not result:
-                    return False
-                
-                table_name = result[0]
-                physical_table = self.get_physical_table_name(table_name)
-                
-                # Usuń wiersz
-                cursor.execute(f'DELETE FROM {physical_table} WHERE id = ?', (row_id,))
-                conn.commit()
-                
-                print(f"DEBUG: Usunięto wiersz ID {row_id} z tabeli {table_name}")
-                return True
+            schema = self.get_user_table_schema(table_id)
+            if schema is None:
+                return False
+            
+            # Usuń wiersz
+            with self.connection() as conn:
+                conn.execute(schema.delete_sql, (row_id,))
+            
+            print(f"DEBUG: Usunięto wiersz ID {row_id} z tabeli {schema.table_name}")
+            return True
                 
         except Exception as e:
             print(f"ERROR podczas usuwania wiersza: {e}")
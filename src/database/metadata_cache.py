@@ -0,0 +1,109 @@
+"""
+Cache metadanych aplikacji - kolumny zadań, tagi, kategorie, listy słownikowe
+i schematy tabel użytkownika
+
+Te tabele zmieniają się rzadko, a są czytane przy każdym ładowaniu zadań,
+edycji komórki czy otwarciu dialogu. Wpisy są wersjonowane per grupa:
+metody Database modyfikujące daną tabelę wywołują invalidate(), co podbija
+wersję grupy i unieważnia jej wpisy.
+"""
+import threading
+
+
+# Grupy metadanych (jedna grupa = tabele unieważniane razem)
+TASK_COLUMNS = 'task_columns'
+TASK_TAGS = 'task_tags'
+CATEGORIES = 'categories'
+DICTIONARY_LISTS = 'dictionary_lists'  # listy i ich elementy
+USER_TABLES = 'user_tables'  # deskryptory schematu tabel użytkownika
+
+
+def copy_value(value):
+    """Kopiuje listy i słowniki wyniku (krotki wierszy i skalary są niezmienne)
+
+    Szybsze od copy.deepcopy dla wyników zapytań - bez słownika memo.
+    """
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    return value
+
+
+class MetadataCache:
+    """Cache odczytów metadanych z licznikami trafień i chybień"""
+
+    # Rejestr cache według ścieżki bazy - instancje Database dla tego samego
+    # pliku widzą te same wpisy i te same unieważnienia
+    _caches = {}
+    _caches_lock = threading.Lock()
+
+    def __init__(self):
+        self._entries = {}    # (grupa, klucz) -> (wersja grupy, wartość)
+        self._versions = {}   # grupa -> wersja
+        self._hits = {}
+        self._misses = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, db_path):
+        """Zwraca współdzielony cache dla wskazanej ścieżki bazy"""
+        with cls._caches_lock:
+            cache = cls._caches.get(db_path)
+            if cache is None:
+                cache = cls()
+                cls._caches[db_path] = cache
+            return cache
+
+    def version(self, group):
+        """Zwraca bieżącą wersję grupy (rośnie przy każdym unieważnieniu)"""
+        with self._lock:
+            return self._versions.get(group, 0)
+
+    def get(self, group, key, loader):
+        """Zwraca wartość z cache lub wczytuje ją przez loader()
+
+        Wywołujący dostaje kopię - modyfikacja wyniku nie psuje cache.
+        """
+        with self._lock:
+            version = self._versions.get(group, 0)
+            entry = self._entries.get((group, key))
+            if entry is not None and entry[0] == version:
+                self._hits[group] = self._hits.get(group, 0) + 1
+                return copy_value(entry[1])
+            self._misses[group] = self._misses.get(group, 0) + 1
+
+        # Zapytanie poza blokadą - unieważnienie w trakcie wczytywania
+        # zmieni wersję grupy, więc zapisany wpis będzie od razu nieaktualny
+        value = loader()
+        with self._lock:
+            self._entries[(group, key)] = (version, value)
+        return copy_value(value)
+
+    def invalidate(self, *groups):
+        """Unieważnia wpisy wskazanych grup (bez argumentów - wszystkie)"""
+        with self._lock:
+            if not groups:
+                groups = set(self._versions) | {group for group, _ in self._entries}
+            for group in groups:
+                self._versions[group] = self._versions.get(group, 0) + 1
+            self._entries = {entry_key: entry for entry_key, entry in self._entries.items()
+                             if entry_key[0] not in groups}
+
+    def stats(self):
+        """Zwraca liczniki: {'hits', 'misses', 'groups': {grupa: {...}}}"""
+        with self._lock:
+            groups = set(self._hits) | set(self._misses) | set(self._versions)
+            per_group = {
+                group: {
+                    'hits': self._hits.get(group, 0),
+                    'misses': self._misses.get(group, 0),
+                    'version': self._versions.get(group, 0),
+                }
+                for group in groups
+            }
+            return {
+                'hits': sum(self._hits.values()),
+                'misses': sum(self._misses.values()),
+                'groups': per_group,
+            }
@@ -0,0 +1,508 @@
+"""
+Wersjonowane migracje schematu bazy danych
+
+Numer ostatniej zastosowanej migracji jest zapisany w PRAGMA user_version.
+Przy starcie wykonywane są tylko migracje o wyższym numerze - przy aktualnej
+bazie kończy się to na jednym odczycie PRAGMA.
+"""
+import sqlite3
+
+
+# Indeksy pełnotekstowe FTS5: rodzaj -> (tabela FTS, tabela źródłowa, kolumny tytułu i treści)
+SEARCH_INDEXES = {
+    'task': ('tasks_fts', 'tasks', 'title', 'description'),
+    'note': ('notes_fts', 'notes', 'title', 'content'),
+}
+
+# Lista migracji (wersja, opis, funkcja(cursor)) - wypełniana dekoratorem @migration
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """Rejestruje funkcję jako migrację do podanej wersji schematu"""
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return func
+    return register
+
+
+def table_columns(cursor, table):
+    """Zwraca nazwy kolumn tabeli"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def search_fold_sql(expr):
+    """Wyrażenie SQL zamieniające "ł" na "l" - tylko wbudowane funkcje SQLite
+
+    Pozostałe polskie litery sprowadza do ASCII tokenizer FTS5 (unicode61
+    remove_diacritics 2), "ł" jest dla niego osobną literą. Triggery nie
+    wołają funkcji aplikacji, więc zapis do tasks/notes działa z każdego
+    połączenia (sqlite3, narzędzia bazy, skrypty).
+    """
+    return f"replace(replace({expr}, 'ł', 'l'), 'Ł', 'L')"
+
+
+def populate_search_index(cursor, fts_table, source, title_col, body_col):
+    """Indeksuje od nowa wszystkie wiersze tabeli źródłowej (tekst po search_fold_sql)
+
+    'rebuild' FTS5 czytałby tabelę źródłową bez zamiany "ł".
+    """
+    cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('delete-all')")
+    cursor.execute(f'''
+        INSERT INTO {fts_table}(rowid, {title_col}, {body_col})
+        SELECT id, {search_fold_sql(title_col)}, {search_fold_sql(body_col)} FROM {source}
+    ''')
+
+
+def create_search_triggers(cursor, fts_table, source, title_col, body_col):
+    """Odtwarza triggery synchronizujące indeks FTS5 z tekstem po search_fold_sql"""
+    new_values = f"new.id, {search_fold_sql('new.' + title_col)}, {search_fold_sql('new.' + body_col)}"
+    old_values = f"'delete', old.id, {search_fold_sql('old.' + title_col)}, {search_fold_sql('old.' + body_col)}"
+    columns = f"{title_col}, {body_col}"
+    for suffix in ('ai', 'ad', 'au'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {fts_table}_{suffix}')
+    cursor.execute(f'''
+        CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {source} BEGIN
+            INSERT INTO {fts_table}(rowid, {columns}) VALUES ({new_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {source} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ({old_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER {fts_table}_au AFTER UPDATE OF {columns} ON {source} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ({old_values});
+            INSERT INTO {fts_table}(rowid, {columns}) VALUES ({new_values});
+        END
+    ''')
+
+
+def table_exists(cursor, table):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    return cursor.fetchone() is not None
+
+
+class MigrationRunner:
+    """Wykonuje oczekujące migracje - każdą w osobnej transakcji"""
+
+    def __init__(self, migrations=None):
+        self.migrations = MIGRATIONS if migrations is None else migrations
+
+    @property
+    def latest_version(self):
+        return self.migrations[-1][0] if self.migrations else 0
+
+    def current_version(self, conn):
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+
+    def run(self, conn):
+        """Wykonuje migracje nowsze niż PRAGMA user_version
+
+        Returns:
+            Lista numerów zastosowanych migracji (pusta, gdy schemat jest aktualny)
+        """
+        current = self.current_version(conn)
+        if current >= self.latest_version:
+            return []
+
+        applied = []
+        for version, description, func in self.migrations:
+            if version <= current:
+                continue
+            # DDL w sqlite3 nie otwiera transakcji samo - otwórz ją jawnie,
+            # żeby migracja i nowy user_version zapisały się razem albo wcale
+            conn.execute('BEGIN IMMEDIATE')
+            if self.current_version(conn) >= version:
+                # Inne połączenie zastosowało migrację w międzyczasie
+                conn.rollback()
+                continue
+            try:
+                func(conn.cursor())
+                conn.execute(f'PRAGMA user_version = {int(version)}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                print(f"Błąd migracji bazy do wersji {version} ({description})")
+                raise
+            print(f"Zastosowano migrację bazy {version}: {description}")
+            applied.append(version)
+        return applied
+
+
+# ==================== Migracje ====================
+
+@migration(1, "schemat bazowy")
+def create_base_schema(cursor):
+    """Tabele aplikacji - bazy sprzed wersjonowania mogą je już mieć"""
+    # Tabela zadań
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT DEFAULT 'todo',
+            priority TEXT DEFAULT 'medium',
+            category TEXT,
+            due_date TEXT,
+            note_id INTEGER,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (note_id) REFERENCES notes (id) ON DELETE SET NULL
+        )
+    ''')
+
+    # Tabela kategorii
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            color TEXT DEFAULT '#3498db',
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Tabela tagów zadań
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS task_tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            color TEXT DEFAULT '#3498db',
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Tabela definicji tabel użytkownika
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_tables (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            description TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Tabela kolumn dla tabel użytkownika
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_table_columns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_id INTEGER,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            is_required BOOLEAN DEFAULT 0,
+            is_visible BOOLEAN DEFAULT 1,
+            column_order INTEGER DEFAULT 0,
+            dictionary_list TEXT,
+            settings TEXT,
+            FOREIGN KEY (table_id) REFERENCES user_tables (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Kolumny dodane do tabeli tasks w starszych wersjach aplikacji
+    task_columns = table_columns(cursor, 'tasks')
+    if 'note_id' not in task_columns:
+        cursor.execute('ALTER TABLE tasks ADD COLUMN note_id INTEGER')
+    if 'kanban' not in task_columns:
+        cursor.execute('ALTER TABLE tasks ADD COLUMN kanban INTEGER DEFAULT 0')
+    if 'archived' not in task_columns:
+        cursor.execute('ALTER TABLE tasks ADD COLUMN archived INTEGER DEFAULT 0')
+
+    if 'dictionary_list' not in table_columns(cursor, 'user_table_columns'):
+        cursor.execute('ALTER TABLE user_table_columns ADD COLUMN dictionary_list TEXT')
+
+    # Tabela list słownikowych
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dictionary_lists (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            description TEXT,
+            type TEXT DEFAULT 'Inne',
+            allow_custom BOOLEAN DEFAULT 0,
+            multiple_selection BOOLEAN DEFAULT 0,
+            required BOOLEAN DEFAULT 0,
+            default_item TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    if 'context' not in table_columns(cursor, 'dictionary_lists'):
+        cursor.execute("ALTER TABLE dictionary_lists ADD COLUMN context TEXT DEFAULT 'table'")
+
+    # Tabela elementów list słownikowych
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dictionary_list_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            list_id INTEGER,
+            value TEXT NOT NULL,
+            order_index INTEGER DEFAULT 0,
+            FOREIGN KEY (list_id) REFERENCES dictionary_lists (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Tabela szerokości kolumn dla tabel użytkownika
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_column_widths (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_id INTEGER,
+            column_index INTEGER,
+            width INTEGER,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (table_id) REFERENCES user_tables (id) ON DELETE CASCADE,
+            UNIQUE(table_id, column_index)
+        )
+    ''')
+
+    # Tabela kolumn zadań
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS task_columns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            type TEXT NOT NULL,
+            visible BOOLEAN DEFAULT 1,
+            in_panel BOOLEAN DEFAULT 0,
+            default_value TEXT,
+            column_order INTEGER DEFAULT 0,
+            dictionary_list_id INTEGER,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (dictionary_list_id) REFERENCES dictionary_lists (id) ON DELETE SET NULL
+        )
+    ''')
+
+    # Tabela notatek
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT,
+            parent_id INTEGER,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (parent_id) REFERENCES notes(id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Tabela ustawień aplikacji
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS app_settings (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Dodaj domyślne kategorie
+    default_categories = [
+        ('Praca', '#e74c3c'),
+        ('Dom', '#2ecc71'),
+        ('Nauka', '#f39c12'),
+        ('Hobby', '#9b59b6')
+    ]
+    cursor.executemany('''
+        INSERT OR IGNORE INTO categories (name, color) VALUES (?, ?)
+    ''', default_categories)
+
+
+@migration(2, "wartości kolumn użytkownika w task_column_values")
+def create_task_column_values(cursor):
+    migrate_descriptions = not table_exists(cursor, 'task_column_values')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS task_column_values (
+            task_id INTEGER NOT NULL,
+            column_id INTEGER NOT NULL,
+            value TEXT,
+            PRIMARY KEY (task_id, column_id),
+            FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE,
+            FOREIGN KEY (column_id) REFERENCES task_columns (id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    ''')
+
+    # Filtrowanie i sortowanie po wartości kolumny
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_task_column_values_column
+        ON task_column_values (column_id, value)
+    ''')
+
+    if migrate_descriptions:
+        migrate_description_column_values(cursor)
+
+
+def migrate_description_column_values(cursor):
+    """Przenosi linie "Nazwa: wartość" z tasks.description do task_column_values"""
+    # Import lokalny - db_manager importuje ten moduł
+    from .db_manager import build_column_prefix_lookup, split_description_values
+
+    cursor.execute('SELECT id, name FROM task_columns')
+    prefixes = build_column_prefix_lookup(
+        [{'id': column_id, 'name': name} for column_id, name in cursor.fetchall()])
+    if not prefixes:
+        return
+
+    cursor.execute("SELECT id, description FROM tasks WHERE description LIKE '%:%'")
+    values = []
+    cleaned_descriptions = []
+    for task_id, description in cursor.fetchall():
+        found, kept_lines = split_description_values(description, prefixes)
+        if found:
+            values.extend((task_id, column['id'], value) for column, value in found)
+            cleaned_descriptions.append(('\n'.join(kept_lines).strip(), task_id))
+
+    cursor.executemany('''
+        INSERT OR REPLACE INTO task_column_values (task_id, column_id, value)
+        VALUES (?, ?, ?)
+    ''', values)
+    cursor.executemany('UPDATE tasks SET description = ? WHERE id = ?', cleaned_descriptions)
+    print(f"Przeniesiono {len(values)} wartości kolumn użytkownika z opisów zadań")
+
+
+@migration(3, "indeksy filtrowania zadań")
+def create_task_query_indexes(cursor):
+    """Indeksy dla query_tasks: filtr archiwum/statusu/tagu + sortowanie po dacie"""
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_archived_created
+        ON tasks (archived, created_at, id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_archived_status_created
+        ON tasks (archived, status, created_at)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_category_archived_created
+        ON tasks (category, archived, created_at)
+    ''')
+
+
+@migration(4, "indeks pełnotekstowy FTS5 zadań i notatek")
+def create_search_index(cursor):
+    """Tabele FTS5 (external content) i triggery synchronizujące
+
+    Bez modułu FTS5 migracja niczego nie tworzy - Database.search() użyje LIKE.
+    """
+    for fts_table, source, title_col, body_col in SEARCH_INDEXES.values():
+        if table_exists(cursor, fts_table):
+            continue
+        try:
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE {fts_table} USING fts5(
+                    {title_col}, {body_col},
+                    content='{source}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"Wyszukiwanie pełnotekstowe niedostępne (FTS5): {e}")
+            return
+
+        new_values = f"new.id, new.{title_col}, new.{body_col}"
+        old_values = f"'delete', old.id, old.{title_col}, old.{body_col}"
+        columns = f"{title_col}, {body_col}"
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN
+                INSERT INTO {fts_table}(rowid, {columns}) VALUES ({new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ({old_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {columns} ON {source} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ({old_values});
+                INSERT INTO {fts_table}(rowid, {columns}) VALUES ({new_values});
+            END
+        ''')
+        # Zaindeksuj istniejące wiersze
+        cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+@migration(5, "brakujące kolumny user_table_columns")
+def add_user_table_column_fields(cursor):
+    """add_table_column/update_user_table zapisują color i dictionary_list_id,
+    których nie było w CREATE TABLE user_table_columns"""
+    columns = table_columns(cursor, 'user_table_columns')
+    if 'color' not in columns:
+        cursor.execute('ALTER TABLE user_table_columns ADD COLUMN color TEXT')
+    if 'dictionary_list_id' not in columns:
+        cursor.execute('ALTER TABLE user_table_columns ADD COLUMN dictionary_list_id INTEGER')
+
+
+@migration(6, "brakujące indeksy kluczy obcych")
+def create_foreign_key_indexes(cursor):
+    """Indeksy kolumn, po których aplikacja wyszukuje wiersze podrzędne"""
+    # Drzewo notatek - dzieci notatki
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_notes_parent ON notes (parent_id)')
+    # Zadanie powiązane z notatką
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_note ON tasks (note_id)')
+    # Elementy listy słownikowej w kolejności
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_dictionary_list_items_list
+        ON dictionary_list_items (list_id, order_index)
+    ''')
+    # Kolumny tabeli użytkownika w kolejności
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_user_table_columns_table
+        ON user_table_columns (table_id, column_order)
+    ''')
+
+
+@migration(7, "indeksy sortowania zadań, notatek i list słownikowych")
+def create_ordering_indexes(cursor):
+    """Indeksy zgodne z ORDER BY zapytań wskazanych przez audyt planów
+    (benchmarks/audit_query_plans.py) - bez sortowania w tymczasowym B-drzewie"""
+    # query_tasks bez filtra archiwum: ORDER BY created_at DESC, id DESC z LIMIT
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at, id)')
+    # get_tasks(status) i query_tasks(status=...) bez filtra archiwum
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at, id)')
+    # Zadania tablicy Kanban - get_tasks(kanban=1)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_kanban_created
+        ON tasks (kanban, created_at, id)
+    ''')
+    # Dzieci notatki w kolejności utworzenia (zastępuje idx_notes_parent)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_notes_parent_created ON notes (parent_id, created_at)')
+    cursor.execute('DROP INDEX IF EXISTS idx_notes_parent')
+    # Elementy listy - ORDER BY order_index, value (zastępuje idx_dictionary_list_items_list)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_dictionary_list_items_order
+        ON dictionary_list_items (list_id, order_index, value)
+    ''')
+    cursor.execute('DROP INDEX IF EXISTS idx_dictionary_list_items_list')
+
+
+@migration(8, "indeks automatycznej archiwizacji zadań")
+def create_archive_candidates_index(cursor):
+    """Indeks dla Database.archive_completed_tasks: archived/status równe, zakres updated_at
+    (indeks częściowy nie byłby wybierany bez statystyk ANALYZE - planista woli
+    idx_tasks_archived_status_created z dwoma równościami)"""
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_archived_status_updated
+        ON tasks (archived, status, updated_at)
+    ''')
+
+
+@migration(9, "indeks FTS5 z polskimi literami zamienionymi na ASCII")
+def fold_search_index(cursor):
+    """Indeks FTS5 z "ł" zamienionym na "l", więc zapytanie wpisane bez
+    polskich znaków ("lodz") znajduje "Łódź"
+
+    Tabela FTS (external content) i tak czyta tekst z tabeli źródłowej,
+    więc tytuły i fragmenty wyników pokazują oryginalny tekst.
+    """
+    for fts_table, source, title_col, body_col in SEARCH_INDEXES.values():
+        if not table_exists(cursor, fts_table):
+            continue  # Brak modułu FTS5 - wyszukiwanie używa LIKE
+        create_search_triggers(cursor, fts_table, source, title_col, body_col)
+        populate_search_index(cursor, fts_table, source, title_col, body_col)
+
+
+@migration(10, "triggery indeksu FTS5 bez funkcji SQL aplikacji")
+def builtin_search_triggers(cursor):
+    """Wcześniejsza wersja migracji 9 tworzyła triggery wołające fold_search -
+    zapis do tasks/notes z połączenia spoza ConnectionPool kończył się
+    błędem "no such function". Triggery używają teraz tylko replace()."""
+    fold_search_index(cursor)
@@ -0,0 +1,125 @@
+"""
+Repozytorium notatek dla drzewa notatek - bez wczytywania treści
+
+Drzewo potrzebuje tylko id, tytułu i rodzica notatki oraz informacji, czy
+notatka ma dzieci - dzieci są pobierane dopiero przy rozwinięciu węzła,
+a treść (notes.content) dopiero po wybraniu notatki. Operacje na całych
+poddrzewach (potomkowie, ścieżka do korzenia, usuwanie) wykonuje jedno
+zapytanie WITH RECURSIVE.
+"""
+
+
+# Kolumny węzła drzewa - has_children z indeksu idx_notes_parent_created
+_NODE_COLUMNS = '''
+    n.id, n.title, n.parent_id,
+    EXISTS (SELECT 1 FROM notes AS c WHERE c.parent_id = n.id) AS has_children
+'''
+
+# Notatka i wszyscy jej potomkowie (UNION kończy rekurencję także przy cyklu w danych)
+_SUBTREE_CTE = '''
+    WITH RECURSIVE subtree(id) AS (
+        SELECT id FROM notes WHERE id = ?
+        UNION
+        SELECT n.id FROM notes AS n JOIN subtree AS s ON n.parent_id = s.id
+    )
+'''
+
+
+def _node(row):
+    return {'id': row[0], 'title': row[1], 'parent_id': row[2], 'has_children': bool(row[3])}
+
+
+class NotesRepository:
+    """Zapytania drzewa notatek na połączeniach Database"""
+
+    # Ograniczenie głębokości ścieżki - zabezpieczenie przed cyklem parent_id w danych
+    MAX_DEPTH = 1000
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_children(self, parent_id=None):
+        """Zwraca dzieci notatki (None = notatki główne) w kolejności utworzenia
+
+        Returns:
+            Lista słowników {id, title, parent_id, has_children}
+        """
+        # "parent_id = NULL" nie pasuje do żadnego wiersza - notatki główne osobno
+        if parent_id is None:
+            where, params = 'n.parent_id IS NULL', ()
+        else:
+            where, params = 'n.parent_id = ?', (parent_id,)
+        with self.db.connection() as conn:
+            cursor = conn.execute(f'''
+                SELECT {_NODE_COLUMNS} FROM notes AS n
+                WHERE {where} ORDER BY n.created_at, n.id
+            ''', params)
+            return [_node(row) for row in cursor]
+
+    def get_content(self, note_id):
+        """Zwraca treść notatki lub None, gdy notatki nie ma"""
+        with self.db.connection() as conn:
+            row = conn.execute('SELECT content FROM notes WHERE id = ?', (note_id,)).fetchone()
+            return (row[0] or '') if row else None
+
+    def get_subtree(self, note_id):
+        """Zwraca notatkę i wszystkich jej potomków (bez treści)
+
+        Returns:
+            Lista słowników {id, title, parent_id, has_children}
+        """
+        with self.db.connection() as conn:
+            cursor = conn.execute(f'''
+                {_SUBTREE_CTE}
+                SELECT {_NODE_COLUMNS} FROM notes AS n JOIN subtree AS s ON s.id = n.id
+                ORDER BY n.created_at, n.id
+            ''', (note_id,))
+            return [_node(row) for row in cursor]
+
+    def count_descendants(self, note_id):
+        """Liczba wszystkich potomków notatki (na wszystkich poziomach)"""
+        with self.db.connection() as conn:
+            row = conn.execute(f'{_SUBTREE_CTE} SELECT COUNT(*) - 1 FROM subtree', (note_id,)).fetchone()
+            return max(row[0], 0)
+
+    def get_path(self, note_id):
+        """Zwraca ID notatek od korzenia do note_id włącznie (pusta lista, gdy notatki nie ma)"""
+        with self.db.connection() as conn:
+            cursor = conn.execute('''
+                WITH RECURSIVE path(id, parent_id, depth) AS (
+                    SELECT id, parent_id, 0 FROM notes WHERE id = ?
+                    UNION ALL
+                    SELECT n.id, n.parent_id, p.depth + 1
+                    FROM notes AS n JOIN path AS p ON n.id = p.parent_id
+                    WHERE p.depth < ?
+                )
+                SELECT id FROM path ORDER BY depth DESC
+            ''', (note_id, self.MAX_DEPTH))
+            return [row[0] for row in cursor]
+
+    def get_branch(self, note_id):
+        """Dzieci każdego przodka notatki - wszystko, czego drzewo potrzebuje, by ją pokazać
+
+        Returns:
+            tuple: (ścieżka od korzenia do note_id, słownik id rodzica (None dla
+            notatek głównych) -> lista dzieci z get_children)
+        """
+        path = self.get_path(note_id)
+        children = {None: self.get_children(None)} if path else {}
+        for ancestor_id in path[:-1]:
+            children[ancestor_id] = self.get_children(ancestor_id)
+        return path, children
+
+    def delete_subtree(self, note_id):
+        """Usuwa notatkę z wszystkimi potomkami
+
+        Klucz obcy ON DELETE CASCADE nie działa bez PRAGMA foreign_keys,
+        więc potomkowie są wybierani zapytaniem rekurencyjnym.
+
+        Returns:
+            Lista ID usuniętych notatek
+        """
+        with self.db.connection() as conn:
+            ids = [row[0] for row in conn.execute(f'{_SUBTREE_CTE} SELECT id FROM subtree', (note_id,))]
+            conn.execute(f'{_SUBTREE_CTE} DELETE FROM notes WHERE id IN (SELECT id FROM subtree)', (note_id,))
+            return ids
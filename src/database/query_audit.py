@@ -0,0 +1,133 @@
+"""
+Audyt planów zapytań - EXPLAIN QUERY PLAN dla zapytań wykonywanych przez Database
+
+QueryAudit podpina się pod połączenie bieżącego wątku (set_trace_callback),
+zbiera wykonane instrukcje, a report() wykonuje dla każdej z nich
+EXPLAIN QUERY PLAN i oznacza pełne przeglądy tabel (SCAN bez indeksu)
+oraz sortowania w tymczasowym B-drzewie. Narzędzie deweloperskie - patrz
+benchmarks/audit_query_plans.py.
+"""
+import re
+import sqlite3
+
+
+# Małe tabele metadanych - pełny przegląd jest tańszy niż utrzymywanie indeksu
+SMALL_TABLES = {
+    'categories', 'task_tags', 'task_columns', 'user_tables', 'dictionary_lists',
+    'app_settings', 'sqlite_master', 'sqlite_schema',
+}
+
+# Instrukcje bez planu zapytania (transakcje, DDL, PRAGMA)
+_SKIPPED_PREFIXES = (
+    'BEGIN', 'COMMIT', 'END', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'PRAGMA',
+    'CREATE', 'DROP', 'ALTER', 'ANALYZE', 'VACUUM', 'EXPLAIN', '--',
+)
+
+# Literały zastępowane znakiem ? przy grupowaniu instrukcji różniących się wartościami
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r'\s+')
+_SUBQUERY = re.compile(r'\([^()]*\)')
+_SCAN = re.compile(r'^SCAN (\w+)(.*)$')
+_TABLE_STEP = re.compile(r'^(?:SCAN|SEARCH) (\w+)')
+
+
+def normalize_sql(sql):
+    """Postać instrukcji bez wartości i zbędnych odstępów (klucz grupowania)"""
+    return _WHITESPACE.sub(' ', _LITERALS.sub('?', sql)).strip()
+
+
+def outer_query(sql):
+    """Instrukcja bez podzapytań i list w nawiasach - WHERE/LIMIT zapytania głównego"""
+    sql = normalize_sql(sql)
+    previous = None
+    while previous != sql:
+        previous, sql = sql, _SUBQUERY.sub('', sql)
+    return f' {sql.upper()} '
+
+
+class QueryAudit:
+    """Zbiera instrukcje wykonane na połączeniu i ocenia ich plany"""
+
+    def __init__(self, conn):
+        """
+        Args:
+            conn: Połączenie sqlite3 (np. db.pool.get() w bieżącym wątku)
+        """
+        self.conn = conn
+        self.statements = {}  # znormalizowany SQL -> [przykładowy SQL, liczba wykonań]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        self.conn.set_trace_callback(self._trace)
+
+    def stop(self):
+        self.conn.set_trace_callback(None)
+
+    def _trace(self, sql):
+        if sql.lstrip().upper().startswith(_SKIPPED_PREFIXES):
+            return
+        key = normalize_sql(sql)
+        entry = self.statements.get(key)
+        if entry is None:
+            self.statements[key] = [sql, 1]
+        else:
+            entry[1] += 1
+
+    def explain(self, sql):
+        """Zwraca listę kroków planu (teksty kolumny detail)"""
+        return [row[3] for row in self.conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+
+    @staticmethod
+    def problems(sql, plan, small_tables=SMALL_TABLES):
+        """Wybiera z planu kroki wymagające uwagi
+
+        Pełny przegląd tabeli (SCAN bez USING INDEX) w zapytaniu z WHERE jest
+        problemem, chyba że dotyczy małej tabeli metadanych - odczyt całej
+        tabeli bez filtra i tak musi ją przejrzeć. Sortowanie w tymczasowym
+        B-drzewie oznacza brak indeksu zgodnego z ORDER BY, gdy zapytanie
+        filtruje lub stronicuje wynik (pełny odczyt i tak sortuje wszystko),
+        nie dotyczy tylko małych tabel i nie sortuje po trafności FTS.
+        """
+        query = outer_query(sql)
+        filtered = ' WHERE ' in query
+        limited = ' LIMIT ' in query
+        tables = {match.group(1) for match in map(_TABLE_STEP.match, plan) if match}
+        ranked = any('VIRTUAL TABLE' in detail for detail in plan)
+        found = []
+        for detail in plan:
+            match = _SCAN.match(detail)
+            if match:
+                table, rest = match.groups()
+                if (filtered and 'USING' not in rest and 'VIRTUAL TABLE' not in rest
+                        and table not in small_tables):
+                    found.append(detail)
+            elif detail.startswith('USE TEMP B-TREE'):
+                if (filtered or limited) and not ranked and not tables <= small_tables:
+                    found.append(detail)
+        return found
+
+    def report(self, small_tables=SMALL_TABLES):
+        """Wykonuje EXPLAIN QUERY PLAN dla zebranych instrukcji
+
+        Returns:
+            Lista słowników {sql, count, plan, problems, error} - najpierw
+            instrukcje z problemami
+        """
+        results = []
+        for key, (sql, count) in self.statements.items():
+            entry = {'sql': key, 'count': count, 'plan': [], 'problems': [], 'error': None}
+            try:
+                entry['plan'] = self.explain(sql)
+                entry['problems'] = self.problems(sql, entry['plan'], small_tables)
+            except sqlite3.Error as e:
+                # Np. tabela tymczasowa usunięta po wykonaniu instrukcji
+                entry['error'] = str(e)
+            results.append(entry)
+        results.sort(key=lambda entry: (not entry['problems'], -entry['count']))
+        return results
@@ -0,0 +1,368 @@
+"""
+Kolejka zapisów edycji tabel użytkownika - zmienione wiersze trafiają do bazy zbiorczo
+
+Edycja komórki w wątku GUI trafia do słownika zmian i jako jedna linia JSON
+do otwartego dziennika - zapis do bufora systemu bez fsync, więc nie czeka
+na dysk. Po flush_delay bez kolejnych edycji wątek w tle zapisuje wszystkie
+zmienione wiersze w jednej transakcji (z fsync=True najpierw utrwala
+dziennik). Po udanym zapisie dziennik jest czyszczony, a nieudany zapis jest
+ponawiany z rosnącym odstępem. Jeśli aplikacja zostanie przerwana przed
+zapisem do bazy, recover() przy następnym starcie odtwarza zmiany z dziennika
+(powtórne UPDATE tych samych wartości jest nieszkodliwe). Bez fsync awaria
+systemu (nie samej aplikacji) może zabrać edycje niezapisane jeszcze do bazy.
+"""
+import json
+import os
+import sqlite3
+import threading
+
+from .background_writer import DebouncedWriter
+
+
+# Stany kolejki zgłaszane słuchaczom
+STATE_SAVED = 'saved'
+STATE_UNSAVED = 'unsaved'
+STATE_SAVING = 'saving'
+STATE_ERROR = 'error'
+
+
+def journal_path_for(db_path):
+    """Ścieżka dziennika edycji obok pliku bazy (jak plik -wal)"""
+    return f"{db_path}-edits.jsonl"
+
+
+class TableEditQueue:
+    """Zbiera zmienione wiersze tabel użytkownika i zapisuje je w jednej transakcji"""
+
+    # Rejestr według ścieżki bazy - jedna kolejka i jeden dziennik na plik bazy
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    # Odstęp ponowienia nieudanego zapisu (podwajany po każdym kolejnym błędzie)
+    RETRY_DELAY_MIN = 1.0
+    RETRY_DELAY_MAX = 60.0
+
+    def __init__(self, db, flush_delay=0.5, fsync=False):
+        """
+        Args:
+            db: Instancja Database (deskryptory schematu i pula połączeń)
+            flush_delay: Ile sekund czekać na kolejne edycje przed zapisem
+            fsync: Czy przed zapisem do bazy wymuszać zapis dziennika na dysk
+                (w wątku zapisu; chroni także przed awarią systemu)
+        """
+        self.db = db
+        self.pool = db.pool
+        self.flush_delay = flush_delay
+        self.fsync = fsync
+        self.journal_path = journal_path_for(db.db_path)
+        self._pending = {}    # (table_id, row_id) -> {kolumna: wartość}
+        self._in_flight = {}  # Wiersze zapisywane właśnie przez flush()
+        self._state = STATE_SAVED
+        self._listeners = []
+        self._journal = None  # Otwarty plik dziennika (dopisywanie)
+        self._journal_lock = threading.Lock()  # Pobierany przed self._lock
+        self._retry_delay = 0.0
+        self._closing = False
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._writer = None
+
+    @classmethod
+    def for_database(cls, db):
+        """Zwraca współdzieloną kolejkę dla pliku bazy instancji db"""
+        with cls._instances_lock:
+            queue = cls._instances.get(db.db_path)
+            if queue is None:
+                queue = cls(db)
+                cls._instances[db.db_path] = queue
+            return queue
+
+    # === Stan ===
+
+    def add_listener(self, callback):
+        """Rejestruje callback(stan, liczba_zmienionych_wierszy)
+
+        Wywoływany w wątku, który zmienił stan (także w wątku zapisu) -
+        widoki Qt powinny przekazywać go dalej sygnałem.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            self._listeners = [listener for listener in self._listeners if listener != callback]
+
+    def state(self):
+        """Zwraca stan kolejki: saved, unsaved, saving lub error"""
+        return self._state
+
+    def pending_count(self):
+        """Liczba wierszy czekających na zapis (także zapisywanych w tej chwili)"""
+        with self._lock:
+            return self._count_locked()
+
+    def _count_locked(self):
+        if not self._in_flight:
+            return len(self._pending)
+        return len(self._pending.keys() | self._in_flight.keys())
+
+    def _set_state(self, state):
+        with self._lock:
+            self._state = state
+            listeners = list(self._listeners)
+            count = self._count_locked()
+        for listener in listeners:
+            try:
+                listener(state, count)
+            except Exception as e:
+                print(f"Błąd słuchacza kolejki zapisów: {e}")
+
+    # === Edycje ===
+
+    def stage_update(self, table_id, row_id, row_data):
+        """Zapamiętuje zmianę wiersza - zapis do bazy nastąpi w tle
+
+        Args:
+            table_id: ID tabeli w user_tables
+            row_id: ID wiersza w tabeli fizycznej
+            row_data: Dict {column_name: value} (może być tylko część kolumn)
+        """
+        key = (table_id, row_id)
+        line = self._journal_line(table_id, row_id, row_data)
+        # Linia dziennika i zmiana w self._pending razem - porządkowanie dziennika
+        # po zapisie (_compact_journal) widzi każdą edycję w obu miejscach albo w żadnym
+        with self._journal_lock:
+            self._append_journal(line)
+            with self._lock:
+                # Słuchacze (etykieta stanu w oknie) tylko przy zmianie stanu lub liczby wierszy
+                changed = self._state != STATE_UNSAVED or key not in self._pending
+                self._pending[key] = {**self._pending.get(key, {}), **row_data}
+                self._schedule_flush()
+        if changed:
+            self._set_state(STATE_UNSAVED)
+
+    def apply_pending(self, table_id, rows):
+        """Nakłada niezapisane zmiany na wiersze odczytane z bazy (słowniki z '_row_id')"""
+        with self._lock:
+            if not self._pending and not self._in_flight:
+                return rows
+            changes = {}
+            for source in (self._in_flight, self._pending):
+                for (change_table, row_id), data in source.items():
+                    if change_table == table_id:
+                        changes.setdefault(row_id, {}).update(data)
+        if changes:
+            for row in rows:
+                data = changes.get(row.get('_row_id'))
+                if data:
+                    row.update(data)
+        return rows
+
+    def _schedule_flush(self, delay=None):
+        """Budzi wątek zapisu (wywoływane pod self._lock)
+
+        Args:
+            delay: Opóźnienie zapisu zamiast flush_delay (ponowienie po błędzie)
+        """
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = DebouncedWriter(self, name='table-edit-writer')
+            self._writer.start()
+        self._writer.notify(delay)
+
+    def flush(self):
+        """Zapisuje wszystkie zmienione wiersze w jednej transakcji
+
+        Returns:
+            int: Liczba zapisanych wierszy
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._in_flight = self._pending
+                self._pending = {}
+            self._set_state(STATE_SAVING)
+
+            # fsync w wątku zapisu, bez blokad - stage_update w wątku GUI nie czeka na dysk
+            if self.fsync:
+                self._sync_journal()
+
+            try:
+                written = self._write_rows(self._in_flight)
+            except sqlite3.Error as e:
+                with self._lock:
+                    failed_count = len(self._in_flight)
+                    # Nowsze edycje mają pierwszeństwo przed wierszami z nieudanego zapisu
+                    for key, data in self._in_flight.items():
+                        self._pending[key] = {**data, **self._pending.get(key, {})}
+                    self._in_flight = {}
+                    # Dziennik zostaje - zmiany zostaną zapisane przy kolejnej próbie
+                    self._retry_delay = min(self.RETRY_DELAY_MAX,
+                                            max(self.RETRY_DELAY_MIN, self._retry_delay * 2))
+                    if not self._closing:
+                        self._schedule_flush(self._retry_delay)
+                print(f"Błąd zapisu {failed_count} wierszy tabel użytkownika: {e} "
+                      f"(ponowienie za {self._retry_delay:.0f} s)")
+                self._set_state(STATE_ERROR)
+                return 0
+
+            # Wiersze z dziennika (także z wcześniejszych nieudanych prób) są
+            # w bazie - zostają tylko linie edycji dodanych w trakcie zapisu
+            self._retry_delay = 0.0
+            with self._journal_lock:
+                with self._lock:
+                    self._in_flight = {}
+                    pending = dict(self._pending)
+                    state = STATE_UNSAVED if pending else STATE_SAVED
+                self._compact_journal(pending)
+            self._set_state(state)
+            return written
+
+    def _write_rows(self, rows):
+        """Wykonuje UPDATE wierszy - zapytania o tym samym SQL przez executemany"""
+        statements = {}
+        for (table_id, row_id), data in rows.items():
+            schema = self.db.get_user_table_schema(table_id)
+            if schema is None:
+                print(f"Pominięto zmiany wiersza {row_id} - brak tabeli o ID {table_id}")
+                continue
+            statement = schema.update_statement(data, row_id)
+            if statement is None:
+                continue
+            sql, params = statement
+            statements.setdefault(sql, []).append(params)
+
+        with self.db.connection() as conn:
+            for sql, params_list in statements.items():
+                conn.executemany(sql, params_list)
+        return sum(len(params_list) for params_list in statements.values())
+
+    def close(self):
+        """Zatrzymuje wątek zapisu i zapisuje zaległe zmiany"""
+        with self._lock:
+            writer = self._writer
+            self._writer = None
+            self._closing = True
+        if writer is not None:
+            writer.stop()
+        try:
+            self.flush()
+        finally:
+            with self._journal_lock:
+                with self._lock:
+                    self._closing = False
+                    saved = not self._pending
+                self._close_journal()
+                # Dziennik bez zmian nie jest potrzebny - zostaje tylko po nieudanym zapisie
+                if saved:
+                    self._remove_journal()
+
+    # === Dziennik ===
+
+    def recover(self):
+        """Odtwarza zmiany z dziennika po przerwanym działaniu aplikacji
+
+        Returns:
+            int: Liczba odtworzonych wierszy
+        """
+        if not os.path.exists(self.journal_path):
+            return 0
+        with self._flush_lock:
+            recovered = {}
+            try:
+                with open(self.journal_path, 'r', encoding='utf-8') as journal:
+                    for line in journal:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # Niedokończona ostatnia linia (przerwany zapis) - pomijamy
+                            continue
+                        key = (entry['table_id'], entry['row_id'])
+                        recovered[key] = {**recovered.get(key, {}), **entry['data']}
+            except OSError as e:
+                print(f"Błąd odczytu dziennika edycji {self.journal_path}: {e}")
+                return 0
+            if not recovered:
+                with self._journal_lock:
+                    self._close_journal()
+                    self._remove_journal()
+                return 0
+            with self._lock:
+                for key, data in recovered.items():
+                    self._pending[key] = {**data, **self._pending.get(key, {})}
+
+        print(f"Odtworzono {len(recovered)} niezapisanych wierszy tabel użytkownika z dziennika")
+        self.flush()
+        return len(recovered)
+
+    @staticmethod
+    def _journal_line(table_id, row_id, row_data):
+        entry = {'table_id': table_id, 'row_id': row_id, 'data': row_data}
+        return json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+
+    def _append_journal(self, line):
+        """Dopisuje linię do dziennika - bez fsync (pod self._journal_lock)"""
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal.write(line)
+            # Do bufora systemu - przerwanie aplikacji nie zabierze linii
+            self._journal.flush()
+        except OSError as e:
+            # Bez dziennika zmiana i tak trafi do bazy - traci tylko ochronę przed awarią
+            print(f"Błąd zapisu dziennika edycji: {e}")
+
+    def _sync_journal(self):
+        """Utrwala dziennik na dysku (w wątku zapisu, bez self._journal_lock)"""
+        with self._journal_lock:
+            fileno = self._journal.fileno() if self._journal is not None else None
+        if fileno is None:
+            return
+        try:
+            os.fsync(fileno)
+        except OSError as e:
+            print(f"Błąd utrwalania dziennika edycji: {e}")
+
+    def _compact_journal(self, pending):
+        """Zostawia w dzienniku tylko niezapisane zmiany (pod self._journal_lock)
+
+        Args:
+            pending: Wiersze czekające na zapis - {(table_id, row_id): dane}
+        """
+        try:
+            if not pending:
+                if self._journal is not None:
+                    self._journal.truncate(0)
+                else:
+                    # Np. po recover() - dziennik był tylko czytany
+                    self._remove_journal()
+                return
+            # Edycje dodane w trakcie zapisu - nowy dziennik podmieniany w całości,
+            # więc przerwanie w tym miejscu nie zabierze ich linii
+            self._close_journal()
+            temp_path = f"{self.journal_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as journal:
+                journal.writelines(
+                    self._journal_line(table_id, row_id, data)
+                    for (table_id, row_id), data in pending.items()
+                )
+            os.replace(temp_path, self.journal_path)
+        except OSError as e:
+            print(f"Błąd porządkowania dziennika edycji: {e}")
+
+    def _close_journal(self):
+        """Zamyka plik dziennika (pod self._journal_lock)"""
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except OSError as e:
+                print(f"Błąd zamykania dziennika edycji: {e}")
+            self._journal = None
+
+    def _remove_journal(self):
+        """Usuwa zamknięty dziennik po zapisaniu wszystkich jego zmian"""
+        try:
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        except OSError as e:
+            print(f"Błąd usuwania dziennika edycji: {e}")
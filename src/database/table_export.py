@@ -0,0 +1,152 @@
+"""
+Eksport tabel użytkownika, zadań i notatek do CSV / JSON Lines
+
+Wiersze są czytane z kursora porcjami (fetchmany) i od razu zapisywane do
+pliku - krotki z kursora trafiają do csv.writer bez budowania słowników,
+a linie JSON są składane z gotowych kluczy. Pamięć nie zależy od liczby
+wierszy. Plik powstaje pod nazwą tymczasową (.part) i jest podmieniany
+dopiero po udanym eksporcie.
+"""
+import csv
+import json
+import os
+
+
+# Obsługiwane formaty plików
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+
+# Separator CSV - średnik, jak w arkuszach z polskimi ustawieniami (przecinek dziesiętny)
+CSV_DELIMITER = ';'
+
+# Ile wierszy pobierać z kursora naraz
+FETCH_SIZE = 5000
+
+
+class ExportCancelled(Exception):
+    """Eksport przerwany przez użytkownika (plik docelowy nie powstaje)"""
+
+
+def export_query(conn, sql, params, header, file_path, fmt=FORMAT_CSV, total=None,
+                 progress=None, should_cancel=None):
+    """Zapisuje wynik zapytania do pliku CSV lub JSONL
+
+    Args:
+        conn: Połączenie sqlite3
+        sql, params: Zapytanie i jego parametry
+        header: Nazwy kolumn wyniku (nagłówek CSV / klucze JSON)
+        file_path: Plik docelowy
+        fmt: 'csv' lub 'jsonl'
+        total: Liczba wierszy do postępu (None = nieznana)
+        progress: Funkcja progress(wiersze, total) po każdej porcji
+        should_cancel: Funkcja zwracająca True, gdy eksport ma zostać przerwany
+
+    Returns:
+        int: Liczba zapisanych wierszy
+    """
+    if fmt not in (FORMAT_CSV, FORMAT_JSONL):
+        raise ValueError(f"Nieobsługiwany format eksportu: {fmt}")
+
+    temp_path = file_path + '.part'
+    rows_done = 0
+    cursor = conn.execute(sql, params)
+    try:
+        # utf-8-sig - Excel rozpoznaje kodowanie CSV po znaczniku BOM
+        encoding = 'utf-8-sig' if fmt == FORMAT_CSV else 'utf-8'
+        with open(temp_path, 'w', encoding=encoding, newline='') as out:
+            if fmt == FORMAT_CSV:
+                writer = csv.writer(out, delimiter=CSV_DELIMITER)
+                writer.writerow(header)
+                write_rows = writer.writerows
+            else:
+                write_rows = _jsonl_writer(out, header)
+
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                write_rows(rows)
+                rows_done += len(rows)
+                if progress:
+                    progress(rows_done, total)
+                if should_cancel and should_cancel():
+                    raise ExportCancelled(f"Eksport przerwany po {rows_done} wierszach")
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        cursor.close()
+    return rows_done
+
+
+def _jsonl_writer(out, header):
+    """Zwraca funkcję zapisującą krotki jako linie JSON {"kolumna": wartość, ...}"""
+    encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+    keys = [encode(name) + ': ' for name in header]
+
+    def write_rows(rows):
+        out.writelines(
+            '{' + ', '.join([key + encode(value) for key, value in zip(keys, row)]) + '}\n'
+            for row in rows
+        )
+    return write_rows
+
+
+def export_user_table(db, table_id, file_path, fmt=FORMAT_CSV, progress=None, should_cancel=None):
+    """Eksportuje tabelę użytkownika (kolumna ID + kolumny w kolejności column_order)
+
+    Returns:
+        int: Liczba zapisanych wierszy
+
+    Raises:
+        ValueError: Brak tabeli o podanym ID
+    """
+    schema = db.get_user_table_schema(table_id)
+    if schema is None:
+        raise ValueError(f"Nie znaleziono tabeli o ID {table_id}")
+
+    # Edycje czekające w kolejce zapisów muszą trafić do pliku
+    db.table_edits.flush()
+
+    conn = db.pool.get()
+    total = conn.execute(f'SELECT COUNT(*) FROM {schema.physical_table}').fetchone()[0]
+    sql = f"SELECT {', '.join(('id',) + schema.safe_names)} FROM {schema.physical_table} ORDER BY id"
+    header = ['ID'] + list(schema.column_names)
+    return export_query(conn, sql, (), header, file_path, fmt, total, progress, should_cancel)
+
+
+def export_tasks(db, file_path, fmt=FORMAT_CSV, progress=None, should_cancel=None):
+    """Eksportuje zadania z kolumnami użytkownika (wartości z task_column_values)"""
+    # Import lokalny - db_manager importuje ten moduł
+    from .db_manager import STANDARD_TASK_COLUMNS
+
+    custom_columns = [column for column in db.get_task_columns()
+                      if column['name'] not in STANDARD_TASK_COLUMNS]
+    value_columns = ''.join(
+        ', (SELECT value FROM task_column_values v WHERE v.task_id = t.id AND v.column_id = ?)'
+        for _ in custom_columns
+    )
+    sql = f'''
+        SELECT t.id, t.title, t.status, t.category, t.note_id, t.created_at, t.updated_at,
+               t.kanban, t.archived, t.description{value_columns}
+        FROM tasks t
+        ORDER BY t.id
+    '''
+    header = ['ID', 'Zadanie', 'Status', 'TAG', 'Notatka', 'Data dodania', 'Data zmiany',
+              'KanBan', 'Archiwum', 'Opis'] + [column['name'] for column in custom_columns]
+
+    conn = db.pool.get()
+    total = conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[0]
+    params = [column['id'] for column in custom_columns]
+    return export_query(conn, sql, params, header, file_path, fmt, total, progress, should_cancel)
+
+
+def export_notes(db, file_path, fmt=FORMAT_CSV, progress=None, should_cancel=None):
+    """Eksportuje notatki (parent_id zachowuje strukturę drzewa)"""
+    conn = db.pool.get()
+    total = conn.execute('SELECT COUNT(*) FROM notes').fetchone()[0]
+    sql = 'SELECT id, parent_id, title, content, created_at, updated_at FROM notes ORDER BY id'
+    header = ['ID', 'Nadrzędna', 'Tytuł', 'Treść', 'Data utworzenia', 'Data zmiany']
+    return export_query(conn, sql, (), header, file_path, fmt, total, progress, should_cancel)
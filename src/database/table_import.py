@@ -0,0 +1,205 @@
+"""
+Import danych z plików CSV do tabel użytkownika
+
+Plik jest czytany strumieniowo (csv.reader), wartości są konwertowane według
+typu SQL kolumny (Database.get_sql_type), a wiersze wstawiane przez
+executemany w porcjach - pamięć nie zależy od wielkości pliku.
+"""
+import csv
+import os
+import re
+from functools import lru_cache
+
+
+# Wartości CheckBox uznawane za zaznaczone / odznaczone
+TRUE_VALUES = {'1', 'true', 'tak', 'yes', 't', 'y', 'x', '✓'}
+FALSE_VALUES = {'0', 'false', 'nie', 'no', 'f', 'n'}
+
+# Brak kolumny w pliku - indeks poza każdym rekordem
+MISSING = float('inf')
+
+# Daty w formatach spotykanych w arkuszach (dd.mm.rrrr, dd/mm/rrrr, rrrr/mm/dd)
+_DMY_DATE = re.compile(r'^(\d{1,2})[./-](\d{1,2})[./-](\d{4})(.*)$')
+_YMD_DATE = re.compile(r'^(\d{4})[./](\d{1,2})[./](\d{1,2})(.*)$')
+
+
+class ImportCancelled(Exception):
+    """Import przerwany przez użytkownika (wstawione porcje zostają w tabeli)"""
+
+
+def convert_number(value):
+    """Liczba z tekstu typu '1 234,50 zł' - niepoprawna wartość zostaje tekstem"""
+    if value == '':
+        return None
+    if not value[-1].isdigit() or ',' in value or ' ' in value:
+        cleaned = (value.replace('zł', '').replace('\xa0', '').replace(' ', '')
+                   .replace(',', '.'))
+    else:
+        cleaned = value
+    try:
+        return float(cleaned)
+    except ValueError:
+        return value
+
+
+# Wartości CheckBox i dat powtarzają się w kolejnych wierszach - wyniki są zapamiętywane
+@lru_cache(maxsize=4096)
+def convert_bool(value):
+    """CheckBox zapisywany jako 1/0 - nierozpoznana wartość zostaje tekstem"""
+    if value == '':
+        return None
+    lowered = value.strip().lower()
+    if lowered in TRUE_VALUES:
+        return 1
+    if lowered in FALSE_VALUES:
+        return 0
+    return value
+
+
+@lru_cache(maxsize=4096)
+def convert_date(value):
+    """Data do formatu rrrr-mm-dd (jak DateDelegate), z zachowaniem części godzinowej"""
+    if value == '':
+        return None
+    value = value.strip()
+    if len(value) >= 10 and value[4] == '-' and value[7] == '-':
+        return value
+    match = _DMY_DATE.match(value)
+    if match:
+        day, month, year, rest = match.groups()
+        return f"{year}-{int(month):02d}-{int(day):02d}{rest}"
+    match = _YMD_DATE.match(value)
+    if match:
+        year, month, day, rest = match.groups()
+        return f"{year}-{int(month):02d}-{int(day):02d}{rest}"
+    return value
+
+
+# Typ SQL kolumny (Database.get_sql_type) -> konwerter wartości z CSV
+# (None - tekst bez konwersji, pusty tekst zapisywany jako NULL)
+SQL_TYPE_CONVERTERS = {
+    'TEXT': None,
+    'DATE': convert_date,
+    'DATETIME': convert_date,
+    'TIME': None,
+    'BOOLEAN': convert_bool,
+    'DECIMAL': convert_number,
+}
+
+
+def converter_for(sql_type):
+    """Zwraca konwerter dla typu SQL (DECIMAL(10,2) -> DECIMAL)"""
+    return SQL_TYPE_CONVERTERS.get(sql_type.split('(', 1)[0])
+
+
+def import_csv(db, table_id, file_path, delimiter=None, encoding='utf-8-sig',
+               batch_size=5000, commit_every=50000, progress=None, should_cancel=None):
+    """Importuje plik CSV do tabeli użytkownika
+
+    Pierwszy wiersz pliku to nagłówki - kolumny dopasowywane są po nazwie
+    (lub bezpiecznej nazwie) kolumny tabeli, nieznane kolumny są pomijane.
+
+    Args:
+        db: Instancja Database
+        table_id: ID tabeli w user_tables
+        file_path: Ścieżka do pliku CSV
+        delimiter: Separator pól (None = wykryj z nagłówka: ',', ';' lub tab)
+        encoding: Kodowanie pliku (utf-8-sig pomija BOM z Excela)
+        batch_size: Ile wierszy przekazywać do jednego executemany
+        commit_every: Co ile wierszy zatwierdzać transakcję
+        progress: Funkcja progress(wiersze, przeczytane_bajty, rozmiar_pliku)
+            wywoływana po każdej porcji
+        should_cancel: Funkcja zwracająca True, gdy import ma zostać przerwany
+
+    Returns:
+        dict: {'rows', 'columns', 'ignored_columns'}
+
+    Raises:
+        ValueError: Brak tabeli lub żadna kolumna pliku nie pasuje do tabeli
+        ImportCancelled: should_cancel() zwróciło True
+    """
+    schema = db.get_user_table_schema(table_id)
+    if schema is None:
+        raise ValueError(f"Nie znaleziono tabeli o ID {table_id}")
+
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'r', encoding=encoding, newline='') as csv_file:
+        header_line = csv_file.readline()
+        if delimiter is None:
+            delimiter = max((';', ',', '\t'), key=header_line.count)
+        header = next(csv.reader([header_line], delimiter=delimiter), [])
+
+        # Kolumna tabeli (kolejność insert_sql) -> (indeks w pliku, konwerter)
+        file_indexes = {}
+        ignored_columns = []
+        for file_index, name in enumerate(header):
+            safe_name = schema.safe_column(name.strip())
+            if safe_name is None or safe_name in file_indexes:
+                ignored_columns.append(name)
+            else:
+                file_indexes[safe_name] = file_index
+        if not file_indexes:
+            raise ValueError("Żadna kolumna pliku nie pasuje do kolumn tabeli")
+
+        plan = []
+        matched_columns = []
+        for column_name, safe_name, column_type in schema.columns:
+            file_index = file_indexes.get(safe_name, MISSING)
+            plan.append((file_index, converter_for(db.get_sql_type(column_type))))
+            if file_index is not MISSING:
+                matched_columns.append(column_name)
+
+        reader = csv.reader(csv_file, delimiter=delimiter)
+        conn = db.pool.get()
+        rows_done = 0
+        uncommitted = 0
+        batch = []
+
+        def insert_batch():
+            conn.executemany(schema.insert_sql, batch)
+            batch.clear()
+
+        try:
+            for record in reader:
+                if not record:
+                    continue
+                record_length = len(record)
+                batch.append([
+                    None if file_index >= record_length
+                    else (convert(record[file_index]) if convert else record[file_index] or None)
+                    for file_index, convert in plan
+                ])
+
+                if len(batch) >= batch_size:
+                    rows_done += len(batch)
+                    uncommitted += len(batch)
+                    insert_batch()
+                    if uncommitted >= commit_every:
+                        conn.commit()
+                        uncommitted = 0
+                    if progress:
+                        progress(rows_done, _position(csv_file), file_size)
+                    if should_cancel and should_cancel():
+                        conn.commit()
+                        raise ImportCancelled(f"Import przerwany po {rows_done} wierszach")
+
+            if batch:
+                rows_done += len(batch)
+                insert_batch()
+            conn.commit()
+        except ImportCancelled:
+            raise
+        except BaseException:
+            # Niezatwierdzona porcja jest wycofywana - zatwierdzone zostają
+            conn.rollback()
+            raise
+
+    if progress:
+        progress(rows_done, file_size, file_size)
+    print(f"Zaimportowano {rows_done} wierszy do tabeli {schema.table_name}")
+    return {'rows': rows_done, 'columns': matched_columns, 'ignored_columns': ignored_columns}
+
+
+def _position(csv_file):
+    """Przybliżona pozycja w pliku (tell() pliku tekstowego jest niedostępne przy iteracji)"""
+    return csv_file.buffer.tell()
@@ -0,0 +1,106 @@
+"""
+Potok ładowania zadań dla widoku zadań
+"""
+from .db_manager import build_column_prefix_lookup, split_description_values
+
+
+class TaskLoader:
+    """Ładuje zadania w stałej liczbie zapytań, niezależnej od liczby zadań
+    
+    Metadane (kolumny, tagi, kategorie) są pobierane raz na instancję loadera
+    (kolejne strony z query() korzystają z tych samych), wartości kolumn
+    użytkownika jednym zapytaniem na ładowanie, a opisy zadań parsowane są
+    przez gotową mapę prefiksów "Nazwa:" -> kolumna.
+    """
+    
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.category_colors = {}
+        self._prefixes = None
+        self._combined_colors = None
+    
+    def prepare(self):
+        """Wczytuje metadane (kolumny, kolory) - raz na instancję loadera"""
+        if self._prefixes is None:
+            self._prefixes = build_column_prefix_lookup(self.db_manager.get_task_columns())
+            self.category_colors = self.get_category_colors()
+            # Kolory z tagów mają priorytet nad kategoriami
+            self._combined_colors = {**self.category_colors, **self.get_tag_colors()}
+    
+    def load(self, task_ids=None):
+        """Zwraca listę słowników zadań w formacie używanym przez TasksView
+        
+        Args:
+            task_ids: Lista ID zadań do wczytania (None = wszystkie zadania)
+        """
+        tasks = self.db_manager.get_task_rows(task_ids)
+        return self.build(tasks, self.db_manager.get_task_column_values(task_ids))
+    
+    def query(self, limit=None, offset=0, **filters):
+        """Zwraca stronę zadań z Database.query_tasks w formacie TasksView"""
+        tasks = self.db_manager.query_tasks(limit=limit, offset=offset, **filters)
+        if not tasks:
+            return []
+        column_values = self.db_manager.get_task_column_values([task['id'] for task in tasks])
+        return self.build(tasks, column_values)
+    
+    def build(self, tasks, column_values):
+        """Buduje słowniki zadań z wierszy tabeli tasks i wartości kolumn użytkownika"""
+        self.prepare()
+        prefixes = self._prefixes
+        combined_colors = self._combined_colors
+        
+        result = []
+        for task in tasks:
+            completed = task['status'] == 'completed'
+            task_dict = {
+                'id': task['id'],
+                'date_added': task['created_at'],
+                'status': completed,
+                'task': task['title'],
+                'note_id': task['note_id'],
+                'tag': task['category'],  # category (używane jako tag)
+                'date_completed': task['updated_at'] if completed else None,
+                'kanban_status': 'DONE' if completed else 'TODO',
+                'archived': task['archived'] == 1,
+                'kanban': task['kanban'] or 0
+            }
+            
+            # Wartości z opisu zapisane przed migracją do task_column_values
+            description = task['description']
+            if description and ':' in description:
+                found, _ = split_description_values(description, prefixes)
+                for column, value in found:
+                    task_dict[column['name']] = value
+            
+            # Wartości z tabeli task_column_values mają pierwszeństwo
+            task_dict.update(column_values.get(task['id'], {}))
+            
+            # Dodaj kolor kategorii jako kolor tagu
+            tag_name = task_dict.get('tag')
+            if tag_name:
+                task_dict['tag_color'] = combined_colors.get(tag_name) or '#3498db'
+            else:
+                task_dict['tag_color'] = None
+            
+            result.append(task_dict)
+        
+        return result
+    
+    def get_category_colors(self):
+        """Zwraca mapę nazwa kategorii -> kolor"""
+        categories = self.db_manager.get_categories()
+        return {cat[1]: cat[2] for cat in categories if cat[1] and cat[2]}
+    
+    def get_tag_colors(self):
+        """Zwraca mapę nazwa tagu -> kolor z dedykowanej tabeli tagów"""
+        tag_colors = {}
+        try:
+            for tag_row in self.db_manager.get_task_tags():
+                tag_name = tag_row[1]
+                tag_color = tag_row[2]
+                if tag_name and tag_color:
+                    tag_colors[tag_name] = tag_color
+        except Exception as e:
+            print(f"Błąd pobierania tagów: {e}")
+        return tag_colors
@@ -0,0 +1,45 @@
+"""
+Porównywanie tekstu bez rozróżniania wielkości liter - także liter polskich
+
+LIKE i lower() w SQLite zmieniają wielkość tylko liter ASCII, więc "żółw"
+nie pasuje do "Żółw". Funkcje z SQL_FUNCTIONS są rejestrowane na każdym
+połączeniu ConnectionPool - zapytania SQL i filtry liczone w Pythonie
+(np. TasksView.build_task_filter) używają tej samej funkcji i dają ten
+sam wynik.
+
+fold_search zamienia polskie litery na litery ASCII w zapytaniach FTS5 -
+tokenizer unicode61 usuwa znaki diakrytyczne, ale "ł" jest osobną literą,
+więc indeks zawiera tekst z "ł" zamienionym na "l" (migrations.search_fold_sql)
+i zapytanie musi być sprowadzone do tej samej postaci.
+"""
+
+# Polskie litery -> litery ASCII (ta sama długość tekstu i granice słów)
+POLISH_LETTERS = str.maketrans('ąćęłńóśźżĄĆĘŁŃÓŚŹŻ', 'acelnoszzACELNOSZZ')
+
+
+def fold_case(text):
+    """Zwraca tekst bez rozróżniania wielkości liter (Unicode, str.casefold)"""
+    if text is None:
+        return None
+    return str(text).casefold()
+
+
+def fold_search(text):
+    """Zwraca tekst z polskimi literami zamienionymi na ASCII (indeks i zapytania FTS5)"""
+    if text is None:
+        return None
+    return str(text).translate(POLISH_LETTERS)
+
+
+# Funkcje SQL: nazwa -> (liczba argumentów, funkcja)
+SQL_FUNCTIONS = {
+    'fold_case': (1, fold_case),
+    # Tylko w zapytaniach (wyszukiwanie bez FTS5) - triggery używają wbudowanego replace()
+    'fold_search': (1, fold_search),
+}
+
+
+def register_functions(conn):
+    """Rejestruje funkcje SQL_FUNCTIONS na połączeniu SQLite"""
+    for name, (num_params, func) in SQL_FUNCTIONS.items():
+        conn.create_function(name, num_params, func, deterministic=True)
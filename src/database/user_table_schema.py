@@ -0,0 +1,101 @@
+"""
+Deskryptor schematu tabeli użytkownika
+
+Zapis komórki nie musi za każdym razem czytać user_tables i user_table_columns -
+deskryptor trzyma nazwę tabeli fizycznej, mapowanie nazw kolumn na bezpieczne
+nazwy, typy kolumn i gotowe zapytania INSERT/UPDATE. Database przechowuje
+deskryptory w cache metadanych (grupa user_tables), unieważnianym przez
+create/update/delete_user_table.
+"""
+
+
+class UserTableSchema:
+    """Niezmienny opis tabeli użytkownika z przygotowanymi zapytaniami"""
+
+    def __init__(self, table_id, table_name, physical_table, columns, safe_name_func):
+        """
+        Args:
+            table_id: ID tabeli w user_tables
+            table_name: Nazwa tabeli widoczna dla użytkownika
+            physical_table: Nazwa tabeli fizycznej z danymi
+            columns: Lista (nazwa kolumny, bezpieczna nazwa, typ) - tylko kolumny
+                istniejące w tabeli fizycznej, w kolejności column_order
+            safe_name_func: Funkcja nazwa kolumny -> bezpieczna nazwa
+                (Database.get_safe_column_name)
+        """
+        self.table_id = table_id
+        self.table_name = table_name
+        self.physical_table = physical_table
+        self.columns = tuple(columns)
+        self.column_names = tuple(name for name, _, _ in self.columns)
+        self.safe_names = tuple(safe_name for _, safe_name, _ in self.columns)
+        self.types = {name: col_type for name, _, col_type in self.columns}
+        self._safe_name_func = safe_name_func
+        self._safe_set = frozenset(self.safe_names)
+        self._key_cache = {name: safe_name for name, safe_name, _ in self.columns}
+
+        placeholders = ', '.join('?' * len(self.safe_names))
+        self.insert_sql = (f"INSERT INTO {physical_table} ({', '.join(self.safe_names)}) "
+                           f"VALUES ({placeholders})")
+        self.update_sql = self._build_update_sql(self.safe_names)
+        self.delete_sql = f"DELETE FROM {physical_table} WHERE id = ?"
+        self._partial_update_sql = {}
+
+    def safe_column(self, key):
+        """Zwraca bezpieczną nazwę kolumny dla klucza row_data lub None
+
+        Kluczem może być nazwa kolumny lub jej bezpieczna nazwa (jak dawniej
+        w insert_table_row/update_table_row).
+        """
+        safe_name = self._key_cache.get(key)
+        if safe_name is None:
+            safe_name = self._safe_name_func(key)
+            if safe_name not in self._safe_set:
+                return None
+            self._key_cache[key] = safe_name
+        return safe_name
+
+    def insert_params(self, row_data):
+        """Parametry insert_sql - brakujące kolumny dostają NULL
+
+        Returns:
+            list wartości w kolejności kolumn lub None, gdy row_data nie ma
+            żadnej znanej kolumny
+        """
+        values = dict.fromkeys(self.safe_names)
+        matched = False
+        for key, value in row_data.items():
+            safe_name = self.safe_column(key)
+            if safe_name is not None:
+                values[safe_name] = value
+                matched = True
+        return list(values.values()) if matched else None
+
+    def update_statement(self, row_data, row_id):
+        """Zwraca (sql, parametry) UPDATE dla row_data lub None bez znanych kolumn
+
+        Pełny wiersz używa przygotowanego update_sql, niepełny - zapytania
+        zbudowanego raz dla danego zestawu kolumn.
+        """
+        values = {}
+        for key, value in row_data.items():
+            safe_name = self.safe_column(key)
+            if safe_name is not None:
+                values[safe_name] = value
+        if not values:
+            return None
+
+        if len(values) == len(self.safe_names):
+            return self.update_sql, [values[name] for name in self.safe_names] + [row_id]
+
+        safe_names = tuple(name for name in self.safe_names if name in values)
+        sql = self._partial_update_sql.get(safe_names)
+        if sql is None:
+            sql = self._build_update_sql(safe_names)
+            self._partial_update_sql[safe_names] = sql
+        return sql, [values[name] for name in safe_names] + [row_id]
+
+    def _build_update_sql(self, safe_names):
+        assignments = [f"{name} = ?" for name in safe_names]
+        assignments.append("updated_at = CURRENT_TIMESTAMP")
+        return f"UPDATE {self.physical_table} SET {', '.join(assignments)} WHERE id = ?"
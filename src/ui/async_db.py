@@ -0,0 +1,183 @@
+"""
+Asynchroniczny dostęp do bazy - zapytania Database w puli wątków poza wątkiem GUI
+
+AsyncDatabase wykonuje funkcje (zwykle metody Database) w QThreadPool,
+a wynik przekazuje sygnałem DbRequest.finished do wątku GUI. Zablokowana
+baza (timeout połączenia 30 s) zatrzymuje wtedy tylko wątek puli - widok
+pokazuje stan ładowania zamiast zamrożonego okna. Każdy wątek puli ma
+własne połączenie z ConnectionPool, zamykane przez Database.close().
+
+Przez pulę idą odczyty widoków (ładowanie list, liczniki, odświeżanie po
+zdarzeniach zmian) oraz archiwizacja. Pojedyncze zapisy z akcji użytkownika
+(update_task, add_task, ustawienia, notatki) nadal wykonuje wątek GUI -
+przy bazie zablokowanej przez inny proces taki zapis może zatrzymać okno
+do czasu zwolnienia blokady (timeout połączenia 30 s). Edycje tabel
+użytkownika omijają ten problem przez TableEditQueue.
+"""
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class DbRequest(QObject):
+    """Zlecenie wykonywane w puli - wynik lub błąd przychodzi sygnałem w wątku GUI
+
+    Po cancel() wynik nie jest dostarczany (np. widok zlecił już nowsze
+    ładowanie); zapytanie, które zdążyło się rozpocząć, jest dokończone.
+    """
+
+    finished = pyqtSignal(object)  # wynik funkcji
+    failed = pyqtSignal(str)       # komunikat błędu
+    done = pyqtSignal()            # po finished lub failed (także po anulowaniu)
+
+    # Sygnały wewnętrzne emitowane z wątku puli - kolejkowane do wątku GUI
+    _result_ready = pyqtSignal(object)
+    _error_ready = pyqtSignal(str)
+
+    def __init__(self, description, parent=None):
+        super().__init__(parent)
+        self.description = description
+        self.cancelled = False
+        self._result_ready.connect(self._deliver_result)
+        self._error_ready.connect(self._deliver_error)
+
+    def cancel(self):
+        """Rezygnuje z wyniku zlecenia"""
+        self.cancelled = True
+
+    def _deliver_result(self, result):
+        if not self.cancelled:
+            self.finished.emit(result)
+        self.done.emit()
+
+    def _deliver_error(self, message):
+        if not self.cancelled:
+            self.failed.emit(message)
+        self.done.emit()
+
+
+class _DbTask(QRunnable):
+    """Wywołanie funkcji w wątku puli i przekazanie wyniku do DbRequest"""
+
+    def __init__(self, request, func, args, kwargs):
+        super().__init__()
+        self.request = request
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        request = self.request
+        if request.cancelled:
+            request._error_ready.emit("Anulowano")
+            return
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            print(f"Błąd zapytania w tle ({request.description}): {e}")
+            import traceback
+            traceback.print_exc()
+            request._error_ready.emit(str(e))
+            return
+        request._result_ready.emit(result)
+
+
+class AsyncDatabase(QObject):
+    """Pula wątków wykonująca zapytania do jednej bazy"""
+
+    # Czy jakieś zlecenie czeka lub trwa (np. wskaźnik zajętości w oknie)
+    busy_changed = pyqtSignal(bool)
+
+    # Liczba wątków puli - WAL pozwala na równoległe odczyty, zapisy i tak są kolejkowane
+    MAX_THREADS = 2
+
+    # Rejestr według ścieżki bazy - widoki tej samej bazy dzielą pulę wątków
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_manager, max_threads=MAX_THREADS, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        # Wątki nie wygasają - ich połączenia z bazą są używane ponownie
+        self.thread_pool.setExpiryTimeout(-1)
+        self._pending = set()
+        self._latest = {}  # klucz -> ostatnie zlecenie submit_latest
+
+    @classmethod
+    def for_database(cls, db_manager):
+        """Zwraca współdzieloną instancję dla bazy db_manager (tworzoną w wątku GUI)"""
+        with cls._instances_lock:
+            instance = cls._instances.get(db_manager.db_path)
+            if instance is None:
+                instance = cls(db_manager)
+                cls._instances[db_manager.db_path] = instance
+            return instance
+
+    def submit(self, func, *args, on_result=None, on_error=None, **kwargs):
+        """Zleca wywołanie func(*args, **kwargs) w puli wątków
+
+        Args:
+            func: Funkcja do wykonania (np. metoda Database)
+            on_result: Funkcja wywoływana w wątku GUI z wynikiem
+            on_error: Funkcja wywoływana w wątku GUI z komunikatem błędu
+
+        Returns:
+            DbRequest - sygnały finished/failed, cancel()
+        """
+        request = DbRequest(getattr(func, '__name__', repr(func)), self)
+        if on_result is not None:
+            request.finished.connect(on_result)
+        if on_error is not None:
+            request.failed.connect(on_error)
+        request.done.connect(lambda: self._finish(request))
+
+        was_busy = bool(self._pending)
+        self._pending.add(request)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        self.thread_pool.start(_DbTask(request, func, args, kwargs))
+        return request
+
+    def submit_latest(self, key, func, *args, **kwargs):
+        """Jak submit(), ale anuluje poprzednie zlecenie z tym samym kluczem
+
+        Kolejne przeładowania widoku nie nadpiszą nowszych danych starszym
+        wynikiem, który przyszedł później.
+        """
+        previous = self._latest.get(key)
+        if previous is not None:
+            previous.cancel()
+        request = self.submit(func, *args, **kwargs)
+        self._latest[key] = request
+        return request
+
+    def is_busy(self):
+        """Czy jakieś zlecenie czeka lub trwa"""
+        return bool(self._pending)
+
+    def shutdown(self, timeout_ms=10000):
+        """Anuluje oczekujące zlecenia i czeka na zakończenie trwających
+
+        Wywoływane przed Database.close() - po zamknięciu połączeń żaden
+        wątek puli nie powinien już sięgać do bazy.
+        """
+        for request in list(self._pending):
+            request.cancel()
+        # Zlecenia usunięte z kolejki nie wyślą done - zapominamy je tutaj
+        self.thread_pool.clear()
+        finished = self.thread_pool.waitForDone(timeout_ms)
+        self._pending.clear()
+        self._latest.clear()
+        self.busy_changed.emit(False)
+        return finished
+
+    def _finish(self, request):
+        self._pending.discard(request)
+        for key, latest in list(self._latest.items()):
+            if latest is request:
+                del self._latest[key]
+        request.deleteLater()
+        if not self._pending:
+            self.busy_changed.emit(False)
@@ -0,0 +1,71 @@
+"""
+Wątki backupu bazy danych - kopiowanie poza wątkiem GUI z postępem
+"""
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class BackupExportWorker(QThread):
+    """Tworzy backup bazy (BackupManager.export_backup) w osobnym wątku"""
+
+    progress_changed = pyqtSignal(int)         # procent skopiowanych stron
+    backup_finished = pyqtSignal(bool, str)    # sukces, komunikat
+
+    def __init__(self, backup_manager, backup_path, parent=None):
+        super().__init__(parent)
+        self.backup_manager = backup_manager
+        self.backup_path = backup_path
+        self._cancelled = False
+
+    def cancel(self):
+        """Przerywa backup po bieżącym kroku (plik docelowy nie powstaje)"""
+        self._cancelled = True
+
+    def _report_progress(self, copied, total):
+        self.progress_changed.emit(int(copied * 100 / total) if total else 100)
+
+    def run(self):
+        try:
+            success, message = self.backup_manager.export_backup(
+                self.backup_path,
+                progress=self._report_progress,
+                should_cancel=lambda: self._cancelled,
+            )
+        except Exception as e:
+            print(f"Błąd backupu do {self.backup_path}: {e}")
+            import traceback
+            traceback.print_exc()
+            success, message = False, str(e)
+        self.backup_finished.emit(success, message)
+
+
+class BackupImportWorker(QThread):
+    """Sprawdza i importuje backup (BackupManager.import_backup) w osobnym wątku"""
+
+    progress_changed = pyqtSignal(int, str)    # procent, etap
+    import_finished = pyqtSignal(bool, str)    # sukces, komunikat
+
+    def __init__(self, backup_manager, backup_path, before_replace=None, parent=None):
+        super().__init__(parent)
+        self.backup_manager = backup_manager
+        self.backup_path = backup_path
+        self.before_replace = before_replace
+        self._cancelled = False
+
+    def cancel(self):
+        """Przerywa import przed podmianą pliku (aktualna baza pozostaje bez zmian)"""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            success, message = self.backup_manager.import_backup(
+                self.backup_path,
+                progress=self.progress_changed.emit,
+                should_cancel=lambda: self._cancelled,
+                before_replace=self.before_replace,
+            )
+        except Exception as e:
+            print(f"Błąd importu backupu z {self.backup_path}: {e}")
+            import traceback
+            traceback.print_exc()
+            success, message = False, str(e)
+        self.import_finished.emit(success, message)
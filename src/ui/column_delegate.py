@@ -9,10 +9,15 @@ from PyQt6.QtWidgets import (
     QCheckBox,
     QLineEdit,
     QStyleOptionViewItem,
+    QStyleOptionButton,
+    QStyle,
+    QApplication,
 )
-from PyQt6.QtCore import Qt, QDateTime, QDate
+from PyQt6.QtCore import Qt, QDateTime, QDate, QEvent, QSize, pyqtSignal
 from PyQt6.QtGui import QColor, QBrush
 
+from .tasks_table_model import CELL_KIND_ROLE, CELL_CHECKBOX, CELL_BUTTON, TASK_ID_ROLE
+
 
 class ColumnDelegate(QStyledItemDelegate):
     """Delegat obsługujący różne typy edytorów dla kolumn"""
@@ -110,7 +115,7 @@ class ColumnDelegate(QStyledItemDelegate):
                 return editor
                 
             elif column_type == "CheckBox":
-                # CheckBox jest już obsługiwany jako widget w komórce, nie jako delegat
+                # CheckBox jest malowany i przełączany przez TaskCellDelegate, bez edytora
                 return None
                 
             else:  # Tekstowa lub inne
@@ -238,3 +243,107 @@ class ColumnDelegate(QStyledItemDelegate):
         """Zwraca preferowany rozmiar dla komórki."""
         # Można tu dodać logikę dopasowującą rozmiar, jeśli jest potrzebna
         return super().sizeHint(option, index)
+
+
+class TaskCellDelegate(ColumnDelegate):
+    """Delegat tabeli zadań - maluje checkboxy i przyciski zamiast tworzyć widgety"""
+
+    # Kliknięcie przycisku w komórce: task_id, nazwa kolumny
+    button_clicked = pyqtSignal(int, str)
+
+    def __init__(self, parent=None, db_manager=None, theme_manager=None):
+        super().__init__(parent, db_manager, theme_manager)
+        self._pressed_cell = None  # (wiersz, kolumna) wciśniętego przycisku
+
+    def _style(self, option):
+        widget = option.widget
+        return widget.style() if widget is not None else QApplication.style()
+
+    def _paint_cell_background(self, painter, option, index):
+        """Maluje tło komórki (kolor z modelu lub zaznaczenie) bez tekstu"""
+        option_copy = QStyleOptionViewItem(option)
+        self.initStyleOption(option_copy, index)
+        option_copy.text = ""
+        option_copy.features &= ~QStyleOptionViewItem.ViewItemFeature.HasCheckIndicator
+
+        brush = option_copy.backgroundBrush
+        if brush.style() != Qt.BrushStyle.NoBrush:
+            painter.fillRect(option.rect, brush)
+            option_copy.backgroundBrush = QBrush(Qt.BrushStyle.NoBrush)
+
+        self._style(option).drawControl(QStyle.ControlElement.CE_ItemViewItem, option_copy, painter, option.widget)
+
+    def _checkbox_rect(self, option):
+        """Prostokąt wskaźnika checkboxa wyśrodkowany w komórce"""
+        style = self._style(option)
+        size = QSize(
+            style.pixelMetric(QStyle.PixelMetric.PM_IndicatorWidth, None, option.widget),
+            style.pixelMetric(QStyle.PixelMetric.PM_IndicatorHeight, None, option.widget)
+        )
+        return QStyle.alignedRect(option.direction, Qt.AlignmentFlag.AlignCenter, size, option.rect)
+
+    def paint(self, painter, option, index):
+        """Maluje checkbox/przycisk dla komórek specjalnych, resztę jak ColumnDelegate"""
+        kind = index.data(CELL_KIND_ROLE)
+        if kind is None:
+            super().paint(painter, option, index)
+            return
+
+        self._paint_cell_background(painter, option, index)
+        style = self._style(option)
+
+        button_option = QStyleOptionButton()
+        button_option.state = QStyle.StateFlag.State_Enabled
+
+        if kind == CELL_CHECKBOX:
+            checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+            button_option.rect = self._checkbox_rect(option)
+            button_option.state |= QStyle.StateFlag.State_On if checked else QStyle.StateFlag.State_Off
+            style.drawControl(QStyle.ControlElement.CE_CheckBox, button_option, painter, option.widget)
+        elif kind == CELL_BUTTON:
+            button_option.rect = option.rect.adjusted(2, 2, -2, -2)
+            button_option.text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+            if self._pressed_cell == (index.row(), index.column()):
+                button_option.state |= QStyle.StateFlag.State_Sunken
+            else:
+                button_option.state |= QStyle.StateFlag.State_Raised
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button_option, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        """Obsługuje kliknięcia w malowane checkboxy i przyciski"""
+        kind = index.data(CELL_KIND_ROLE)
+        if kind is None:
+            return super().editorEvent(event, model, option, index)
+
+        event_type = event.type()
+
+        if kind == CELL_CHECKBOX:
+            toggle = False
+            if event_type == QEvent.Type.MouseButtonRelease:
+                toggle = (event.button() == Qt.MouseButton.LeftButton
+                          and option.rect.contains(event.position().toPoint()))
+            elif event_type == QEvent.Type.KeyPress:
+                toggle = event.key() in (Qt.Key.Key_Space, Qt.Key.Key_Select)
+            elif event_type in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick):
+                return event.button() == Qt.MouseButton.LeftButton
+
+            if not toggle:
+                return False
+            checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+            new_state = Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked
+            return model.setData(index, new_state, Qt.ItemDataRole.CheckStateRole)
+
+        if kind == CELL_BUTTON:
+            if event_type in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick):
+                if event.button() != Qt.MouseButton.LeftButton:
+                    return False
+                self._pressed_cell = (index.row(), index.column())
+                return True
+            if event_type == QEvent.Type.MouseButtonRelease:
+                pressed = self._pressed_cell == (index.row(), index.column())
+                self._pressed_cell = None
+                if pressed and option.rect.contains(event.position().toPoint()):
+                    self.button_clicked.emit(index.data(TASK_ID_ROLE), model.headerData(index.column(), Qt.Orientation.Horizontal))
+                return True
+
+        return False
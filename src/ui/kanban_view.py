@@ -4,6 +4,8 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QColor
 
+from .async_db import AsyncDatabase
+
 
 class KanbanView(QWidget):
     """Widok Kanban z trzema kolumnami: Do wykonania, Realizowane, Zakończone"""
@@ -15,6 +17,8 @@ class KanbanView(QWidget):
     def __init__(self, db_manager, theme_manager):
         super().__init__()
         self.db_manager = db_manager
+        self.async_db = AsyncDatabase.for_database(db_manager)
+        self._load_request = None  # Ostatnie zlecone ładowanie zadań
         self.theme_manager = theme_manager
         self.tasks = []
         
@@ -68,6 +72,13 @@ class KanbanView(QWidget):
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         main_layout.addWidget(header)
         
+        # Stan ładowania - zadania pobiera w tle pula wątków AsyncDatabase
+        self.loading_label = QLabel("⏳ Ładowanie zadań...")
+        self.loading_label.setStyleSheet(self.theme_manager.get_label_style())
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.setVisible(False)
+        main_layout.addWidget(self.loading_label)
+        
         # Layout dla trzech kolumn
         self.columns_layout = QHBoxLayout()
         self.columns_layout.setSpacing(10)
@@ -291,27 +302,41 @@ class KanbanView(QWidget):
         return table
         
     def load_tasks(self):
-        """Ładuje zadania z flagą kanban=1 z bazy danych"""
+        """Ładuje zadania z flagą kanban=1 z bazy danych (zapytanie w tle)"""
+        try:
+            # Pobierz tylko zadania z flagą kanban=1 (filtr w SQLite po indeksie)
+            request = self.async_db.submit_latest(
+                ('kanban-tasks', id(self)), self.db_manager.get_tasks,
+                kanban=1, on_result=self.on_tasks_loaded,
+            )
+            request.done.connect(lambda: self.on_load_request_done(request))
+            self._load_request = request
+            self.loading_label.setVisible(True)
+        except Exception as e:
+            print(f"Błąd ładowania zadań Kanban: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def on_load_request_done(self, request):
+        """Ukrywa stan ładowania po ostatnim zleconym ładowaniu"""
+        if self._load_request is request:
+            self._load_request = None
+            self.loading_label.setVisible(False)
+    
+    def on_tasks_loaded(self, kanban_tasks):
+        """Wypełnia tablicę zadaniami pobranymi w tle"""
         try:
-            # Pobierz wszystkie zadania
-            all_tasks = self.db_manager.get_tasks()
-            
-            # Filtruj zadania które mają kanban=1
             self.tasks = []
-            for task in all_tasks:
-                # Sprawdź czy zadanie ma kolumnę kanban (index 10 po dodaniu)
+            for task in kanban_tasks:
                 # Struktura: (id, title, description, status, priority, category, due_date, note_id, created_at, updated_at, kanban)
-                kanban_flag = task[10] if len(task) > 10 else 0
-                
-                if kanban_flag == 1:
-                    task_dict = {
-                        'id': task[0],
-                        'title': task[1],
-                        'description': task[2] or '',
-                        'status': task[3],  # 'todo', 'in_progress', 'completed'
-                        'note_id': task[7] if len(task) > 7 else None
-                    }
-                    self.tasks.append(task_dict)
+                task_dict = {
+                    'id': task[0],
+                    'title': task[1],
+                    'description': task[2] or '',
+                    'status': task[3],  # 'todo', 'in_progress', 'completed'
+                    'note_id': task[7] if len(task) > 7 else None
+                }
+                self.tasks.append(task_dict)
             
             # Wypełnij tabele
             self.populate_tables()
@@ -410,10 +435,7 @@ class KanbanView(QWidget):
         """Przenosi zadanie do kolumny 'Realizowane'"""
         try:
             # Aktualizuj status w bazie danych
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE tasks SET status = ? WHERE id = ?', ('in_progress', task_id))
-                conn.commit()
+            self.db_manager.update_task(task_id, status='in_progress')
             
             # Wyemituj sygnał
             self.task_moved.emit(task_id, 'in_progress')
@@ -430,11 +452,8 @@ class KanbanView(QWidget):
             completed = (state == Qt.CheckState.Checked.value)
             
             # Aktualizuj status w bazie danych
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                new_status = 'completed' if completed else 'in_progress'
-                cursor.execute('UPDATE tasks SET status = ? WHERE id = ?', (new_status, task_id))
-                conn.commit()
+            new_status = 'completed' if completed else 'in_progress'
+            self.db_manager.update_task(task_id, status=new_status)
             
             # Wyemituj sygnał
             self.task_status_changed.emit(task_id, completed)
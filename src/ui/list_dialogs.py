@@ -11,10 +11,11 @@ from PyQt6.QtCore import Qt
 class ListDialog(QDialog):
     """Dialog do dodawania/edycji list słownikowych"""
     
-    def __init__(self, parent=None, list_data=None, theme_manager=None, context="table"):
+    def __init__(self, parent=None, list_data=None, theme_manager=None, context="table", db_manager=None):
         super().__init__(parent)
         self.list_data = list_data
         self.theme_manager = theme_manager
+        self.db_manager = db_manager
         self.context = context  # "table" dla list tabel, "task" dla list zadań
         self.is_edit_mode = list_data is not None
         
@@ -309,6 +310,16 @@ class ListDialog(QDialog):
         if 'case_sensitive' in self.list_data:
             self.case_sensitive_check.setChecked(bool(self.list_data['case_sensitive']))
     
+    def get_database(self):
+        """Zwraca bazę danych przekazaną przez okno główne (lub współdzieloną instancję)"""
+        if self.db_manager is None:
+            import sys
+            import os
+            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+            from database.db_manager import Database
+            self.db_manager = Database.for_path()
+        return self.db_manager
+    
     def save_list(self):
         """Zapisuje listę"""
         # Walidacja
@@ -340,12 +351,7 @@ class ListDialog(QDialog):
         
         # Zapisz konfigurację listy do bazy danych
         try:
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
-            db = Database()
+            db = self.get_database()
             
             if self.is_edit_mode and self.list_data:
                 # Tryb edycji - TODO: dodać metodę update_dictionary_list
@@ -1,25 +1,28 @@
 import sys
 import os
 import datetime
+from functools import partial
 import keyboard  # Do globalnych skrótów klawiszowych
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QTextEdit, QComboBox, 
                              QDateTimeEdit, QLabel, QFrame, QSplitter, QStackedWidget,
                              QTabWidget, QCheckBox, QSpinBox, QGroupBox, QGridLayout,
                              QTreeWidget, QTreeWidgetItem, QHeaderView, QDialog,
-                             QMessageBox, QTableWidget, QTableWidgetItem,
+                             QMessageBox, QTableWidget, QTableWidgetItem, QTableView,
                              QStyledItemDelegate, QDateEdit, QCalendarWidget,
                              QDoubleSpinBox, QFormLayout, QListWidget, QLineEdit,
                              QScrollArea, QInputDialog, QSizePolicy, QFileDialog, QSystemTrayIcon, QMenu)
-from PyQt6.QtCore import Qt, QDateTime, QDate, QTimer
+from PyQt6.QtCore import Qt, QDateTime, QDate, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon, QKeyEvent, QColor, QPalette, QKeySequence, QShortcut
 from .pomodoro_view import PomodoroView
 from .theme_manager import ThemeManager
 from .quick_task_dialog import QuickTaskDialog
+from .user_table_model import UserTableModel
+from .async_db import AsyncDatabase
 from src.utils.backup_manager import BackupManager
 
-class EditableTableWidget(QTableWidget):
-    """Rozszerzona QTableWidget z obsługą Enter dla dodawania rekordów"""
+class EditableTableView(QTableView):
+    """QTableView tabeli użytkownika z obsługą Enter dla dodawania rekordów"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -31,22 +34,20 @@ class EditableTableWidget(QTableWidget):
     
     def keyPressEvent(self, e: QKeyEvent | None):
         """Obsługuje naciśnięcia klawiszy"""
-        if e and (e.key() == Qt.Key.Key_Return or e.key() == Qt.Key.Key_Enter):
-            current_row = self.currentRow()
-            
-            # Jeśli to ostatni wiersz i jest wypełniony
-            if (self.main_window and current_row == self.rowCount() - 1 and 
-                self.main_window.is_row_filled(current_row)):
+        model = self.model()
+        if (e and (e.key() == Qt.Key.Key_Return or e.key() == Qt.Key.Key_Enter)
+                and self.state() != QTableView.State.EditingState
+                and isinstance(model, UserTableModel)):
+            current_row = self.currentIndex().row()
+            draft_row = model.draft_row()
+            
+            # Rekord dodany z pustego wiersza - przejdź do nowego pustego wiersza
+            if draft_row > 0 and current_row == draft_row - 1:
                 print("Zatwierdzono nowy rekord klawiszem Enter")
-                self.main_window.add_empty_row()
-                # Przejdź do nowego pustego wiersza
-                self.setCurrentCell(current_row + 1, 1)  # Ustaw kursor na kolumnie "Nazwa"
-            else:
-                # Domyślne zachowanie Enter
-                super().keyPressEvent(e)
-        else:
-            # Domyślne zachowanie dla innych klawiszy
-            super().keyPressEvent(e)
+                self.setCurrentIndex(model.index(draft_row, 1))  # Kolumna "Nazwa"
+                return
+        # Domyślne zachowanie Enter i pozostałych klawiszy
+        super().keyPressEvent(e)
 
 # Dodaj ścieżkę do modułów
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -212,10 +213,17 @@ class CurrencyDelegate(QStyledItemDelegate):
 
 
 class TaskManagerApp(QMainWindow):
+    # Stan kolejki zapisów tabel użytkownika (przekazywany z wątku zapisu)
+    table_save_state_changed = pyqtSignal(str, int)  # stan, liczba niezapisanych wierszy
+    
     def __init__(self):
         super().__init__()
-        self.db = Database()
+        self.db = Database.for_path()
         self.db_manager = self.db  # Alias dla kompatybilności
+        # Zapytania widoków wykonywane w puli wątków - zablokowana baza nie zamraża okna
+        self.async_db = AsyncDatabase.for_database(self.db)
+        # Checkpoint WAL w tle, gdy nic nie jest zapisywane
+        self.db.start_background_checkpoints()
         self.theme_manager = ThemeManager()  # Dodaj ThemeManager
         self.current_columns_config = []  # Przechowuje konfigurację kolumn aktualnej tabeli
         
@@ -345,6 +353,13 @@ class TaskManagerApp(QMainWindow):
         except Exception as e:
             print(f"Błąd podczas usuwania globalnych skrótów: {e}")
         
+        # Zatrzymaj automatyczne backupy i zapytania w tle przed zamknięciem bazy
+        self.stop_backup_scheduler()
+        self.async_db.shutdown()
+        
+        # Zamknij trwałe połączenia z bazą danych
+        self.db.close()
+
         self.tray_icon.hide()
         QApplication.quit()
     
@@ -375,21 +390,8 @@ class TaskManagerApp(QMainWindow):
     def load_quick_task_shortcut(self):
         """Wczytuje zapisany skrót klawiszowy z bazy danych"""
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT value 
-                FROM app_settings 
-                WHERE key = 'quick_task_shortcut'
-            """)
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result and result[0]:
-                return result[0]
-            else:
-                # Domyślny skrót
-                return "Ctrl+Shift+N"
+            # Pusta wartość w bazie oznacza skrót domyślny
+            return self.db_manager.settings.get('quick_task_shortcut') or "Ctrl+Shift+N"
         except Exception as e:
             print(f"Błąd wczytywania skrótu: {e}")
             return "Ctrl+Shift+N"
@@ -400,14 +402,7 @@ class TaskManagerApp(QMainWindow):
             # Pobierz wartość z QKeySequenceEdit
             new_shortcut = self.quick_task_shortcut.keySequence().toString()
             
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO app_settings (key, value)
-                VALUES ('quick_task_shortcut', ?)
-            """, (new_shortcut,))
-            conn.commit()
-            conn.close()
+            self.db_manager.settings.set('quick_task_shortcut', new_shortcut)
             
             # Zaktualizuj globalny skrót
             self.quick_task_shortcut_obj.setKey(QKeySequence(new_shortcut))
@@ -436,29 +431,14 @@ class TaskManagerApp(QMainWindow):
             )
     
     def refresh_tasks_after_quick_add(self):
-        """Odświeża widok zadań po dodaniu zadania przez quick dialog"""
-        if hasattr(self, 'tasks_view') and self.tasks_view:
-            self.tasks_view.load_tasks()
-            print("Odświeżono listę zadań po dodaniu przez quick dialog")
+        """Po dodaniu zadania przez quick dialog - wiersz dodaje TasksView ze zdarzenia bazy"""
+        print("Dodano zadanie przez quick dialog")
     
     def load_main_window_shortcut(self):
         """Wczytuje zapisany skrót wywołania głównego okna z bazy danych"""
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT value 
-                FROM app_settings 
-                WHERE key = 'main_window_shortcut'
-            """)
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result and result[0]:
-                return result[0]
-            else:
-                # Domyślny skrót
-                return "Ctrl+Shift+M"
+            # Pusta wartość w bazie oznacza skrót domyślny
+            return self.db_manager.settings.get('main_window_shortcut') or "Ctrl+Shift+M"
         except Exception as e:
             print(f"Błąd wczytywania skrótu głównego okna: {e}")
             return "Ctrl+Shift+M"
@@ -469,14 +449,7 @@ class TaskManagerApp(QMainWindow):
             # Pobierz wartość z QKeySequenceEdit
             new_shortcut = self.show_main_window_shortcut.keySequence().toString()
             
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO app_settings (key, value)
-                VALUES ('main_window_shortcut', ?)
-            """, (new_shortcut,))
-            conn.commit()
-            conn.close()
+            self.db_manager.settings.set('main_window_shortcut', new_shortcut)
             
             # Zaktualizuj globalny skrót jeśli istnieje
             if hasattr(self, 'show_main_window_shortcut_obj'):
@@ -495,14 +468,8 @@ class TaskManagerApp(QMainWindow):
         
         # Zapisz ustawienie
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO app_settings (key, value)
-                VALUES ('background_mode', ?)
-            """, (str(enabled),))
-            conn.commit()
-            conn.close()
+            # Zapis jako 'True'/'False' - w tej postaci ustawienie jest już w bazach użytkowników
+            self.db_manager.settings.set('background_mode', str(enabled))
             print(f"Tryb pracy w tle: {'włączony' if enabled else 'wyłączony'}")
         except Exception as e:
             print(f"Błąd zapisywania trybu pracy w tle: {e}")
@@ -517,18 +484,9 @@ class TaskManagerApp(QMainWindow):
     def load_background_mode_setting(self):
         """Wczytuje ustawienie pracy w tle z bazy danych"""
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT value 
-                FROM app_settings 
-                WHERE key = 'background_mode'
-            """)
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result and result[0]:
-                enabled = result[0].lower() == 'true'
+            value = self.db_manager.settings.get('background_mode')
+            if value:
+                enabled = value.lower() == 'true'
                 self.background_mode_check.setChecked(enabled)
                 self.show_main_window_shortcut.setEnabled(enabled)
                 
@@ -1131,10 +1089,7 @@ class TaskManagerApp(QMainWindow):
         """Tworzy zaawansowany widok zadań"""
         try:
             from .tasks_view import TasksView
-            from database.db_manager import Database
-            
-            db = Database()
-            self.tasks_view = TasksView(db, self.theme_manager)
+            self.tasks_view = TasksView(self.db_manager, self.theme_manager)
             self.stacked_widget.addWidget(self.tasks_view)
             
             # Połącz sygnały
@@ -1218,7 +1173,7 @@ class TaskManagerApp(QMainWindow):
             from .notes_view import NotesView
             
             # Utwórz nowy widok notatek z ThemeManager
-            self.notes_view = NotesView(self, self.theme_manager)
+            self.notes_view = NotesView(self, self.theme_manager, self.db_manager)
             
             # Podłącz sygnały
             self.notes_view.note_created.connect(self.on_note_created)
@@ -1264,17 +1219,30 @@ class TaskManagerApp(QMainWindow):
         # Usuń hardcoded style - zostanie ustawiony przez apply_theme_to_tables_view
         layout.addWidget(self.table_info_label)
         
+        # Stan zapisu edycji (edycje trafiają do bazy zbiorczo w tle)
+        self.table_save_label = QLabel("")
+        layout.addWidget(self.table_save_label)
+        self.table_save_state_changed.connect(self.on_table_save_state_changed)
+        self.db.table_edits.add_listener(self.table_save_state_changed.emit)
+        
         return panel
     
+    def on_table_save_state_changed(self, state, pending_count):
+        """Pokazuje stan zapisu edycji tabeli użytkownika"""
+        if state == 'unsaved':
+            text = f"● Niezapisane zmiany ({pending_count})"
+        elif state == 'saving':
+            text = f"Zapisywanie... ({pending_count})"
+        elif state == 'error':
+            text = f"⚠ Błąd zapisu - ponowię ({pending_count})"
+        else:
+            text = "✓ Zapisano"
+        self.table_save_label.setText(text)
+    
     def load_user_tables(self):
         """Ładuje tabele użytkownika z bazy danych"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
-            db = Database()
+            db = self.db
             user_tables = db.get_user_tables()
             
             # Wyczyść obecne opcje
@@ -1312,10 +1280,10 @@ class TaskManagerApp(QMainWindow):
             
             if table_data:
                 print(f"DEBUG: Otwieranie dialogu edycji dla tabeli: {table_data.get('name')}")
-                dialog = TableDialog(self, table_data, self.theme_manager)
+                dialog = TableDialog(self, table_data, self.theme_manager, self.db_manager)
             else:
                 print("DEBUG: Nie można pobrać danych tabeli, otwieranie pustego dialogu")
-                dialog = TableDialog(self, None, self.theme_manager)
+                dialog = TableDialog(self, None, self.theme_manager, self.db_manager)
                 
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 print("Konfiguracja tabeli została zaktualizowana")
@@ -1332,12 +1300,7 @@ class TaskManagerApp(QMainWindow):
     def get_table_data_for_editing(self, table_name):
         """Pobiera pełne dane tabeli dla trybu edycji"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
-            db = Database()
+            db = self.db
             user_tables = db.get_user_tables()
             
             # Znajdź tabelę o podanej nazwie
@@ -1357,17 +1320,23 @@ class TaskManagerApp(QMainWindow):
     
     def create_editable_data_table(self):
         """Tworzy edytowalną tabelę danych z pustym wierszem na końcu"""
-        from PyQt6.QtWidgets import QTableWidgetItem, QCheckBox, QWidget, QHBoxLayout
-        from PyQt6.QtCore import Qt
-        
-        table = EditableTableWidget()
+        table = EditableTableView()
         table.set_main_window(self)
-        table.setRowCount(6)  # 5 rekordów + 1 pusty wiersz
-        table.setColumnCount(6)
         
-        # Nagłówki kolumn (zgodnie z naszą konfiguracją)
+        # Model stronicowany - wiersze pobierane przy przewijaniu
+        self.user_table_model = UserTableModel(table)
+        self.user_table_model.async_db = self.async_db
+        self.user_table_model.row_edited.connect(self.on_table_row_edited)
+        self.user_table_model.loading_changed.connect(lambda loading: self.update_table_info_label())
+        self.user_table_model.load_failed.connect(lambda message: self.update_table_info_label())
+        table.setModel(self.user_table_model)
+        
+        # Kolumny przykładowe (zgodnie z naszą konfiguracją)
         headers = ["ID", "Nazwa projektu", "Data utworzenia", "Status", "Zakończone", "Priorytet"]
-        table.setHorizontalHeaderLabels(headers)
+        self.user_table_model.set_columns([
+            {'name': name, 'type': 'CheckBox' if col == 4 else 'Tekstowa', 'editable': col != 0}
+            for col, name in enumerate(headers)
+        ])
         
         # Przykładowe dane (5 rekordów)
         sample_data = [
@@ -1377,43 +1346,12 @@ class TaskManagerApp(QMainWindow):
             ["4", "Aplikacja mobilna", "2024-10-22", "W trakcie", False, "Niski"],
             ["5", "Dashboard analityczny", "2024-10-24", "Planowane", False, "Średni"],
         ]
-        
-        # Wypełnienie tabeli danymi
-        for row, row_data in enumerate(sample_data):
-            for col, value in enumerate(row_data):
-                if col == 4:  # Kolumna "Zakończone" (CheckBox)
-                    self.create_checkbox_cell(table, row, col, value)
-                else:
-                    # Zwykły edytowalny tekst
-                    item = QTableWidgetItem(str(value))
-                    if col == 0:  # ID - tylko do odczytu
-                        item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                    table.setItem(row, col, item)
-        
-        # Pusty wiersz na końcu (do dodawania nowych rekordów)
-        empty_row = len(sample_data)
-        base_color, alternate_color, _, text_color = self._get_table_theme_colors()
-        for col in range(table.columnCount()):
-            if col == 4:  # CheckBox
-                self.create_checkbox_cell(table, empty_row, col, False)
-            elif col == 0:  # Auto-generowane ID
-                next_id = str(len(sample_data) + 1)
-                item = QTableWidgetItem(next_id)
-                item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                item.setBackground(alternate_color)
-                table.setItem(empty_row, col, item)
-            else:
-                # Puste edytowalne pole z subtelnym podświetleniem
-                item = QTableWidgetItem("")
-                item.setBackground(base_color)
-                # Użyj koloru tekstu motywu, aby wyróżnić stan edycji
-                item.setForeground(text_color)
-                table.setItem(empty_row, col, item)
+        self.user_table_model.set_rows([dict(zip(headers, row_data)) for row_data in sample_data])
         
         # Ustawienia tabeli
         table.resizeColumnsToContents()
         table.setAlternatingRowColors(True)
-        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         
         # Rozciągnij tabelę na cały dostępny obszar
         header = table.horizontalHeader()
@@ -1434,52 +1372,15 @@ class TaskManagerApp(QMainWindow):
         # Zastosuj styl z theme managera zamiast hardcoded style
         table.setStyleSheet(self.theme_manager.get_table_style())
         
-        # Obsługa dodawania nowych rekordów
-        table.itemChanged.connect(self.on_table_item_changed)
-        
         # Przechowaj referencję do tabeli dla obsługi Enter
         self.current_data_table = table
         
         return table
     
-    def create_checkbox_cell(self, table, row, col, checked):
-        """Tworzy komórkę z CheckBox'em"""
-        # Walidacja typu - konwersja na bool
-        if isinstance(checked, str):
-            checked = checked.lower() in ('true', '1', 'yes', 'tak')
-        elif checked is None:
-            checked = False
-        else:
-            checked = bool(checked)
-        
-        # Utwórz widget z checkboxem
-        checkbox_widget = QWidget()
-        checkbox_layout = QHBoxLayout(checkbox_widget)
-        checkbox = QCheckBox()
-        checkbox.setChecked(checked)
-        self.configure_table_widget(checkbox)
-        checkbox.stateChanged.connect(lambda state, r=row: self.on_data_checkbox_changed(r, state))
-        checkbox_layout.addWidget(checkbox)
-        checkbox_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        checkbox_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Ustaw widget w komórce
-        table.setCellWidget(row, col, checkbox_widget)
-        
-        # Utwórz pustą komórkę i ustaw ją jako nieedytowalną żeby zapobiec pokazywaniu edytora tekstowego
-        item = QTableWidgetItem("")
-        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Wyłącz edycję
-        table.setItem(row, col, item)
-    
     def load_table_columns_config(self, table_name):
         """Ładuje konfigurację kolumn dla wybranej tabeli"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
-            db = Database()
+            db = self.db
             user_tables = db.get_user_tables()
             
             # Znajdź tabelę o podanej nazwie
@@ -1498,21 +1399,17 @@ class TaskManagerApp(QMainWindow):
             print(f"DEBUG: Ładowanie tabeli: {table_name}")
             
             try:
-                # Zapisz szerokości kolumn poprzedniej tabeli
+                # Zapisz szerokości kolumn i zaległe edycje poprzedniej tabeli
                 if hasattr(self, 'current_table_id') and self.current_table_id:
                     self.save_current_column_widths()
+                    self.db.table_edits.flush()
                 
                 # Znajdź ID tabeli
-                import sys
-                import os
-                sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-                from database.db_manager import Database
-                
-                db = Database()
-                conn = db.get_connection()
-                cursor = conn.cursor()
-                cursor.execute('SELECT id FROM user_tables WHERE name = ?', (table_name,))
-                result = cursor.fetchone()
+                db = self.db
+                with db.connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('SELECT id FROM user_tables WHERE name = ?', (table_name,))
+                    result = cursor.fetchone()
                 
                 if result:
                     self.current_table_id = result[0]
@@ -1573,12 +1470,8 @@ class TaskManagerApp(QMainWindow):
             self.clear_table()
             return
         
-        # Ustaw liczbę kolumn
-        self.main_data_table.setColumnCount(len(columns_config))
-        
-        # Ustaw nagłówki kolumn
-        headers = [col['name'] for col in columns_config]
-        self.main_data_table.setHorizontalHeaderLabels(headers)
+        # Ustaw kolumny i nagłówki modelu
+        self.user_table_model.set_columns(columns_config)
         
         # Zapisz konfigurację kolumn dla późniejszego użycia
         self.current_columns_config = columns_config
@@ -1589,9 +1482,6 @@ class TaskManagerApp(QMainWindow):
             self.main_data_table.setColumnHidden(col_index, not is_visible)
             print(f"DEBUG: Kolumna {col_index} ({col_config['name']}): visible={is_visible}")
         
-        # Wyczyść obecne dane
-        self.main_data_table.setRowCount(1)  # Jeden pusty wiersz na start
-        
         # Ustaw edytory komórek zgodnie z typami kolumn
         self.setup_column_editors()
         
@@ -1604,12 +1494,9 @@ class TaskManagerApp(QMainWindow):
         # Skonfiguruj śledzenie zmian szerokości kolumn
         self.setup_column_width_tracking()
         
-        # Załaduj dane z bazy
+        # Załaduj dane z bazy (pusty wiersz do edycji dodaje model)
         self.load_table_data_from_db()
         
-        # Dodaj pusty wiersz do edycji
-        self.add_empty_row()
-        
         print(f"DEBUG: Skonfigurowano tabelę z {len(columns_config)} kolumnami")
     
     def apply_table_styling(self, table, resize_columns=True):
@@ -1696,8 +1583,7 @@ class TaskManagerApp(QMainWindow):
     
     def clear_table(self):
         """Czyści tabelę"""
-        self.main_data_table.setRowCount(0)
-        self.main_data_table.setColumnCount(0)
+        self.user_table_model.clear()
         self.current_columns_config = []
     
     def setup_column_editors(self):
@@ -1727,8 +1613,8 @@ class TaskManagerApp(QMainWindow):
                     print(f"DEBUG: Ustawianie CurrencyDelegate dla kolumny {col_index}")
                     self.main_data_table.setItemDelegateForColumn(col_index, CurrencyDelegate(self))
                 elif col_type == 'CheckBox':
-                    # CheckBox jest już obsługiwany w create_checkbox_cell
-                    print(f"DEBUG: CheckBox dla kolumny {col_index} - obsługiwany przez create_checkbox_cell")
+                    # CheckBox maluje domyślny delegat na podstawie CheckStateRole modelu
+                    print(f"DEBUG: CheckBox dla kolumny {col_index} - obsługiwany przez model")
                     pass
                 else:
                     print(f"DEBUG: Standardowy edytor dla kolumny {col_index}")
@@ -1750,22 +1636,16 @@ class TaskManagerApp(QMainWindow):
                 print(f"DEBUG: Znaleziono dictionary_list_id: {list_id}")
                 
                 # Pobierz opcje z bazy danych
-                import sys
-                import os
-                sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-                from database.db_manager import Database
-                
-                db = Database()
-                conn = db.get_connection()
-                
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT value FROM dictionary_list_items 
-                    WHERE list_id = ? 
-                    ORDER BY order_index, value
-                """, (list_id,))
-                
-                options = [row[0] for row in cursor.fetchall()]
+                db = self.db
+                with db.connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        SELECT value FROM dictionary_list_items 
+                        WHERE list_id = ? 
+                        ORDER BY order_index, value
+                    """, (list_id,))
+                    
+                    options = [row[0] for row in cursor.fetchall()]
                 print(f"DEBUG: Znaleziono opcje: {options}")
                 return options if options else ["Brak opcji"]
             else:
@@ -1781,106 +1661,62 @@ class TaskManagerApp(QMainWindow):
             traceback.print_exc()
             return ["Błąd ładowania"]
     
-    def add_empty_row(self):
-        """Dodaje pusty wiersz do edycji z wartościami domyślnymi"""
-        if not hasattr(self, 'current_columns_config') or not self.current_columns_config:
-            return
-            
-        # Dodaj nowy wiersz
-        current_rows = self.main_data_table.rowCount()
-        self.main_data_table.setRowCount(current_rows + 1)
+    def on_table_row_edited(self, row):
+        """Obsługuje zmianę wiersza w modelu tabeli (komórka lub CheckBox)"""
+        model = self.user_table_model
         
-        row = current_rows  # Nowy wiersz
-        base_color, alternate_color, warning_color, text_color = self._get_table_theme_colors()
+        # Pusty wiersz do dodawania - zapis dopiero po wypełnieniu
+        if model.is_draft_row(row):
+            if model.is_row_filled(row):
+                print(f"Dodano nowy rekord w wierszu {row + 1}")
+                row_id = self.save_table_row(row)
+                model.commit_draft(row_id)
+                self.update_table_info_label()
+            return
         
-        for col_index, col_config in enumerate(self.current_columns_config):
-            col_type = col_config.get('type', 'Tekstowa')
-            default_value = col_config.get('default_value', '')
-            is_editable = col_config.get('editable', True)
-            
-            if col_type == 'CheckBox':
-                # CheckBox z wartością domyślną
-                default_checked = default_value.lower() in ('true', '1', 'yes', 'tak') if isinstance(default_value, str) else bool(default_value)
-                self.create_checkbox_cell(self.main_data_table, row, col_index, default_checked)
-            else:
-                # Zwykła komórka z wartością domyślną
-                item = QTableWidgetItem(str(default_value) if default_value else "")
-                item.setBackground(base_color)
-                
-                # Ustaw edytowalność
-                if not is_editable:
-                    item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                
-                self.main_data_table.setItem(row, col_index, item)
+        # Istniejący wiersz - zaktualizuj w bazie danych
+        self.save_table_row(row)
     
     def save_table_row(self, row):
-        """Zapisuje wiersz do bazy danych"""
+        """Zapisuje wiersz do bazy danych
+        
+        Returns:
+            int: Id wiersza w bazie lub None
+        """
         if not hasattr(self, 'current_table_id') or not self.current_table_id:
             print("DEBUG: Brak current_table_id, pomijam zapis")
-            return
+            return None
         
         if not hasattr(self, 'current_columns_config') or not self.current_columns_config:
             print("DEBUG: Brak current_columns_config, pomijam zapis")
-            return
+            return None
         
         try:
-            # Zbierz dane z wiersza
-            row_data = {}
-            
-            for col_index, col_config in enumerate(self.current_columns_config):
-                col_name = col_config['name']
-                col_type = col_config.get('type', 'Tekstowa')
-                
-                # Pobierz wartość z komórki
-                if col_type == 'CheckBox':
-                    # Dla CheckBox pobierz stan
-                    widget = self.main_data_table.cellWidget(row, col_index)
-                    if widget:
-                        checkbox = widget.findChild(QCheckBox)
-                        if checkbox:
-                            row_data[col_name] = 1 if checkbox.isChecked() else 0
-                        else:
-                            row_data[col_name] = 0
-                    else:
-                        row_data[col_name] = 0
-                else:
-                    # Dla innych typów pobierz tekst
-                    item = self.main_data_table.item(row, col_index)
-                    if item:
-                        value = item.text()
-                        # Konwersja wartości pustych na None
-                        row_data[col_name] = value if value else None
-                    else:
-                        row_data[col_name] = None
+            # Wartości wiersza trzyma model
+            row_data = self.user_table_model.row_values(row)
+            row_id = self.user_table_model.row_id(row)
             
             # Sprawdź czy wiersz ma już ID (czy istnieje w bazie)
-            if hasattr(self, 'table_row_ids') and row in self.table_row_ids:
-                # Aktualizuj istniejący wiersz
-                row_id = self.table_row_ids[row]
-                success = self.db_manager.update_table_row(self.current_table_id, row_id, row_data)
-                if success:
-                    print(f"DEBUG: Zaktualizowano wiersz {row} (ID {row_id})")
-                else:
-                    print(f"ERROR: Nie udało się zaktualizować wiersza {row}")
+            if row_id is not None:
+                # Istniejący wiersz - zmiana trafi do bazy zbiorczo w tle
+                self.db_manager.table_edits.stage_update(self.current_table_id, row_id, row_data)
             else:
                 # Wstaw nowy wiersz
                 row_id = self.db_manager.insert_table_row(self.current_table_id, row_data)
                 if row_id:
-                    # Zapisz ID wiersza
-                    if not hasattr(self, 'table_row_ids'):
-                        self.table_row_ids = {}
-                    self.table_row_ids[row] = row_id
                     print(f"DEBUG: Dodano nowy wiersz {row} (ID {row_id})")
                 else:
                     print(f"ERROR: Nie udało się dodać wiersza {row}")
+            return row_id
                     
         except Exception as e:
             print(f"ERROR podczas zapisywania wiersza {row}: {e}")
             import traceback
             traceback.print_exc()
+            return None
     
     def load_table_data_from_db(self):
-        """Ładuje dane z bazy danych do tabeli"""
+        """Ładuje dane z bazy danych do tabeli - od razu tylko pierwszą stronę wierszy"""
         if not hasattr(self, 'current_table_id') or not self.current_table_id:
             print("DEBUG: Brak current_table_id, pomijam ładowanie danych")
             return
@@ -1890,62 +1726,65 @@ class TaskManagerApp(QMainWindow):
             return
         
         try:
-            # Pobierz dane z bazy
-            rows = self.db_manager.get_table_rows(self.current_table_id)
-            print(f"DEBUG: Załadowano {len(rows)} wierszy z bazy danych")
-            
-            # Wyczyść mapowanie ID wierszy
-            self.table_row_ids = {}
-            
-            # Wyłącz tymczasowo sygnał itemChanged żeby uniknąć wielokrotnego zapisu
-            self.main_data_table.itemChanged.disconnect(self.on_table_item_changed)
-            
-            # Ustaw liczbę wierszy (dane + 1 pusty wiersz)
-            self.main_data_table.setRowCount(len(rows))
-            
-            # Wypełnij wiersze danymi
-            base_color, alternate_color, warning_color, text_color = self._get_table_theme_colors()
-            
-            for row_index, row_data in enumerate(rows):
-                # Zapisz ID wiersza
-                if '_row_id' in row_data:
-                    self.table_row_ids[row_index] = row_data['_row_id']
-                
-                # Wypełnij komórki
-                for col_index, col_config in enumerate(self.current_columns_config):
-                    col_name = col_config['name']
-                    col_type = col_config.get('type', 'Tekstowa')
-                    value = row_data.get(col_name, '')
-                    
-                    if col_type == 'CheckBox':
-                        # Utwórz CheckBox
-                        is_checked = bool(value) if value else False
-                        self.create_checkbox_cell(self.main_data_table, row_index, col_index, is_checked)
-                    else:
-                        # Zwykła komórka
-                        item = QTableWidgetItem(str(value) if value is not None else "")
-                        
-                        # Ustaw edytowalność
-                        if not col_config.get('editable', True):
-                            item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                        
-                        self.main_data_table.setItem(row_index, col_index, item)
-            
-            # Przywróć sygnał itemChanged
-            self.main_data_table.itemChanged.connect(self.on_table_item_changed)
-            
-            print(f"DEBUG: Załadowano dane do tabeli")
+            table_id = self.current_table_id
+            
+            # Rozmiar strony i budżet pamięci (0 = bez limitu) z ustawień aplikacji
+            settings = self.db_manager.settings
+            batch_size = settings.get_int('user_table_batch_size', UserTableModel.FETCH_BATCH_SIZE)
+            max_cached_rows = settings.get_int('user_table_max_cached_rows', UserTableModel.MAX_CACHED_ROWS)
+            self.user_table_model.set_paging(batch_size, max_cached_rows or None)
+            
+            # Kolejne strony model pobierze przy przewijaniu (fetchMore), a strony
+            # zwolnione z pamięci - ponownie, gdy widok do nich wróci. Błąd zapytania
+            # trafia do modelu (load_failed), który ponawia pobranie strony
+            def fetch_page(offset, limit):
+                rows = list(self.db_manager.iter_table_rows(table_id, offset=offset, limit=limit))
+                # Strona pobrana ponownie musi pokazać edycje czekające na zapis
+                return self.db_manager.table_edits.apply_pending(table_id, rows)
+            
+            def on_counted(total):
+                if getattr(self, 'current_table_id', None) != table_id:
+                    return  # W międzyczasie otwarto inną tabelę
+                self.user_table_model.set_source(fetch_page, total)
+                print(f"DEBUG: Tabela ma {total} wierszy w bazie danych")
+                self.update_table_info_label()
+            
+            def on_count_failed(message):
+                if getattr(self, 'current_table_id', None) != table_id:
+                    return
+                # Tabela nie jest pokazywana jako pusta - model czeka na źródło do ponowienia
+                seconds = UserTableModel.LOAD_RETRY_MS // 1000
+                if hasattr(self, 'table_info_label'):
+                    self.table_info_label.setText(f"⚠ Błąd ładowania tabeli - ponowienie za {seconds} s")
+                QTimer.singleShot(UserTableModel.LOAD_RETRY_MS, retry_load)
+            
+            def retry_load():
+                if getattr(self, 'current_table_id', None) == table_id:
+                    self.load_table_data_from_db()
+            
+            # Wiersze poprzedniej tabeli znikają od razu, liczba wierszy liczona jest w tle
+            self.user_table_model.begin_loading()
+            self.async_db.submit_latest(
+                'user-table-count', self.db_manager.count_table_rows, table_id,
+                on_result=on_counted,
+                on_error=on_count_failed,
+            )
             
         except Exception as e:
             print(f"ERROR podczas ładowania danych z bazy: {e}")
             import traceback
             traceback.print_exc()
-            
-            # Przywróć sygnał w przypadku błędu
-            try:
-                self.main_data_table.itemChanged.connect(self.on_table_item_changed)
-            except:
-                pass
+    
+    def update_table_info_label(self):
+        """Aktualizuje etykietę z liczbą rekordów i kolumn tabeli"""
+        if hasattr(self, 'table_info_label'):
+            model = self.user_table_model
+            text = f"Rekordów: {model.total_count()} | Kolumn: {model.columnCount()}"
+            if model.load_error() is not None:
+                text += f" | ⚠ Błąd ładowania - ponowienie za {model.LOAD_RETRY_MS // 1000} s"
+            elif model.is_loading():
+                text += " | ⏳ Ładowanie..."
+            self.table_info_label.setText(text)
     
     def load_fallback_table_data(self, table_name):
         """Ładuje przykładowe dane gdy nie ma konfiguracji z bazy"""
@@ -1976,191 +1815,24 @@ class TaskManagerApp(QMainWindow):
         self.refresh_table_data(data)
         
         # Aktualizuj informacje o tabeli
-        if hasattr(self, 'table_info_label'):
-            self.table_info_label.setText(f"Rekordów: {len(data)} | Kolumn: {self.main_data_table.columnCount()}")
+        self.update_table_info_label()
     
     def refresh_table_data(self, data):
-        """Odświeża dane w tabeli z optymalizacjami wydajności"""
-        # Dla dużych zbiorów danych (>100 rekordów) używaj lazy loading
-        if len(data) > 100:
-            self.refresh_table_data_lazy(data)
-            return
-            
-        # Wyłącz sygnały podczas masowego wypełniania danych
-        self.main_data_table.blockSignals(True)
+        """Odświeża dane w tabeli (wiersze jako listy wartości w kolejności kolumn)"""
+        model = self.user_table_model
+        names = [model.column_name(col) for col in range(model.columnCount())]
         
-        try:
-            # Wyczyść obecne dane
-            self.main_data_table.setRowCount(len(data) + 1)  # +1 dla pustego wiersza
-            
-            # Batch creation of items - tworzymy wszystkie items naraz
-            items_to_set = []
-            base_color, alternate_color, warning_color, text_color = self._get_table_theme_colors()
-            
-            # Wypełnij danymi
-            for row, row_data in enumerate(data):
-                for col, value in enumerate(row_data):
-                    if col == 4:  # CheckBox
-                        self.create_checkbox_cell(self.main_data_table, row, col, value)
-                    else:
-                        item = QTableWidgetItem(str(value))
-                        if col == 0:  # ID - tylko do odczytu
-                            item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                        items_to_set.append((row, col, item))
-            
-            # Ustaw wszystkie items naraz
-            for row, col, item in items_to_set:
-                self.main_data_table.setItem(row, col, item)
-            
-            # Pusty wiersz na końcu
-            empty_row = len(data)
-            for col in range(self.main_data_table.columnCount()):
-                if col == 4:  # CheckBox
-                    self.create_checkbox_cell(self.main_data_table, empty_row, col, False)
-                elif col == 0:  # Auto-generowane ID
-                    next_id = str(len(data) + 1)
-                    item = QTableWidgetItem(next_id)
-                    item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                    item.setBackground(alternate_color)
-                    self.main_data_table.setItem(empty_row, col, item)
-                else:
-                    # Puste edytowalne pole z białym tłem
-                    item = QTableWidgetItem("")
-                    item.setBackground(base_color)
-                    self.main_data_table.setItem(empty_row, col, item)
-            
-        finally:
-            # Zawsze włącz z powrotem sygnały
-            self.main_data_table.blockSignals(False)
+        # Model udostępnia widokowi wiersze stronami - bez tworzenia komórek dla całych danych
+        model.set_rows([dict(zip(names, row_data)) for row_data in data])
         
-        # Wykonaj operacje wymagające sygnałów na końcu
         self.main_data_table.resizeColumnsToContents()
         
         # Zastosuj styling tylko raz na końcu bez dodatkowego resize
         self.apply_table_styling(self.main_data_table, resize_columns=False)
     
-    def refresh_table_data_lazy(self, data):
-        """Lazy loading dla dużych zbiorów danych - ładuje tylko pierwszych 50 wierszy"""
-        print(f"DEBUG: Używanie lazy loading dla {len(data)} rekordów")
-        
-        # Załaduj tylko pierwsze 50 rekordów
-        visible_data = data[:50]
-        self.all_data = data  # Zachowaj wszystkie dane
-        
-        # Wyłącz sygnały
-        self.main_data_table.blockSignals(True)
-        
-        try:
-            # Ustaw liczbę wierszy na wszystkie dane + pusty wiersz + wiersz "Załaduj więcej"
-            self.main_data_table.setRowCount(len(visible_data) + 2)
-            base_color, alternate_color, warning_color, text_color = self._get_table_theme_colors()
-            
-            # Wypełnij widocznymi danymi
-            for row, row_data in enumerate(visible_data):
-                for col, value in enumerate(row_data):
-                    if col == 4:  # CheckBox
-                        self.create_checkbox_cell(self.main_data_table, row, col, value)
-                    else:
-                        item = QTableWidgetItem(str(value))
-                        if col == 0:  # ID - tylko do odczytu
-                            item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                        self.main_data_table.setItem(row, col, item)
-            
-            # Dodaj wiersz "Załaduj więcej..." jeśli są ukryte dane
-            if len(data) > 50:
-                load_more_row = len(visible_data)
-                load_more_item = QTableWidgetItem(f"--- Załaduj więcej ({len(data) - 50} ukrytych rekordów) ---")
-                load_more_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
-                load_more_item.setBackground(warning_color)
-                self.main_data_table.setItem(load_more_row, 1, load_more_item)
-            
-            # Pusty wiersz na końcu
-            empty_row = len(visible_data) + (1 if len(data) > 50 else 0)
-            for col in range(self.main_data_table.columnCount()):
-                if col == 4:  # CheckBox
-                    self.create_checkbox_cell(self.main_data_table, empty_row, col, False)
-                elif col == 0:  # Auto-generowane ID
-                    next_id = str(len(data) + 1)
-                    item = QTableWidgetItem(next_id)
-                    item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                    item.setBackground(alternate_color)
-                    self.main_data_table.setItem(empty_row, col, item)
-                else:
-                    # Puste edytowalne pole z białym tłem
-                    item = QTableWidgetItem("")
-                    item.setBackground(base_color)
-                    self.main_data_table.setItem(empty_row, col, item)
-                    
-        finally:
-            self.main_data_table.blockSignals(False)
-        
-        self.main_data_table.resizeColumnsToContents()
-        self.apply_table_styling(self.main_data_table, resize_columns=False)
-    
-    def on_table_item_changed(self, item):
-        """Obsługuje zmianę zawartości komórki"""
-        if not hasattr(self, 'current_table_id') or not self.current_table_id:
-            return
-        
-        row = item.row()
-        col = item.column()
-        
-        # Jeśli to ostatni wiersz (pusty wiersz do dodawania)
-        if row == self.main_data_table.rowCount() - 1:
-            # Sprawdź czy wiersz został wypełniony
-            if self.is_row_filled(row):
-                print(f"Dodano nowy rekord w wierszu {row + 1}")
-                
-                # Zapisz nowy wiersz do bazy danych
-                self.save_table_row(row)
-                
-                # Dodaj kolejny pusty wiersz
-                self.add_empty_row()
-        else:
-            # Istniejący wiersz - zaktualizuj w bazie danych
-            self.save_table_row(row)
-    
     def is_row_filled(self, row):
-        """Sprawdza czy wiersz jest wypełniony - sprawdza pierwszą edytowalną kolumnę"""
-        if not hasattr(self, 'current_columns_config') or not self.current_columns_config:
-            return False
-        
-        # Znajdź pierwszą edytowalną kolumnę tekstową
-        for col_index, col_config in enumerate(self.current_columns_config):
-            if col_config.get('editable', True) and col_config.get('type', 'Tekstowa') == 'Tekstowa':
-                item = self.main_data_table.item(row, col_index)
-                if item and item.text().strip() != "":
-                    return True
-        
-        return False
-    
-    def on_data_checkbox_changed(self, row, state):
-        """Obsługuje zmianę stanu CheckBox'a w tabeli danych"""
-        is_checked = state == 2  # Qt.CheckState.Checked
-        
-        # Bezpieczne pobranie nazwy z tabeli
-        if hasattr(self, 'current_columns_config') and self.current_columns_config:
-            # Znajdź pierwszą kolumnę tekstową
-            item_name = None
-            for col_index, col_config in enumerate(self.current_columns_config):
-                if col_config.get('type') == 'Tekstowa':
-                    name_item = self.main_data_table.item(row, col_index)
-                    if name_item and name_item.text():
-                        item_name = name_item.text()
-                        break
-            
-            if not item_name:
-                item_name = f"Rekord {row + 1}"
-        else:
-            item_name = f"Rekord {row + 1}"
-        
-        status_text = "zakończony" if is_checked else "niezakończony"
-        print(f"'{item_name}' został oznaczony jako {status_text}")
-        
-        # Zapisz zmianę w bazie danych (jeśli to nie jest nowy wiersz)
-        if hasattr(self, 'current_table_id') and self.current_table_id:
-            if row < self.main_data_table.rowCount() - 1:  # Nie ostatni wiersz
-                self.save_table_row(row)
+        """Sprawdza czy wiersz jest wypełniony - sprawdza edytowalne kolumny tekstowe"""
+        return self.user_table_model.is_row_filled(row)
     
     def create_pomodoro_view(self):
         """Tworzy widok Pomodoro"""
@@ -2370,6 +2042,46 @@ class TaskManagerApp(QMainWindow):
         self.import_backup_btn.clicked.connect(self.import_database_backup)
         backup_layout.addWidget(self.import_backup_btn, 1, 1)
         
+        # Eksport danych do CSV / JSONL
+        self.export_tasks_btn = QPushButton("📄 Eksportuj zadania")
+        self.export_tasks_btn.clicked.connect(self.export_tasks_to_file)
+        backup_layout.addWidget(self.export_tasks_btn, 2, 0)
+        
+        self.export_notes_btn = QPushButton("📄 Eksportuj notatki")
+        self.export_notes_btn.clicked.connect(self.export_notes_to_file)
+        backup_layout.addWidget(self.export_notes_btn, 2, 1)
+        
+        # Automatyczne backupy (BackupScheduler) - interwał i rotacja kopii
+        auto_backup_layout = QHBoxLayout()
+        self.auto_backup_check = QCheckBox("Automatyczny backup co")
+        auto_backup_layout.addWidget(self.auto_backup_check)
+        self.auto_backup_interval_spin = QSpinBox()
+        self.auto_backup_interval_spin.setRange(1, 168)
+        self.auto_backup_interval_spin.setValue(1)
+        self.auto_backup_interval_spin.setSuffix(" h")
+        auto_backup_layout.addWidget(self.auto_backup_interval_spin)
+        auto_backup_layout.addStretch()
+        backup_layout.addLayout(auto_backup_layout, 3, 0, 1, 2)
+        
+        retention_layout = QHBoxLayout()
+        retention_layout.addWidget(QLabel("Zachowuj kopie:"))
+        self.auto_backup_keep_spins = {}
+        for key, label, default in (('hourly', "godzinowe", 24), ('daily', "dzienne", 7), ('weekly', "tygodniowe", 4)):
+            spin = QSpinBox()
+            spin.setRange(0, 365)
+            spin.setValue(default)
+            spin.setSuffix(f" {label}")
+            retention_layout.addWidget(spin)
+            self.auto_backup_keep_spins[key] = spin
+        retention_layout.addStretch()
+        backup_layout.addLayout(retention_layout, 4, 0, 1, 2)
+        
+        auto_backup_desc = QLabel("Kopie są kompresowane i zapisywane w katalogu backups obok bazy; "
+                                  "kopia jest pomijana, gdy baza nie zmieniła się od poprzedniej.")
+        auto_backup_desc.setWordWrap(True)
+        auto_backup_desc.setStyleSheet("color: gray; font-size: 9pt;")
+        backup_layout.addWidget(auto_backup_desc, 5, 0, 1, 2)
+        
         layout.addWidget(backup_group)
         
         # Przyciski akcji
@@ -2395,6 +2107,13 @@ class TaskManagerApp(QMainWindow):
         # Wczytaj stan checkboxa pracy w tle
         self.load_background_mode_setting()
         
+        # Wczytaj ustawienia automatycznych backupów (uruchamia harmonogram)
+        self.load_auto_backup_settings()
+        self.auto_backup_check.stateChanged.connect(self.save_auto_backup_settings)
+        self.auto_backup_interval_spin.valueChanged.connect(self.save_auto_backup_settings)
+        for spin in self.auto_backup_keep_spins.values():
+            spin.valueChanged.connect(self.save_auto_backup_settings)
+        
         # Wczytaj stan autostartu
         autostart_enabled = self.check_autostart_status()
         self.autostart_check.setChecked(autostart_enabled)
@@ -2475,6 +2194,9 @@ class TaskManagerApp(QMainWindow):
             # Usuń stare hardkodowane style i zastąp motywem
             self.table_info_label.setStyleSheet(self.theme_manager.get_label_style())
         
+        if hasattr(self, 'table_save_label'):
+            self.table_save_label.setStyleSheet(self.theme_manager.get_label_style())
+        
         # Znajdź i zaktualizuj wszystkie komponenty widoku tabel
         tables_widgets = []
         
@@ -2917,6 +2639,18 @@ class TaskManagerApp(QMainWindow):
         self.delete_table_btn.setEnabled(False)
         tables_buttons_layout.addWidget(self.delete_table_btn)
         
+        self.import_table_btn = QPushButton("Importuj CSV")
+        self.import_table_btn.clicked.connect(self.import_csv_to_selected_table)
+        self.import_table_btn.setEnabled(False)
+        self.import_table_btn.setToolTip("Wczytaj wiersze z pliku CSV (pierwszy wiersz - nazwy kolumn)")
+        tables_buttons_layout.addWidget(self.import_table_btn)
+        
+        self.export_table_btn = QPushButton("Eksportuj")
+        self.export_table_btn.clicked.connect(self.export_selected_table)
+        self.export_table_btn.setEnabled(False)
+        self.export_table_btn.setToolTip("Zapisz wiersze tabeli do pliku CSV lub JSON Lines")
+        tables_buttons_layout.addWidget(self.export_table_btn)
+        
         tables_buttons_layout.addStretch()
         tables_layout.addLayout(tables_buttons_layout)
         
@@ -2994,6 +2728,8 @@ class TaskManagerApp(QMainWindow):
         has_selection = bool(self.tables_tree.selectedItems())
         self.edit_table_btn.setEnabled(has_selection)
         self.delete_table_btn.setEnabled(has_selection)
+        self.import_table_btn.setEnabled(has_selection)
+        self.export_table_btn.setEnabled(has_selection)
     
     def on_list_selection_changed(self):
         """Obsługuje zmianę zaznaczenia w drzewie list"""
@@ -3006,7 +2742,7 @@ class TaskManagerApp(QMainWindow):
         """Dodaje nową tabelę"""
         from .table_dialogs import TableDialog
         
-        dialog = TableDialog(self, None, self.theme_manager)
+        dialog = TableDialog(self, None, self.theme_manager, self.db_manager)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             # TODO: Odśwież listę tabel
             print("Tabela została dodana")
@@ -3035,7 +2771,7 @@ class TaskManagerApp(QMainWindow):
                     
                     from .table_dialogs import TableDialog
                     
-                    dialog = TableDialog(self, table_data, self.theme_manager)
+                    dialog = TableDialog(self, table_data, self.theme_manager, self.db_manager)
                     if dialog.exec() == QDialog.DialogCode.Accepted:
                         print("Tabela została zaktualizowana")
                         self.refresh_tables_list()
@@ -3052,6 +2788,159 @@ class TaskManagerApp(QMainWindow):
                 traceback.print_exc()
                 QMessageBox.critical(self, "Błąd", f"Błąd podczas ładowania danych tabeli: {e}")
     
+    def import_csv_to_selected_table(self):
+        """Importuje plik CSV do wybranej tabeli w osobnym wątku z paskiem postępu"""
+        from PyQt6.QtWidgets import QProgressDialog
+        from .table_transfer import TableImportWorker
+        
+        selected_items = self.tables_tree.selectedItems()
+        if not selected_items:
+            return
+        item = selected_items[0]
+        try:
+            table_id = int(item.text(0))
+        except ValueError:
+            return
+        table_name = item.text(1)
+        
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            f"Import CSV do tabeli {table_name}",
+            "",
+            "Pliki CSV (*.csv *.txt);;Wszystkie pliki (*.*)"
+        )
+        if not file_path:
+            return
+        
+        progress_dialog = QProgressDialog(f"Importowanie do tabeli {table_name}...", "Przerwij", 0, 100, self)
+        progress_dialog.setWindowTitle("Import CSV")
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        
+        worker = TableImportWorker(self.db_manager, table_id, file_path, self)
+        progress_dialog.canceled.connect(worker.cancel)
+        
+        def on_progress(rows, percent):
+            progress_dialog.setValue(percent)
+            progress_dialog.setLabelText(f"Importowanie do tabeli {table_name}... ({rows} wierszy)")
+        
+        def on_finished(result):
+            progress_dialog.close()
+            message = f"Zaimportowano {result['rows']} wierszy do tabeli {table_name}."
+            if result['ignored_columns']:
+                message += f"\n\nPominięte kolumny pliku: {', '.join(result['ignored_columns'])}"
+            QMessageBox.information(self, "Import CSV", message)
+        
+        def on_failed(message):
+            progress_dialog.close()
+            QMessageBox.warning(self, "Import CSV", f"Import nie został dokończony:\n{message}")
+        
+        def on_thread_finished():
+            # Odśwież widok, jeśli importowano do otwartej tabeli
+            if getattr(self, 'current_table_id', None) == table_id:
+                self.load_table_data_from_db()
+            self._table_import_worker = None
+        
+        worker.progress_changed.connect(on_progress)
+        worker.import_finished.connect(on_finished)
+        worker.import_failed.connect(on_failed)
+        worker.finished.connect(on_thread_finished)
+        
+        # Referencja do wątku, żeby nie został usunięty w trakcie pracy
+        self._table_import_worker = worker
+        worker.start()
+    
+    def export_selected_table(self):
+        """Eksportuje wybraną tabelę do pliku CSV lub JSONL"""
+        selected_items = self.tables_tree.selectedItems()
+        if not selected_items:
+            return
+        item = selected_items[0]
+        try:
+            table_id = int(item.text(0))
+        except ValueError:
+            return
+        table_name = item.text(1)
+        self.run_data_export(
+            f"tabeli {table_name}", table_name,
+            lambda file_path, fmt: partial(self.db_manager.export_user_table, table_id, file_path, fmt)
+        )
+    
+    def export_tasks_to_file(self):
+        """Eksportuje zadania do pliku CSV lub JSONL"""
+        self.run_data_export(
+            "zadań", "zadania",
+            lambda file_path, fmt: partial(self.db_manager.export_tasks, file_path, fmt)
+        )
+    
+    def export_notes_to_file(self):
+        """Eksportuje notatki do pliku CSV lub JSONL"""
+        self.run_data_export(
+            "notatek", "notatki",
+            lambda file_path, fmt: partial(self.db_manager.export_notes, file_path, fmt)
+        )
+    
+    def run_data_export(self, subject, default_name, make_export):
+        """Pyta o plik i eksportuje dane w osobnym wątku z paskiem postępu
+        
+        Args:
+            subject: Opis danych w komunikatach (np. "tabeli Faktury")
+            default_name: Proponowana nazwa pliku (bez rozszerzenia)
+            make_export: Funkcja (ścieżka, format) -> wywołanie Database.export_*
+        """
+        from PyQt6.QtWidgets import QProgressDialog
+        from .table_transfer import TableExportWorker
+        
+        if getattr(self, '_table_export_worker', None) is not None:
+            QMessageBox.information(self, "Eksport", "Poprzedni eksport jeszcze trwa.")
+            return
+        
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            f"Eksport {subject}",
+            f"{default_name}.csv",
+            "CSV (*.csv);;JSON Lines (*.jsonl)"
+        )
+        if not file_path:
+            return
+        fmt = 'jsonl' if file_path.lower().endswith('.jsonl') or 'jsonl' in selected_filter else 'csv'
+        if not file_path.lower().endswith('.' + fmt):
+            file_path += '.' + fmt
+        
+        progress_dialog = QProgressDialog(f"Eksportowanie {subject}...", "Przerwij", 0, 100, self)
+        progress_dialog.setWindowTitle("Eksport")
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        
+        worker = TableExportWorker(self.db_manager, make_export(file_path, fmt), self)
+        progress_dialog.canceled.connect(worker.cancel)
+        
+        def on_progress(rows, percent):
+            progress_dialog.setValue(percent)
+            progress_dialog.setLabelText(f"Eksportowanie {subject}... ({rows} wierszy)")
+        
+        def on_finished(rows):
+            progress_dialog.close()
+            QMessageBox.information(self, "Eksport", f"Zapisano {rows} wierszy do pliku:\n{file_path}")
+        
+        def on_failed(message):
+            progress_dialog.close()
+            QMessageBox.warning(self, "Eksport", f"Eksport nie został dokończony:\n{message}")
+        
+        def on_thread_finished():
+            self._table_export_worker = None
+        
+        worker.progress_changed.connect(on_progress)
+        worker.export_finished.connect(on_finished)
+        worker.export_failed.connect(on_failed)
+        worker.finished.connect(on_thread_finished)
+        
+        # Referencja do wątku, żeby nie został usunięty w trakcie pracy
+        self._table_export_worker = worker
+        worker.start()
+    
     def delete_selected_table(self):
         """Usuwa wybraną tabelę"""
         selected_items = self.tables_tree.selectedItems()
@@ -3068,18 +2957,13 @@ class TaskManagerApp(QMainWindow):
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 try:
                     # Znajdź ID tabeli
-                    import sys
-                    import os
-                    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-                    from database.db_manager import Database
-                    
-                    db = Database()
-                    conn = db.get_connection()
-                    cursor = conn.cursor()
-                    
-                    # Pobierz ID tabeli
-                    cursor.execute('SELECT id FROM user_tables WHERE name = ?', (table_name,))
-                    result = cursor.fetchone()
+                    db = self.db
+                    with db.connection() as conn:
+                        cursor = conn.cursor()
+                        
+                        # Pobierz ID tabeli
+                        cursor.execute('SELECT id FROM user_tables WHERE name = ?', (table_name,))
+                        result = cursor.fetchone()
                     
                     print(f"DEBUG: Wyszukiwanie tabeli '{table_name}' w bazie: {result}")
                     
@@ -3116,7 +3000,7 @@ class TaskManagerApp(QMainWindow):
         """Dodaje nową listę słownikową"""
         from .list_dialogs import ListDialog
         
-        dialog = ListDialog(self, None, self.theme_manager)
+        dialog = ListDialog(self, None, self.theme_manager, db_manager=self.db_manager)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             # TODO: Odśwież listę list
             print("Lista została dodana")
@@ -3139,7 +3023,7 @@ class TaskManagerApp(QMainWindow):
                 
                 from .list_dialogs import ListDialog
                 
-                dialog = ListDialog(self, list_data, self.theme_manager, context="table")
+                dialog = ListDialog(self, list_data, self.theme_manager, context="table", db_manager=self.db_manager)
                 if dialog.exec() == QDialog.DialogCode.Accepted:
                     # TODO: Odśwież listę list
                     print("Lista została zaktualizowana")
@@ -3162,18 +3046,13 @@ class TaskManagerApp(QMainWindow):
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 try:
                     # Znajdź ID listy
-                    import sys
-                    import os
-                    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-                    from database.db_manager import Database
-                    
-                    db = Database()
-                    conn = db.get_connection()
-                    cursor = conn.cursor()
-                    
-                    # Pobierz ID listy
-                    cursor.execute('SELECT id FROM dictionary_lists WHERE name = ?', (list_name,))
-                    result = cursor.fetchone()
+                    db = self.db
+                    with db.connection() as conn:
+                        cursor = conn.cursor()
+                        
+                        # Pobierz ID listy
+                        cursor.execute('SELECT id FROM dictionary_lists WHERE name = ?', (list_name,))
+                        result = cursor.fetchone()
                     
                     if result:
                         list_id = result[0]
@@ -3208,17 +3087,12 @@ class TaskManagerApp(QMainWindow):
     def update_tables_tree(self):
         """Aktualizuje drzewo tabel"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
             # Debug: sprawdź bezpośrednio w bazie danych
-            db = Database()
+            db = self.db
             print(f"DEBUG: Używana ścieżka bazy danych: {db.db_path}")
             
             # Sprawdź bezpośrednio z bazy
-            with db.get_connection() as conn:
+            with db.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, name FROM user_tables ORDER BY name")
                 direct_tables = cursor.fetchall()
@@ -3256,12 +3130,7 @@ class TaskManagerApp(QMainWindow):
         """Odświeża listę list słownikowych"""
         print("DEBUG: Odświeżanie listy list słownikowych...")
         try:
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
-            db = Database()
+            db = self.db
             lists = db.get_dictionary_lists()
             print(f"DEBUG: Załadowano {len(lists)} list słownikowych")
             
@@ -3399,9 +3268,8 @@ class TaskManagerApp(QMainWindow):
         
         if view_id in view_mapping:
             self.stacked_widget.setCurrentIndex(view_mapping[view_id])
-            if view_id == "tasks":
-                self.refresh_tasks_list()
-            elif view_id == "kanban":
+            # Widok zadań jest aktualizowany na bieżąco zdarzeniami z bazy
+            if view_id == "kanban":
                 # Odśwież widok KanBan przy aktywacji zakładki
                 if hasattr(self, 'kanban_view') and self.kanban_view:
                     self.kanban_view.load_tasks()
@@ -3466,10 +3334,7 @@ class TaskManagerApp(QMainWindow):
                 if hasattr(self, 'kanban_checkbox'):
                     self.kanban_checkbox.setChecked(False)
                 
-                # Odśwież listę zadań jeśli jesteśmy w widoku zadań
-                if self.stacked_widget.currentIndex() == 0:
-                    self.refresh_tasks_list()
-                    
+                # Nowy wiersz wstawia TasksView po zdarzeniu z bazy
                 print(f"Dodano zadanie z ID: {task_id}")
             else:
                 print("Błąd podczas dodawania zadania")
@@ -3495,48 +3360,31 @@ class TaskManagerApp(QMainWindow):
             task_id = self.db.add_task(
                 title=task_data.get("title", ""),
                 description=description,
-                category=task_data.get("category", ""),
+                # Dla TAG - zapisz jako categorię jeśli nie ma kategorii
+                category=task_data.get("category") or task_data.get("tag", ""),
                 priority=task_data.get("priority", "medium"),
                 due_date=task_data.get("due_date", ""),
                 kanban=kanban_value
             )
             
             if task_id:
-                # Zapisz wartości niestandardowych kolumn (wszystkie kolumny użytkownika)
-                # Użyj bezpośredniego zapytania SQL do aktualizacji dodatkowych pól
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    
-                    # Dla TAG - zapisz jako categorię jeśli nie ma kategorii
-                    if task_data.get("tag") and not task_data.get("category"):
-                        cursor.execute('UPDATE tasks SET category = ? WHERE id = ?', 
-                                     (task_data.get("tag"), task_id))
-                    
-                    # Pobierz wszystkie kolumny użytkownika z bazy
-                    all_columns = self.db_manager.get_task_columns()
-                    standard_columns = {'ID', 'Data dodania', 'Status', 'Zadanie', 'Notatka', 
-                                       'Data realizacji', 'KanBan', 'Archiwum', 'TAG'}
-                    
-                    # Znajdź kolumny użytkownika które mają wartości w task_data
-                    user_column_values = []
-                    for col in all_columns:
-                        col_name = col['name']
-                        # Pomiń kolumny standardowe
-                        if col_name in standard_columns:
-                            continue
-                        # Sprawdź czy mamy wartość dla tej kolumny
-                        if col_name in task_data and task_data[col_name]:
-                            user_column_values.append(f"{col_name}: {task_data[col_name]}")
-                    
-                    # Zapisz wartości kolumn użytkownika w description jako metadata
-                    if user_column_values:
-                        # Dodaj metadata do description
-                        cursor.execute('SELECT description FROM tasks WHERE id = ?', (task_id,))
-                        current_desc = cursor.fetchone()[0] or ""
-                        new_desc = current_desc + "\n" + "\n".join(user_column_values) if current_desc else "\n".join(user_column_values)
-                        cursor.execute('UPDATE tasks SET description = ? WHERE id = ?', (new_desc, task_id))
-                    
-                    conn.commit()
+                # Zapisz wartości kolumn użytkownika w tabeli task_column_values
+                all_columns = self.db_manager.get_task_columns()
+                standard_columns = {'ID', 'Data dodania', 'Status', 'Zadanie', 'Notatka', 
+                                   'Data realizacji', 'KanBan', 'Archiwum', 'TAG'}
+                
+                user_column_values = {}
+                for col in all_columns:
+                    col_name = col['name']
+                    # Pomiń kolumny standardowe
+                    if col_name in standard_columns:
+                        continue
+                    # Sprawdź czy mamy wartość dla tej kolumny
+                    if col_name in task_data and task_data[col_name]:
+                        user_column_values[col['id']] = task_data[col_name]
+                
+                if user_column_values:
+                    self.db.set_task_column_values(task_id, user_column_values)
             
             return task_id
             
@@ -3599,9 +3447,7 @@ class TaskManagerApp(QMainWindow):
     def on_kanban_task_status_changed(self, task_id, completed):
         """Obsługuje zmianę statusu zadania w widoku KanBan"""
         try:
-            # Odśwież widok zadań jeśli jest aktywny
-            if hasattr(self, 'tasks_view') and self.tasks_view:
-                self.tasks_view.load_tasks()
+            # Wiersz w widoku zadań aktualizuje zdarzenie z bazy
             print(f"Zadanie {task_id} oznaczone jako {'zakończone' if completed else 'w trakcie'}")
         except Exception as e:
             print(f"Błąd zmiany statusu zadania: {e}")
@@ -3609,9 +3455,7 @@ class TaskManagerApp(QMainWindow):
     def on_kanban_task_moved(self, task_id, new_status):
         """Obsługuje przeniesienie zadania między kolumnami w KanBan"""
         try:
-            # Odśwież widok zadań jeśli jest aktywny
-            if hasattr(self, 'tasks_view') and self.tasks_view:
-                self.tasks_view.load_tasks()
+            # Wiersz w widoku zadań aktualizuje zdarzenie z bazy
             print(f"Zadanie {task_id} przeniesione do: {new_status}")
         except Exception as e:
             print(f"Błąd przenoszenia zadania: {e}")
@@ -3645,9 +3489,7 @@ class TaskManagerApp(QMainWindow):
     def handle_note_button_click(self, task_id):
         """Obsługuje kliknięcie przycisku notatki dla zadania"""
         try:
-            from database.db_manager import Database
-            
-            db = Database()
+            db = self.db
             
             # Pobierz dane zadania
             task = db.get_task(task_id)
@@ -3684,14 +3526,10 @@ class TaskManagerApp(QMainWindow):
                         # Odśwież drzewo notatek i wybierz nową notatkę
                         from PyQt6.QtCore import QTimer
                         def delayed_actions():
-                            self.notes_view.load_notes_from_database()
-                            self.notes_view.select_note_in_tree(new_note_id)
+                            # Notatki ładują się w tle - zaznaczenie po zbudowaniu drzewa
+                            self.notes_view.load_notes_from_database(select_note_id=new_note_id)
                         QTimer.singleShot(100, delayed_actions)
                     
-                    # Odśwież widok zadań aby zaktualizować ikony przycisków
-                    if hasattr(self, 'tasks_view') and self.tasks_view:
-                        self.tasks_view.load_tasks()
-                    
                     print(f"Utworzono notatkę {new_note_id} dla zadania {task_id}")
                 else:
                     print("Błąd podczas tworzenia notatki")
@@ -3716,95 +3554,97 @@ class TaskManagerApp(QMainWindow):
     def setup_test_data(self):
         """Tworzy testowe dane dla demonstracji funkcjonalności"""
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            
-            # Sprawdź czy istnieje tabela testowa z kolumnami Date i Lista
-            cursor.execute("""
-                SELECT COUNT(*) FROM user_tables 
-                WHERE name = 'Test_Delegaty'
-            """)
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            if cursor.fetchone()[0] == 0:
-                # Utwórz tabelę testową
+                # Sprawdź czy istnieje tabela testowa z kolumnami Date i Lista
                 cursor.execute("""
-                    INSERT INTO user_tables (name, description) 
-                    VALUES ('Test_Delegaty', 'Tabela testowa dla delegatów kolumn')
+                    SELECT COUNT(*) FROM user_tables 
+                    WHERE name = 'Test_Delegaty'
                 """)
+            
+                if cursor.fetchone()[0] == 0:
+                    # Utwórz tabelę testową
+                    cursor.execute("""
+                        INSERT INTO user_tables (name, description) 
+                        VALUES ('Test_Delegaty', 'Tabela testowa dla delegatów kolumn')
+                    """)
                 
-                table_id = cursor.lastrowid
+                    table_id = cursor.lastrowid
                 
-                # Dodaj kolumny różnych typów
-                test_columns = [
-                    ("ID", "Numeryczna", ""),
-                    ("Nazwa", "Tekstowa", ""),
-                    ("Data", "Data", ""),
-                    ("Status", "Lista", "status_options"),
-                    ("Aktywny", "CheckBox", ""),
-                    ("Priorytet", "Lista", "priority_options")
-                ]
+                    # Dodaj kolumny różnych typów
+                    test_columns = [
+                        ("ID", "Numeryczna", ""),
+                        ("Nazwa", "Tekstowa", ""),
+                        ("Data", "Data", ""),
+                        ("Status", "Lista", "status_options"),
+                        ("Aktywny", "CheckBox", ""),
+                        ("Priorytet", "Lista", "priority_options")
+                    ]
                 
-                for col_name, col_type, dict_list in test_columns:
-                    cursor.execute("""
-                        INSERT INTO user_table_columns 
-                        (table_id, name, type, dictionary_list, column_order) 
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (table_id, col_name, col_type, dict_list, len(test_columns)))
+                    for col_name, col_type, dict_list in test_columns:
+                        cursor.execute("""
+                            INSERT INTO user_table_columns 
+                            (table_id, name, type, dictionary_list, column_order) 
+                            VALUES (?, ?, ?, ?, ?)
+                        """, (table_id, col_name, col_type, dict_list, len(test_columns)))
                 
-                # Dodaj listy słownikowe
-                test_lists = [
-                    ("status_options", "Opcje statusu", ["Nowy", "W trakcie", "Gotowe", "Anulowany"]),
-                    ("priority_options", "Opcje priorytetu", ["Niski", "Średni", "Wysoki", "Krytyczny"])
-                ]
+                    # Dodaj listy słownikowe
+                    test_lists = [
+                        ("status_options", "Opcje statusu", ["Nowy", "W trakcie", "Gotowe", "Anulowany"]),
+                        ("priority_options", "Opcje priorytetu", ["Niski", "Średni", "Wysoki", "Krytyczny"])
+                    ]
                 
-                list_id_mapping = {}
+                    list_id_mapping = {}
                 
-                for list_name, description, options in test_lists:
-                    # Sprawdź czy lista już istnieje
-                    cursor.execute("""
-                        SELECT id FROM dictionary_lists WHERE name = ?
-                    """, (list_name,))
-                    
-                    existing = cursor.fetchone()
-                    if existing:
-                        list_id = existing[0]
-                    else:
-                        # Dodaj listę słownikową
+                    for list_name, description, options in test_lists:
+                        # Sprawdź czy lista już istnieje
                         cursor.execute("""
-                            INSERT INTO dictionary_lists (name, description, type) 
-                            VALUES (?, ?, 'static')
-                        """, (list_name, description))
-                        list_id = cursor.lastrowid
+                            SELECT id FROM dictionary_lists WHERE name = ?
+                        """, (list_name,))
                     
-                    list_id_mapping[list_name] = list_id
+                        existing = cursor.fetchone()
+                        if existing:
+                            list_id = existing[0]
+                        else:
+                            # Dodaj listę słownikową
+                            cursor.execute("""
+                                INSERT INTO dictionary_lists (name, description, type) 
+                                VALUES (?, ?, 'static')
+                            """, (list_name, description))
+                            list_id = cursor.lastrowid
                     
-                    # Usuń stare elementy listy
-                    cursor.execute("""
-                        DELETE FROM dictionary_list_items WHERE list_id = ?
-                    """, (list_id,))
+                        list_id_mapping[list_name] = list_id
                     
-                    # Dodaj elementy listy
-                    for index, option in enumerate(options):
+                        # Usuń stare elementy listy
                         cursor.execute("""
-                            INSERT INTO dictionary_list_items (list_id, value, order_index) 
-                            VALUES (?, ?, ?)
-                        """, (list_id, option, index))
+                            DELETE FROM dictionary_list_items WHERE list_id = ?
+                        """, (list_id,))
+                    
+                        # Dodaj elementy listy
+                        for index, option in enumerate(options):
+                            cursor.execute("""
+                                INSERT INTO dictionary_list_items (list_id, value, order_index) 
+                                VALUES (?, ?, ?)
+                            """, (list_id, option, index))
                 
-                # Zaktualizuj kolumny z ID list słownikowych
-                cursor.execute("""
-                    UPDATE user_table_columns 
-                    SET dictionary_list_id = ? 
-                    WHERE table_id = ? AND dictionary_list = 'status_options'
-                """, (list_id_mapping.get('status_options'), table_id))
+                    # Zaktualizuj kolumny z ID list słownikowych
+                    cursor.execute("""
+                        UPDATE user_table_columns 
+                        SET dictionary_list_id = ? 
+                        WHERE table_id = ? AND dictionary_list = 'status_options'
+                    """, (list_id_mapping.get('status_options'), table_id))
                 
-                cursor.execute("""
-                    UPDATE user_table_columns 
-                    SET dictionary_list_id = ? 
-                    WHERE table_id = ? AND dictionary_list = 'priority_options'
-                """, (list_id_mapping.get('priority_options'), table_id))
+                    cursor.execute("""
+                        UPDATE user_table_columns 
+                        SET dictionary_list_id = ? 
+                        WHERE table_id = ? AND dictionary_list = 'priority_options'
+                    """, (list_id_mapping.get('priority_options'), table_id))
                 
-                conn.commit()
-                print("DEBUG: Utworzono testową tabelę z delegatami")
+                    conn.commit()
+                    # Tabela, kolumny i listy dodane bezpośrednim SQL - cache metadanych nieaktualny
+                    self.db.invalidate_metadata('dictionary_lists', 'user_tables')
+                    print("DEBUG: Utworzono testową tabelę z delegatami")
                 
         except Exception as e:
             print(f"Błąd podczas tworzenia testowych danych: {e}")
@@ -3813,7 +3653,7 @@ class TaskManagerApp(QMainWindow):
         """Otwiera dialog tworzenia nowej tabeli"""
         from .table_dialogs import TableDialog
         
-        dialog = TableDialog(self, None, self.theme_manager)
+        dialog = TableDialog(self, None, self.theme_manager, self.db_manager)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             # Odśwież listę tabel
             self.load_user_tables()
@@ -3826,17 +3666,12 @@ class TaskManagerApp(QMainWindow):
             return
             
         try:
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
-            db = Database()
+            db = self.db
             saved_widths = db.get_column_widths(self.current_table_id)
             
             # Zastosuj zapisane szerokości
             for column_index, width in saved_widths.items():
-                if column_index < self.main_data_table.columnCount():
+                if column_index < self.user_table_model.columnCount():
                     self.main_data_table.setColumnWidth(column_index, width)
                     print(f"DEBUG: Przywrócono szerokość kolumny {column_index}: {width}px")
             
@@ -3849,18 +3684,13 @@ class TaskManagerApp(QMainWindow):
             return
             
         try:
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
             # Pobierz aktualne szerokości kolumn
             column_widths = []
-            for i in range(self.main_data_table.columnCount()):
+            for i in range(self.user_table_model.columnCount()):
                 width = self.main_data_table.columnWidth(i)
                 column_widths.append(width)
             
-            db = Database()
+            db = self.db
             db.save_column_widths(self.current_table_id, column_widths)
             
         except Exception as e:
@@ -4090,35 +3920,32 @@ class TaskManagerApp(QMainWindow):
     def load_task_tags(self):
         """Ładuje tagi z listy słownikowej 'Tagi zadań'"""
         try:
-            from database.db_manager import Database
-            db = Database()
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            
-            # Pobierz ID listy słownikowej dla kolumny TAG
-            cursor.execute("SELECT dictionary_list_id FROM task_columns WHERE name='TAG'")
-            result = cursor.fetchone()
-            
-            if not result or not result[0]:
-                print("UWAGA: Kolumna TAG nie ma przypisanej listy słownikowej!")
-                conn.close()
-                return
+            db = self.db
+            with db.connection() as conn:
+                cursor = conn.cursor()
             
-            tag_list_id = result[0]
-            print(f"DEBUG: Ładowanie tagów z listy słownikowej ID={tag_list_id}")
+                # Pobierz ID listy słownikowej dla kolumny TAG
+                cursor.execute("SELECT dictionary_list_id FROM task_columns WHERE name='TAG'")
+                result = cursor.fetchone()
+            
+                if not result or not result[0]:
+                    print("UWAGA: Kolumna TAG nie ma przypisanej listy słownikowej!")
+                    return
             
-            # Wyczyść istniejące tagi
-            self.tags_list.clear()
+                tag_list_id = result[0]
+                print(f"DEBUG: Ładowanie tagów z listy słownikowej ID={tag_list_id}")
             
-            # Pobierz tagi z listy słownikowej
-            cursor.execute("""
-                SELECT id, value FROM dictionary_list_items 
-                WHERE list_id = ? 
-                ORDER BY order_index
-            """, (tag_list_id,))
+                # Wyczyść istniejące tagi
+                self.tags_list.clear()
             
-            tags = cursor.fetchall()
-            conn.close()
+                # Pobierz tagi z listy słownikowej
+                cursor.execute("""
+                    SELECT id, value FROM dictionary_list_items 
+                    WHERE list_id = ? 
+                    ORDER BY order_index
+                """, (tag_list_id,))
+            
+                tags = cursor.fetchall()
             
             # Dodaj tagi do listy (z domyślnymi kolorami, bo lista słownikowa nie ma kolorów)
             default_colors = ['#e74c3c', '#f39c12', '#3498db', '#2ecc71', '#9b59b6', '#1abc9c', '#34495e']
@@ -4192,19 +4019,18 @@ class TaskManagerApp(QMainWindow):
     def load_task_settings(self):
         """Ładuje ustawienia zadań z bazy danych"""
         try:
-            # Archiwizacja
-            archive_enabled = self.db_manager.get_setting('task_archive_enabled', '0')
-            self.archive_completed_check.setChecked(archive_enabled == '1')
+            settings = self.db_manager.settings
             
-            archive_days = self.db_manager.get_setting('task_archive_days', '30')
-            self.archive_time_spin.setValue(int(archive_days))
+            # Archiwizacja
+            archive_enabled = settings.get_bool('task_archive_enabled')
+            self.archive_completed_check.setChecked(archive_enabled)
+            self.archive_time_spin.setValue(settings.get_int('task_archive_days', 30))
             
             # Automatyczne przenoszenie
-            auto_move = self.db_manager.get_setting('task_auto_move_completed', '0')
-            self.auto_move_completed_check.setChecked(auto_move == '1')
+            self.auto_move_completed_check.setChecked(settings.get_bool('task_auto_move_completed'))
             
             # Uruchom timer archiwizacji jeśli jest włączona
-            if archive_enabled == '1':
+            if archive_enabled:
                 self.start_archive_timer()
             
         except Exception as e:
@@ -4213,19 +4039,19 @@ class TaskManagerApp(QMainWindow):
     def save_task_settings(self):
         """Zapisuje ustawienia zadań do bazy danych"""
         try:
-            # Archiwizacja
-            archive_enabled = '1' if self.archive_completed_check.isChecked() else '0'
-            self.db_manager.set_setting('task_archive_enabled', archive_enabled)
+            archive_enabled = self.archive_completed_check.isChecked()
+            archive_days = self.archive_time_spin.value()
             
-            archive_days = str(self.archive_time_spin.value())
-            self.db_manager.set_setting('task_archive_days', archive_days)
-            
-            # Automatyczne przenoszenie
-            auto_move = '1' if self.auto_move_completed_check.isChecked() else '0'
-            self.db_manager.set_setting('task_auto_move_completed', auto_move)
+            # Jeden zapis do bazy dla wszystkich kluczy; widok zadań dostaje
+            # zmianę task_auto_move_completed przez szynę zdarzeń
+            self.db_manager.settings.update({
+                'task_archive_enabled': archive_enabled,
+                'task_archive_days': archive_days,
+                'task_auto_move_completed': self.auto_move_completed_check.isChecked(),
+            })
             
             # Restart timera archiwizacji
-            if archive_enabled == '1':
+            if archive_enabled:
                 self.start_archive_timer()
             else:
                 self.stop_archive_timer()
@@ -4258,38 +4084,16 @@ class TaskManagerApp(QMainWindow):
             if not self.archive_completed_check.isChecked():
                 return
             
-            days = self.archive_time_spin.value()
-            cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days)
+            def on_archived(archived_ids):
+                if archived_ids:
+                    print(f"Automatycznie zarchiwizowano {len(archived_ids)} zadań")
             
-            # Pobierz wszystkie ukończone zadania
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, updated_at FROM tasks 
-                    WHERE status = 'completed' AND archived = 0
-                ''')
-                tasks = cursor.fetchall()
-                
-                archived_count = 0
-                for task in tasks:
-                    task_id, updated_at_str = task
-                    # Parsuj datę
-                    try:
-                        updated_at = datetime.datetime.strptime(updated_at_str, "%Y-%m-%d %H:%M:%S")
-                        if updated_at < cutoff_date:
-                            # Archiwizuj zadanie
-                            cursor.execute('UPDATE tasks SET archived = 1 WHERE id = ?', (task_id,))
-                            archived_count += 1
-                    except:
-                        pass
-                
-                conn.commit()
-                
-                if archived_count > 0:
-                    print(f"Automatycznie zarchiwizowano {archived_count} zadań")
-                    # Odśwież widok zadań jeśli jest otwarty
-                    if hasattr(self, 'tasks_view') and self.tasks_view:
-                        self.tasks_view.load_tasks()
+            # Jedno UPDATE w bazie, w tle - widok zadań podmieni tylko zwrócone wiersze
+            # (Database publikuje zdarzenie zmiany dla zarchiwizowanych ID)
+            self.async_db.submit_latest(
+                'archive-completed', self.db_manager.archive_completed_tasks,
+                self.archive_time_spin.value(), on_result=on_archived,
+            )
                         
         except Exception as e:
             print(f"Błąd podczas automatycznej archiwizacji: {e}")
@@ -4305,35 +4109,33 @@ class TaskManagerApp(QMainWindow):
                 tag_data = dialog.get_tag_data()
                 
                 # Pobierz ID listy słownikowej dla kolumny TAG
-                from database.db_manager import Database
-                db = Database()
-                conn = db.get_connection()
-                cursor = conn.cursor()
+                db = self.db
+                with db.connection() as conn:
+                    cursor = conn.cursor()
                 
-                cursor.execute("SELECT dictionary_list_id FROM task_columns WHERE name='TAG'")
-                result = cursor.fetchone()
+                    cursor.execute("SELECT dictionary_list_id FROM task_columns WHERE name='TAG'")
+                    result = cursor.fetchone()
                 
-                if not result or not result[0]:
-                    QMessageBox.warning(self, "Błąd", "Kolumna TAG nie ma przypisanej listy słownikowej!")
-                    conn.close()
-                    return
+                    if not result or not result[0]:
+                        QMessageBox.warning(self, "Błąd", "Kolumna TAG nie ma przypisanej listy słownikowej!")
+                        return
                 
-                tag_list_id = result[0]
+                    tag_list_id = result[0]
                 
-                # Pobierz najwyższy order_index
-                cursor.execute("SELECT MAX(order_index) FROM dictionary_list_items WHERE list_id = ?", (tag_list_id,))
-                max_order = cursor.fetchone()[0]
-                next_order = (max_order or 0) + 1
+                    # Pobierz najwyższy order_index
+                    cursor.execute("SELECT MAX(order_index) FROM dictionary_list_items WHERE list_id = ?", (tag_list_id,))
+                    max_order = cursor.fetchone()[0]
+                    next_order = (max_order or 0) + 1
                 
-                # Dodaj tag do listy słownikowej
-                cursor.execute('''
-                    INSERT INTO dictionary_list_items (list_id, value, order_index) 
-                    VALUES (?, ?, ?)
-                ''', (tag_list_id, tag_data["name"], next_order))
+                    # Dodaj tag do listy słownikowej
+                    cursor.execute('''
+                        INSERT INTO dictionary_list_items (list_id, value, order_index) 
+                        VALUES (?, ?, ?)
+                    ''', (tag_list_id, tag_data["name"], next_order))
                 
-                conn.commit()
-                tag_id = cursor.lastrowid
-                conn.close()
+                    conn.commit()
+                    tag_id = cursor.lastrowid
+                db.invalidate_metadata('dictionary_lists')
                 
                 if tag_id:
                     # Dodaj tag do listy z ID
@@ -4372,25 +4174,22 @@ class TaskManagerApp(QMainWindow):
                 
                 # Zaktualizuj w bazie danych jeśli tag ma ID
                 if "id" in tag_data and tag_data["id"]:
-                    from database.db_manager import Database
-                    db = Database()
-                    conn = db.get_connection()
-                    cursor = conn.cursor()
+                    db = self.db
                     
                     try:
                         # Aktualizuj wartość w liście słownikowej
-                        cursor.execute('''
-                            UPDATE dictionary_list_items 
-                            SET value = ? 
-                            WHERE id = ?
-                        ''', (updated_data["name"], int(tag_data["id"])))
-                        conn.commit()
-                        conn.close()
+                        with db.connection() as conn:
+                            cursor = conn.cursor()
+                            cursor.execute('''
+                                UPDATE dictionary_list_items 
+                                SET value = ? 
+                                WHERE id = ?
+                            ''', (updated_data["name"], int(tag_data["id"])))
+                        db.invalidate_metadata('dictionary_lists')
                         updated_data["id"] = tag_data["id"]  # Zachowaj ID
                         print(f"Zaktualizowano tag ID={tag_data['id']} na '{updated_data['name']}'")
                     except Exception as e:
                         print(f"Błąd aktualizacji tagu: {e}")
-                        conn.close()
                 
                 # Zaktualizuj element na liście
                 current_item.setText(updated_data["name"])
@@ -4435,20 +4234,17 @@ class TaskManagerApp(QMainWindow):
                 # Usuń z bazy danych jeśli tag ma ID
                 tag_data = current_item.data(Qt.ItemDataRole.UserRole)
                 if tag_data and "id" in tag_data and tag_data["id"]:
-                    from database.db_manager import Database
-                    db = Database()
-                    conn = db.get_connection()
-                    cursor = conn.cursor()
+                    db = self.db
                     
                     try:
                         # Usuń z listy słownikowej
-                        cursor.execute('DELETE FROM dictionary_list_items WHERE id = ?', (int(tag_data["id"]),))
-                        conn.commit()
-                        conn.close()
+                        with db.connection() as conn:
+                            cursor = conn.cursor()
+                            cursor.execute('DELETE FROM dictionary_list_items WHERE id = ?', (int(tag_data["id"]),))
+                        db.invalidate_metadata('dictionary_lists')
                         print(f"Usunięto tag ID={tag_data['id']} ('{tag_name}') z listy słownikowej")
                     except Exception as e:
                         print(f"Błąd usuwania tagu: {e}")
-                        conn.close()
                 
                 # Usuń z listy UI
                 self.tags_list.takeItem(self.tags_list.row(current_item))
@@ -4466,7 +4262,7 @@ class TaskManagerApp(QMainWindow):
         """Dodaje nową listę zadań"""
         try:
             from .list_dialogs import ListDialog
-            dialog = ListDialog(self, theme_manager=self.theme_manager, context="task")
+            dialog = ListDialog(self, theme_manager=self.theme_manager, context="task", db_manager=self.db_manager)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 list_data = dialog.get_list_data()
                 
@@ -4498,7 +4294,7 @@ class TaskManagerApp(QMainWindow):
                 return
             
             from .list_dialogs import ListDialog
-            dialog = ListDialog(self, list_data=list_data, theme_manager=self.theme_manager, context="task")
+            dialog = ListDialog(self, list_data=list_data, theme_manager=self.theme_manager, context="task", db_manager=self.db_manager)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 updated_data = dialog.get_list_data()
                 
@@ -4931,8 +4727,78 @@ class TaskManagerApp(QMainWindow):
             import traceback
             traceback.print_exc()
     
+    def load_auto_backup_settings(self):
+        """Wczytuje ustawienia automatycznych backupów i uruchamia harmonogram"""
+        try:
+            settings = self.db_manager.settings
+            self.auto_backup_check.setChecked(settings.get_bool('auto_backup_enabled'))
+            self.auto_backup_interval_spin.setValue(settings.get_int('auto_backup_interval_hours', 1))
+            for key, spin in self.auto_backup_keep_spins.items():
+                spin.setValue(settings.get_int(f'auto_backup_keep_{key}', spin.value()))
+            self.restart_backup_scheduler()
+        except Exception as e:
+            print(f"Błąd ładowania ustawień automatycznego backupu: {e}")
+    
+    def save_auto_backup_settings(self):
+        """Zapisuje ustawienia automatycznych backupów i restartuje harmonogram"""
+        try:
+            values = {
+                'auto_backup_enabled': self.auto_backup_check.isChecked(),
+                'auto_backup_interval_hours': self.auto_backup_interval_spin.value(),
+            }
+            for key, spin in self.auto_backup_keep_spins.items():
+                values[f'auto_backup_keep_{key}'] = spin.value()
+            self.db_manager.settings.update(values)
+            self.restart_backup_scheduler()
+        except Exception as e:
+            print(f"Błąd zapisywania ustawień automatycznego backupu: {e}")
+    
+    def restart_backup_scheduler(self):
+        """Zatrzymuje bieżący harmonogram backupów i uruchamia nowy z aktualnymi ustawieniami"""
+        self.stop_backup_scheduler()
+        if not self.auto_backup_check.isChecked():
+            return
+        from src.utils.backup_scheduler import BackupScheduler
+        
+        self.backup_scheduler = BackupScheduler(
+            self.db_manager.db_path,
+            interval_hours=self.auto_backup_interval_spin.value(),
+            keep_hourly=self.auto_backup_keep_spins['hourly'].value(),
+            keep_daily=self.auto_backup_keep_spins['daily'].value(),
+            keep_weekly=self.auto_backup_keep_spins['weekly'].value(),
+        )
+        self.backup_scheduler.start()
+    
+    def stop_backup_scheduler(self):
+        """Zatrzymuje wątek automatycznych backupów"""
+        scheduler = getattr(self, 'backup_scheduler', None)
+        if scheduler is not None:
+            scheduler.stop()
+            self.backup_scheduler = None
+    
+    def close_database_for_import(self):
+        """Zatrzymuje dostęp do bazy i zamyka połączenia przed importem backupu
+        
+        Jak przy quit_application - wywoływane w wątku GUI, zanim wątek
+        importu podmieni plik bazy.
+        """
+        self.stop_backup_scheduler()
+        self.stop_archive_timer()
+        if hasattr(self, '_width_save_timer'):
+            self._width_save_timer.stop()
+        self.async_db.shutdown()
+        self.db.close()
+    
+    def reopen_database_after_import(self):
+        """Przywraca dostęp do bazy, gdy import się nie udał (baza bez zmian)"""
+        self.db.reopen()
+        self.db.start_background_checkpoints()
+        self.restart_backup_scheduler()
+        if self.archive_completed_check.isChecked():
+            self.start_archive_timer()
+    
     def export_database_backup(self):
-        """Eksportuje backup bazy danych"""
+        """Eksportuje backup bazy danych w osobnym wątku z paskiem postępu"""
         try:
             # Pobierz ścieżkę do bazy danych
             db_path = self.db_manager.db_path
@@ -4950,21 +4816,41 @@ class TaskManagerApp(QMainWindow):
             )
             
             if file_path:
-                # Eksportuj backup
-                success, message = backup_manager.export_backup(file_path)
+                from PyQt6.QtWidgets import QProgressDialog
+                from .backup_worker import BackupExportWorker
                 
-                if success:
-                    QMessageBox.information(
-                        self,
-                        "Sukces",
-                        f"Backup został pomyślnie wyeksportowany!\n\n{message}\n\nLokalizacja: {file_path}"
-                    )
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "Błąd",
-                        f"Nie udało się wyeksportować backupu:\n\n{message}"
-                    )
+                # Backup API kopiuje migawkę bazy - aplikacja działa dalej w trakcie kopiowania
+                progress_dialog = QProgressDialog("Tworzenie backupu bazy danych...", "Przerwij", 0, 100, self)
+                progress_dialog.setWindowTitle("Backup bazy danych")
+                progress_dialog.setMinimumDuration(500)
+                progress_dialog.setAutoClose(False)
+                progress_dialog.setAutoReset(False)
+                
+                worker = BackupExportWorker(backup_manager, file_path, self)
+                progress_dialog.canceled.connect(worker.cancel)
+                worker.progress_changed.connect(progress_dialog.setValue)
+                
+                def on_finished(success, message):
+                    progress_dialog.close()
+                    self._backup_worker = None
+                    if success:
+                        QMessageBox.information(
+                            self,
+                            "Sukces",
+                            f"Backup został pomyślnie wyeksportowany!\n\n{message}\n\nLokalizacja: {file_path}"
+                        )
+                    else:
+                        QMessageBox.warning(
+                            self,
+                            "Błąd",
+                            f"Nie udało się wyeksportować backupu:\n\n{message}"
+                        )
+                
+                worker.backup_finished.connect(on_finished)
+                
+                # Referencja do wątku, żeby nie został usunięty w trakcie pracy
+                self._backup_worker = worker
+                worker.start()
                     
         except Exception as e:
             QMessageBox.critical(
@@ -4997,36 +4883,73 @@ class TaskManagerApp(QMainWindow):
                 self,
                 "Importuj backup bazy danych",
                 "",
-                "Pliki bazy danych (*.db);;Wszystkie pliki (*.*)"
+                "Pliki bazy danych (*.db *.db.gz);;Wszystkie pliki (*.*)"
             )
             
             if file_path:
-                # Pobierz ścieżkę do bazy danych
-                db_path = self.db_manager.db_path
+                from PyQt6.QtWidgets import QProgressDialog
+                from .backup_worker import BackupImportWorker
                 
                 # Utwórz BackupManager
-                backup_manager = BackupManager(db_path)
+                backup_manager = BackupManager(self.db_manager.db_path)
                 
-                # Importuj backup (BackupManager sam tworzy automatyczny backup)
-                success, message = backup_manager.import_backup(file_path)
+                # Połączenia zamykane w wątku GUI przed startem wątku importu -
+                # zapytania w tle, backupy i timery nie sięgną już do bazy, a pula
+                # nie otworzy pliku ponownie do reopen_database_after_import()
+                self.close_database_for_import()
                 
-                if success:
-                    QMessageBox.information(
-                        self,
-                        "Sukces",
-                        f"{message}\n\n"
-                        "Aplikacja zostanie zamknięta. Uruchom ją ponownie, aby zobaczyć zaimportowane dane."
-                    )
-                    # Zamknij aplikację
-                    QApplication.quit()
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "Błąd",
-                        f"Nie udało się zaimportować backupu:\n\n{message}"
-                    )
+                progress_dialog = QProgressDialog("Sprawdzanie pliku backupu...", "Przerwij", 0, 100, self)
+                progress_dialog.setWindowTitle("Import backupu")
+                progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+                progress_dialog.setMinimumDuration(0)
+                progress_dialog.setAutoClose(False)
+                progress_dialog.setAutoReset(False)
+                
+                def ensure_database_closed():
+                    # Wywoływane w wątku importu tuż przed podmianą pliku
+                    if not self.db_manager.pool.is_closed():
+                        raise RuntimeError("Baza danych jest nadal otwarta - import przerwany")
+                
+                # BackupManager sam tworzy automatyczny backup aktualnej bazy
+                worker = BackupImportWorker(backup_manager, file_path, ensure_database_closed, self)
+                progress_dialog.canceled.connect(worker.cancel)
+                
+                def on_progress(percent, stage):
+                    progress_dialog.setLabelText(stage)
+                    progress_dialog.setValue(percent)
+                
+                def on_finished(success, message):
+                    progress_dialog.close()
+                    self._backup_worker = None
+                    if success:
+                        QMessageBox.information(
+                            self,
+                            "Sukces",
+                            f"{message}\n\n"
+                            "Aplikacja zostanie zamknięta. Uruchom ją ponownie, aby zobaczyć zaimportowane dane."
+                        )
+                        # Zamknij aplikację
+                        QApplication.quit()
+                    else:
+                        # Aktualna baza nie została zmieniona - aplikacja działa dalej
+                        self.reopen_database_after_import()
+                        QMessageBox.warning(
+                            self,
+                            "Błąd",
+                            f"Nie udało się zaimportować backupu:\n\n{message}"
+                        )
+                
+                worker.progress_changed.connect(on_progress)
+                worker.import_finished.connect(on_finished)
+                
+                # Referencja do wątku, żeby nie został usunięty w trakcie pracy
+                self._backup_worker = worker
+                worker.start()
                     
         except Exception as e:
+            # Import nie wystartował - baza nie została zmieniona
+            if self.db.pool.is_closed() and getattr(self, '_backup_worker', None) is None:
+                self.reopen_database_after_import()
             QMessageBox.critical(
                 self,
                 "Błąd",
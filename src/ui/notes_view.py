@@ -1,17 +1,19 @@
 import sys
 import os
 from datetime import datetime
+from functools import partial
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                             QLabel, QTextEdit, QTreeWidget, QTreeWidgetItem,
+                             QLabel, QTextEdit, QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator,
                              QSplitter, QFrame, QMessageBox, QInputDialog,
                              QToolBar, QApplication, QDialog, QDialogButtonBox,
                              QLineEdit, QFormLayout, QColorDialog)
-from PyQt6.QtCore import Qt, pyqtSignal, QUrl
+from PyQt6.QtCore import Qt, pyqtSignal, QUrl, QTimer
 from PyQt6.QtGui import QFont, QIcon, QTextCursor, QTextCharFormat, QColor, QAction
 
 # Import bazy danych
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from database.db_manager import Database
+from .async_db import AsyncDatabase
 
 
 class NoteDialog(QDialog):
@@ -72,17 +74,28 @@ class NotesView(QWidget):
     note_updated = pyqtSignal(dict)
     note_deleted = pyqtSignal(int)
     
-    def __init__(self, parent=None, theme_manager=None):
+    # Odstęp ponowienia ładowania drzewa po błędzie zapytania (np. zablokowana baza)
+    LOAD_RETRY_MS = 5000
+    
+    def __init__(self, parent=None, theme_manager=None, db_manager=None):
         super().__init__(parent)
         
         # ThemeManager
         self.theme_manager = theme_manager
         
-        # Inicjalizuj bazę danych
-        self.db = Database()
+        # Baza danych aplikacji (uruchomiony samodzielnie - współdzielona instancja)
+        self.db = db_manager if db_manager is not None else Database.for_path()
+        self.async_db = AsyncDatabase.for_database(self.db)
+        self._load_request = None  # Ostatnie zlecone ładowanie notatek
         
         # Stan aplikacji
-        self.notes_data = {}  # Cache notatek {id: data}
+        # Cache notatek {id: data} - tylko węzły pobrane do drzewa; 'content' jest None
+        # do pierwszego wyboru notatki, 'children' None do pierwszego rozwinięcia węzła
+        self.notes_data = {}
+        self.expanded_note_ids = set()  # Rozwinięte węzły (przywracane po przebudowie drzewa)
+        self._rebuilding_tree = False
+        self._load_retry_timer = None  # Ponowienie ładowania po błędzie zapytania
+        self._retry_select_note_id = None
         self.current_note_id = None
         
         self.init_ui()
@@ -317,6 +330,9 @@ class NotesView(QWidget):
         self.notes_tree = QTreeWidget()
         self.notes_tree.setHeaderLabel("Struktura notatek")
         self.notes_tree.itemClicked.connect(self.on_note_selected)
+        # Dzieci węzła pobierane dopiero przy jego rozwinięciu
+        self.notes_tree.itemExpanded.connect(self.on_item_expanded)
+        self.notes_tree.itemCollapsed.connect(self.on_item_collapsed)
         self.notes_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.notes_tree.customContextMenuRequested.connect(self.show_tree_context_menu)
         
@@ -430,44 +446,174 @@ class NotesView(QWidget):
         # Zastosuj motyw po inicjalizacji UI
         self.apply_theme()
     
-    def load_notes_from_database(self):
-        """Ładuje notatki z bazy danych"""
+    def load_notes_from_database(self, select_note_id=None):
+        """Ładuje notatki główne z bazy danych (zapytanie w tle, bez treści notatek)
+        
+        Args:
+            select_note_id: Notatka do zaznaczenia po zbudowaniu drzewa
+        """
+        request = self.async_db.submit_latest(
+            ('notes', id(self)), self.db.notes.get_children, None,
+            on_result=lambda rows: self.on_notes_loaded(rows, select_note_id),
+            on_error=lambda message: self.on_notes_load_failed(select_note_id),
+        )
+        request.done.connect(lambda: self.on_load_request_done(request))
+        self._load_request = request
+        self.notes_tree.setHeaderLabel("Struktura notatek (ładowanie...)")
+    
+    def on_load_request_done(self, request):
+        """Przywraca nagłówek drzewa po ostatnim zleconym ładowaniu"""
+        if self._load_request is request:
+            self._load_request = None
+            self.notes_tree.setHeaderLabel("Struktura notatek")
+    
+    def on_notes_load_failed(self, select_note_id=None):
+        """Błąd ładowania (np. baza zablokowana) - stan w nagłówku i ponowienie w tle
+        
+        Przykładowe notatki powstają tylko przy pustej bazie, nie po błędzie.
+        """
+        # done po błędzie nie przywróci zwykłego nagłówka
+        self._load_request = None
+        seconds = self.LOAD_RETRY_MS // 1000
+        self.notes_tree.setHeaderLabel(f"Struktura notatek (błąd ładowania - ponowienie za {seconds} s)")
+        if self._load_retry_timer is None:
+            self._load_retry_timer = QTimer(self)
+            self._load_retry_timer.setSingleShot(True)
+            self._load_retry_timer.timeout.connect(
+                lambda: self.load_notes_from_database(self._retry_select_note_id))
+        self._retry_select_note_id = select_note_id
+        self._load_retry_timer.start(self.LOAD_RETRY_MS)
+    
+    def on_notes_loaded(self, root_notes, select_note_id=None):
+        """Buduje drzewo z notatek głównych pobranych w tle"""
         try:
-            db_notes = self.db.get_all_notes()
-            
-            # Konwertuj format bazy na format aplikacji
-            self.notes_data = {}
-            
-            if not db_notes:
+            if not root_notes:
                 # Jeśli baza jest pusta, dodaj przykładowe notatki
                 self.create_sample_notes()
                 return
             
-            # Załaduj notatki z bazy
-            for note in db_notes:
-                self.notes_data[note['id']] = {
-                    'title': note['title'],
-                    'content': note['content'],
-                    'parent_id': note['parent_id'],
-                    'children': [],
-                    'color': '#2c3e50'  # Domyślny kolor
-                }
-            
-            # Buduj relacje dzieci
-            for note_id, note_data in self.notes_data.items():
-                if note_data['parent_id']:
-                    parent_id = note_data['parent_id']
-                    if parent_id in self.notes_data:
-                        if 'children' not in self.notes_data[parent_id]:
-                            self.notes_data[parent_id]['children'] = []
-                        self.notes_data[parent_id]['children'].append(note_id)
+            # Rozwinięte wcześniej węzły pobiorą dzieci ponownie przy przebudowie drzewa
+            previous = self.notes_data
+            self.notes_data = {}
+            self.cache_notes(root_notes, previous)
             
             self.refresh_tree()
-            print(f"Załadowano {len(self.notes_data)} notatek z bazy danych")
+            print(f"Załadowano {len(root_notes)} notatek głównych z bazy danych")
+            if select_note_id is not None:
+                self.select_note_in_tree(select_note_id)
             
         except Exception as e:
             print(f"Błąd ładowania notatek: {e}")
-            self.create_sample_notes()
+            import traceback
+            traceback.print_exc()
+    
+    def cache_notes(self, notes, previous=None):
+        """Dopisuje węzły z NotesRepository do cache, zachowując pobraną treść i kolor
+        
+        Args:
+            notes: Węzły z NotesRepository.get_children
+            previous: Poprzedni cache przy pełnym przeładowaniu - dzieci węzłów
+                są wtedy pobierane ponownie
+
+        Returns:
+            Lista ID notatek w kolejności z bazy
+        """
+        reloading = previous is not None
+        previous = self.notes_data if previous is None else previous
+        for note in notes:
+            cached = previous.get(note['id'], {})
+            if not note['has_children']:
+                children = []
+            else:
+                children = None if reloading else cached.get('children')
+            self.notes_data[note['id']] = {
+                'title': note['title'],
+                'content': cached.get('content'),
+                'parent_id': note['parent_id'],
+                'has_children': note['has_children'],
+                'children': children,
+                'color': cached.get('color', '#2c3e50')  # Domyślny kolor
+            }
+        return [note['id'] for note in notes]
+    
+    def cache_new_note(self, note_id, title, content, parent_id=None):
+        """Dodaje do cache notatkę utworzoną w widoku i dopisuje ją do dzieci rodzica"""
+        self.notes_data[note_id] = {
+            'title': title,
+            'content': content,
+            'parent_id': parent_id,
+            'has_children': False,
+            'children': [],
+            'color': '#2c3e50'  # Domyślny kolor
+        }
+        parent = self.notes_data.get(parent_id)
+        if parent is not None:
+            parent['has_children'] = True
+            # Niepobrane dzieci rodzica (None) zostaną pobrane z bazy razem z nową notatką
+            if parent['children'] is not None:
+                parent['children'].append(note_id)
+        return self.notes_data[note_id]
+    
+    def on_item_expanded(self, item):
+        """Pobiera w tle dzieci rozwiniętego węzła, jeśli nie ma ich jeszcze w cache"""
+        note_id = item.data(0, Qt.ItemDataRole.UserRole)
+        if note_id is None or self._rebuilding_tree:
+            return
+        self.expanded_note_ids.add(note_id)
+        note_data = self.notes_data.get(note_id)
+        if note_data is None or note_data['children'] is not None:
+            return
+        self.async_db.submit(
+            self.db.notes.get_children, note_id,
+            on_result=partial(self.on_children_loaded, note_id),
+        )
+    
+    def on_item_collapsed(self, item):
+        note_id = item.data(0, Qt.ItemDataRole.UserRole)
+        if note_id is not None and not self._rebuilding_tree:
+            self.expanded_note_ids.discard(note_id)
+    
+    def on_children_loaded(self, parent_id, children):
+        """Wstawia pod węzeł dzieci pobrane w tle"""
+        parent_data = self.notes_data.get(parent_id)
+        if parent_data is None:
+            return  # Węzeł usunięty w międzyczasie
+        parent_data['children'] = self.cache_notes(children)
+        parent_data['has_children'] = bool(children)
+        
+        item = self.find_tree_item(parent_id)
+        if item is None:
+            return
+        # Usuń wskaźnik "Ładowanie..." i dodaj dzieci
+        item.takeChildren()
+        self._rebuilding_tree = True
+        try:
+            for child_id in parent_data['children']:
+                self.add_note_to_tree(child_id, item)
+        finally:
+            self._rebuilding_tree = False
+        if not children:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
+        self.load_expanded_children()
+    
+    def load_expanded_children(self):
+        """Pobiera dzieci węzłów rozwiniętych przy przebudowie drzewa, których nie ma w cache"""
+        for note_id in list(self.expanded_note_ids):
+            note_data = self.notes_data.get(note_id)
+            if note_data is not None and note_data['children'] is None:
+                item = self.find_tree_item(note_id)
+                if item is not None:
+                    self.on_item_expanded(item)
+    
+    def find_tree_item(self, note_id):
+        """Zwraca element drzewa notatki lub None, gdy węzeł nie jest wczytany"""
+        iterator = QTreeWidgetItemIterator(self.notes_tree)
+        while iterator.value():
+            item = iterator.value()
+            if item.data(0, Qt.ItemDataRole.UserRole) == note_id:
+                return item
+            iterator += 1
+        return None
     
     def create_sample_notes(self):
         """Tworzy przykładowe notatki w bazie"""
@@ -492,18 +638,25 @@ class NotesView(QWidget):
             print(f"Błąd tworzenia przykładowych notatek: {e}")
     
     def refresh_tree(self):
-        """Odświeża drzewo notatek"""
-        self.notes_tree.clear()
-        
-        # Znajdź notatki główne (bez rodzica)
-        root_notes = [note_id for note_id, data in self.notes_data.items() 
-                     if data['parent_id'] is None]
+        """Odświeża drzewo notatek z cache (rozwinięte węzły pozostają rozwinięte)"""
+        self._rebuilding_tree = True
+        try:
+            self.notes_tree.clear()
+            
+            # Znajdź notatki główne (bez rodzica)
+            root_notes = [note_id for note_id, data in self.notes_data.items() 
+                         if data['parent_id'] is None]
+            
+            for note_id in root_notes:
+                self.add_note_to_tree(note_id, None)
+        finally:
+            self._rebuilding_tree = False
         
-        for note_id in root_notes:
-            self.add_note_to_tree(note_id, None)
+        # Rozwinięte węzły bez dzieci w cache (np. po ponownym wczytaniu) pobierają je teraz
+        self.load_expanded_children()
     
     def add_note_to_tree(self, note_id, parent_item):
-        """Dodaje notatkę do drzewa rekurencyjnie"""
+        """Dodaje notatkę do drzewa wraz z dziećmi, które są już w cache"""
         if note_id not in self.notes_data:
             return
         
@@ -519,8 +672,6 @@ class NotesView(QWidget):
         
         # Dodaj ikony i ustaw kolor w zależności od poziomu
         note_color = note_data.get('color', '#e3f2fd')  # Domyślny jasny niebieski
-        print(f"DEBUG: Ustawianie koloru dla notatki '{note_data['title']}': {note_color}")
-        color = QColor(note_color)
         
         if note_data['parent_id'] is None:
             # Główna notatka - bardziej wyrazista
@@ -535,7 +686,6 @@ class NotesView(QWidget):
             bg_color.setAlpha(255)  # Pełna nieprzezroczystość!
             item.setBackground(0, bg_color)
             item.setData(0, Qt.ItemDataRole.BackgroundRole, bg_color)  # Alternatywna metoda
-            print(f"DEBUG: Ustawiono kolor tła głównej notatki: {bg_color.name()}")
         else:
             # Podnotatka
             item.setText(0, f"📑 {note_data['title']}")
@@ -549,7 +699,6 @@ class NotesView(QWidget):
             bg_color.setAlpha(220)  # Prawie pełna nieprzezroczystość
             item.setBackground(0, bg_color)
             item.setData(0, Qt.ItemDataRole.BackgroundRole, bg_color)  # Alternatywna metoda
-            print(f"DEBUG: Ustawiono kolor tła podnotatki: {bg_color.name()}")
         
         # Pogrub wszystkie notatki dla lepszej widoczności
         font = item.font(0)
@@ -557,27 +706,72 @@ class NotesView(QWidget):
         font.setPointSize(12)  # Większa czcionka
         item.setFont(0, font)
         
-        # Dodaj dzieci rekurencyjnie
-        for child_id in note_data.get('children', []):
-            self.add_note_to_tree(child_id, item)
+        children = note_data['children']
+        if children is None:
+            # Dzieci jeszcze niepobrane - wskaźnik rozwinięcia i element zastępczy
+            if note_data['has_children']:
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+                QTreeWidgetItem(item, ["⏳ Ładowanie..."])
+        else:
+            for child_id in children:
+                self.add_note_to_tree(child_id, item)
         
-        item.setExpanded(True)
+        if note_id in self.expanded_note_ids:
+            item.setExpanded(True)
     
     def on_note_selected(self, item):
-        """Obsługuje wybór notatki z drzewa"""
+        """Obsługuje wybór notatki z drzewa - treść pobierana w tle przy pierwszym wyborze"""
         note_id = item.data(0, Qt.ItemDataRole.UserRole)
         if note_id and note_id in self.notes_data:
+            # Niezapisane zmiany poprzedniej notatki trafiają do bazy przed przełączeniem
+            if getattr(self, '_save_timer', None) is not None and self._save_timer.isActive():
+                self._save_timer.stop()
+                self.save_current_note_to_db()
+            
             self.current_note_id = note_id
             note_data = self.notes_data[note_id]
             
             # Zaktualizuj edytor
             self.editor_title.setText(note_data['title'])
-            self.text_editor.blockSignals(True)  # Zablokuj sygnał textChanged
-            self.text_editor.setPlainText(note_data['content'])
-            self.text_editor.blockSignals(False)
+            if note_data['content'] is None:
+                self.text_editor.blockSignals(True)
+                self.text_editor.setPlainText("")
+                self.text_editor.blockSignals(False)
+                self.text_editor.setPlaceholderText("Ładowanie treści...")
+                self.text_editor.setEnabled(False)
+                self.async_db.submit_latest(
+                    ('note-content', id(self)), self.db.notes.get_content, note_id,
+                    on_result=partial(self.on_content_loaded, note_id),
+                )
+                return
             
-            # Włącz edycję
-            self.text_editor.setEnabled(True)
+            self.show_note_content(note_data['content'])
+    
+    def on_content_loaded(self, note_id, content):
+        """Treść notatki pobrana w tle - pokazywana, jeśli notatka jest nadal wybrana"""
+        if note_id not in self.notes_data:
+            return
+        if self.notes_data[note_id]['content'] is None:
+            self.notes_data[note_id]['content'] = content or ''
+        if self.current_note_id == note_id:
+            self.show_note_content(self.notes_data[note_id]['content'])
+    
+    def show_note_content(self, content):
+        """Wstawia treść do edytora bez wyzwalania automatycznego zapisu"""
+        self.text_editor.blockSignals(True)  # Zablokuj sygnał textChanged
+        self.text_editor.setPlainText(content)
+        self.text_editor.blockSignals(False)
+        self.text_editor.setPlaceholderText("")
+        
+        # Włącz edycję
+        self.text_editor.setEnabled(True)
+    
+    def ensure_note_content(self, note_id):
+        """Zwraca treść notatki, pobierając ją z bazy, jeśli nie ma jej w cache"""
+        note_data = self.notes_data[note_id]
+        if note_data['content'] is None:
+            note_data['content'] = self.db.notes.get_content(note_id) or ''
+        return note_data['content']
     
     def on_text_changed(self):
         """Obsługuje zmiany tekstu - automatyczny zapis do bazy"""
@@ -602,6 +796,8 @@ class NotesView(QWidget):
         if self.current_note_id and self.current_note_id in self.notes_data:
             try:
                 note_data = self.notes_data[self.current_note_id]
+                if note_data['content'] is None:
+                    return  # Treść jeszcze niepobrana - nie ma czego zapisywać
                 self.db.update_note(
                     self.current_note_id,
                     title=note_data['title'],
@@ -628,12 +824,7 @@ class NotesView(QWidget):
                     note_id = self.db.add_note(data['title'], data['content'])
                     
                     # Dodaj do cache
-                    self.notes_data[note_id] = {
-                        'title': data['title'],
-                        'content': data['content'],
-                        'parent_id': None,
-                        'children': []
-                    }
+                    self.cache_new_note(note_id, data['title'], data['content'])
                     
                     self.refresh_tree()
                     self.note_created.emit(self.notes_data[note_id])
@@ -665,19 +856,8 @@ class NotesView(QWidget):
             # Zapisz do bazy
             note_id = self.db.add_note(title, selected_text, self.current_note_id)
             
-            # Dodaj do cache
-            self.notes_data[note_id] = {
-                'title': title,
-                'content': selected_text,
-                'parent_id': self.current_note_id,
-                'children': [],
-                'color': '#2c3e50'  # Domyślny kolor
-            }
-            
-            # Dodaj do dzieci rodzica
-            if 'children' not in self.notes_data[self.current_note_id]:
-                self.notes_data[self.current_note_id]['children'] = []
-            self.notes_data[self.current_note_id]['children'].append(note_id)
+            # Dodaj do cache i do dzieci rodzica
+            self.cache_new_note(note_id, title, selected_text, self.current_note_id)
             
             # Zamień zaznaczony tekst na link
             link_text = f"→ {title}"
@@ -699,26 +879,42 @@ class NotesView(QWidget):
             QMessageBox.warning(self, "Błąd", f"Nie udało się utworzyć notatki: {e}")
     
     def select_note_in_tree(self, note_id):
-        """Wybiera notatkę w drzewie"""
-        def find_item(item, target_id):
-            if item.data(0, Qt.ItemDataRole.UserRole) == target_id:
-                return item
-            
-            for i in range(item.childCount()):
-                child = item.child(i)
-                result = find_item(child, target_id)
-                if result:
-                    return result
-            return None
-        
-        # Szukaj w elementach głównych
-        for i in range(self.notes_tree.topLevelItemCount()):
-            item = self.notes_tree.topLevelItem(i)
-            found = find_item(item, note_id)
-            if found:
-                self.notes_tree.setCurrentItem(found)
-                self.on_note_selected(found)
-                break
+        """Wybiera notatkę w drzewie, w razie potrzeby pobierając w tle gałąź z jej przodkami"""
+        item = self.find_tree_item(note_id)
+        if item is not None:
+            self.expand_ancestors(item)
+            self.notes_tree.setCurrentItem(item)
+            self.on_note_selected(item)
+            return
+        
+        self.async_db.submit_latest(
+            ('note-branch', id(self)), self.db.notes.get_branch, note_id,
+            on_result=partial(self.on_branch_loaded, note_id),
+        )
+    
+    def on_branch_loaded(self, note_id, branch):
+        """Dopisuje do cache dzieci przodków notatki, rozwija je i wybiera notatkę"""
+        path, children = branch
+        if not path:
+            return  # Notatka usunięta w międzyczasie
+        for parent_id, rows in children.items():
+            ids = self.cache_notes(rows)
+            if parent_id is not None and parent_id in self.notes_data:
+                self.notes_data[parent_id]['children'] = ids
+        self.expanded_note_ids.update(path[:-1])
+        self.refresh_tree()
+        
+        item = self.find_tree_item(note_id)
+        if item is not None:
+            self.notes_tree.setCurrentItem(item)
+            self.on_note_selected(item)
+    
+    def expand_ancestors(self, item):
+        """Rozwija wszystkie węzły nad elementem"""
+        parent = item.parent()
+        while parent is not None:
+            parent.setExpanded(True)
+            parent = parent.parent()
     
     def show_tree_context_menu(self, position):
         """Pokazuje menu kontekstowe dla drzewa"""
@@ -787,7 +983,12 @@ class NotesView(QWidget):
             return
         
         note_data = self.notes_data[note_id]
-        dialog = NoteDialog(self, note_data['title'], note_data['content'], note_id)
+        try:
+            content = self.ensure_note_content(note_id)
+        except Exception as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się wczytać notatki: {e}")
+            return
+        dialog = NoteDialog(self, note_data['title'], content, note_id)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             data = dialog.get_data()
@@ -820,11 +1021,17 @@ class NotesView(QWidget):
         
         note_data = self.notes_data[note_id]
         
-        # Sprawdź czy ma dzieci
-        if note_data.get('children'):
+        try:
+            # Sprawdź czy ma dzieci (na wszystkich poziomach, także niewczytanych)
+            descendants = self.db.notes.count_descendants(note_id) if note_data['has_children'] else 0
+        except Exception as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się usunąć notatki: {e}")
+            return
+        
+        if descendants:
             reply = QMessageBox.question(
                 self, "Usuwanie notatki",
-                f"Notatka '{note_data['title']}' ma {len(note_data['children'])} podnotatek.\n"
+                f"Notatka '{note_data['title']}' ma {descendants} podnotatek.\n"
                 "Czy na pewno chcesz ją usunąć wraz z wszystkimi podnotatkami?",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
@@ -832,20 +1039,25 @@ class NotesView(QWidget):
                 return
         
         try:
-            # Usuń z bazy (CASCADE automatycznie usuwa podnotatki)
-            self.db.delete_note(note_id)
+            # Usuń z bazy całe poddrzewo
+            deleted_ids = self.db.delete_note(note_id)
             
             # Usuń z rodzica w cache
-            if note_data['parent_id'] and note_data['parent_id'] in self.notes_data:
-                parent = self.notes_data[note_data['parent_id']]
+            parent = self.notes_data.get(note_data['parent_id'])
+            if parent is not None and parent['children'] is not None:
                 if note_id in parent['children']:
                     parent['children'].remove(note_id)
+                parent['has_children'] = bool(parent['children'])
             
-            # Usuń z cache rekurencyjnie
-            self.delete_note_from_cache(note_id)
+            # Usuń z cache notatkę i wszystkich potomków
+            for deleted_id in deleted_ids:
+                self.notes_data.pop(deleted_id, None)
+                self.expanded_note_ids.discard(deleted_id)
             
-            # Wyczyść edytor jeśli usuwana notatka była wybrana
-            if self.current_note_id == note_id:
+            # Wyczyść edytor jeśli usuwana notatka (lub jej przodek) była wybrana
+            if self.current_note_id in deleted_ids:
+                if getattr(self, '_save_timer', None) is not None:
+                    self._save_timer.stop()
                 self.current_note_id = None
                 self.editor_title.setText("Wybierz notatkę")
                 self.text_editor.clear()
@@ -853,25 +1065,11 @@ class NotesView(QWidget):
             
             self.refresh_tree()
             self.note_deleted.emit(note_id)
-            print(f"Usunięto notatkę: {note_data['title']}")
+            print(f"Usunięto notatkę: {note_data['title']} (razem z podnotatkami: {len(deleted_ids)})")
             
         except Exception as e:
             QMessageBox.warning(self, "Błąd", f"Nie udało się usunąć notatki: {e}")
     
-    def delete_note_from_cache(self, note_id):
-        """Usuwa notatkę z cache rekurencyjnie"""
-        if note_id not in self.notes_data:
-            return
-        
-        note_data = self.notes_data[note_id]
-        
-        # Usuń dzieci
-        for child_id in note_data.get('children', []):
-            self.delete_note_from_cache(child_id)
-        
-        # Usuń samą notatkę
-        del self.notes_data[note_id]
-    
     def add_child_note(self, parent_id):
         """Dodaje podnotatkę"""
         dialog = NoteDialog(self)
@@ -882,20 +1080,11 @@ class NotesView(QWidget):
                     # Zapisz do bazy
                     note_id = self.db.add_note(data['title'], data['content'], parent_id)
                     
-                    # Dodaj do cache
-                    self.notes_data[note_id] = {
-                        'title': data['title'],
-                        'content': data['content'],
-                        'parent_id': parent_id,
-                        'children': [],
-                        'color': '#2c3e50'  # Domyślny kolor
-                    }
-                    
-                    # Dodaj do dzieci rodzica
-                    if 'children' not in self.notes_data[parent_id]:
-                        self.notes_data[parent_id]['children'] = []
-                    self.notes_data[parent_id]['children'].append(note_id)
+                    # Dodaj do cache i do dzieci rodzica
+                    self.cache_new_note(note_id, data['title'], data['content'], parent_id)
                     
+                    # Rozwiń rodzica, żeby nowa podnotatka była widoczna
+                    self.expanded_note_ids.add(parent_id)
                     self.refresh_tree()
                     self.note_created.emit(self.notes_data[note_id])
                     print(f"Dodano podnotatkę: {data['title']}")
@@ -14,6 +14,7 @@ import os
 
 # Dodaj ścieżkę do modułu database
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from database.db_manager import STANDARD_TASK_COLUMNS
 
 
 class QuickTaskDialog(QDialog):
@@ -191,17 +192,16 @@ class QuickTaskDialog(QDialog):
         if 'dictionary_list_id' in col_config and col_config['dictionary_list_id']:
             try:
                 list_id = col_config['dictionary_list_id']
-                conn = self.db_manager.get_connection()
-                cursor = conn.cursor()
+                with self.db_manager.connection() as conn:
+                    cursor = conn.cursor()
                 
-                cursor.execute("""
-                    SELECT value FROM dictionary_list_items 
-                    WHERE list_id = ? 
-                    ORDER BY order_index
-                """, (list_id,))
+                    cursor.execute("""
+                        SELECT value FROM dictionary_list_items 
+                        WHERE list_id = ? 
+                        ORDER BY order_index
+                    """, (list_id,))
                 
-                options = [row[0] for row in cursor.fetchall()]
-                conn.close()
+                    options = [row[0] for row in cursor.fetchall()]
                 
                 if options:
                     combo.addItems(options)
@@ -289,49 +289,60 @@ class QuickTaskDialog(QDialog):
     def update_task_columns(self, task_id, task_data):
         """Aktualizuje wartości w niestandardowych kolumnach zadania"""
         try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
+            with self.db_manager.connection() as conn:
+                cursor = conn.cursor()
             
-            # Pobierz bieżące dane zadania
-            cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-            task_row = cursor.fetchone()
+                # Pobierz bieżące dane zadania
+                cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+                task_row = cursor.fetchone()
             
-            if not task_row:
-                conn.close()
-                return
+                if not task_row:
+                    return
             
-            # Pobierz nazwy kolumn
-            cursor.execute("PRAGMA table_info(tasks)")
-            columns = [col[1] for col in cursor.fetchall()]
+                # Pobierz nazwy kolumn
+                cursor.execute("PRAGMA table_info(tasks)")
+                columns = [col[1] for col in cursor.fetchall()]
             
-            # Przygotuj UPDATE
-            update_parts = []
-            update_values = []
+                # Przygotuj UPDATE
+                update_parts = []
+                update_values = []
             
-            for col_name, value in task_data.items():
-                # Pomiń standardowe pola
-                if col_name in ['title', 'description', 'status']:
-                    continue
+                for col_name, value in task_data.items():
+                    # Pomiń standardowe pola
+                    if col_name in ['title', 'description', 'status']:
+                        continue
                 
-                # Sprawdź czy kolumna istnieje w tabeli tasks
-                safe_col_name = col_name.lower().replace(' ', '_')
-                if safe_col_name in columns:
-                    update_parts.append(f"{safe_col_name} = ?")
+                    # Sprawdź czy kolumna istnieje w tabeli tasks
+                    safe_col_name = col_name.lower().replace(' ', '_')
+                    if safe_col_name in columns:
+                        update_parts.append(f"{safe_col_name} = ?")
                     
-                    # Konwersja wartości
-                    if isinstance(value, bool):
-                        update_values.append(1 if value else 0)
-                    else:
-                        update_values.append(value)
+                        # Konwersja wartości
+                        if isinstance(value, bool):
+                            update_values.append(1 if value else 0)
+                        else:
+                            update_values.append(value)
+            
+                if update_parts:
+                    update_values.append(task_id)
+                    sql = f"UPDATE tasks SET {', '.join(update_parts)} WHERE id = ?"
+                    cursor.execute(sql, update_values)
+                    conn.commit()
+                    print(f"DEBUG: Zaktualizowano {len(update_parts)} kolumn dla zadania ID={task_id}")
             
             if update_parts:
-                update_values.append(task_id)
-                sql = f"UPDATE tasks SET {', '.join(update_parts)} WHERE id = ?"
-                cursor.execute(sql, update_values)
-                conn.commit()
-                print(f"DEBUG: Zaktualizowano {len(update_parts)} kolumn dla zadania ID={task_id}")
+                self.db_manager.notify_tasks_changed('update', [task_id])
+            
+            # Kolumny użytkownika trafiają do tabeli task_column_values
+            custom_values = {}
+            for col in self.task_columns:
+                if col['name'] in STANDARD_TASK_COLUMNS or col['name'] not in task_data:
+                    continue
+                value = task_data[col['name']]
+                custom_values[col['id']] = (1 if value else 0) if isinstance(value, bool) else value
             
-            conn.close()
+            if custom_values:
+                self.db_manager.set_task_column_values(task_id, custom_values)
             
         except Exception as e:
             print(f"ERROR: Błąd aktualizacji kolumn zadania: {e}")
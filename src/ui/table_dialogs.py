@@ -14,10 +14,11 @@ from PyQt6.QtGui import QColor
 class TableDialog(QDialog):
     """Dialog do dodawania/edycji tabel"""
     
-    def __init__(self, parent=None, table_data=None, theme_manager=None):
+    def __init__(self, parent=None, table_data=None, theme_manager=None, db_manager=None):
         super().__init__(parent)
         self.table_data = table_data
         self.theme_manager = theme_manager
+        self.db_manager = db_manager
         self.is_edit_mode = table_data is not None
         
         self.setWindowTitle("Edytuj tabelę" if self.is_edit_mode else "Dodaj nową tabelę")
@@ -384,15 +385,20 @@ class TableDialog(QDialog):
                 import traceback
                 traceback.print_exc()
     
-    def load_dictionary_lists(self):
-        """Ładuje prawdziwe listy słownikowe z bazy danych"""
-        try:
+    def get_database(self):
+        """Zwraca bazę danych przekazaną przez okno główne (lub współdzieloną instancję)"""
+        if self.db_manager is None:
             import sys
             import os
             sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
             from database.db_manager import Database
-            
-            db = Database()
+            self.db_manager = Database.for_path()
+        return self.db_manager
+    
+    def load_dictionary_lists(self):
+        """Ładuje prawdziwe listy słownikowe z bazy danych"""
+        try:
+            db = self.get_database()
             lists = db.get_dictionary_lists()
             
             # Wyczyść obecne elementy
@@ -486,13 +492,7 @@ class TableDialog(QDialog):
         # Zapisz konfigurację tabeli do bazy danych
         try:
             print("DEBUG: Próba zapisu do bazy danych...")
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-            from database.db_manager import Database
-            
-            db = Database()
-            print("DEBUG: Utworzono instancję Database")
+            db = self.get_database()
             
             if self.is_edit_mode and self.table_data:
                 # Tryb edycji - aktualizuj istniejącą tabelę
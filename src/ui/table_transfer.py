@@ -0,0 +1,98 @@
+"""
+Wątki importu i eksportu danych tabel - praca poza wątkiem GUI z postępem
+"""
+import os
+import sys
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+# Dodaj ścieżkę do modułów
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from database.table_import import ImportCancelled
+from database.table_export import ExportCancelled
+
+
+class TableImportWorker(QThread):
+    """Importuje plik CSV do tabeli użytkownika w osobnym wątku"""
+
+    progress_changed = pyqtSignal(int, int)  # zaimportowane wiersze, procent pliku
+    import_finished = pyqtSignal(dict)       # wynik Database.import_table_csv
+    import_failed = pyqtSignal(str)          # komunikat błędu lub przerwania
+
+    def __init__(self, db_manager, table_id, file_path, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.table_id = table_id
+        self.file_path = file_path
+        self._cancelled = False
+
+    def cancel(self):
+        """Przerywa import po bieżącej porcji (wstawione porcje zostają)"""
+        self._cancelled = True
+
+    def _report_progress(self, rows, position, size):
+        percent = int(position * 100 / size) if size else 100
+        self.progress_changed.emit(rows, min(percent, 100))
+
+    def run(self):
+        try:
+            result = self.db.import_table_csv(
+                self.table_id, self.file_path,
+                progress=self._report_progress,
+                should_cancel=lambda: self._cancelled,
+            )
+            self.import_finished.emit(result)
+        except ImportCancelled as e:
+            self.import_failed.emit(str(e))
+        except Exception as e:
+            print(f"Błąd importu pliku {self.file_path}: {e}")
+            import traceback
+            traceback.print_exc()
+            self.import_failed.emit(str(e))
+        finally:
+            # Połączenie tego wątku nie będzie już używane
+            self.db.pool.close()
+
+
+class TableExportWorker(QThread):
+    """Eksportuje dane do pliku CSV/JSONL w osobnym wątku
+
+    export_func to jedna z metod Database.export_* z ustawionymi już
+    argumentami (np. functools.partial) - wątek dokłada progress i should_cancel.
+    """
+
+    progress_changed = pyqtSignal(int, int)  # zapisane wiersze, procent
+    export_finished = pyqtSignal(int)        # liczba zapisanych wierszy
+    export_failed = pyqtSignal(str)          # komunikat błędu lub przerwania
+
+    def __init__(self, db_manager, export_func, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.export_func = export_func
+        self._cancelled = False
+
+    def cancel(self):
+        """Przerywa eksport po bieżącej porcji (plik docelowy nie powstaje)"""
+        self._cancelled = True
+
+    def _report_progress(self, rows, total):
+        percent = int(rows * 100 / total) if total else 100
+        self.progress_changed.emit(rows, min(percent, 100))
+
+    def run(self):
+        try:
+            rows = self.export_func(
+                progress=self._report_progress,
+                should_cancel=lambda: self._cancelled,
+            )
+            self.export_finished.emit(rows)
+        except ExportCancelled as e:
+            self.export_failed.emit(str(e))
+        except Exception as e:
+            print(f"Błąd eksportu: {e}")
+            import traceback
+            traceback.print_exc()
+            self.export_failed.emit(str(e))
+        finally:
+            # Połączenie tego wątku nie będzie już używane
+            self.db.pool.close()
@@ -0,0 +1,472 @@
+"""
+Model danych tabeli zadań (QAbstractTableModel)
+
+Komórki nie są widgetami - checkboxy i przyciski maluje TaskCellDelegate,
+a wiersze są pobierane stronami (np. z Database.query_tasks) dopiero,
+gdy widok o nie poprosi przez canFetchMore/fetchMore. Z ustawionym
+async_db (AsyncDatabase) strony są pobierane w puli wątków, a wiersze
+dochodzą do modelu, gdy strona przyjdzie - sygnał loading_changed pozwala
+widokowi pokazać stan ładowania.
+"""
+from functools import partial
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QColor, QBrush
+
+
+# Role danych używane przez widok i delegata
+TASK_ID_ROLE = Qt.ItemDataRole.UserRole
+TAG_COLOR_ROLE = Qt.ItemDataRole.UserRole + 1
+CELL_KIND_ROLE = Qt.ItemDataRole.UserRole + 2
+
+# Rodzaje komórek malowanych przez delegata
+CELL_CHECKBOX = "checkbox"
+CELL_BUTTON = "button"
+
+# Kolumny standardowe o stałym zachowaniu
+CHECKBOX_COLUMNS = {"Status", "Archiwum"}
+BUTTON_COLUMNS = {"Notatka", "KanBan"}
+READ_ONLY_COLUMNS = {"ID", "Data dodania", "Data realizacji"}
+
+# Tło komórki statusu (odpowiednik dawnego rgba(..., 0.3) w stylu checkboxa)
+STATUS_DONE_COLOR = QColor(46, 204, 113, 77)
+STATUS_OPEN_COLOR = QColor(231, 76, 60, 77)
+
+# Przezroczystość tła wiersza w kolorze tagu
+ROW_TINT_ALPHA = 40
+
+
+def is_truthy(value):
+    """Interpretuje wartość kolumny CheckBox (w bazie zapisaną jako tekst)"""
+    if isinstance(value, str):
+        return value.strip() not in ("", "0", "False", "false", "None")
+    return bool(value)
+
+
+def format_task_date(value):
+    """Formatuje datę zadania do wyświetlenia w tabeli"""
+    if not value:
+        return ""
+    if isinstance(value, str):
+        return value
+    return value.strftime("%d.%m.%Y %H:%M")
+
+
+class TasksTableModel(QAbstractTableModel):
+    """Model tabeli zadań - trzyma listę słowników w formacie TaskLoader"""
+
+    # Sygnały zmian wprowadzonych przez użytkownika (zapis robi TasksView)
+    check_toggled = pyqtSignal(int, str, int)   # task_id, nazwa kolumny, Qt.CheckState.value
+    cell_edited = pyqtSignal(int, str, object)  # task_id, nazwa kolumny, nowa wartość
+    # Strona zadań pobierana w tle (True) / pobrana (False)
+    loading_changed = pyqtSignal(bool)
+
+    # Liczba wierszy pobieranych w jednej stronie
+    FETCH_BATCH_SIZE = 200
+
+    def __init__(self, theme_manager=None, parent=None):
+        super().__init__(parent)
+        self.theme_manager = theme_manager
+        self.tag_color_resolver = None  # Funkcja nazwa_tagu -> kolor HEX
+        self._columns = []
+        self._tasks = []  # Wiersze już pobrane (widoczne dla widoku)
+        self._row_by_id = None  # Mapa task_id -> wiersz, budowana przy pierwszym użyciu
+        self._fetch_page = None  # Funkcja (offset, limit) -> lista zadań
+        self._total = 0  # Liczba wszystkich wierszy źródła
+        self.async_db = None  # AsyncDatabase - strony pobierane poza wątkiem GUI
+        self._source_async_db = None  # async_db źródła ustawionego przez set_source
+        self._page_request = None  # Trwające pobieranie strony w tle
+        self._loading = False  # Ostatnio wysłany stan loading_changed
+        self._color_cache = {}
+        self._text_color = QColor("#2c3e50")
+        self.update_theme_colors()
+
+    # === Dane modelu ===
+
+    def set_columns(self, columns):
+        """Ustawia listę widocznych kolumn (słowniki z kluczami name, type)"""
+        self.beginResetModel()
+        self._columns = list(columns)
+        self.endResetModel()
+
+    def set_source(self, fetch_page, total):
+        """Ustawia źródło stron zadań - od razu pobierana jest tylko pierwsza strona
+
+        Z ustawionym async_db model jest po resecie pusty, a pierwsza strona
+        dochodzi po pobraniu w tle.
+
+        Args:
+            fetch_page: Funkcja (offset, limit) zwracająca listę słowników zadań
+            total: Liczba wszystkich zadań w źródle
+        """
+        self._reset_source(fetch_page, total, self.async_db)
+
+    def set_tasks(self, tasks):
+        """Ustawia gotową listę zadań (udostępnianą widokowi stronami)"""
+        tasks = list(tasks)
+        self._reset_source(lambda offset, limit: tasks[offset:offset + limit], len(tasks), None)
+
+    def _reset_source(self, fetch_page, total, async_db):
+        self._cancel_page_request()
+        self.beginResetModel()
+        self._fetch_page = fetch_page
+        self._source_async_db = async_db
+        self._total = total
+        if async_db is None:
+            self._tasks = list(fetch_page(0, self.FETCH_BATCH_SIZE)) if total else []
+        else:
+            self._tasks = []
+        self._row_by_id = None
+        self.endResetModel()
+        if async_db is not None and total:
+            self._request_page(0)
+        self._update_loading()
+
+    def is_loading(self):
+        """Czy strona zadań jest pobierana w tle"""
+        return self._page_request is not None
+
+    def set_total(self, total):
+        """Aktualizuje liczbę wszystkich wierszy źródła (np. po zmianie poza pobranymi stronami)"""
+        self._total = max(total, len(self._tasks))
+
+    def task_at(self, row):
+        """Zwraca słownik pobranego zadania dla wiersza lub None"""
+        if 0 <= row < len(self._tasks):
+            return self._tasks[row]
+        return None
+
+    def row_for_task(self, task_id):
+        """Zwraca numer wiersza zadania lub None, jeśli zadania nie ma w modelu"""
+        if self._row_by_id is None:
+            self._row_by_id = {task['id']: row for row, task in enumerate(self._tasks)}
+        return self._row_by_id.get(task_id)
+
+    def rows(self):
+        """Zwraca (bez kopiowania) listę pobranych zadań w kolejności wierszy"""
+        return self._tasks
+
+    def insert_task(self, row, task):
+        """Wstawia zadanie w wierszu row
+
+        Zadanie, które trafiłoby za ostatni pobrany wiersz, gdy źródło ma
+        jeszcze niepobrane strony, przyjdzie z kolejną stroną - zwiększany
+        jest tylko licznik wierszy.
+        """
+        if row >= len(self._tasks) and self.canFetchMore():
+            self._total += 1
+            return
+        row = max(0, min(row, len(self._tasks)))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.insert(row, task)
+        self._total += 1
+        self._shift_rows_from(row)
+        self.endInsertRows()
+
+    def remove_task(self, task_id):
+        """Usuwa pobrany wiersz zadania - zwraca True, jeśli zadanie było w modelu"""
+        row = self.row_for_task(task_id)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._tasks[row]
+        self._total -= 1
+        self._row_by_id.pop(task_id, None)
+        self._shift_rows_from(row)
+        self.endRemoveRows()
+        return True
+
+    def remove_tasks(self, task_ids):
+        """Usuwa pobrane wiersze wielu zadań jednym przebiegiem (np. po archiwizacji)
+
+        Ciągłe zakresy wierszy są usuwane od dołu, a mapa wierszy
+        przebudowywana raz na końcu.
+
+        Returns:
+            Liczba usuniętych wierszy
+        """
+        rows = sorted({row for row in map(self.row_for_task, task_ids) if row is not None}, reverse=True)
+        if not rows:
+            return 0
+        index = 0
+        while index < len(rows):
+            # Zakres kolejnych wierszy [first, last]
+            last = first = rows[index]
+            index += 1
+            while index < len(rows) and rows[index] == first - 1:
+                first = rows[index]
+                index += 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._tasks[first:last + 1]
+            self.endRemoveRows()
+        self._total -= len(rows)
+        self._row_by_id = None
+        return len(rows)
+
+    def _shift_rows_from(self, row):
+        """Aktualizuje mapę task_id -> wiersz dla wierszy od row w dół"""
+        if self._row_by_id is None:
+            return
+        for shifted in range(row, len(self._tasks)):
+            self._row_by_id[self._tasks[shifted]['id']] = shifted
+
+    def replace_task(self, task):
+        """Podmienia słownik zadania w jego wierszu i odświeża wiersz"""
+        row = self.row_for_task(task['id'])
+        if row is None:
+            return False
+        self._tasks[row] = task
+        self.refresh_task(task['id'])
+        return True
+
+    def column_name(self, column):
+        """Zwraca nazwę kolumny o podanym indeksie"""
+        if 0 <= column < len(self._columns):
+            return self._columns[column]["name"]
+        return None
+
+    def total_count(self):
+        """Liczba wszystkich zadań źródła (także jeszcze niepobranych)"""
+        return self._total
+
+    def refresh_task(self, task_id):
+        """Odświeża wiersz zadania po zmianie jego słownika"""
+        row = self.row_for_task(task_id)
+        if row is None or not self._columns:
+            return
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._columns) - 1))
+
+    def update_theme_colors(self):
+        """Pobiera kolory motywu i odświeża wczytane wiersze"""
+        if self.theme_manager:
+            text_color = self.theme_manager.get_current_colors().get('text_color', '#2c3e50')
+            self._text_color = QColor(text_color)
+        if self._tasks and self._columns:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._tasks) - 1, len(self._columns) - 1))
+
+    # === Stronicowanie ===
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch_page is None:
+            return False
+        return len(self._tasks) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch_page is None:
+            return
+        offset = len(self._tasks)
+        if self._source_async_db is not None:
+            self._request_page(offset)
+            return
+        self._append_page(offset, self._fetch_page(offset, self.FETCH_BATCH_SIZE))
+
+    def _request_page(self, offset):
+        """Zleca pobranie strony w tle (jedna strona naraz)"""
+        if self._page_request is not None:
+            return
+        request = self._source_async_db.submit(
+            self._fetch_page, offset, self.FETCH_BATCH_SIZE,
+            on_result=partial(self._on_page_loaded, offset),
+        )
+        request.done.connect(partial(self._on_page_request_done, request))
+        self._page_request = request
+        self._update_loading()
+
+    def _on_page_loaded(self, offset, page):
+        if offset != len(self._tasks):
+            # W międzyczasie wstawiono lub usunięto wiersze - strona z aktualnej pozycji
+            self._page_request = None
+            self._request_page(len(self._tasks))
+            return
+        self._append_page(offset, page)
+
+    def _on_page_request_done(self, request):
+        if self._page_request is request:
+            self._page_request = None
+            self._update_loading()
+
+    def _cancel_page_request(self):
+        if self._page_request is not None:
+            self._page_request.cancel()
+            self._page_request = None
+
+    def _update_loading(self):
+        """Wysyła loading_changed, gdy stan ładowania się zmienił"""
+        loading = self.is_loading()
+        if loading != self._loading:
+            self._loading = loading
+            self.loading_changed.emit(loading)
+
+    def _append_page(self, offset, page):
+        """Dopisuje pobraną stronę na końcu modelu"""
+        if not page:
+            # Źródło ma mniej wierszy niż zakładano - koniec stron
+            self._total = offset
+            return
+        self.beginInsertRows(QModelIndex(), offset, offset + len(page) - 1)
+        self._tasks.extend(page)
+        if self._row_by_id is not None:
+            self._row_by_id.update((task['id'], offset + i) for i, task in enumerate(page))
+        self.endInsertRows()
+
+    # === Interfejs QAbstractTableModel ===
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        # ColumnDelegate rozpoznaje typ kolumny po tekście nagłówka
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.column_name(section)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        kind = self._cell_kind(index.column())
+        if kind == CELL_CHECKBOX:
+            return flags | Qt.ItemFlag.ItemIsUserCheckable
+        if kind == CELL_BUTTON or self.column_name(index.column()) in READ_ONLY_COLUMNS:
+            return flags
+        return flags | Qt.ItemFlag.ItemIsEditable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._tasks):
+            return None
+
+        task = self._tasks[index.row()]
+        column = self._columns[index.column()]
+        name = column["name"]
+
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
+            return self._display_value(task, column)
+        if role == Qt.ItemDataRole.CheckStateRole:
+            if self._cell_kind(index.column()) != CELL_CHECKBOX:
+                return None
+            checked = self._is_checked(task, name)
+            return Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._background(task, name)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._foreground(task, name)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if self._cell_kind(index.column()) is not None:
+                return Qt.AlignmentFlag.AlignCenter
+            return None
+        if role == TASK_ID_ROLE:
+            return task['id']
+        if role == TAG_COLOR_ROLE:
+            return self._tag_color(task)
+        if role == CELL_KIND_ROLE:
+            return self._cell_kind(index.column())
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Przekazuje zmianę użytkownika do widoku - model nie zapisuje do bazy"""
+        if not index.isValid() or index.row() >= len(self._tasks):
+            return False
+
+        task = self._tasks[index.row()]
+        name = self.column_name(index.column())
+
+        if role == Qt.ItemDataRole.CheckStateRole and self._cell_kind(index.column()) == CELL_CHECKBOX:
+            state = value.value if isinstance(value, Qt.CheckState) else int(value)
+            self.check_toggled.emit(task['id'], name, state)
+            return True
+
+        if role == Qt.ItemDataRole.EditRole and self.flags(index) & Qt.ItemFlag.ItemIsEditable:
+            self.cell_edited.emit(task['id'], name, value)
+            return True
+
+        return False
+
+    # === Pomocnicze ===
+
+    def _cell_kind(self, column):
+        """Zwraca rodzaj komórki malowanej przez delegata (lub None dla tekstu)"""
+        if not 0 <= column < len(self._columns):
+            return None
+        col = self._columns[column]
+        if col["name"] in BUTTON_COLUMNS:
+            return CELL_BUTTON
+        if col["name"] in CHECKBOX_COLUMNS or col.get("type") == "CheckBox":
+            return CELL_CHECKBOX
+        return None
+
+    def _display_value(self, task, column):
+        name = column["name"]
+        if name == "ID":
+            return str(task['id'])
+        if name == "Data dodania":
+            return format_task_date(task.get('date_added') or task.get('created_at'))
+        if name == "Data realizacji":
+            return format_task_date(task.get('date_completed'))
+        if name == "Zadanie":
+            return task.get('task') or ""
+        if name == "TAG":
+            return task.get('tag') or ""
+        if name == "Notatka":
+            return "📝" if task.get('note_id') else "➕"
+        if name == "KanBan":
+            return "✓ 📊" if task.get('kanban', 0) == 1 else "📊"
+        if name in CHECKBOX_COLUMNS or column.get("type") == "CheckBox":
+            return None
+        value = task.get(name, "")
+        return str(value) if value else ""
+
+    def _is_checked(self, task, name):
+        if name == "Status":
+            return bool(task.get('status'))
+        if name == "Archiwum":
+            return bool(task.get('archived', False))
+        return is_truthy(task.get(name))
+
+    def _tag_color(self, task):
+        """Kolor tagu zadania (uzupełniany przez tag_color_resolver, gdy brak w danych)"""
+        tag = task.get('tag')
+        if not tag:
+            return None
+        color = task.get('tag_color')
+        if not color and self.tag_color_resolver is not None:
+            color = self.tag_color_resolver(tag)
+            task['tag_color'] = color
+        return color
+
+    def _color(self, color_hex, alpha=255):
+        """Zwraca (z cache) QColor dla koloru HEX i przezroczystości"""
+        key = (color_hex, alpha)
+        color = self._color_cache.get(key)
+        if color is None:
+            color = QColor(color_hex)
+            color.setAlpha(alpha)
+            self._color_cache[key] = color
+        return color
+
+    def _background(self, task, name):
+        if name == "Status":
+            return STATUS_DONE_COLOR if task.get('status') else STATUS_OPEN_COLOR
+        color_hex = self._tag_color(task)
+        if not color_hex:
+            return None
+        if name == "TAG":
+            return QBrush(self._color(color_hex))
+        return self._color(color_hex, ROW_TINT_ALPHA)
+
+    def _foreground(self, task, name):
+        if name != "TAG":
+            return None
+        color_hex = self._tag_color(task)
+        if not color_hex:
+            return self._text_color
+        base_color = self._color(color_hex)
+        brightness = (base_color.red() * 299 + base_color.green() * 587 + base_color.blue() * 114) / 1000
+        return QColor("#000000") if brightness > 160 else QColor("#ffffff")
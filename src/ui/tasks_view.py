@@ -1,13 +1,24 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QPushButton, QTableWidget, QTableWidgetItem, QGroupBox,
-                            QCheckBox, QLineEdit, QDateEdit, QComboBox, QHeaderView,
+                            QTableView, QGroupBox,
+                            QLineEdit, QDateEdit, QComboBox, QHeaderView,
                             QMenu, QDialog, QDialogButtonBox, QFormLayout, QSpinBox,
                             QMessageBox, QApplication, QAbstractItemView, QSizePolicy)
 from PyQt6.QtCore import Qt, QDate, pyqtSignal, QDateTime
-from PyQt6.QtGui import QFont, QColor, QAction, QBrush
+from PyQt6.QtGui import QFont, QAction
 from .theme_manager import ThemeManager
-from .column_delegate import ColumnDelegate
+from .column_delegate import TaskCellDelegate
+from .tasks_table_model import TasksTableModel
+from .async_db import AsyncDatabase
 import datetime
+import sys
+import os
+
+# Dodaj ścieżkę do modułu database
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from database.task_loader import TaskLoader
+from database.change_events import DELETE
+from database.text_fold import fold_case
+from database.app_settings import SETTINGS_TABLE
 
 class TasksView(QWidget):
     """Zaawansowany widok zarządzania zadaniami"""
@@ -16,21 +27,31 @@ class TasksView(QWidget):
     task_created = pyqtSignal(dict)
     task_updated = pyqtSignal(int, dict)  # task_id, task_data
     task_deleted = pyqtSignal(int)
+    # Zmiany zadań z szyny zdarzeń bazy (przekazywane do wątku GUI)
+    tasks_changed_in_db = pyqtSignal(str, list)  # rodzaj zmiany, lista ID zadań
+    settings_changed_in_db = pyqtSignal(list)  # zmienione klucze app_settings
     
     def __init__(self, db_manager, theme_manager=None):
         super().__init__()
         self.db_manager = db_manager
+        self.async_db = AsyncDatabase.for_database(db_manager)
+        self._load_requests = set()  # Zapytania widoku trwające w tle
+        self._changed_task_ids = set()  # Zmienione zadania czekające na pobranie w tle
         self.theme_manager = theme_manager or ThemeManager()
-        self.current_tasks = []
+        self.task_loader = TaskLoader(self.db_manager)
         self.custom_columns = []
         self.visible_columns = []  # Kolumny widoczne w tabeli
         self.tag_color_map = {}
         self.category_color_map = {}
-        self._row_task_ids = []
-        self._suspend_item_updates = False
+        self._auto_move_completed = False
         self.setup_ui()
         self.load_tasks()
         
+        # Zmiany zapisane przez Database aktualizują tylko dotknięte wiersze
+        self.tasks_changed_in_db.connect(self.on_tasks_changed)
+        self.settings_changed_in_db.connect(self.on_settings_changed)
+        self.db_manager.events.subscribe(self._on_database_event)
+        
         # Załaduj tagi z ustawień po utworzeniu wszystkich komponentów
         self.update_tags_from_settings()
     
@@ -60,14 +81,12 @@ class TasksView(QWidget):
             self.search_input.setStyleSheet(self.theme_manager.get_line_edit_style())
         if hasattr(self, 'tasks_table'):
             self.tasks_table.setStyleSheet(self.theme_manager.get_table_style())
+            self.tasks_model.update_theme_colors()
         if hasattr(self, 'controls_widget'):
             self.controls_widget.setStyleSheet(self.theme_manager.get_controls_widget_style())
         if hasattr(self, 'table_container'):
             self.table_container.setStyleSheet(self.theme_manager.get_controls_widget_style())
             
-        # Odśwież tabelę żeby zastosować nowe style
-        if hasattr(self, 'current_tasks'):
-            self.populate_table()
         
     def setup_ui(self):
         """Tworzy interfejs użytkownika"""
@@ -136,6 +155,13 @@ class TasksView(QWidget):
         controls_layout.addWidget(self.search_input)
 
         controls_layout.addStretch()
+
+        # Stan ładowania - zapytania do bazy wykonuje pula wątków AsyncDatabase
+        self.loading_label = QLabel("⏳ Ładowanie zadań...")
+        self.loading_label.setStyleSheet(self.theme_manager.get_label_style())
+        self.loading_label.setVisible(False)
+        controls_layout.addWidget(self.loading_label)
+
         parent_layout.addWidget(controls_widget)
         self.controls_widget = controls_widget
 
@@ -147,8 +173,15 @@ class TasksView(QWidget):
         table_layout = QVBoxLayout(table_widget)
         table_layout.setContentsMargins(15, 15, 15, 15)
 
-        # Tabela
-        self.tasks_table = QTableWidget()
+        # Tabela (model/widok - komórki malowane przez delegata, bez widgetów)
+        self.tasks_table = QTableView()
+        self.tasks_model = TasksTableModel(self.theme_manager, self)
+        self.tasks_model.async_db = self.async_db
+        self.tasks_model.loading_changed.connect(self.update_loading_state)
+        self.tasks_model.tag_color_resolver = self.get_color_for_tag
+        self.tasks_model.check_toggled.connect(self.on_task_check_toggled)
+        self.tasks_model.cell_edited.connect(self.on_task_cell_edited)
+        self.tasks_table.setModel(self.tasks_model)
         self.setup_table_columns()
 
         # Stylizacja tabeli
@@ -158,6 +191,10 @@ class TasksView(QWidget):
         self.tasks_table.setAlternatingRowColors(True)
         self.tasks_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.tasks_table.verticalHeader().setVisible(False)
+        # Stała wysokość wierszy - widok nie mierzy każdego wiersza przy przewijaniu
+        self.tasks_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.tasks_table.verticalHeader().setDefaultSectionSize(30)
+        self.tasks_table.setWordWrap(False)
         
         # Ustaw triggery edycji - pojedyncze kliknięcie lub double click
         self.tasks_table.setEditTriggers(
@@ -173,9 +210,6 @@ class TasksView(QWidget):
         self.tasks_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tasks_table.customContextMenuRequested.connect(self.show_context_menu)
 
-        # Reaguj na zmiany w komórkach (np. wybór nowego tagu)
-        self.tasks_table.itemChanged.connect(self.on_task_item_changed)
-
         table_layout.addWidget(self.tasks_table)
         parent_layout.addWidget(table_widget)
         self.table_container = table_widget
@@ -213,6 +247,7 @@ class TasksView(QWidget):
                     resize_mode = "Interactive"
                 
                 all_columns.append({
+                    "id": col["id"],
                     "name": col["name"],
                     "type": col["type"],
                     "visible": col["visible"],
@@ -231,17 +266,16 @@ class TasksView(QWidget):
             
             print(f"DEBUG: Załadowano {len(all_columns)} kolumn z bazy, {len(self.visible_columns)} widocznych, {len(self.custom_columns)} niestandardowych")
             
-            # Ustaw liczę kolumn i nagłówki
-            column_names = [col["name"] for col in self.visible_columns]
-            self.tasks_table.setColumnCount(len(column_names))
-            self.tasks_table.setHorizontalHeaderLabels(column_names)
+            # Ustaw kolumny modelu (nagłówki pochodzą z nazw kolumn)
+            self.tasks_model.set_columns(self.visible_columns)
             
             # Utwórz i skonfiguruj delegata dla kolumn
-            self.column_delegate = ColumnDelegate(
+            self.column_delegate = TaskCellDelegate(
                 parent=self.tasks_table,
                 db_manager=self.db_manager,
                 theme_manager=self.theme_manager
             )
+            self.column_delegate.button_clicked.connect(self.on_task_button_clicked)
             
             # Ustaw typy kolumn w delegacie
             for col in self.visible_columns:
@@ -270,9 +304,8 @@ class TasksView(QWidget):
                 {"name": "KanBan", "type": "CheckBox", "visible": True, "width": 60, "resize_mode": "Fixed"},
                 {"name": "Archiwum", "type": "CheckBox", "visible": False, "width": 60, "resize_mode": "Fixed"}
             ]
-            column_names = [col["name"] for col in self.visible_columns if col["visible"]]
-            self.tasks_table.setColumnCount(len(column_names))
-            self.tasks_table.setHorizontalHeaderLabels(column_names)
+            self.visible_columns = [col for col in self.visible_columns if col["visible"]]
+            self.tasks_model.set_columns(self.visible_columns)
         
     def configure_table_header(self):
         """Konfiguruje header tabeli z odpowiednimi szerokościami i trybami kolumn na podstawie ustawień"""
@@ -306,83 +339,45 @@ class TasksView(QWidget):
             traceback.print_exc()
         
     def load_tasks(self):
-        """Ładuje zadania z bazy danych"""
+        """Ładuje zadania z bazy danych - metadane i strony pobierane są w tle"""
         try:
-            # Pobierz zadania z bazy danych
-            tasks = self.db_manager.get_tasks()
-            
-            # Pobierz kolory tagów z dedykowanej tabeli oraz kategorii
-            tag_colors = {}
-            try:
-                tag_rows = self.db_manager.get_task_tags()
-                for tag_row in tag_rows:
-                    tag_name = tag_row[1]
-                    tag_color = tag_row[2]
-                    if tag_name and tag_color:
-                        tag_colors[tag_name] = tag_color
-            except Exception as e:
-                print(f"Błąd pobierania tagów: {e}")
-
-            categories = self.db_manager.get_categories()
-            category_colors = {cat[1]: cat[2] for cat in categories if cat[1] and cat[2]}
-            self.category_color_map = category_colors.copy()
-            # Kolory z tagów mają priorytet nad kategoriami
-            combined_colors = {**category_colors, **tag_colors}
+            # Migawka ustawień w pamięci - późniejsze zmiany obsługuje on_settings_changed
+            self._auto_move_completed = self.db_manager.settings.get_bool('task_auto_move_completed')
             
-            # Konwertuj zadania do odpowiedniego formatu z kolorami tagów
-            self.current_tasks = []
-            for task in tasks:
-                task_dict = {
-                    'id': task[0],
-                    'date_added': task[7],  # created_at
-                    'status': task[3] == 'completed',  # status
-                    'task': task[1],  # title
-                    'note_id': task[9],  # note_id
-                    'tag': task[5],  # category (używane jako tag)
-                    'date_completed': task[8] if task[3] == 'completed' else None,  # updated_at jeśli completed
-                    'kanban_status': 'DONE' if task[3] == 'completed' else 'TODO',
-                    'archived': task[11] == 1 if len(task) > 11 else False,  # flaga archived
-                    'kanban': task[10] if len(task) > 10 else 0  # flaga kanban
-                }
-                
-                # Parsuj description aby wyciągnąć wartości kolumn użytkownika
-                description = task[2]  # description
-                if description:
-                    # Pobierz wszystkie kolumny użytkownika
-                    all_columns = self.db_manager.get_task_columns()
-                    standard_columns = {'ID', 'Data dodania', 'Status', 'Zadanie', 'Notatka', 
-                                       'Data realizacji', 'KanBan', 'Archiwum', 'TAG'}
-                    
-                    # Wyciągnij wartości dla wszystkich kolumn użytkownika z description
-                    for line in description.split('\n'):
-                        if ':' in line:
-                            # Sprawdź czy linia zaczyna się od nazwy kolumny użytkownika
-                            for col in all_columns:
-                                col_name = col['name']
-                                if col_name not in standard_columns and line.startswith(f'{col_name}:'):
-                                    value = line.replace(f'{col_name}:', '').strip()
-                                    task_dict[col_name] = value
-                                    break
-                
-                # Dodaj kolor kategorii jako kolor tagu
-                tag_name = task_dict.get('tag')
-                if tag_name:
-                    color_hex = combined_colors.get(tag_name)
-                    task_dict['tag_color'] = color_hex or '#3498db'
-                else:
-                    task_dict['tag_color'] = None
-                
-                self.current_tasks.append(task_dict)
-            
-            self.populate_table()
-            # Skonfiguruj header po załadowaniu danych
-            self.configure_table_header()
-            # Zastosuj kolorowanie komórek po wszystkich konfiguracjach
-            self.apply_cell_coloring()
+            # Świeże metadane (kolumny, kolory) dla stron pobieranych przez model
+            loader = TaskLoader(self.db_manager)
+            self.track_load_request(self.async_db.submit_latest(
+                ('tasks-metadata', id(self)), loader.prepare,
+                on_result=lambda _: self.on_task_loader_ready(loader),
+            ))
         except Exception as e:
             print(f"Błąd ładowania zadań: {e}")
             import traceback
             traceback.print_exc()
+    
+    def on_task_loader_ready(self, loader):
+        """Metadane wczytane w tle - model zaczyna pobierać strony zadań"""
+        self.task_loader = loader
+        self.category_color_map = loader.category_colors.copy()
+        self.populate_table()
+        # Skonfiguruj header po załadowaniu danych
+        self.configure_table_header()
+        # Zastosuj kolorowanie komórek po wszystkich konfiguracjach
+        self.apply_cell_coloring()
+    
+    def track_load_request(self, request):
+        """Pokazuje stan ładowania do zakończenia zapytania w tle"""
+        self._load_requests.add(request)
+        request.done.connect(lambda: self._on_load_request_done(request))
+        self.update_loading_state()
+    
+    def _on_load_request_done(self, request):
+        self._load_requests.discard(request)
+        self.update_loading_state()
+    
+    def update_loading_state(self, *args):
+        """Pokazuje etykietę ładowania, gdy w tle trwa zapytanie widoku lub pobieranie strony"""
+        self.loading_label.setVisible(bool(self._load_requests) or self.tasks_model.is_loading())
             
     def get_sample_tasks(self):
         """Zwraca przykładowe zadania (tymczasowo)"""
@@ -419,199 +414,26 @@ class TasksView(QWidget):
         return None
     
     def populate_table(self):
-        """Wypełnia tabelę zadaniami"""
-        filtered_tasks = self.filter_tasks_data()
-        self._row_task_ids = [task['id'] for task in filtered_tasks]
-
-        self._suspend_item_updates = True
-        try:
-            self.tasks_table.setRowCount(len(filtered_tasks))
-
-            for row, task in enumerate(filtered_tasks):
-                # ID
-                id_col = self.get_column_index("ID")
-                if id_col is not None:
-                    id_item = QTableWidgetItem(str(task['id']))
-                    id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.tasks_table.setItem(row, id_col, id_item)
-
-                # Data dodania
-                date_added_col = self.get_column_index("Data dodania")
-                if date_added_col is not None:
-                    date_value = task.get('date_added') or task.get('created_at')
-                    if date_value:
-                        if isinstance(date_value, str):
-                            date_str = date_value
-                        else:
-                            date_str = date_value.strftime("%d.%m.%Y %H:%M")
-                    else:
-                        date_str = ""
-                    date_item = QTableWidgetItem(date_str)
-                    date_item.setFlags(date_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.tasks_table.setItem(row, date_added_col, date_item)
-
-                # Status (checkbox)
-                status_col = self.get_column_index("Status")
-                if status_col is not None:
-                    status_widget = QCheckBox()
-                    status_widget.setChecked(task['status'])
-
-                    if task['status']:
-                        status_color = "background-color: rgba(46, 204, 113, 0.3);"
-                    else:
-                        status_color = "background-color: rgba(231, 76, 60, 0.3);"
-
-                    checkbox_style = self.theme_manager.get_checkbox_style() + status_color
-                    status_widget.setStyleSheet(checkbox_style)
-                    status_widget.stateChanged.connect(lambda state, task_id=task['id']: self.toggle_task_status(task_id, state))
-                    self.tasks_table.setCellWidget(row, status_col, status_widget)
-
-                # Zadanie
-                task_col = self.get_column_index("Zadanie")
-                if task_col is not None:
-                    task_item = QTableWidgetItem(task['task'])
-                    self.tasks_table.setItem(row, task_col, task_item)
-
-                # Notatka
-                note_col = self.get_column_index("Notatka")
-                if note_col is not None:
-                    note_btn = QPushButton("📝" if task['note_id'] else "➕")
-                    note_btn.setStyleSheet(self.theme_manager.get_button_style())
-                    note_btn.clicked.connect(lambda checked, task_id=task['id']: self.open_task_note(task_id))
-                    self.tasks_table.setCellWidget(row, note_col, note_btn)
-
-                # TAG
-                tag_col = self.get_column_index("TAG")
-                if tag_col is not None:
-                    tag_value = task.get('tag') or ""
-                    tag_item = QTableWidgetItem(tag_value)
-
-                    tag_color_hex = task.get('tag_color') if tag_value else None
-                    tag_item.setData(Qt.ItemDataRole.UserRole + 1, tag_color_hex)
-
-                    if tag_color_hex:
-                        base_color = QColor(tag_color_hex)
-                        tag_brush = QBrush(base_color)
-                        tag_item.setBackground(tag_brush)
-                        tag_item.setData(Qt.ItemDataRole.BackgroundRole, tag_brush)
-
-                        brightness = (base_color.red() * 299 + base_color.green() * 587 + base_color.blue() * 114) / 1000
-                        text_color = QColor("#000000") if brightness > 160 else QColor("#ffffff")
-                        tag_item.setForeground(text_color)
-                    else:
-                        default_text = self.theme_manager.get_current_colors().get('text_color', '#2c3e50')
-                        tag_item.setForeground(QColor(default_text))
-                        tag_item.setData(Qt.ItemDataRole.BackgroundRole, None)
-
-                    self.tasks_table.setItem(row, tag_col, tag_item)
-
-                # Data realizacji
-                completion_col = self.get_column_index("Data realizacji")
-                if completion_col is not None:
-                    date_completed = task.get('date_completed')
-                    if date_completed:
-                        if isinstance(date_completed, str):
-                            completion_date = date_completed
-                        else:
-                            completion_date = date_completed.strftime("%d.%m.%Y %H:%M")
-                    else:
-                        completion_date = ""
-                    completion_item = QTableWidgetItem(completion_date)
-                    completion_item.setFlags(completion_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.tasks_table.setItem(row, completion_col, completion_item)
-
-                # KanBan
-                kanban_col = self.get_column_index("KanBan")
-                if kanban_col is not None:
-                    # Sprawdź czy zadanie jest już w KanBan
-                    is_in_kanban = task.get('kanban', 0) == 1
-                    kanban_btn = QPushButton("✓ 📊" if is_in_kanban else "📊")
-                    kanban_btn.setStyleSheet(self.theme_manager.get_button_style())
-                    kanban_btn.clicked.connect(lambda checked, task_id=task['id'], in_kanban=is_in_kanban: self.toggle_kanban(task_id, in_kanban))
-                    self.tasks_table.setCellWidget(row, kanban_col, kanban_btn)
-
-                # Archiwum (checkbox)
-                archive_col = self.get_column_index("Archiwum")
-                if archive_col is not None:
-                    archive_widget = QCheckBox()
-                    archive_widget.setChecked(task.get('archived', False))
-                    archive_widget.setStyleSheet(self.theme_manager.get_checkbox_style())
-                    archive_widget.stateChanged.connect(lambda state, task_id=task['id']: self.toggle_task_archive(task_id, state))
-                    self.tasks_table.setCellWidget(row, archive_col, archive_widget)
-
-                # Ustaw kolor tła dla całego wiersza
-                self.set_row_background_color(row, task.get('tag_color'))
-
-                # Kolumny niestandardowe
-                for col in self.custom_columns:
-                    col_index = self.get_column_index(col["name"])
-                    if col_index is not None:
-                        value = task.get(col["name"], "")
-
-                        if col["type"] == "CheckBox":
-                            checkbox_widget = QCheckBox()
-                            checkbox_widget.setChecked(bool(value))
-                            checkbox_widget.setStyleSheet(self.theme_manager.get_checkbox_style())
-                            self.tasks_table.setCellWidget(row, col_index, checkbox_widget)
-                        else:
-                            item = QTableWidgetItem(str(value) if value else "")
-                            self.tasks_table.setItem(row, col_index, item)
-        finally:
-            self._suspend_item_updates = False
-
-        # Po wypełnieniu tabeli ponownie zastosuj kolorowanie komórek TAG
-        self.apply_cell_coloring()
-
-    def set_row_background_color(self, row, color_hex):
-        """Ustawia (lub czyści) kolor tła wiersza na podstawie tagu"""
+        """Wypełnia tabelę zadaniami - model pobiera strony z Database.query_tasks"""
+        filters = self.current_query_filters()
+        order_by = 'status' if self._auto_move_completed else 'created'
+        loader = self.task_loader
+        
+        def fetch_page(offset, limit):
+            return loader.query(limit=limit, offset=offset, order_by=order_by, **filters)
+        
         try:
-            status_col_index = self.get_column_index("Status")
-            tag_col_index = self.get_column_index("TAG")
-
-            if not color_hex:
-                # Usuń niestandardowe kolory tła
-                for col in range(self.tasks_table.columnCount()):
-                    if col == status_col_index or col == tag_col_index:
-                        continue
-
-                    item = self.tasks_table.item(row, col)
-                    if item:
-                        item.setBackground(QBrush())
-                        item.setData(Qt.ItemDataRole.BackgroundRole, None)
-                    else:
-                        widget = self.tasks_table.cellWidget(row, col)
-                        if widget:
-                            import re
-                            current_style = widget.styleSheet()
-                            current_style = re.sub(r'background-color:[^;]*;?', '', current_style)
-                            widget.setStyleSheet(current_style)
-                return
-
-            color = QColor(color_hex)
-            rgba_color = f"rgba({color.red()}, {color.green()}, {color.blue()}, 0.15)"
-
-            for col in range(self.tasks_table.columnCount()):
-                if col == status_col_index or col == tag_col_index:
-                    continue
-
-                item = self.tasks_table.item(row, col)
-                if item:
-                    bg_color = QColor(color_hex)
-                    bg_color.setAlpha(40)
-                    item.setBackground(bg_color)
-                    item.setData(Qt.ItemDataRole.BackgroundRole, bg_color)
-                else:
-                    widget = self.tasks_table.cellWidget(row, col)
-                    if widget:
-                        import re
-                        current_style = widget.styleSheet()
-                        current_style = re.sub(r'background-color:[^;]*;?', '', current_style)
-                        widget.setStyleSheet(f"{current_style}; background-color: {rgba_color};")
+            # Liczba wierszy w tle - nowszy filtr anuluje wynik poprzedniego
+            self.track_load_request(self.async_db.submit_latest(
+                ('tasks-count', id(self)), self.db_manager.count_tasks,
+                on_result=lambda total: self.tasks_model.set_source(fetch_page, total),
+                **filters
+            ))
         except Exception as e:
-            print(f"Błąd ustawiania koloru tła wiersza {row}: {e}")
+            print(f"Błąd pobierania zadań: {e}")
             import traceback
             traceback.print_exc()
-    
+
     def get_color_for_tag(self, tag_name):
         """Zwraca kolor HEX przypisany do tagu lub fallback"""
         if not tag_name:
@@ -627,62 +449,71 @@ class TasksView(QWidget):
 
         return "#3498db"
 
-    def on_task_item_changed(self, item):
-        """Reaguje na zmianę wartości komórki (np. zmiana TAGu)"""
-        if self._suspend_item_updates:
-            return
-
-        row = item.row()
-        col = item.column()
-
-        if row >= len(self._row_task_ids):
+    def find_task(self, task_id):
+        """Zwraca słownik pobranego zadania z modelu tabeli lub None"""
+        row = self.tasks_model.row_for_task(task_id)
+        return self.tasks_model.task_at(row) if row is not None else None
+
+    def on_task_check_toggled(self, task_id, column_name, state):
+        """Reaguje na kliknięcie checkboxa w tabeli"""
+        if column_name == "Status":
+            self.toggle_task_status(task_id, state)
+        elif column_name == "Archiwum":
+            self.toggle_task_archive(task_id, state)
+        else:
+            self.set_custom_column_value(task_id, column_name, 1 if state == Qt.CheckState.Checked.value else 0)
+
+    def on_task_button_clicked(self, task_id, column_name):
+        """Reaguje na kliknięcie przycisku w tabeli (Notatka / KanBan)"""
+        if column_name == "Notatka":
+            self.open_task_note(task_id)
+        elif column_name == "KanBan":
+            task = self.find_task(task_id)
+            in_kanban = task is not None and task.get('kanban', 0) == 1
+            self.toggle_kanban(task_id, in_kanban)
+
+    def on_task_cell_edited(self, task_id, column_name, value):
+        """Reaguje na edycję komórki (np. zmiana TAGu)"""
+        task = self.find_task(task_id)
+        if task is None:
             return
 
-        if col >= len(self.visible_columns):
+        if column_name == "Zadanie":
+            title = str(value or "").strip()
+            if not title:
+                return
+            try:
+                self.db_manager.update_task(task_id, title=title)
+            except Exception as e:
+                print(f"Błąd aktualizacji treści zadania {task_id}: {e}")
             return
 
-        column_name = self.visible_columns[col]["name"]
         if column_name != "TAG":
+            self.set_custom_column_value(task_id, column_name, value)
             return
 
-        task_id = self._row_task_ids[row]
-        tag_value = (item.text() or "").strip()
-        color_hex = self.get_color_for_tag(tag_value) if tag_value else None
-
-        default_text = self.theme_manager.get_current_colors().get('text_color', '#2c3e50')
+        tag_value = str(value or "").strip()
 
-        self._suspend_item_updates = True
+        # Zapisz zmianę w bazie danych - wiersz z nowym kolorem podmieni on_tasks_changed
         try:
-            if color_hex:
-                color = QColor(color_hex)
-                brush = QBrush(color)
-                item.setData(Qt.ItemDataRole.BackgroundRole, brush)
-                item.setBackground(brush)
+            self.db_manager.update_task(task_id, category=tag_value if tag_value else None)
+        except Exception as e:
+            print(f"Błąd aktualizacji tagu zadania {task_id}: {e}")
 
-                brightness = (color.red() * 299 + color.green() * 587 + color.blue() * 114) / 1000
-                text_color = QColor("#000000") if brightness > 160 else QColor("#ffffff")
-                item.setForeground(text_color)
-                self.set_row_background_color(row, color_hex)
-            else:
-                item.setData(Qt.ItemDataRole.BackgroundRole, None)
-                item.setBackground(QBrush())
-                item.setForeground(QColor(default_text))
-                self.set_row_background_color(row, None)
-        finally:
-            self._suspend_item_updates = False
+    def set_custom_column_value(self, task_id, column_name, value):
+        """Zapisuje wartość kolumny użytkownika w tabeli task_column_values"""
+        column = next((c for c in self.custom_columns if c["name"] == column_name), None)
+        if column is None:
+            return
 
-        # Zaktualizuj lokalne dane zadania
-        for task in self.current_tasks:
-            if task['id'] == task_id:
-                task['tag'] = tag_value if tag_value else None
-                task['tag_color'] = color_hex
-                break
+        task = self.find_task(task_id)
+        if task is not None:
+            task[column_name] = value
 
-        # Zapisz zmianę w bazie danych
         try:
-            self.db_manager.update_task(task_id, category=tag_value if tag_value else None)
+            self.db_manager.set_task_column_value(task_id, column["id"], value)
         except Exception as e:
-            print(f"Błąd aktualizacji tagu zadania {task_id}: {e}")
+            print(f"Błąd zapisu kolumny {column_name} zadania {task_id}: {e}")
 
     def toggle_task_archive(self, task_id, state):
         """Przełącza status archiwizacji zadania"""
@@ -690,64 +521,199 @@ class TasksView(QWidget):
             archived = (state == Qt.CheckState.Checked.value)
             print(f"Zadanie {task_id} - Archiwum: {archived}")
             
-            # Zapisz status archiwizacji w bazie danych
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE tasks SET archived = ? WHERE id = ?', (1 if archived else 0, task_id))
-                conn.commit()
-            
-            # Aktualizuj lokalnie
-            for task in self.current_tasks:
-                if task['id'] == task_id:
-                    task['archived'] = archived
-                    break
-            
-            # Odśwież widok jeśli filtr nie pokazuje zarchiwizowanych
-            status_filter = self.status_filter.currentText()
-            if status_filter != "Zarchiwizowane" and archived:
-                self.populate_table()
+            # Zapisz status archiwizacji w bazie danych (wiersz zaktualizuje on_tasks_changed)
+            self.db_manager.update_task(task_id, archived=1 if archived else 0)
             
         except Exception as e:
             print(f"Błąd zmiany statusu archiwizacji: {e}")
             import traceback
             traceback.print_exc()
     
-    def filter_tasks_data(self):
-        """Filtruje zadania według ustawionych kryteriów"""
-        filtered = self.current_tasks.copy()
+    def build_task_filter(self):
+        """Zwraca funkcję sprawdzającą, czy zadanie spełnia ustawione filtry"""
+        status_filter = self.status_filter.currentText()
+        tag_filter = self.tag_filter.currentText()
+        # Ta sama funkcja co w filtrze SQL (Database.query_tasks)
+        search_text = fold_case(self.search_input.text().strip())
+        
+        def matches(task):
+            archived = task.get('archived', False)
+            if status_filter == "Aktywne":
+                # Aktywne = niezakończone i niezarchiwizowane
+                if task['status'] or archived:
+                    return False
+            elif status_filter == "Zakończone":
+                # Zakończone = zakończone ale niezarchiwizowane
+                if not task['status'] or archived:
+                    return False
+            elif status_filter == "Zarchiwizowane":
+                # Tylko zarchiwizowane
+                if not archived:
+                    return False
+            elif archived:  # "Wszystkie" - wszystkie bez zarchiwizowanych
+                return False
+            
+            # Filtr TAG
+            if tag_filter != "Wszystkie" and task['tag'] != tag_filter:
+                return False
+            
+            # Filtr wyszukiwania
+            if search_text and search_text not in fold_case(task['task'] or ''):
+                return False
+            return True
         
-        # Filtr statusu
+        return matches
+    
+    def set_auto_move_completed(self, enabled):
+        """Włącza/wyłącza przenoszenie ukończonych zadań pod nieukończone"""
+        if self._auto_move_completed != enabled:
+            self._auto_move_completed = enabled
+            self.populate_table()
+    
+    def current_query_filters(self):
+        """Zwraca filtry Database.query_tasks odpowiadające kontrolkom widoku"""
+        filters = {}
         status_filter = self.status_filter.currentText()
         if status_filter == "Aktywne":
-            # Aktywne = niezakończone i niezarchiwizowane
-            filtered = [task for task in filtered if not task['status'] and not task.get('archived', False)]
+            filters['status'] = 'open'
+            filters['archived'] = False
         elif status_filter == "Zakończone":
-            # Zakończone = zakończone ale niezarchiwizowane
-            filtered = [task for task in filtered if task['status'] and not task.get('archived', False)]
+            filters['status'] = 'completed'
+            filters['archived'] = False
         elif status_filter == "Zarchiwizowane":
-            # Tylko zarchiwizowane
-            filtered = [task for task in filtered if task.get('archived', False)]
-        else:  # "Wszystkie"
-            # Wszystkie bez zarchiwizowanych
-            filtered = [task for task in filtered if not task.get('archived', False)]
-            
-        # Filtr TAG
+            filters['archived'] = True
+        else:  # "Wszystkie" - wszystkie bez zarchiwizowanych
+            filters['archived'] = False
+        
         tag_filter = self.tag_filter.currentText()
         if tag_filter != "Wszystkie":
-            filtered = [task for task in filtered if task['tag'] == tag_filter]
-            
-        # Filtr wyszukiwania
-        search_text = self.search_input.text().lower()
+            filters['tag'] = tag_filter
+        
+        search_text = self.search_input.text().strip()
         if search_text:
-            filtered = [task for task in filtered if search_text in task['task'].lower()]
+            filters['text'] = search_text
+        return filters
+    
+    @staticmethod
+    def _auto_move_sort_key(task):
+        return (task['status'], task['id'])
+    
+    def _on_database_event(self, table, kind, task_ids):
+        """Odbiera zdarzenie z szyny bazy (w wątku, który zapisał zmianę)"""
+        if table == 'tasks':
+            self.tasks_changed_in_db.emit(kind, list(task_ids))
+        elif table == SETTINGS_TABLE:
+            self.settings_changed_in_db.emit(list(task_ids))
+    
+    def on_settings_changed(self, keys):
+        """Reaguje na zmianę ustawień zapisanych w app_settings"""
+        if 'task_auto_move_completed' in keys:
+            self.set_auto_move_completed(self.db_manager.settings.get_bool('task_auto_move_completed'))
+    
+    def on_tasks_changed(self, kind, task_ids):
+        """Aktualizuje w miejscu tylko wiersze zadań, których dotyczy zmiana
         
-        # Automatyczne przenoszenie ukończonych pod nieukończone
-        auto_move = self.db_manager.get_setting('task_auto_move_completed', '0')
-        if auto_move == '1':
-            # Sortuj: nieukończone (False) na górze, ukończone (True) na dole
-            filtered.sort(key=lambda t: (t['status'], t['id']))
+        Zmienione zadania są pobierane w tle - zdarzenia przychodzące w trakcie
+        pobierania dołączają do jednego zapytania (submit_latest).
+        """
+        try:
+            if kind == DELETE:
+                not_loaded = [task_id for task_id in task_ids if self.tasks_model.row_for_task(task_id) is None]
+                self.tasks_model.remove_tasks(task_ids)
+                # Usunięcie zadań spoza pobranych stron zmienia tylko licznik wierszy
+                if not_loaded:
+                    self.refresh_total_count()
+                return
             
-        return filtered
+            self._changed_task_ids.update(task_ids)
+            self.async_db.submit_latest(
+                ('tasks-changed', id(self)), self.load_changed_tasks, sorted(self._changed_task_ids),
+                on_result=self.on_changed_tasks_loaded,
+            )
+        except Exception as e:
+            print(f"Błąd aktualizacji wierszy zadań {task_ids}: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def load_changed_tasks(self, task_ids):
+        """Pobiera zmienione zadania (w wątku puli AsyncDatabase)
+        
+        Returns:
+            tuple: (task_ids, lista zadań w formacie TaskLoader, kolory kategorii)
+        """
+        loader = TaskLoader(self.db_manager)
+        return task_ids, loader.load(task_ids), loader.category_colors
+    
+    def on_changed_tasks_loaded(self, result):
+        """Wstawia, podmienia lub usuwa wiersze zadań pobranych w tle"""
+        task_ids, tasks, category_colors = result
+        try:
+            self._changed_task_ids.difference_update(task_ids)
+            loaded = {task['id']: task for task in tasks}
+            self.category_color_map.update(category_colors)
+            
+            matches = self.build_task_filter()
+            # Zadania usunięte w międzyczasie lub niepasujące do filtrów (np. po
+            # archiwizacji) znikają z tabeli jednym przebiegiem
+            self.tasks_model.remove_tasks([
+                task_id for task_id in task_ids
+                if task_id not in loaded or not matches(loaded[task_id])
+            ])
+            for task_id in task_ids:
+                task = loaded.get(task_id)
+                if task is not None and matches(task):
+                    self._apply_task_locally(task, matches)
+            
+            # Zmiana zadań spoza pobranych stron zmienia tylko licznik wierszy
+            if any(self.tasks_model.row_for_task(task_id) is None for task_id in task_ids):
+                self.refresh_total_count()
+        except Exception as e:
+            print(f"Błąd aktualizacji wierszy zadań {task_ids}: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def refresh_total_count(self):
+        """Przelicza w tle liczbę wszystkich zadań spełniających filtry tabeli"""
+        self.async_db.submit_latest(
+            ('tasks-total', id(self)), self.db_manager.count_tasks,
+            on_result=self.tasks_model.set_total,
+            **self.current_query_filters()
+        )
+    
+    def _apply_task_locally(self, task, matches):
+        """Wstawia, podmienia lub usuwa wiersz zadania w modelu tabeli"""
+        row = self.tasks_model.row_for_task(task['id'])
+        if not matches(task):
+            if row is not None:
+                self.tasks_model.remove_task(task['id'])
+            return
+        
+        if row is not None:
+            old_task = self.tasks_model.task_at(row)
+            if not self._auto_move_completed or old_task['status'] == task['status']:
+                self.tasks_model.replace_task(task)
+                return
+            # Zmiana statusu przy auto-przenoszeniu - wiersz zmienia pozycję
+            self.tasks_model.remove_task(task['id'])
+        
+        self.tasks_model.insert_task(self._insertion_row(task), task)
+    
+    def _insertion_row(self, task):
+        """Wyznacza wiersz dla zadania zgodnie z bieżącym sortowaniem tabeli"""
+        rows = self.tasks_model.rows()
+        if self._auto_move_completed:
+            key = self._auto_move_sort_key(task)
+            for row, other in enumerate(rows):
+                if self._auto_move_sort_key(other) > key:
+                    return row
+            return len(rows)
+        
+        # Domyślnie: od najnowszych (data dodania malejąco)
+        key = (task.get('date_added') or '', task['id'])
+        for row, other in enumerate(rows):
+            if (other.get('date_added') or '', other['id']) < key:
+                return row
+        return len(rows)
         
     def filter_tasks(self):
         """Odświeża tabelę z filtrami"""
@@ -755,38 +721,38 @@ class TasksView(QWidget):
         
     def toggle_task_status(self, task_id, state):
         """Przełącza status zadania"""
-        task = None
-        for t in self.current_tasks:
-            if t['id'] == task_id:
-                task = t
-                is_completed = (state == Qt.CheckState.Checked.value)
-                task['status'] = is_completed
-                
-                # Ustaw datę realizacji
-                if is_completed:
-                    task['date_completed'] = datetime.datetime.now()
-                    completion_date = task['date_completed'].strftime("%Y-%m-%d %H:%M:%S")
-                else:
-                    task['date_completed'] = None
-                    completion_date = None
-                
-                # Zapisz zmiany do bazy danych
-                try:
-                    self.db_manager.update_task(task_id, status=is_completed, date_completed=completion_date)
-                    print(f"DEBUG: Zaktualizowano status zadania {task_id}: {is_completed}, data realizacji: {completion_date}")
-                except Exception as e:
-                    print(f"Błąd aktualizacji zadania {task_id}: {e}")
-                
-                break
-                
-        if task:
-            self.populate_table()
-            self.load_existing_tags()
-            self.task_updated.emit(task['id'], task)
+        task = self.find_task(task_id)
+        if task is None:
+            return
+        
+        is_completed = (state == Qt.CheckState.Checked.value)
+        
+        # Zapisz zmiany do bazy danych - data realizacji to updated_at ukończonego zadania
+        try:
+            self.db_manager.update_task(task_id, status='completed' if is_completed else 'todo')
+            print(f"DEBUG: Zaktualizowano status zadania {task_id}: {is_completed}")
+        except Exception as e:
+            print(f"Błąd aktualizacji zadania {task_id}: {e}")
+            return
+        
+        # Wiersz podmieni dopiero przeładowanie w tle (on_changed_tasks_loaded) -
+        # słuchacze dostają zadanie z nowym statusem od razu. updated_at w bazie
+        # to CURRENT_TIMESTAMP (UTC), jak data realizacji z TaskLoader
+        updated_task = dict(task)
+        updated_task['status'] = is_completed
+        updated_task['kanban_status'] = 'DONE' if is_completed else 'TODO'
+        updated_task['date_completed'] = (
+            datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            if is_completed else None
+        )
+        self.task_updated.emit(task_id, updated_task)
         
     def load_existing_tags(self):
         """Ładuje istniejące tagi do filtra"""
-        existing_tags = list(set([task['tag'] for task in self.current_tasks if task['tag']]))
+        with self.db_manager.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT category FROM tasks WHERE category IS NOT NULL AND category != ''")
+            existing_tags = [row[0] for row in cursor.fetchall()]
         
         self.tag_filter.clear()
         self.tag_filter.addItem("Wszystkie")
@@ -806,14 +772,8 @@ class TasksView(QWidget):
             
             print(f"Zadanie {task_id} {action} KanBan")
             
-            # Aktualizuj flagę kanban w bazie danych
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('UPDATE tasks SET kanban = ? WHERE id = ?', (new_kanban_value, task_id))
-                conn.commit()
-            
-            # Odśwież widok zadań aby pokazać zmianę
-            self.load_tasks()
+            # Aktualizuj flagę kanban w bazie danych (wiersz zaktualizuje on_tasks_changed)
+            self.db_manager.update_task(task_id, kanban=new_kanban_value)
             
             print(f"Zadanie {task_id} - flaga kanban ustawiona na {new_kanban_value}")
         except Exception as e:
@@ -823,7 +783,7 @@ class TasksView(QWidget):
         
     def show_context_menu(self, position):
         """Pokazuje menu kontekstowe dla tabeli"""
-        if self.tasks_table.itemAt(position) is None:
+        if not self.tasks_table.indexAt(position).isValid():
             return
             
         menu = QMenu(self)
@@ -863,10 +823,10 @@ class TasksView(QWidget):
         row = self.tasks_table.rowAt(position.y())
         print(f"DEBUG: Wiersz: {row}")
         
-        if row >= 0 and row < len(self._row_task_ids):
-            # Pobierz ID zadania z mapy wiersz -> ID
-            task_id = self._row_task_ids[row]
-            print(f"DEBUG: Zadanie ID z _row_task_ids: {task_id}")
+        task = self.tasks_model.task_at(row)
+        if task is not None:
+            task_id = task['id']
+            print(f"DEBUG: Zadanie ID z modelu: {task_id}")
             
             if action == edit_action:
                 self.edit_task(task_id)
@@ -876,20 +836,12 @@ class TasksView(QWidget):
                 self.open_task_note(task_id)
             elif action == kanban_action:
                 # Pobierz aktualny stan kanban dla zadania
-                current_kanban = False
-                for task in self.current_tasks:
-                    if task['id'] == task_id:
-                        current_kanban = task.get('kanban', 0) == 1
-                        break
+                current_kanban = task.get('kanban', 0) == 1
                 self.toggle_kanban(task_id, current_kanban)
             elif action == archive_action:
                 print(f"DEBUG: ARCHIVE_ACTION wykryty!")
                 # Pobierz aktualny stan archiwizacji dla zadania
-                current_archived = False
-                for task in self.current_tasks:
-                    if task['id'] == task_id:
-                        current_archived = task.get('archived', False)
-                        break
+                current_archived = task.get('archived', False)
                 print(f"DEBUG: Archiwizacja zadania {task_id}, aktualny stan: {current_archived}")
                 # Jeśli zadanie nie jest zarchiwizowane, zaarchiwizuj (Checked)
                 # Jeśli jest zarchiwizowane, odarchiwizuj (Unchecked)
@@ -912,13 +864,8 @@ class TasksView(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            # Usuń z bazy danych
+            # Usuń z bazy danych (wiersz usunie on_tasks_changed)
             self.db_manager.delete_task(task_id)
-            
-            # Usuń z lokalnej listy
-            self.current_tasks = [task for task in self.current_tasks if task['id'] != task_id]
-            self.populate_table()
-            self.load_existing_tags()
             self.task_deleted.emit(task_id)
             print(f"Usunięto zadanie {task_id} z bazy danych")
             
@@ -934,41 +881,39 @@ class TasksView(QWidget):
 
             # Pobierz tagi z listy słownikowej
             try:
-                conn = self.db_manager.get_connection()
-                cursor = conn.cursor()
+                with self.db_manager.connection() as conn:
+                    cursor = conn.cursor()
                 
-                # Pobierz ID listy słownikowej dla kolumny TAG
-                cursor.execute("SELECT dictionary_list_id FROM task_columns WHERE name='TAG'")
-                result = cursor.fetchone()
+                    # Pobierz ID listy słownikowej dla kolumny TAG
+                    cursor.execute("SELECT dictionary_list_id FROM task_columns WHERE name='TAG'")
+                    result = cursor.fetchone()
                 
-                if result and result[0]:
-                    tag_list_id = result[0]
+                    if result and result[0]:
+                        tag_list_id = result[0]
                     
-                    # Pobierz tagi z listy słownikowej
-                    cursor.execute("""
-                        SELECT id, value FROM dictionary_list_items 
-                        WHERE list_id = ? 
-                        ORDER BY order_index
-                    """, (tag_list_id,))
+                        # Pobierz tagi z listy słownikowej
+                        cursor.execute("""
+                            SELECT id, value FROM dictionary_list_items 
+                            WHERE list_id = ? 
+                            ORDER BY order_index
+                        """, (tag_list_id,))
                     
-                    tags = cursor.fetchall()
+                        tags = cursor.fetchall()
                     
-                    # Kolory domyślne (bo lista słownikowa nie ma kolorów)
-                    default_colors = ['#e74c3c', '#f39c12', '#3498db', '#2ecc71', '#9b59b6', '#1abc9c', '#34495e']
+                        # Kolory domyślne (bo lista słownikowa nie ma kolorów)
+                        default_colors = ['#e74c3c', '#f39c12', '#3498db', '#2ecc71', '#9b59b6', '#1abc9c', '#34495e']
                     
-                    for i, (tag_id, tag_name) in enumerate(tags):
-                        if tag_name:
-                            tag_entries.append({
-                                "id": tag_id,
-                                "name": tag_name,
-                                "color": default_colors[i % len(default_colors)]
-                            })
+                        for i, (tag_id, tag_name) in enumerate(tags):
+                            if tag_name:
+                                tag_entries.append({
+                                    "id": tag_id,
+                                    "name": tag_name,
+                                    "color": default_colors[i % len(default_colors)]
+                                })
                     
-                    print(f"DEBUG: Załadowano {len(tag_entries)} tagów z listy słownikowej ID={tag_list_id}")
-                else:
-                    print("UWAGA: Kolumna TAG nie ma przypisanej listy słownikowej")
-                
-                conn.close()
+                        print(f"DEBUG: Załadowano {len(tag_entries)} tagów z listy słownikowej ID={tag_list_id}")
+                    else:
+                        print("UWAGA: Kolumna TAG nie ma przypisanej listy słownikowej")
             except Exception as fetch_exc:
                 print(f"Błąd pobierania tagów z listy słownikowej: {fetch_exc}")
                 import traceback
@@ -1071,44 +1016,9 @@ class TasksView(QWidget):
             traceback.print_exc()
     
     def apply_cell_coloring(self):
-        """Stosuje kolorowanie komórek po wypełnieniu tabeli"""
+        """Odświeża kolory komórek (liczone przez model przy malowaniu)"""
         try:
-            tag_col = self.get_column_index("TAG")
-            if tag_col is None:
-                return
-            default_text = self.theme_manager.get_current_colors().get('text_color', '#2c3e50')
-
-            self._suspend_item_updates = True
-            try:
-                for row in range(self.tasks_table.rowCount()):
-                    tag_item = self.tasks_table.item(row, tag_col)
-                    if not tag_item:
-                        continue
-
-                    tag_value = (tag_item.text() or "").strip()
-                    tag_color_hex = tag_item.data(Qt.ItemDataRole.UserRole + 1)
-                    if not tag_color_hex and tag_value:
-                        tag_color_hex = self.get_color_for_tag(tag_value)
-                        tag_item.setData(Qt.ItemDataRole.UserRole + 1, tag_color_hex)
-
-                    if tag_value and tag_color_hex:
-                        base_color = QColor(tag_color_hex)
-                        tag_brush = QBrush(base_color)
-                        tag_item.setBackground(tag_brush)
-                        tag_item.setData(Qt.ItemDataRole.BackgroundRole, tag_brush)
-
-                        brightness = (base_color.red() * 299 + base_color.green() * 587 + base_color.blue() * 114) / 1000
-                        text_color = QColor("#000000") if brightness > 160 else QColor("#ffffff")
-                        tag_item.setForeground(text_color)
-                        self.set_row_background_color(row, tag_color_hex)
-                    else:
-                        tag_item.setData(Qt.ItemDataRole.BackgroundRole, None)
-                        tag_item.setBackground(QBrush())
-                        tag_item.setForeground(QColor(default_text))
-                        self.set_row_background_color(row, None)
-            finally:
-                self._suspend_item_updates = False
-                        
+            self.tasks_model.update_theme_colors()
         except Exception as e:
             print(f"Błąd stosowania kolorowania komórek: {e}")
             import traceback
@@ -0,0 +1,511 @@
+"""
+Model danych tabeli użytkownika (QAbstractTableModel)
+
+Wiersze są pobierane stronami (Database.iter_table_rows) dopiero, gdy widok
+o nie poprosi przez canFetchMore/fetchMore - otwarcie tabeli z milionem
+rekordów czyta tylko pierwszą stronę. Pamięć ogranicza budżet wierszy:
+najdawniej oglądane strony są zwalniane i pobierane ponownie, gdy widok
+do nich wróci. Na końcu tabeli jest pusty wiersz do dodawania nowych
+rekordów (pokazywany, gdy pobrano już wszystkie strony). Z ustawionym
+async_db (AsyncDatabase) strony są pobierane w puli wątków - wiersze
+dochodzą, gdy strona przyjdzie, a zwolniona strona jest do tego czasu
+pusta i nieedytowalna. Błąd pobierania strony (np. baza zablokowana) nie
+zmienia liczby wierszy - model zgłasza load_failed i ponawia pobranie
+po LOAD_RETRY_MS.
+"""
+from collections import OrderedDict
+from functools import partial
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSignal
+
+from .tasks_table_model import is_truthy
+
+
+# Klucz identyfikatora wiersza w słownikach z Database.iter_table_rows
+ROW_ID_KEY = '_row_id'
+
+
+class UserTableModel(QAbstractTableModel):
+    """Model tabeli użytkownika - słowniki {'_row_id', nazwa kolumny: wartość}"""
+
+    # Wiersz zmieniony przez użytkownika (zapis do bazy robi okno główne)
+    row_edited = pyqtSignal(int)  # numer wiersza
+    # Strona wierszy pobierana w tle (True) / wszystkie zlecone strony pobrane (False)
+    loading_changed = pyqtSignal(bool)
+    # Nie udało się pobrać strony wierszy (komunikat błędu) - ponowienie po LOAD_RETRY_MS
+    load_failed = pyqtSignal(str)
+
+    # Domyślna liczba wierszy pobieranych w jednej stronie
+    FETCH_BATCH_SIZE = 500
+    # Domyślny budżet pamięci - ile wierszy trzymać (None = bez limitu)
+    MAX_CACHED_ROWS = 20000
+    # Minimalna liczba stron w pamięci (widoczny obszar może obejmować dwie strony)
+    MIN_CACHED_PAGES = 3
+    # Po ilu milisekundach ponowić pobranie stron po błędzie
+    LOAD_RETRY_MS = 5000
+
+    def __init__(self, parent=None, batch_size=None, max_cached_rows=MAX_CACHED_ROWS):
+        super().__init__(parent)
+        self.batch_size = batch_size or self.FETCH_BATCH_SIZE
+        self.max_cached_rows = max_cached_rows
+        self._columns = []
+        self._pages = OrderedDict()  # numer strony -> wiersze (od najdawniej używanej)
+        self._loaded = 0  # Liczba wierszy udostępnionych widokowi przez fetchMore
+        self._draft = {}  # Pusty wiersz do dodawania nowego rekordu
+        self._fetch_page = None  # Funkcja (offset, limit) -> lista wierszy
+        self._static_rows = None  # Lista wierszy z set_rows (dopisywane są do niej nowe rekordy)
+        self._total = 0  # Liczba wszystkich wierszy źródła
+        self._page_loads = 0  # Liczba pobranych stron (także ponownie po zwolnieniu)
+        self.async_db = None  # AsyncDatabase - strony pobierane poza wątkiem GUI
+        self._source_async_db = None  # async_db źródła ustawionego przez set_source
+        self._page_requests = {}  # numer strony -> trwające pobieranie w tle
+        self._awaiting_source = False  # begin_loading() - źródło jeszcze nieustawione
+        self._loading = False  # Ostatnio wysłany stan loading_changed
+        self._load_error = None  # Komunikat ostatniego błędu pobierania strony
+        self._failed_pages = set()  # Strony do ponownego pobrania po błędzie
+        self._retry_timer = None
+
+    # === Dane modelu ===
+
+    def set_columns(self, columns):
+        """Ustawia kolumny (słowniki z kluczami name, type, default_value, editable)"""
+        self.beginResetModel()
+        self._columns = list(columns)
+        self._draft = self._new_draft()
+        self.endResetModel()
+
+    def set_paging(self, batch_size=None, max_cached_rows=MAX_CACHED_ROWS):
+        """Zmienia rozmiar strony i budżet pamięci - wywoływać przed set_source
+
+        Args:
+            batch_size: Liczba wierszy w stronie (None = FETCH_BATCH_SIZE)
+            max_cached_rows: Ile wierszy trzymać w pamięci (None = bez limitu)
+        """
+        self.batch_size = batch_size or self.FETCH_BATCH_SIZE
+        self.max_cached_rows = max_cached_rows
+
+    def set_source(self, fetch_page, total):
+        """Ustawia źródło stron wierszy - od razu pobierana jest tylko pierwsza strona
+
+        Z ustawionym async_db model jest po resecie pusty, a pierwsza strona
+        dochodzi po pobraniu w tle.
+
+        Args:
+            fetch_page: Funkcja (offset, limit) zwracająca listę słowników wierszy
+            total: Liczba wszystkich wierszy w źródle
+        """
+        self._reset_source(fetch_page, total, self.async_db)
+
+    def set_rows(self, rows):
+        """Ustawia gotową listę wierszy (np. dane przykładowe bez tabeli w bazie)"""
+        rows = list(rows)
+        self._reset_source(lambda offset, limit: rows[offset:offset + limit], len(rows), None)
+        self._static_rows = rows
+
+    def begin_loading(self):
+        """Usuwa wiersze poprzedniego źródła do czasu set_source
+
+        Używane, gdy liczba wierszy nowego źródła jest liczona w tle - model
+        jest pusty (także bez pustego wiersza), więc nie da się edytować
+        wierszy poprzedniej tabeli.
+        """
+        self._cancel_page_requests()
+        self._clear_load_error()
+        self.beginResetModel()
+        self._fetch_page = None
+        self._static_rows = None
+        self._total = 0
+        self._pages = OrderedDict()
+        self._loaded = 0
+        self._awaiting_source = True
+        self.endResetModel()
+        self._update_loading()
+
+    def _reset_source(self, fetch_page, total, async_db):
+        self._cancel_page_requests()
+        self._clear_load_error()
+        self._awaiting_source = False
+        self.beginResetModel()
+        self._fetch_page = fetch_page
+        self._source_async_db = async_db
+        self._static_rows = None
+        self._total = total
+        self._pages = OrderedDict()
+        self._loaded = 0
+        self._page_loads = 0
+        if total and async_db is None:
+            first_page = self._try_load_page(0)
+            self._loaded = len(first_page or [])
+        self._draft = self._new_draft()
+        self.endResetModel()
+        if total and async_db is not None:
+            self._request_page(0)
+        self._update_loading()
+
+    def is_loading(self):
+        """Czy model czeka na źródło lub stronę wierszy pobieraną w tle"""
+        return self._awaiting_source or bool(self._page_requests)
+
+    def clear(self):
+        """Usuwa kolumny i wiersze"""
+        self._cancel_page_requests()
+        self._clear_load_error()
+        self._awaiting_source = False
+        self.beginResetModel()
+        self._columns = []
+        self._pages = OrderedDict()
+        self._loaded = 0
+        self._draft = {}
+        self._fetch_page = None
+        self._static_rows = None
+        self._total = 0
+        self.endResetModel()
+        self._update_loading()
+
+    def columns(self):
+        """Zwraca listę konfiguracji kolumn"""
+        return self._columns
+
+    def column_name(self, column):
+        """Zwraca nazwę kolumny o podanym indeksie"""
+        if 0 <= column < len(self._columns):
+            return self._columns[column]['name']
+        return None
+
+    def load_error(self):
+        """Komunikat błędu pobierania strony (None, gdy strony pobierają się poprawnie)"""
+        return self._load_error
+
+    def total_count(self):
+        """Liczba wszystkich wierszy źródła (także jeszcze niepobranych)"""
+        return self._total
+
+    def cache_stats(self):
+        """Zwraca stan pamięci modelu: {'cached_rows', 'cached_pages', 'loaded_rows', 'page_loads'}"""
+        return {
+            'cached_rows': sum(len(page) for page in self._pages.values()),
+            'cached_pages': len(self._pages),
+            'loaded_rows': self._loaded,
+            'page_loads': self._page_loads,
+        }
+
+    def row_values(self, row):
+        """Zwraca wartości kolumn wiersza (bez '_row_id') do zapisu w bazie"""
+        data = self._row_dict(row)
+        if data is None:
+            return {}
+        return {column['name']: data.get(column['name']) for column in self._columns}
+
+    def row_id(self, row):
+        """Zwraca id wiersza w bazie lub None (pusty wiersz / dane bez bazy)"""
+        data = self._row_dict(row)
+        return data.get(ROW_ID_KEY) if data is not None else None
+
+    def is_draft_row(self, row):
+        """Czy to pusty wiersz do dodawania nowego rekordu"""
+        return self._has_draft_row() and row == self._loaded
+
+    def draft_row(self):
+        """Numer pustego wiersza lub -1, gdy nie jest jeszcze widoczny"""
+        return self._loaded if self._has_draft_row() else -1
+
+    def is_row_filled(self, row):
+        """Sprawdza czy wiersz ma wypełnioną edytowalną kolumnę tekstową"""
+        data = self._row_dict(row)
+        if data is None:
+            return False
+        for column in self._columns:
+            if column.get('editable', True) and column.get('type', 'Tekstowa') == 'Tekstowa':
+                value = data.get(column['name'])
+                if value is not None and str(value).strip() != "":
+                    return True
+        return False
+
+    def commit_draft(self, row_id=None):
+        """Zamienia pusty wiersz w zwykły rekord i dodaje nowy pusty wiersz
+
+        Args:
+            row_id: Id wstawionego wiersza w bazie (None dla danych bez bazy)
+        """
+        if not self._has_draft_row():
+            return
+        row = self._loaded
+        record = self._draft
+        record[ROW_ID_KEY] = row_id
+        if self._static_rows is not None:
+            self._static_rows.append(record)
+        page_no, page_row = divmod(row, self.batch_size)
+        page = self._pages.get(page_no)
+        if page is not None and len(page) == page_row:
+            page.append(record)
+        elif page_row == 0:
+            self._store_page(page_no, [record])
+        # Zwolniona strona zostanie pobrana ponownie - już z nowym rekordem
+        self._loaded += 1
+        self._total += 1
+        self._draft = self._new_draft()
+        # Dotychczasowy pusty wiersz zostaje rekordem, nowy pusty wiersz dochodzi na końcu
+        self.beginInsertRows(QModelIndex(), row + 1, row + 1)
+        self.endInsertRows()
+        if self._columns:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._columns) - 1))
+
+    # === Stronicowanie ===
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._load_error is not None:
+            return False  # Po błędzie kolejne strony dopiero po ponowieniu
+        return not self._all_rows_loaded()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch_page is None:
+            return
+        offset = self._loaded
+        if self._source_async_db is not None:
+            self._request_page(offset // self.batch_size)
+            return
+        page = self._try_load_page(offset // self.batch_size)
+        if page is not None:
+            self._append_page(offset, page)
+
+    def _append_page(self, offset, page):
+        """Udostępnia widokowi pobraną stronę zaczynającą się od wiersza offset
+
+        Strona krótsza niż batch_size kończy źródło - liczba wierszy jest
+        przycinana (np. wiersze usunięte po policzeniu tabeli) i pojawia się
+        pusty wiersz. Wywoływane tylko dla stron pobranych bez błędu.
+        """
+        end = offset + len(page)
+        total = end if len(page) < self.batch_size else max(self._total, end)
+        # Ostatnia strona - pojawia się też pusty wiersz
+        inserted = len(page) + (1 if end >= total and self._columns else 0)
+        if not inserted:
+            self._loaded = end
+            self._total = total
+            return
+        self.beginInsertRows(QModelIndex(), offset, offset + inserted - 1)
+        self._loaded = end
+        self._total = total
+        self.endInsertRows()
+
+    def retry_failed_pages(self):
+        """Ponawia pobranie stron, których nie udało się pobrać"""
+        failed = sorted(self._failed_pages)
+        self._clear_load_error()
+        for page_no in failed:
+            offset = page_no * self.batch_size
+            if offset >= self._loaded:
+                self.fetchMore()
+            elif self._columns:
+                # Zwolniona strona - widok pobierze ją ponownie przy odczycie danych
+                last = min(offset + self.batch_size, self._loaded) - 1
+                self.dataChanged.emit(self.index(offset, 0), self.index(last, len(self._columns) - 1))
+
+    # === Interfejs QAbstractTableModel ===
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded + (1 if self._has_draft_row() else 0)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.column_name(section)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        column = self._columns[index.column()]
+        if not column.get('editable', True):
+            return flags
+        if column.get('type') == 'CheckBox':
+            return flags | Qt.ItemFlag.ItemIsUserCheckable
+        return flags | Qt.ItemFlag.ItemIsEditable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        data = self._row_dict(index.row())
+        if data is None:
+            return None
+
+        column = self._columns[index.column()]
+        value = data.get(column['name'])
+        is_checkbox = column.get('type') == 'CheckBox'
+
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
+            if is_checkbox:
+                return None
+            return str(value) if value is not None else ""
+        if role == Qt.ItemDataRole.CheckStateRole and is_checkbox:
+            return Qt.CheckState.Checked if is_truthy(value) else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.TextAlignmentRole and is_checkbox:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Zmienia wartość w modelu i zgłasza wiersz do zapisu przez row_edited"""
+        if not index.isValid():
+            return False
+        data = self._row_dict(index.row())
+        if data is None:
+            return False
+
+        column = self._columns[index.column()]
+        if role == Qt.ItemDataRole.CheckStateRole and column.get('type') == 'CheckBox':
+            state = value.value if isinstance(value, Qt.CheckState) else int(value)
+            data[column['name']] = 1 if state == Qt.CheckState.Checked.value else 0
+        elif role == Qt.ItemDataRole.EditRole and self.flags(index) & Qt.ItemFlag.ItemIsEditable:
+            # Puste wartości zapisywane są jako NULL
+            data[column['name']] = value if value not in (None, "") else None
+        else:
+            return False
+
+        self.dataChanged.emit(index, index)
+        self.row_edited.emit(index.row())
+        return True
+
+    # === Pomocnicze ===
+
+    def _has_draft_row(self):
+        """Pusty wiersz jest widoczny dopiero za ostatnią pobraną stroną"""
+        return bool(self._columns) and not self._awaiting_source and self._all_rows_loaded()
+
+    def _all_rows_loaded(self):
+        return self._fetch_page is None or self._loaded >= self._total
+
+    def _row_dict(self, row):
+        if 0 <= row < self._loaded:
+            page_no, page_row = divmod(row, self.batch_size)
+            page = self._pages.get(page_no)
+            if page is None:
+                # Strona zwolniona z pamięci - widok do niej wrócił
+                if self._source_async_db is not None:
+                    self._request_page(page_no)
+                    return None
+                if self._load_error is not None:
+                    return None  # Ponowienie po błędzie zleca retry_failed_pages
+                page = self._try_load_page(page_no)
+                if page is None:
+                    return None
+            else:
+                self._pages.move_to_end(page_no)
+            return page[page_row] if page_row < len(page) else None
+        if self.is_draft_row(row):
+            return self._draft
+        return None
+
+    def _load_page(self, page_no):
+        """Pobiera stronę ze źródła i zapisuje ją w pamięci"""
+        page = list(self._fetch_page(page_no * self.batch_size, self.batch_size))
+        self._page_loads += 1
+        if page:
+            self._store_page(page_no, page)
+        return page
+
+    def _try_load_page(self, page_no):
+        """_load_page bez pobierania w tle - błąd przechodzi w stan błędu modelu
+
+        Returns:
+            Lista wierszy lub None, gdy pobranie się nie udało
+        """
+        try:
+            return self._load_page(page_no)
+        except Exception as e:
+            print(f"Błąd pobierania strony {page_no} wierszy tabeli: {e}")
+            import traceback
+            traceback.print_exc()
+            self._on_page_failed(page_no, str(e))
+            return None
+
+    def _request_page(self, page_no):
+        """Zleca pobranie strony w tle (każda strona najwyżej raz naraz)"""
+        if page_no in self._page_requests or self._load_error is not None:
+            return
+        request = self._source_async_db.submit(
+            self._fetch_page, page_no * self.batch_size, self.batch_size,
+            on_result=partial(self._on_page_loaded, page_no),
+            on_error=partial(self._on_page_failed, page_no),
+        )
+        request.done.connect(partial(self._on_page_request_done, page_no, request))
+        self._page_requests[page_no] = request
+        self._update_loading()
+
+    def _on_page_loaded(self, page_no, page):
+        page = list(page)
+        self._page_loads += 1
+        offset = page_no * self.batch_size
+        if offset == self._loaded:
+            # Kolejna strona na końcu (fetchMore)
+            if page:
+                self._store_page(page_no, page)
+            self._append_page(offset, page)
+        elif offset < self._loaded and page:
+            # Strona zwolniona z pamięci, do której wrócił widok
+            self._store_page(page_no, page)
+            if self._columns:
+                last = min(offset + len(page), self._loaded) - 1
+                self.dataChanged.emit(self.index(offset, 0), self.index(last, len(self._columns) - 1))
+
+    def _on_page_failed(self, page_no, message):
+        """Błąd pobierania strony - liczba wierszy bez zmian, ponowienie po LOAD_RETRY_MS"""
+        self._failed_pages.add(page_no)
+        self._load_error = message
+        if self._retry_timer is None:
+            self._retry_timer = QTimer(self)
+            self._retry_timer.setSingleShot(True)
+            self._retry_timer.timeout.connect(self.retry_failed_pages)
+        self._retry_timer.start(self.LOAD_RETRY_MS)
+        self.load_failed.emit(message)
+
+    def _clear_load_error(self):
+        self._load_error = None
+        self._failed_pages = set()
+        if self._retry_timer is not None:
+            self._retry_timer.stop()
+
+    def _on_page_request_done(self, page_no, request):
+        if self._page_requests.get(page_no) is request:
+            del self._page_requests[page_no]
+            self._update_loading()
+
+    def _cancel_page_requests(self):
+        for request in self._page_requests.values():
+            request.cancel()
+        self._page_requests = {}
+
+    def _update_loading(self):
+        """Wysyła loading_changed, gdy stan ładowania się zmienił"""
+        loading = self.is_loading()
+        if loading != self._loading:
+            self._loading = loading
+            self.loading_changed.emit(loading)
+
+    def _store_page(self, page_no, page):
+        """Zapisuje stronę i zwalnia najdawniej używane strony ponad budżet pamięci"""
+        self._pages[page_no] = page
+        self._pages.move_to_end(page_no)
+        if self.max_cached_rows is None:
+            return
+        max_pages = max(self.MIN_CACHED_PAGES, self.max_cached_rows // self.batch_size)
+        while len(self._pages) > max_pages:
+            self._pages.popitem(last=False)
+
+    def _new_draft(self):
+        """Pusty wiersz z wartościami domyślnymi kolumn"""
+        draft = {}
+        for column in self._columns:
+            default_value = column.get('default_value')
+            if column.get('type') == 'CheckBox':
+                draft[column['name']] = 1 if is_truthy(default_value) else 0
+            else:
+                draft[column['name']] = default_value if default_value else None
+        return draft
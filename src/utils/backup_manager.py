@@ -1,13 +1,106 @@
 """
 System zarządzania backupami bazy danych
 """
+import gzip
 import os
-import shutil
 import sqlite3
 from datetime import datetime
 from pathlib import Path
 
 
+# Ile stron bazy kopiować w jednym kroku backupu (po każdym kroku - postęp i przerwanie)
+BACKUP_PAGES_PER_STEP = 1024
+
+
+# Porcja kopiowania pliku przy imporcie backupu
+IMPORT_CHUNK_SIZE = 1024 * 1024
+
+# Pierwsze bajty pliku gzip (kopie automatyczne .db.gz)
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Tabele, bez których plik nie jest bazą aplikacji
+REQUIRED_TABLES = ('tasks', 'notes')
+
+# Kolumny ze schematu bazowego (migracja 1), które musi mieć każda obecna tabela -
+# kolumny dodane później uzupełnią migracje
+REQUIRED_SCHEMA = {
+    'tasks': {'id', 'title', 'description', 'status', 'category', 'created_at', 'updated_at'},
+    'notes': {'id', 'title', 'content', 'parent_id', 'created_at', 'updated_at'},
+    'user_tables': {'id', 'name'},
+    'user_table_columns': {'id', 'table_id', 'name', 'type', 'column_order'},
+    'task_columns': {'id', 'name', 'type'},
+    'dictionary_lists': {'id', 'name'},
+    'dictionary_list_items': {'id', 'list_id', 'value'},
+    'app_settings': {'key', 'value'},
+}
+
+# Pliki towarzyszące bazie usuwane przy podmianie (WAL, pamięć współdzielona,
+# dziennik edycji tabel użytkownika - patrz database.table_edit_queue)
+DATABASE_SIDE_FILES = ('-wal', '-shm', '-edits.jsonl')
+
+
+class BackupCancelled(Exception):
+    """Backup przerwany przez użytkownika (plik docelowy nie powstaje)"""
+
+
+def backup_database(source_path, target_path, progress=None, should_cancel=None,
+                    pages_per_step=BACKUP_PAGES_PER_STEP):
+    """Tworzy spójną kopię działającej bazy przez sqlite3 backup API
+
+    Kopia powstaje z migawki: połączenie źródłowe trzyma transakcję odczytu,
+    więc w trybie WAL aplikacja dalej czyta i zapisuje, a zapisy innych
+    połączeń nie restartują kopiowania (bez transakcji backup zaczynałby od
+    nowa po każdym zapisie). Strony kopiowane są porcjami; plik docelowy
+    powstaje pod nazwą tymczasową (.part) i jest podmieniany dopiero po
+    udanym backupie - przerwany backup nie zostawia niepełnego pliku.
+
+    Args:
+        source_path: Ścieżka do bazy źródłowej
+        target_path: Ścieżka pliku kopii
+        progress: Funkcja progress(skopiowane_strony, wszystkie_strony) po każdym kroku
+        should_cancel: Funkcja zwracająca True, gdy backup ma zostać przerwany
+        pages_per_step: Liczba stron kopiowanych w jednym kroku
+
+    Returns:
+        int: Rozmiar pliku kopii w bajtach
+
+    Raises:
+        BackupCancelled: should_cancel() zwróciło True
+    """
+    temp_path = target_path + '.part'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    def on_step(status, remaining, total):
+        if progress:
+            progress(total - remaining, total)
+        if should_cancel and should_cancel():
+            raise BackupCancelled("Backup przerwany przez użytkownika")
+
+    try:
+        source = sqlite3.connect(source_path, timeout=30, isolation_level=None)
+        try:
+            # Transakcja odczytu = migawka bazy na czas całego kopiowania
+            source.execute('BEGIN')
+            source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+            target = sqlite3.connect(temp_path)
+            try:
+                source.backup(target, pages=pages_per_step, progress=on_step)
+                # Kopia jako jeden samodzielny plik (bez -wal obok)
+                target.execute('PRAGMA journal_mode=DELETE')
+            finally:
+                target.close()
+            source.execute('ROLLBACK')
+        finally:
+            source.close()
+        os.replace(temp_path, target_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return os.path.getsize(target_path)
+
+
 class BackupManager:
     """Zarządza eksportem i importem backupów bazy danych"""
     
@@ -20,12 +113,17 @@ class BackupManager:
         """
         self.db_path = db_path
         
-    def export_backup(self, backup_path):
+    def export_backup(self, backup_path, progress=None, should_cancel=None):
         """
         Eksportuje backup bazy danych do wskazanego pliku
         
+        Kopia jest spójna także przy pracującej aplikacji (patrz backup_database),
+        więc nie trzeba zamykać połączeń ani wykonywać checkpointu WAL.
+        
         Args:
             backup_path: Ścieżka docelowa dla pliku backupu
+            progress: Funkcja progress(skopiowane_strony, wszystkie_strony)
+            should_cancel: Funkcja zwracająca True, gdy backup ma zostać przerwany
             
         Returns:
             tuple: (success: bool, message: str)
@@ -40,66 +138,194 @@ class BackupManager:
             if backup_dir and not os.path.exists(backup_dir):
                 os.makedirs(backup_dir)
             
-            # Skopiuj bazę danych do pliku backupu
-            shutil.copy2(self.db_path, backup_path)
-            
-            # Sprawdź czy backup został utworzony
-            if os.path.exists(backup_path):
-                backup_size = os.path.getsize(backup_path)
-                return True, f"Backup utworzony pomyślnie ({backup_size} bajtów)"
-            else:
-                return False, "Nie udało się utworzyć pliku backupu"
+            # Skopiuj bazę danych stronami przez backup API
+            backup_size = backup_database(self.db_path, backup_path, progress, should_cancel)
+            return True, f"Backup utworzony pomyślnie ({backup_size} bajtów)"
                 
+        except BackupCancelled as e:
+            return False, str(e)
         except PermissionError:
             return False, "Brak uprawnień do zapisu w wybranej lokalizacji"
         except Exception as e:
             return False, f"Błąd podczas tworzenia backupu: {str(e)}"
     
-    def import_backup(self, backup_path):
+    def import_backup(self, backup_path, progress=None, should_cancel=None, before_replace=None):
         """
         Importuje backup bazy danych ze wskazanego pliku
         
+        Plik (także skompresowana kopia .db.gz z automatycznych backupów) jest
+        najpierw kopiowany obok bazy pod nazwą tymczasową i sprawdzany
+        (validate_backup_file). Aktualna baza jest podmieniana dopiero po
+        udanej walidacji, przez os.replace - uszkodzony lub niepełny plik
+        nigdy jej nie nadpisze, a przerwanie w dowolnym momencie zostawia
+        bazę bez zmian.
+        
         Args:
             backup_path: Ścieżka do pliku backupu
+            progress: Funkcja progress(procent, opis_etapu)
+            should_cancel: Funkcja zwracająca True, gdy import ma zostać przerwany
+            before_replace: Funkcja wywoływana tuż przed podmianą pliku - wyjątek
+                przerywa import (np. połączenia aplikacji z bazą nie są zamknięte)
             
         Returns:
             tuple: (success: bool, message: str)
         """
+        staged_path = f"{self.db_path}.import.part"
+        
+        def report(percent, stage):
+            if progress:
+                progress(percent, stage)
+            if should_cancel and should_cancel():
+                raise BackupCancelled("Import przerwany - baza danych nie została zmieniona")
+        
         try:
             # Sprawdź czy plik backupu istnieje
             if not os.path.exists(backup_path):
                 return False, "Plik backupu nie istnieje"
             
-            # Sprawdź czy to prawidłowy plik SQLite
-            if not self._is_valid_sqlite_file(backup_path):
-                return False, "Wybrany plik nie jest prawidłową bazą danych SQLite"
+            # Kopia robocza obok bazy - ten sam system plików, więc podmiana jest atomowa
+            report(0, "Kopiowanie pliku backupu...")
+            self._stage_backup_file(backup_path, staged_path,
+                                    lambda percent: report(percent * 60 // 100, "Kopiowanie pliku backupu..."))
+            
+            report(60, "Sprawdzanie integralności bazy...")
+            valid, message = self.validate_backup_file(staged_path, should_cancel)
+            if not valid:
+                return False, message
             
             # Utwórz backup aktualnej bazy przed nadpisaniem
+            report(85, "Kopia bezpieczeństwa aktualnej bazy...")
             if os.path.exists(self.db_path):
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 auto_backup_path = f"{self.db_path}.backup_{timestamp}"
                 try:
-                    shutil.copy2(self.db_path, auto_backup_path)
+                    backup_database(self.db_path, auto_backup_path)
                     print(f"Utworzono automatyczny backup aktualnej bazy: {auto_backup_path}")
                 except Exception as e:
                     print(f"Ostrzeżenie: Nie udało się utworzyć automatycznego backupu: {e}")
             
-            # Zamknij wszystkie połączenia z bazą danych
-            # (to powinno być zrobione przed wywołaniem tej metody)
-            
-            # Nadpisz bazę danych plikiem backupu
-            shutil.copy2(backup_path, self.db_path)
+            report(95, "Podmiana bazy danych...")
+            if before_replace:
+                before_replace()
+            self._replace_database(staged_path)
             
-            # Sprawdź czy import się powiódł
-            if os.path.exists(self.db_path):
-                return True, "Backup zaimportowany pomyślnie. Aplikacja wymaga ponownego uruchomienia."
-            else:
-                return False, "Nie udało się zaimportować backupu"
+            if progress:
+                progress(100, "Gotowe")
+            return True, "Backup zaimportowany pomyślnie. Aplikacja wymaga ponownego uruchomienia."
                 
+        except BackupCancelled as e:
+            return False, str(e)
         except PermissionError:
             return False, "Brak uprawnień do zapisu w lokalizacji bazy danych"
         except Exception as e:
             return False, f"Błąd podczas importu backupu: {str(e)}"
+        finally:
+            if os.path.exists(staged_path):
+                os.remove(staged_path)
+    
+    def _stage_backup_file(self, backup_path, staged_path, progress):
+        """Kopiuje (lub rozpakowuje .gz) plik backupu porcjami, raportując procent"""
+        total = os.path.getsize(backup_path)
+        with open(backup_path, 'rb') as raw:
+            compressed = raw.read(2) == GZIP_MAGIC
+            raw.seek(0)
+            source = gzip.open(raw, 'rb') if compressed else raw
+            with open(staged_path, 'wb') as target:
+                while True:
+                    chunk = source.read(IMPORT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+                    # Postęp według pozycji w pliku źródłowym (także dla .gz)
+                    progress(int(raw.tell() * 100 / total) if total else 100)
+                target.flush()
+                os.fsync(target.fileno())
+    
+    def validate_backup_file(self, file_path, should_cancel=None):
+        """
+        Sprawdza, czy plik może zastąpić bazę aplikacji
+        
+        Kolejno: nagłówek SQLite, PRAGMA quick_check, obecność tabel
+        i kolumn z REQUIRED_SCHEMA oraz wersja schematu (user_version) nie
+        nowsza niż aktualnej bazy - brakujące nowsze kolumny i tabele dodadzą
+        migracje przy starcie.
+        
+        Returns:
+            tuple: (valid: bool, message: str)
+        """
+        with open(file_path, 'rb') as f:
+            if f.read(16) != b'SQLite format 3\x00':
+                return False, "Wybrany plik nie jest bazą danych SQLite"
+        
+        # immutable - plik nie jest przez nikogo zapisywany, SQLite nie tworzy obok niego -wal/-shm
+        conn = sqlite3.connect(f"file:{Path(file_path).resolve().as_posix()}?mode=ro&immutable=1", uri=True)
+        try:
+            if should_cancel:
+                # Przerwanie długiego quick_check - niezerowy wynik przerywa zapytanie
+                conn.set_progress_handler(lambda: 1 if should_cancel() else 0, 100000)
+            try:
+                problems = [row[0] for row in conn.execute('PRAGMA quick_check(5)')]
+            except sqlite3.OperationalError as e:
+                if should_cancel and should_cancel():
+                    raise BackupCancelled("Import przerwany - baza danych nie została zmieniona")
+                return False, f"Plik bazy jest uszkodzony: {e}"
+            except sqlite3.DatabaseError as e:
+                return False, f"Plik bazy jest uszkodzony: {e}"
+            if problems != ['ok']:
+                return False, "Plik bazy jest uszkodzony:\n" + '\n'.join(problems)
+            
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            missing_tables = [table for table in REQUIRED_TABLES if table not in tables]
+            if missing_tables:
+                return False, f"Plik nie jest bazą Pro-Ka-Po (brak tabel: {', '.join(missing_tables)})"
+            for table, columns in REQUIRED_SCHEMA.items():
+                if table not in tables:
+                    continue
+                existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+                missing_columns = sorted(columns - existing)
+                if missing_columns:
+                    return False, (f"Niezgodny schemat bazy - tabela {table} nie ma kolumn: "
+                                   f"{', '.join(missing_columns)}")
+            
+            backup_version = conn.execute('PRAGMA user_version').fetchone()[0]
+        finally:
+            conn.close()
+        
+        current_version = self._schema_version(self.db_path)
+        if current_version is not None and backup_version > current_version:
+            return False, (f"Backup pochodzi z nowszej wersji aplikacji (schemat {backup_version}, "
+                           f"obsługiwany {current_version})")
+        return True, "Plik backupu jest poprawny"
+    
+    @staticmethod
+    def _schema_version(db_path):
+        """PRAGMA user_version bazy lub None, gdy baza nie istnieje"""
+        if not os.path.exists(db_path):
+            return None
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            return conn.execute('PRAGMA user_version').fetchone()[0]
+        finally:
+            conn.close()
+    
+    def _replace_database(self, staged_path):
+        """Podmienia plik bazy na sprawdzoną kopię roboczą
+        
+        Przed podmianą zawartość WAL aktualnej bazy trafia do pliku bazy
+        (checkpoint TRUNCATE), a pliki -wal/-shm i dziennik edycji tabel są
+        usuwane - należą do starej bazy i nie mogą zostać zastosowane do nowej.
+        """
+        if os.path.exists(self.db_path):
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            finally:
+                conn.close()
+        for suffix in DATABASE_SIDE_FILES:
+            side_path = self.db_path + suffix
+            if os.path.exists(side_path):
+                os.remove(side_path)
+        os.replace(staged_path, self.db_path)
     
     def _is_valid_sqlite_file(self, file_path):
         """
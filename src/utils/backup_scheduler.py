@@ -0,0 +1,240 @@
+"""
+Automatyczne backupy bazy danych - harmonogram, kompresja, pomijanie duplikatów i rotacja
+
+BackupScheduler w osobnym wątku co interval_hours tworzy kopię bazy przez
+backup API (backup_database), kompresuje ją gzipem i usuwa stare kopie
+według polityki: najnowsza kopia z każdej z ostatnich N godzin, N dni
+i N tygodni. Kopia nie jest zapisywana, gdy baza się nie zmieniła - w trakcie
+działania decyduje PRAGMA data_version, a po ponownym uruchomieniu skrót
+SHA-256 zawartości zapisany w nazwie ostatniej kopii.
+"""
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from .backup_manager import backup_database
+
+
+# Nazwa kopii: <nazwa bazy>_<rrrrmmdd_ggmmss>_<skrót zawartości>.db.gz
+BACKUP_NAME = re.compile(r'^(?P<stem>.+)_(?P<stamp>\d{8}_\d{6})_(?P<digest>[0-9a-f]{16})\.db\.gz$')
+STAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+# Rozmiar porcji przy liczeniu skrótu i kompresji
+CHUNK_SIZE = 1024 * 1024
+
+# Wyniki run_backup()
+BACKUP_CREATED = 'created'
+BACKUP_UNCHANGED = 'unchanged'
+
+
+def list_backups(backup_dir, stem):
+    """Zwraca kopie bazy z katalogu od najnowszej: lista (data, skrót, ścieżka)"""
+    if not os.path.isdir(backup_dir):
+        return []
+    backups = []
+    for name in os.listdir(backup_dir):
+        match = BACKUP_NAME.match(name)
+        if not match or match.group('stem') != stem:
+            continue
+        try:
+            created = datetime.strptime(match.group('stamp'), STAMP_FORMAT)
+        except ValueError:
+            continue
+        path = os.path.join(backup_dir, name)
+        backups.append((created, match.group('digest'), path, os.path.getmtime(path)))
+    # Kopie z tej samej sekundy - rozstrzyga czas modyfikacji pliku
+    backups.sort(key=lambda backup: (backup[0], backup[3]), reverse=True)
+    return [backup[:3] for backup in backups]
+
+
+def select_backups_to_keep(backups, keep_hourly=24, keep_daily=7, keep_weekly=4):
+    """Wybiera kopie do zachowania (rotacja dziadek-ojciec-syn)
+
+    Z każdego z keep_hourly ostatnich okresów godzinnych, keep_daily dni
+    i keep_weekly tygodni (ISO) zostaje najnowsza kopia; kopia może liczyć
+    się do kilku okresów naraz.
+
+    Args:
+        backups: Lista (data, skrót, ścieżka) od najnowszej (list_backups)
+
+    Returns:
+        set ścieżek kopii do zachowania
+    """
+    periods = (
+        (keep_hourly, lambda created: (created.date(), created.hour)),
+        (keep_daily, lambda created: created.date()),
+        (keep_weekly, lambda created: created.isocalendar()[:2]),
+    )
+    keep = set()
+    for limit, period_of in periods:
+        seen = set()
+        for created, _, path in backups:
+            if len(seen) >= limit:
+                break
+            period = period_of(created)
+            if period not in seen:
+                seen.add(period)
+                keep.add(path)
+    return keep
+
+
+def file_digest(path):
+    """Skrót SHA-256 zawartości pliku (pierwsze 16 znaków hex)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class BackupScheduler(threading.Thread):
+    """Wątek w tle tworzący kopie bazy co interval_hours"""
+
+    def __init__(self, db_path, backup_dir=None, interval_hours=1.0, keep_hourly=24,
+                 keep_daily=7, keep_weekly=4, startup_delay=60.0, compresslevel=6):
+        """
+        Args:
+            db_path: Ścieżka do pliku bazy danych
+            backup_dir: Katalog kopii (domyślnie <katalog bazy>/backups)
+            interval_hours: Co ile godzin tworzyć kopię
+            keep_hourly, keep_daily, keep_weekly: Polityka rotacji (select_backups_to_keep)
+            startup_delay: Ile sekund po starcie odczekać z pierwszą zaległą kopią
+            compresslevel: Poziom kompresji gzip (1-9)
+        """
+        super().__init__(name='backup-scheduler', daemon=True)
+        self.db_path = db_path
+        self.backup_dir = backup_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), 'backups')
+        self.interval_hours = interval_hours
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+        self.startup_delay = startup_delay
+        self.compresslevel = compresslevel
+        self.stem = os.path.splitext(os.path.basename(db_path))[0]
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._run_now = False
+        self._monitor = None
+        self._backed_up_version = None
+
+    # === Sterowanie ===
+
+    def backup_now(self):
+        """Zleca kopię bez czekania na kolejny termin"""
+        self._run_now = True
+        self._wakeup.set()
+
+    def stop(self, timeout=10.0):
+        """Zatrzymuje wątek (trwająca kopia zostanie dokończona)"""
+        self._stopped = True
+        self._wakeup.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        next_due = self._first_due()
+        while not self._stopped:
+            remaining = next_due - time.time()
+            if remaining > 0 and not self._run_now:
+                self._wakeup.wait(remaining)
+                self._wakeup.clear()
+                continue
+            self._run_now = False
+            try:
+                self.run_backup()
+            except Exception as e:
+                print(f"Błąd automatycznego backupu bazy: {e}")
+                import traceback
+                traceback.print_exc()
+            next_due = time.time() + self.interval_hours * 3600
+
+        if self._monitor is not None:
+            self._monitor.close()
+            self._monitor = None
+
+    def _first_due(self):
+        """Termin pierwszej kopii: interwał od ostatniej kopii na dysku, nie wcześniej niż startup_delay"""
+        backups = list_backups(self.backup_dir, self.stem)
+        earliest = time.time() + self.startup_delay
+        if not backups:
+            return earliest
+        due = backups[0][0].timestamp() + self.interval_hours * 3600
+        return max(due, earliest)
+
+    # === Kopia ===
+
+    def _data_version(self):
+        """PRAGMA data_version własnego połączenia - zmienia się po zapisach innych połączeń"""
+        if self._monitor is None:
+            self._monitor = sqlite3.connect(self.db_path, timeout=30)
+        return self._monitor.execute('PRAGMA data_version').fetchone()[0]
+
+    def run_backup(self):
+        """Tworzy skompresowaną kopię, jeśli baza zmieniła się od poprzedniej
+
+        Returns:
+            tuple: (BACKUP_CREATED lub BACKUP_UNCHANGED, ścieżka kopii lub None)
+        """
+        # Odczyt przed kopią - zapis w trakcie kopiowania wymusi kolejną kopię
+        version = self._data_version()
+        if version == self._backed_up_version:
+            return BACKUP_UNCHANGED, None
+
+        os.makedirs(self.backup_dir, exist_ok=True)
+        snapshot_path = os.path.join(self.backup_dir, f"{self.stem}.snapshot")
+        try:
+            backup_database(self.db_path, snapshot_path)
+            digest = file_digest(snapshot_path)
+
+            backups = list_backups(self.backup_dir, self.stem)
+            if backups and backups[0][1] == digest:
+                # Zawartość taka jak w ostatniej kopii (np. po ponownym uruchomieniu)
+                self._backed_up_version = version
+                return BACKUP_UNCHANGED, backups[0][2]
+
+            stamp = datetime.now().strftime(STAMP_FORMAT)
+            backup_path = os.path.join(self.backup_dir, f"{self.stem}_{stamp}_{digest}.db.gz")
+            temp_path = backup_path + '.part'
+            try:
+                with open(snapshot_path, 'rb') as source, \
+                        gzip.open(temp_path, 'wb', compresslevel=self.compresslevel) as target:
+                    shutil.copyfileobj(source, target, CHUNK_SIZE)
+                os.replace(temp_path, backup_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+
+        self._backed_up_version = version
+        removed = self.apply_retention()
+        print(f"Automatyczny backup bazy: {os.path.basename(backup_path)} "
+              f"({os.path.getsize(backup_path)} bajtów, usunięto starych kopii: {removed})")
+        return BACKUP_CREATED, backup_path
+
+    def apply_retention(self):
+        """Usuwa kopie spoza polityki rotacji
+
+        Returns:
+            int: Liczba usuniętych kopii
+        """
+        backups = list_backups(self.backup_dir, self.stem)
+        keep = select_backups_to_keep(backups, self.keep_hourly, self.keep_daily, self.keep_weekly)
+        removed = 0
+        for _, _, path in backups:
+            if path in keep:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                print(f"Nie udało się usunąć starej kopii {path}: {e}")
+        return removed